@@ -68,6 +68,9 @@ for polynomial_order in polynomial_orders_3:
     data["valderrama"].evaluations = [nr_evaluations, nr_evaluations]
     data.save(folder + name + ".h5")
 
+# The worker processes are reused by all runs above, close them when done
+UQ.close()
+
 
 
 
@@ -132,3 +135,6 @@ for polynomial_order in polynomial_orders_11:
     nr_evaluations = len(data["valderrama"].evaluations)
     data["valderrama"].evaluations = [nr_evaluations, nr_evaluations]
     data.save(folder + name + ".h5")
+
+# The worker processes are reused by all runs above, close them when done
+UQ.close()
@@ -3,7 +3,17 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 """
 This module contains the classes that are responsible for running the model and
 calculate features of the model, both in parallel (``RunModel`` and
-``Parallel``), as well as the class for performing the uncertainty calculations
+``Parallel``), and the executors that distribute the model evaluations
+(``SerialExecutor``, ``ProcessExecutor``, ``ThreadExecutor`` and
+``DistributedExecutor``), a cache of model evaluations
+(``EvaluationCache``), memoization of polynomial bases, quadrature rules
+and Sobol samples (``BasisCache``), running Monte Carlo estimates
+(``OnlineStatistics``), incremental least squares fits
+(``IncrementalLeastSquares``), compact storage of the model parameters
+of many evaluations (``ModelParameters``), memory-mapped transport of the
+results from the workers (``OutputArena``), checkpointing of completed evaluations
+(``Checkpoint``), streaming storage of the results (``ResultAggregator``),
+as well as the class for performing the uncertainty calculations
 (``UncertaintyCalculations``. It also contains the base classes that are
 responsible for setting and updating parameters, models and features across
 classes (``Base`` and ``ParameterBase``).
@@ -13,8 +23,32 @@ from .base import Base, ParameterBase
 from .run_model import RunModel
 from .uncertainty_calculations import UncertaintyCalculations
 from .parallel import Parallel
+from .executors import Executor, SerialExecutor, ProcessExecutor
+from .executors import ThreadExecutor, DistributedExecutor
+from .evaluation_cache import EvaluationCache
+from .checkpoint import Checkpoint
+from .basis_cache import BasisCache
+from .online_statistics import OnlineStatistics
+from .least_squares import IncrementalLeastSquares
+from .result_aggregator import ResultAggregator
+from .model_parameters import ModelParameters
+from .output_arena import OutputArena, SharedArray
 
 __all__ = ["Parallel",
+           "Executor",
+           "SerialExecutor",
+           "ProcessExecutor",
+           "ThreadExecutor",
+           "DistributedExecutor",
+           "EvaluationCache",
+           "Checkpoint",
+           "BasisCache",
+           "OnlineStatistics",
+           "IncrementalLeastSquares",
+           "ResultAggregator",
+           "ModelParameters",
+           "OutputArena",
+           "SharedArray",
            "Base",
            "ParameterBase",
            "RunModel",
@@ -0,0 +1,346 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import hashlib
+import collections
+
+import numpy as np
+import chaospy as cp
+from SALib.sample import saltelli
+
+from .evaluation_cache import EvaluationCache, exact_string
+
+
+def distribution_signature(distribution):
+    """
+    Get a string that identifies a Chaospy distribution.
+
+    Parameters
+    ----------
+    distribution : chaospy.Dist
+        The distribution.
+
+    Returns
+    -------
+    signature : {str, None}
+        The name of the distribution class and the exact values of its
+        parameters. Parameters that are distributions themselves, for example
+        the distributions of a joint distribution, are included recursively.
+        None if the distribution can not be identified by its parameters,
+        for example if a parameter is not numeric.
+    """
+    parameters = getattr(distribution, "prm", None)
+    if parameters is None:
+        parameters = getattr(distribution, "_parameters", None)
+
+    if not isinstance(parameters, dict):
+        return None
+
+    items = []
+    for name in sorted(parameters):
+        value = parameters[name]
+
+        if isinstance(value, cp.Dist):
+            signature = distribution_signature(value)
+
+            if signature is None:
+                return None
+
+            items.append(str(name) + ":" + signature)
+        else:
+            try:
+                numeric = np.asarray(value).dtype.kind in "biufc"
+            except Exception:
+                numeric = False
+
+            if not numeric:
+                return None
+
+            items.append(str(name) + ":" + exact_string(np.asarray(value)))
+
+    return "{}.{}({})".format(distribution.__class__.__module__,
+                              distribution.__class__.__name__,
+                              ",".join(items))
+
+
+
+class BasisCache(object):
+    """
+    A memoization layer for orthogonal polynomial bases, quadrature rules and
+    Sobol samples.
+
+    The polynomial chaos expansions and the Monte Carlo method create the same
+    polynomials, quadrature nodes and weights, and Sobol samples each time
+    they are called with the same distribution and order. These are
+    deterministic and are stored the first time they are created, in memory
+    and optionally on disk, so repeated uncertainty quantifications, for
+    example when checking the convergence of the polynomial order, only
+    create them once.
+
+    Parameters
+    ----------
+    folder : {None, str}, optional
+        The folder where the bases are stored on disk, so they are reused
+        between runs. If None, the bases are only stored in memory.
+        Default is None.
+    max_items : int, optional
+        The maximum number of bases stored in memory. When more are stored,
+        the least recently used are removed. If 0, nothing is stored in memory.
+        Default is 32.
+    max_size : {int, float, None}, optional
+        The maximum size of the bases stored on disk in bytes. When the
+        folder grows larger than `max_size`, the least recently used bases are
+        deleted. If None, the size is not limited.
+        Default is 10**9 (1 GB).
+
+    Attributes
+    ----------
+    folder : {None, str}
+        The folder where the bases are stored on disk.
+    max_items : int
+        The maximum number of bases stored in memory.
+    disk : {None, EvaluationCache}
+        The on-disk storage of the bases.
+
+    Notes
+    -----
+    A basis is identified by the name of the function that creates it, the
+    class and exact parameter values of the distribution, and the remaining
+    arguments. Distributions that can not be identified by the exact values
+    of their parameters are never stored, and their bases are created each
+    time. The stored objects are returned as is, and should not be
+    modified in place.
+
+    See Also
+    --------
+    uncertainpy.core.EvaluationCache
+    """
+    def __init__(self, folder=None, max_items=32, max_size=10**9):
+        self.folder = folder
+        self.max_items = max_items
+
+        if folder is None:
+            self.disk = None
+        else:
+            self.disk = EvaluationCache(folder=folder, max_size=max_size)
+
+        self._memory = collections.OrderedDict()
+
+
+    def key(self, name, distribution=None, *args, **kwargs):
+        """
+        Calculate the key of a basis.
+
+        Parameters
+        ----------
+        name : str
+            Name of the function that creates the basis.
+        distribution : {None, chaospy.Dist}, optional
+            The distribution the basis is created for.
+            Default is None.
+        *args
+            The remaining arguments of the function.
+        **kwargs
+            The remaining keyword arguments of the function.
+
+        Returns
+        -------
+        key : {str, None}
+            A hexadecimal hash that identifies the basis, or None if
+            `distribution` can not be identified by its parameters.
+        """
+        if distribution is None:
+            signature = ""
+        else:
+            signature = distribution_signature(distribution)
+
+            if signature is None:
+                return None
+
+        content = name + "\n" + signature + "\n" + exact_string(list(args)) + "\n" + exact_string(kwargs)
+
+        return hashlib.sha1(content.encode("utf8")).hexdigest()
+
+
+    def memoize(self, key, function, *args, **kwargs):
+        """
+        Get the stored result of `key`, or calculate and store it.
+
+        Parameters
+        ----------
+        key : {str, None}
+            The key of the result. If None, the result is calculated and not
+            stored.
+        function : callable
+            The function that calculates the result.
+        *args
+            Arguments passed to `function`.
+        **kwargs
+            Keyword arguments passed to `function`.
+
+        Returns
+        -------
+        result
+            The result of ``function(*args, **kwargs)``.
+        """
+        if key is None:
+            return function(*args, **kwargs)
+
+        if key in self._memory:
+            self._memory[key] = self._memory.pop(key)
+            return self._memory[key]
+
+        result = None
+        if self.disk is not None:
+            result = self.disk.get(key)
+
+        if result is None:
+            result = function(*args, **kwargs)
+
+            if self.disk is not None:
+                try:
+                    self.disk.set(key, result)
+                except Exception:
+                    # Objects that can not be pickled are only stored in memory
+                    pass
+
+        self._store(key, result)
+
+        return result
+
+
+    def _store(self, key, result):
+        """
+        Store a result in memory, and remove the least recently used results
+        if there are more than `max_items`.
+        """
+        if self.max_items <= 0:
+            return
+
+        self._memory[key] = result
+
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+
+    def orth_ttr(self, order, distribution):
+        """
+        Create an orthogonal polynomial expansion, using
+        ``chaospy.orth_ttr``.
+
+        Parameters
+        ----------
+        order : int
+            The order of the polynomial expansion.
+        distribution : chaospy.Dist
+            The distribution the polynomials are orthogonal to.
+
+        Returns
+        -------
+        P : chaospy.Poly
+            The orthogonal polynomial expansion.
+        """
+        key = self.key("orth_ttr", distribution, order)
+
+        return self.memoize(key, cp.orth_ttr, order, distribution)
+
+
+    def generate_quadrature(self, order, distribution, rule="J", sparse=True):
+        """
+        Create a quadrature rule, using ``chaospy.generate_quadrature``.
+
+        Parameters
+        ----------
+        order : int
+            The order of the quadrature.
+        distribution : chaospy.Dist
+            The distribution the quadrature is created for.
+        rule : str, optional
+            The quadrature rule.
+            Default is "J".
+        sparse : bool, optional
+            If a sparse grid is used.
+            Default is True.
+
+        Returns
+        -------
+        nodes : array
+            The quadrature nodes.
+        weights : array
+            The quadrature weights.
+        """
+        key = self.key("generate_quadrature", distribution, order, rule=rule, sparse=sparse)
+
+        return self.memoize(key, cp.generate_quadrature, order, distribution,
+                            rule=rule, sparse=sparse)
+
+
+    def saltelli_sample(self, problem, nr_samples, calc_second_order=False):
+        """
+        Create Sobol samples, using ``SALib.sample.saltelli.sample``.
+
+        Parameters
+        ----------
+        problem : dict
+            The SALib problem definition.
+        nr_samples : int
+            The number of samples of each Sobol matrix.
+        calc_second_order : bool, optional
+            If the samples for the second order Sobol indices are created.
+            Default is False.
+
+        Returns
+        -------
+        samples : array
+            The Sobol samples, with shape
+            ``(nr_samples*(num_vars + 2), num_vars)`` if only the first and
+            total order indices are calculated.
+        """
+        key = self.key("saltelli_sample", None, problem, nr_samples,
+                       calc_second_order=calc_second_order)
+
+        # Newer versions of SALib add entries to the problem, which would
+        # change the key of the next call with the same problem
+        return self.memoize(key, saltelli.sample, dict(problem), nr_samples,
+                            calc_second_order=calc_second_order)
+
+
+    def clear(self):
+        """
+        Remove all stored bases, both in memory and on disk.
+        """
+        self._memory.clear()
+
+        if self.disk is not None:
+            self.disk.clear()
+
+
+    def __len__(self):
+        """
+        Get the number of bases stored in memory.
+
+        Returns
+        -------
+        int
+            The number of bases stored in memory.
+        """
+        return len(self._memory)
+
+
+    def __contains__(self, key):
+        """
+        Check if a basis with `key` is stored, in memory or on disk.
+
+        Parameters
+        ----------
+        key : str
+            The key of the basis.
+
+        Returns
+        -------
+        bool
+            True if the basis is stored.
+        """
+        if key in self._memory:
+            return True
+
+        return self.disk is not None and key in self.disk
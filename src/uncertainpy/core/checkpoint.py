@@ -0,0 +1,244 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import shutil
+
+from .evaluation_cache import evaluation_key
+from ..utils.logger import get_logger
+
+
+class Checkpoint(object):
+    """
+    Store completed model and feature evaluations in a HDF5 or Exdir file,
+    so an interrupted uncertainty quantification can be resumed.
+
+    Each batch of results is written to the file as soon as it is received
+    from the workers. When the model is evaluated again for the same nodes,
+    only the nodes that are missing from the checkpoint are evaluated.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the checkpoint file.
+    backend : {"auto", "hdf5", "exdir"}, optional
+        The fileformat used to store the checkpoint. "auto" uses the file
+        extension of `filename`, ".h5" for HDF5 files and ".exdir" for Exdir
+        files, and defaults to HDF5 for unknown extensions. "hdf5" requires
+        h5py and "exdir" requires exdir.
+        Default is "auto".
+
+    Attributes
+    ----------
+    filename : str
+        Name of the checkpoint file.
+    backend : {"auto", "hdf5", "exdir"}
+        The fileformat used to store the checkpoint.
+
+    Raises
+    ------
+    ValueError
+        If unsupported backend is chosen.
+
+    Notes
+    -----
+    An evaluation is identified by the model (its name, class and the source
+    code of the run function), the model keyword arguments, the names of the
+    features that are calculated, and the exact values of the model
+    parameters. The polynomial chaos methods create the same nodes each time,
+    while the Monte Carlo method requires `seed` to be set for the nodes of
+    a resumed run to be the same.
+
+    The checkpoint file is not deleted when the model evaluations are
+    finished, so it can be used to resume later runs as well. Delete the file
+    to start from scratch.
+
+    Interpolations of irregular results are not stored, they are recreated
+    when the results are loaded.
+    """
+    def __init__(self, filename, backend="auto"):
+        if backend not in ["auto", "hdf5", "exdir"]:
+            raise ValueError("backend {} not supported. Supported backends are: auto, hdf5, and exdir".format(backend))
+
+        self.filename = filename
+        self.backend = backend
+
+
+    def get_backend(self):
+        """
+        Import the module used to read and write the checkpoint file.
+
+        Returns
+        -------
+        backend : module
+            ``h5py`` or ``exdir.core``.
+
+        Raises
+        ------
+        ImportError
+            If h5py is not installed.
+        ImportError
+            If Exdir is not installed.
+        """
+        if self.backend == "auto":
+            if self.filename.endswith(".exdir"):
+                current_backend = "exdir"
+            else:
+                current_backend = "hdf5"
+        else:
+            current_backend = self.backend
+
+        if current_backend == "hdf5":
+            try:
+                import h5py as backend
+            except ImportError:
+                raise ImportError("The HDF5 backend requires: h5py")
+
+        elif current_backend == "exdir":
+            try:
+                import exdir.core as backend
+            except ImportError:
+                raise ImportError("The Exdir backend requires: exdir")
+
+        return backend
+
+
+    def key(self, model, features, model_parameters):
+        """
+        Calculate the key of an evaluation.
+
+        Parameters
+        ----------
+        model : Model or Model subclass instance
+            The model.
+        features : Features or Features subclass instance
+            The features that are calculated.
+        model_parameters : dict
+            The model parameters used in the evaluation.
+
+        Returns
+        -------
+        key : str
+            A hexadecimal hash that identifies the evaluation.
+        """
+        feature_names = ",".join(sorted(features.features_to_run))
+
+        return evaluation_key(model, model_parameters, extra=feature_names)
+
+
+    def load(self, keys):
+        """
+        Load the stored results for `keys`.
+
+        Parameters
+        ----------
+        keys : list
+            The keys of the evaluations to load.
+
+        Returns
+        -------
+        results : dict
+            A dictionary with the result dictionary for each key that is
+            stored in the checkpoint. Keys that are missing are not included.
+        """
+        results = {}
+
+        if not os.path.exists(self.filename):
+            return results
+
+        logger = get_logger(self)
+
+        backend = self.get_backend()
+
+        def read(item):
+            if isinstance(item, backend.Dataset):
+                return item[()]
+
+            return [read(item[name]) for name in sorted(item)]
+
+        f = backend.File(self.filename, "r")
+
+        for key in keys:
+            if key not in f or key in results:
+                continue
+
+            group = f[key]
+
+            # Incomplete writes are skipped and evaluated again.
+            # Exdir attributes have no get method.
+            if "complete" not in group.attrs or not group.attrs["complete"]:
+                continue
+
+            result = {}
+            for feature in group:
+                result[str(feature)] = {"values": read(group[feature]["values"]),
+                                        "time": read(group[feature]["time"])}
+
+            results[key] = result
+
+        f.close()
+
+        logger.info("Loaded {} of {} evaluations from the checkpoint {}".format(len(results), len(keys), self.filename))
+
+        return results
+
+
+    def save(self, keys, results):
+        """
+        Append results to the checkpoint file.
+
+        Parameters
+        ----------
+        keys : list
+            The key of each evaluation.
+        results : list
+            The result dictionary of each evaluation, in the same order as
+            `keys`. Interpolations are not stored.
+        """
+        backend = self.get_backend()
+
+        def write(group, name, value):
+            try:
+                group.create_dataset(name, data=value)
+            except (TypeError, ValueError):
+                # Irregular values are stored as a group of datasets
+                new_group = group.create_group(name)
+
+                padding = len(str(len(value)))
+                for i, item in enumerate(value):
+                    write(new_group, "{0:0{1}d}".format(i, padding), item)
+
+        directory = os.path.dirname(self.filename)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        f = backend.File(self.filename, "a")
+
+        for key, result in zip(keys, results):
+            if key in f:
+                if "complete" in f[key].attrs and f[key].attrs["complete"]:
+                    continue
+
+                del f[key]
+
+            group = f.create_group(key)
+
+            for feature in result:
+                feature_group = group.create_group(feature)
+
+                write(feature_group, "values", result[feature]["values"])
+                write(feature_group, "time", result[feature]["time"])
+
+            group.attrs["complete"] = True
+
+        f.close()
+
+
+    def clear(self):
+        """
+        Delete the checkpoint file.
+        """
+        if os.path.isdir(self.filename):
+            shutil.rmtree(self.filename)
+
+        elif os.path.isfile(self.filename):
+            os.remove(self.filename)
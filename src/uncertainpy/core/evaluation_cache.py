@@ -0,0 +1,397 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import hashlib
+import inspect
+import tempfile
+
+import six
+import numpy as np
+from six.moves import cPickle as pickle
+
+
+def model_identity(model):
+    """
+    Get a string that identifies the model.
+
+    Parameters
+    ----------
+    model : Model or Model subclass instance
+        The model.
+
+    Returns
+    -------
+    identity : str
+        The model name, the name of the model class, and the source code of
+        the model run function, if available.
+    """
+    identity = "{}.{}:{}".format(model.__class__.__module__,
+                                 model.__class__.__name__,
+                                 model.name)
+
+    try:
+        source = inspect.getsource(model.run)
+    except (IOError, OSError, TypeError):
+        source = ""
+
+    return identity + "\n" + source
+
+
+
+def exact_string(value):
+    """
+    Convert a parameter value to an exact string representation.
+
+    Parameters
+    ----------
+    value
+        The parameter value.
+
+    Returns
+    -------
+    string : str
+        A string that only is equal for equal values. Floats, and integers
+        that are exactly representable as floats, are represented exactly by
+        the hexadecimal representation of the float, and arrays by a hash of
+        their content.
+    """
+    if isinstance(value, (float, np.floating)):
+        return "f" + float(value).hex()
+
+    elif isinstance(value, (bool, np.bool_)):
+        return "b" + repr(bool(value))
+
+    elif isinstance(value, (six.integer_types, np.integer)):
+        if int(float(value)) == int(value):
+            return "f" + float(value).hex()
+
+        return "i" + repr(int(value))
+
+    elif isinstance(value, np.ndarray):
+        return "a" + str(value.dtype) + str(value.shape) + hashlib.sha1(value.tobytes()).hexdigest()
+
+    elif isinstance(value, (list, tuple)):
+        return "l[" + ",".join(exact_string(item) for item in value) + "]"
+
+    elif isinstance(value, dict):
+        items = sorted(value.items())
+        return "d{" + ",".join(str(key) + ":" + exact_string(item) for key, item in items) + "}"
+
+    else:
+        return "r" + repr(value)
+
+
+
+def evaluation_key(model, parameters, extra=""):
+    """
+    Calculate a key that identifies a model evaluation.
+
+    Parameters
+    ----------
+    model : Model or Model subclass instance
+        The model.
+    parameters : dict
+        The model parameters used in the evaluation.
+    extra : str, optional
+        Additional content to include in the key.
+        Default is "".
+
+    Returns
+    -------
+    key : str
+        A hexadecimal hash of the model identity, the model keyword
+        arguments, the exact values of the model parameters and `extra`.
+    """
+    all_parameters = model.model_kwargs.copy()
+    all_parameters.update(parameters)
+
+    content = model_identity(model) + "\n" + exact_string(all_parameters) + "\n" + extra
+
+    return hashlib.sha1(content.encode("utf8")).hexdigest()
+
+
+
+class EvaluationCache(object):
+    """
+    A content-addressed on-disk cache of model evaluations.
+
+    The raw output of the model, ``(time, values, info)``, is stored in a file
+    named by a hash of the model identity, the model keyword arguments, and
+    the exact values of the model parameters. Rerunning an uncertainty
+    quantification with different features or a different polynomial order
+    therefore only evaluates the model for nodes it has not seen before.
+
+    Parameters
+    ----------
+    folder : str, optional
+        The folder where the model evaluations are stored. Created if it does
+        not exist.
+        Default is ".uncertainpy_cache".
+    max_size : {int, float, None}, optional
+        The maximum size of the cache in bytes. When the cache grows larger
+        than `max_size`, the least recently used evaluations are deleted.
+        If None, the size of the cache is not limited.
+        Default is 10**9 (1 GB).
+
+    Attributes
+    ----------
+    folder : str
+        The folder where the model evaluations are stored.
+    max_size : {int, float, None}
+        The maximum size of the cache in bytes.
+
+    Notes
+    -----
+    The model identity is the name of the model, the name of the model class
+    and the source code of the model, if it can be found. Changing the
+    source code of a model therefore invalidates the cached evaluations.
+    Changes in code that the model calls, or in files the model reads, are
+    not detected, and ``clear`` should be called in those cases.
+
+    The cache is safe to use from several processes at the same time, since
+    each evaluation is written to a temporary file that is then renamed.
+
+    The size of the cache is only found by scanning the folder the first time
+    an evaluation is stored, and then updated with the size of each stored
+    evaluation. The folder is scanned again only when this running total
+    grows larger than `max_size`. Evaluations stored by other processes are
+    therefore not counted until the next scan, and the cache can temporarily
+    grow larger than `max_size` when several processes use it.
+    """
+    def __init__(self, folder=".uncertainpy_cache", max_size=10**9):
+        self.folder = folder
+        self.max_size = max_size
+
+        self.suffix = ".pkl"
+
+        self._size = None
+
+
+    def key(self, model, parameters):
+        """
+        Calculate the key of a model evaluation.
+
+        Parameters
+        ----------
+        model : Model or Model subclass instance
+            The model.
+        parameters : dict
+            The model parameters used in the evaluation.
+
+        Returns
+        -------
+        key : str
+            A hexadecimal hash of the model identity, the model keyword
+            arguments and the exact values of the model parameters.
+        """
+        return evaluation_key(model, parameters)
+
+
+    def path(self, key):
+        """
+        Get the path of the file that stores the evaluation with `key`.
+
+        Parameters
+        ----------
+        key : str
+            The key of the model evaluation.
+
+        Returns
+        -------
+        path : str
+            The path of the file.
+        """
+        return os.path.join(self.folder, key + self.suffix)
+
+
+    def get(self, key):
+        """
+        Get a cached model evaluation.
+
+        Parameters
+        ----------
+        key : str
+            The key of the model evaluation.
+
+        Returns
+        -------
+        model_result : {tuple, None}
+            The raw output of the model, ``(time, values, info)``, or None if
+            the evaluation is not cached.
+        """
+        path = self.path(key)
+
+        try:
+            with open(path, "rb") as f:
+                model_result = pickle.load(f)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        # Mark the evaluation as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        return model_result
+
+
+    def set(self, key, model_result):
+        """
+        Store a model evaluation in the cache.
+
+        Parameters
+        ----------
+        key : str
+            The key of the model evaluation.
+        model_result : tuple
+            The raw output of the model, ``(time, values, info)``.
+        """
+        if not os.path.isdir(self.folder):
+            try:
+                os.makedirs(self.folder)
+            except OSError:
+                # Created by another process in the meantime
+                if not os.path.isdir(self.folder):
+                    raise
+
+        if self.max_size is not None and self._size is None:
+            self._size = self.size()
+
+        path = self.path(key)
+
+        handle, tmp_path = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+
+        try:
+            with os.fdopen(handle, "wb") as f:
+                pickle.dump(model_result, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            new_size = os.path.getsize(tmp_path)
+
+            try:
+                old_size = os.path.getsize(path)
+            except OSError:
+                old_size = 0
+
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if self.max_size is None:
+            return
+
+        self._size += new_size - old_size
+
+        if self._size > self.max_size:
+            self.evict()
+
+
+    def size(self):
+        """
+        Get the size of the cache.
+
+        Returns
+        -------
+        size : int
+            The total size of all cached evaluations in bytes.
+        """
+        size = 0
+        for path, stat in self._entries():
+            size += stat.st_size
+
+        return size
+
+
+    def _entries(self):
+        """
+        Get the path and file status of each cached evaluation.
+        """
+        if not os.path.isdir(self.folder):
+            return []
+
+        entries = []
+        for filename in os.listdir(self.folder):
+            if filename.endswith(self.suffix):
+                path = os.path.join(self.folder, filename)
+                try:
+                    entries.append((path, os.stat(path)))
+                except OSError:
+                    # Deleted by another process in the meantime
+                    pass
+
+        return entries
+
+
+    def evict(self):
+        """
+        Delete the least recently used evaluations until the size of the
+        cache is below `max_size`.
+        """
+        if self.max_size is None:
+            return
+
+        entries = self._entries()
+
+        size = sum(stat.st_size for path, stat in entries)
+        self._size = size
+        if size <= self.max_size:
+            return
+
+        entries.sort(key=lambda entry: entry[1].st_mtime)
+
+        for path, stat in entries:
+            if size <= self.max_size:
+                break
+
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+            size -= stat.st_size
+
+        self._size = size
+
+
+    def clear(self):
+        """
+        Delete all cached evaluations.
+        """
+        for path, stat in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+        self._size = 0
+
+
+    def __len__(self):
+        """
+        Get the number of cached evaluations.
+
+        Returns
+        -------
+        int
+            The number of cached evaluations.
+        """
+        return len(self._entries())
+
+
+    def __contains__(self, key):
+        """
+        Check if an evaluation with `key` is cached.
+
+        Parameters
+        ----------
+        key : str
+            The key of the model evaluation.
+
+        Returns
+        -------
+        bool
+            True if the evaluation is cached.
+        """
+        return os.path.isfile(self.path(key))
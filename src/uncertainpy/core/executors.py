@@ -0,0 +1,450 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+try:
+    from itertools import imap
+except ImportError:
+    imap = map
+
+
+
+class Executor(object):
+    """
+    Base class for the executors that evaluate the model and features.
+
+    An executor maps a function over a series of arguments and returns the
+    results in the same order as the arguments. The workers used by an
+    executor are created the first time they are needed, and are kept alive
+    until ``close`` is called, so they can be reused by many uncertainty
+    quantifications.
+
+    Parameters
+    ----------
+    CPUs : {int, None}, optional
+        The number of workers to use.
+        Default is None.
+
+    Attributes
+    ----------
+    CPUs : {int, None}
+        The number of workers to use.
+
+    Notes
+    -----
+    A new executor must implement ``map``, and ``close`` if it holds on to
+    any resources. Executors can be used as context managers::
+
+        with ProcessExecutor(CPUs=4) as executor:
+            results = list(executor.map(function, arguments))
+
+    See Also
+    --------
+    uncertainpy.core.SerialExecutor
+    uncertainpy.core.ProcessExecutor
+    uncertainpy.core.ThreadExecutor
+    uncertainpy.core.DistributedExecutor
+    """
+    def __init__(self, CPUs=None):
+        self.CPUs = CPUs
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    @property
+    def nr_workers(self):
+        """
+        The number of workers that evaluate in parallel.
+
+        Returns
+        -------
+        nr_workers : int
+            The number of workers, at least 1.
+        """
+        if self.CPUs:
+            return self.CPUs
+        else:
+            return 1
+
+
+    def map(self, function, arguments):
+        """
+        Apply `function` to each element of `arguments`.
+
+        Parameters
+        ----------
+        function : callable
+            The function to apply. Takes a single argument.
+        arguments : list
+            The arguments to apply `function` to.
+
+        Returns
+        -------
+        results : iterator
+            An iterator over the results, in the same order as `arguments`.
+
+        Raises
+        ------
+        NotImplementedError
+            If no map method has been implemented.
+        """
+        raise NotImplementedError("No map method implemented in {class_name}".format(class_name=self.__class__.__name__))
+
+
+    def close(self):
+        """
+        Release the workers used by the executor. The workers are created
+        again the next time ``map`` is called.
+        """
+        pass
+
+
+
+class SerialExecutor(Executor):
+    """
+    Evaluate everything in the current process, one argument at the time.
+
+    See Also
+    --------
+    uncertainpy.core.Executor
+    """
+    @property
+    def nr_workers(self):
+        """
+        The number of workers that evaluate in parallel.
+
+        Returns
+        -------
+        nr_workers : int
+            Always 1.
+        """
+        return 1
+
+
+    def map(self, function, arguments):
+        """
+        Apply `function` to each element of `arguments` in the current process.
+
+        Parameters
+        ----------
+        function : callable
+            The function to apply. Takes a single argument.
+        arguments : list
+            The arguments to apply `function` to.
+
+        Returns
+        -------
+        results : iterator
+            An iterator over the results, in the same order as `arguments`.
+        """
+        return imap(function, arguments)
+
+
+
+class ProcessExecutor(Executor):
+    """
+    Evaluate in parallel using a persistent pool of worker processes
+    (``multiprocess.Pool``).
+
+    Parameters
+    ----------
+    CPUs : {int, None}, optional
+        The number of worker processes. If None, the number of CPUs on the
+        computer (multiprocess.cpu_count()) is used.
+        Default is None.
+
+    See Also
+    --------
+    uncertainpy.core.Executor
+    """
+    def __init__(self, CPUs=None):
+        if CPUs is None:
+            import multiprocess
+
+            CPUs = multiprocess.cpu_count()
+
+        super(ProcessExecutor, self).__init__(CPUs=CPUs)
+
+        self._pool = None
+
+
+    def create_pool(self):
+        """
+        Create the pool of workers.
+
+        Returns
+        -------
+        pool : multiprocess.Pool
+            A pool with `CPUs` worker processes.
+        """
+        import multiprocess as mp
+
+        return mp.Pool(processes=self.CPUs)
+
+
+    @property
+    def pool(self):
+        """
+        The pool of workers, created the first time it is used.
+
+        Returns
+        -------
+        pool : multiprocess.Pool
+            The pool of workers.
+        """
+        if self._pool is None:
+            self._pool = self.create_pool()
+
+        return self._pool
+
+
+    def map(self, function, arguments):
+        """
+        Apply `function` to each element of `arguments` in the pool of workers.
+
+        Parameters
+        ----------
+        function : callable
+            The function to apply. Takes a single argument.
+        arguments : list
+            The arguments to apply `function` to. Each argument is sent to a
+            worker as a single task.
+
+        Returns
+        -------
+        results : iterator
+            An iterator over the results, in the same order as `arguments`.
+        """
+        return self.pool.imap(function, arguments, 1)
+
+
+    def close(self):
+        """
+        Close the pool of workers and wait for them to exit.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+
+            self._pool = None
+
+
+
+class ThreadExecutor(ProcessExecutor):
+    """
+    Evaluate in parallel using a persistent pool of threads
+    (``multiprocess.pool.ThreadPool``).
+
+    Threads share memory with the current process, so nothing is pickled, but
+    only models that release the global interpreter lock, such as compiled
+    solvers, run in parallel.
+
+    Parameters
+    ----------
+    CPUs : {int, None}, optional
+        The number of threads. If None, the number of CPUs on the
+        computer (multiprocess.cpu_count()) is used.
+        Default is None.
+
+    See Also
+    --------
+    uncertainpy.core.Executor
+    """
+    def create_pool(self):
+        """
+        Create the pool of threads.
+
+        Returns
+        -------
+        pool : multiprocess.pool.ThreadPool
+            A pool with `CPUs` threads.
+        """
+        from multiprocess.pool import ThreadPool
+
+        return ThreadPool(processes=self.CPUs)
+
+
+
+def _run_serialized(serialized):
+    """
+    Deserialize a function and its argument, and run the function.
+
+    Parameters
+    ----------
+    serialized : bytes
+        The function and its argument serialized with dill.
+
+    Returns
+    -------
+    result
+        The result of the function.
+    """
+    import dill
+
+    function, argument = dill.loads(serialized)
+
+    return function(argument)
+
+
+
+def _count_workers(executor):
+    """
+    Find the number of workers of a ``concurrent.futures`` compatible executor.
+
+    Parameters
+    ----------
+    executor : concurrent.futures.Executor
+        The executor.
+
+    Returns
+    -------
+    nr_workers : {int, None}
+        The number of workers, or None if it could not be found.
+
+    Notes
+    -----
+    Supports the executors in ``concurrent.futures`` (``_max_workers``),
+    ``mpi4py.futures.MPIPoolExecutor`` (``num_workers``) and
+    ``dask.distributed.Client`` (``nthreads``).
+    """
+    nr_workers = getattr(executor, "_max_workers", None)
+
+    if nr_workers is None:
+        try:
+            nr_workers = getattr(executor, "num_workers", None)
+        except Exception:
+            nr_workers = None
+
+    if nr_workers is None and callable(getattr(executor, "nthreads", None)):
+        try:
+            nr_workers = sum(executor.nthreads().values())
+        except Exception:
+            nr_workers = None
+
+    if isinstance(nr_workers, int) and nr_workers > 0:
+        return nr_workers
+
+    return None
+
+
+
+class DistributedExecutor(Executor):
+    """
+    Evaluate on workers managed by a ``concurrent.futures`` compatible
+    executor, which can be spread across several computers.
+
+    Parameters
+    ----------
+    executor : {None, concurrent.futures.Executor}, optional
+        Any executor with a ``concurrent.futures`` compatible ``submit``
+        method, for example ``mpi4py.futures.MPIPoolExecutor`` or a
+        ``dask.distributed.Client``. If None, a local
+        ``concurrent.futures.ProcessPoolExecutor`` with `CPUs` workers is used.
+        Default is None.
+    CPUs : {int, None}, optional
+        The number of workers. Used to create the local executor, and to
+        estimate the chunksize. If None and `executor` is None, the number of
+        CPUs on the computer is used. If None and `executor` is given, the
+        number of workers is found from `executor`.
+        Default is None.
+
+    Attributes
+    ----------
+    executor : concurrent.futures.Executor
+        The executor that runs the tasks.
+
+    Raises
+    ------
+    ValueError
+        If `executor` is given, `CPUs` is None, and the number of workers can
+        not be found from `executor`.
+
+    Notes
+    -----
+    Each task is serialized with dill before it is submitted, so models and
+    features that can not be pickled by the standard pickle module (such as
+    functions defined in ``__main__``) can still be sent to the workers. The
+    workers must have Uncertainpy and dill installed. The executor is only
+    shut down by ``close`` if it was created by DistributedExecutor.
+
+    See Also
+    --------
+    uncertainpy.core.Executor
+    """
+    def __init__(self, executor=None, CPUs=None):
+        if executor is None and CPUs is None:
+            import multiprocess
+
+            CPUs = multiprocess.cpu_count()
+
+        elif executor is not None and CPUs is None:
+            CPUs = _count_workers(executor)
+
+            if CPUs is None:
+                raise ValueError("The number of workers of {} could not be found, "
+                                 "CPUs must be given".format(executor.__class__.__name__))
+
+        super(DistributedExecutor, self).__init__(CPUs=CPUs)
+
+        self._executor = executor
+        self._owns_executor = executor is None
+
+
+    @property
+    def executor(self):
+        """
+        The ``concurrent.futures`` compatible executor, created the first time
+        it is used if no executor was given.
+
+        Returns
+        -------
+        executor : concurrent.futures.Executor
+            The executor that runs the tasks.
+        """
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(max_workers=self.CPUs)
+
+        return self._executor
+
+
+    def map(self, function, arguments):
+        """
+        Submit `function` with each element of `arguments` to the executor.
+
+        Parameters
+        ----------
+        function : callable
+            The function to apply. Takes a single argument.
+        arguments : list
+            The arguments to apply `function` to. Each argument is submitted
+            as a single task.
+
+        Returns
+        -------
+        results : iterator
+            An iterator over the results, in the same order as `arguments`.
+        """
+        import dill
+
+        futures = []
+        for argument in arguments:
+            serialized = dill.dumps((function, argument))
+            futures.append(self.executor.submit(_run_serialized, serialized))
+
+        return (future.result() for future in futures)
+
+
+    def close(self):
+        """
+        Shut down the executor, if it was created by DistributedExecutor.
+        """
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+            self._executor = None
@@ -0,0 +1,326 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+
+
+def tikhonov_parameter(s, projection, outside, nr_nodes, gamma=0.1):
+    """
+    Choose the regularization parameter of a least squares problem with
+    Tikhonov regularization, from the singular value decomposition of the
+    Vandermonde matrix.
+
+    As in chaospy, the regularization parameter is chosen among
+    ``10**-arange(0, 16)`` by robust generalized cross-validation.
+
+    Parameters
+    ----------
+    s : array
+        The singular values of the Vandermonde matrix, with shape ``(K,)``.
+    projection : array
+        The projections ``U.T b`` of the right hand sides on the left
+        singular vectors, with shape ``(K, nr_columns)``.
+    outside : float
+        The sum of the squared norms of the parts of the right hand sides
+        outside the range of the Vandermonde matrix.
+    nr_nodes : int
+        The number of rows of the Vandermonde matrix.
+    gamma : float, optional
+        The robustness parameter of the cross-validation.
+        Default is 0.1.
+
+    Returns
+    -------
+    alpha : float
+        The regularization parameter. All columns use the same
+        regularization parameter.
+
+    Notes
+    -----
+    With ``filters = s**2/(s**2 + alpha)``, the residual and trace of the
+    influence matrix of every alpha are found from `projection` and
+    `outside` without solving any additional systems.
+    """
+    alphas = 10.**-np.arange(0, 16)
+
+    # filters[i, k] = s_k**2/(s_k**2 + alpha_i)
+    filters = s**2/(s**2 + alphas[:, np.newaxis])
+
+    trace = nr_nodes - np.sum(filters, axis=1)
+    mu2 = np.sum(filters**2, axis=1)/nr_nodes
+
+    # Residual sum of squares for each alpha
+    residual = (1 - filters)**2
+    res2 = residual.dot(np.sum(projection**2, axis=1)) + outside
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        skew = nr_nodes*res2/trace**2
+        errors = (gamma + (1 - gamma)*mu2)*skew
+
+    if np.all(np.isnan(errors)):
+        return alphas[0]
+
+    return alphas[np.nanargmin(errors)]
+
+
+
+def tikhonov_coefficients(s, Vt, projection, outside, nr_nodes, gamma=0.1):
+    """
+    Solve a least squares problem with Tikhonov regularization, from the
+    singular value decomposition of the Vandermonde matrix.
+
+    Parameters
+    ----------
+    s : array
+        The singular values of the Vandermonde matrix, with shape ``(K,)``.
+    Vt : array
+        The right singular vectors of the Vandermonde matrix, with shape
+        ``(K, nr_polynomials)``.
+    projection : array
+        The projections ``U.T b`` of the right hand sides on the left
+        singular vectors, with shape ``(K, nr_columns)``.
+    outside : float
+        The sum of the squared norms of the parts of the right hand sides
+        outside the range of the Vandermonde matrix.
+    nr_nodes : int
+        The number of rows of the Vandermonde matrix.
+    gamma : float, optional
+        The robustness parameter of the cross-validation.
+        Default is 0.1.
+
+    Returns
+    -------
+    coefficients : array
+        The regularized solution, with shape ``(nr_polynomials, nr_columns)``.
+
+    Notes
+    -----
+    The regularization parameter is chosen with ``tikhonov_parameter``, and
+    the regularized solution is ``Vt.T diag(s/(s**2 + alpha)) U.T b``.
+    """
+    alpha = tikhonov_parameter(s, projection, outside, nr_nodes, gamma=gamma)
+
+    return Vt.T.dot((s/(s**2 + alpha))[:, np.newaxis]*projection)
+
+
+
+def leave_one_out_error(rhs, residual, leverage):
+    """
+    Calculate the relative leave-one-out error of a linear least squares fit
+    from the residuals and the leverages of the fit with all nodes.
+
+    Parameters
+    ----------
+    rhs : array
+        The right hand sides, with shape ``(nr_nodes, nr_columns)``.
+    residual : array
+        The residuals of the fit with all nodes, with shape
+        ``(nr_nodes, nr_columns)``.
+    leverage : array
+        The diagonal of the hat matrix, with shape ``(nr_nodes,)``.
+
+    Returns
+    -------
+    error : float
+        The sum of the squared leave-one-out residuals
+        ``residual/(1 - leverage)`` divided by the sum of the squared
+        deviations of `rhs` from its mean. Constant right hand sides have an
+        error of 0.
+    """
+    deviation = np.sum((rhs - np.mean(rhs, axis=0))**2)
+    if deviation == 0:
+        return 0.
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        loo_residual = residual/(1 - leverage)[:, np.newaxis]
+
+    return np.sum(loo_residual**2)/deviation
+
+
+
+class IncrementalLeastSquares(object):
+    """
+    A least squares fit with Tikhonov regularization that is updated with
+    new rows of the Vandermonde matrix and the corresponding evaluations.
+
+    Only the normal equations are stored, so adding rows costs
+    ``O(nr_new_nodes*nr_polynomials**2)`` regardless of how many rows are
+    already added, and the rows are not kept in memory.
+
+    Parameters
+    ----------
+    nr_polynomials : int
+        The number of polynomials in the expansion, the number of columns of
+        the Vandermonde matrix.
+
+    Attributes
+    ----------
+    nr_polynomials : int
+        The number of polynomials in the expansion.
+    nr_nodes : int
+        The number of rows added so far.
+    shape : {None, tuple}
+        The shape of the evaluation in a single node.
+
+    Notes
+    -----
+    The Gram matrix ``A.T A``, the moments ``A.T b`` and the squared norms
+    of the evaluations are accumulated. The eigendecomposition of the Gram
+    matrix gives the singular values and right singular vectors of ``A``,
+    and the projections ``U.T b = diag(1/s) Vt A.T b``, so the solution is
+    the same as ``UncertaintyCalculations.fit_regression`` with all rows at
+    once, up to round-off errors. Since the Gram matrix squares the
+    singular values, directions with singular values below about ``1e-6``
+    times the largest are lost to round-off errors and are left out, which
+    only affects very ill-conditioned Vandermonde matrices.
+
+    See Also
+    --------
+    uncertainpy.core.least_squares.tikhonov_coefficients
+    uncertainpy.core.UncertaintyCalculations.extend_PCE_collocation
+    """
+    def __init__(self, nr_polynomials):
+        self.nr_polynomials = nr_polynomials
+        self.nr_nodes = 0
+        self.shape = None
+
+        self._gram = np.zeros((nr_polynomials, nr_polynomials))
+        self._moments = None
+        self._squares = None
+
+
+    def update(self, vandermonde, evaluations):
+        """
+        Add rows to the least squares problem.
+
+        Parameters
+        ----------
+        vandermonde : array_like
+            The polynomials evaluated in the new nodes, with shape
+            ``(nr_new_nodes, nr_polynomials)``.
+        evaluations : array_like
+            The evaluations in the new nodes, with shape
+            ``(nr_new_nodes, ...)``.
+
+        Raises
+        ------
+        ValueError
+            If the shape of the evaluations differs from the evaluations that
+            are already added.
+        """
+        vandermonde = np.asarray(vandermonde, dtype=float)
+        evaluations = np.asarray(evaluations, dtype=float)
+
+        if len(evaluations) == 0:
+            return
+
+        if self.shape is None:
+            self.shape = evaluations.shape[1:]
+            size = int(np.prod(self.shape))
+
+            self._moments = np.zeros((self.nr_polynomials, size))
+            self._squares = np.zeros(size)
+
+        elif evaluations.shape[1:] != self.shape:
+            raise ValueError("The evaluations have shape {}, expected {}".format(evaluations.shape[1:], self.shape))
+
+        rhs = evaluations.reshape(len(evaluations), -1)
+
+        self._gram += vandermonde.T.dot(vandermonde)
+        self._moments += vandermonde.T.dot(rhs)
+        self._squares += np.sum(rhs**2, axis=0)
+        self.nr_nodes += len(evaluations)
+
+
+    def solve(self):
+        """
+        Solve the least squares problem of all rows added so far.
+
+        Returns
+        -------
+        coefficients : {None, array}
+            The coefficients of the polynomials, with shape
+            ``(nr_polynomials,) + shape``, or None if no rows are added.
+        """
+        if self.nr_nodes == 0:
+            return None
+
+        s, Vt, projection, outside = self._decomposition()
+
+        coefficients = tikhonov_coefficients(s, Vt, projection, outside, self.nr_nodes)
+
+        return coefficients.reshape((self.nr_polynomials,) + self.shape)
+
+
+    def leave_one_out_error(self, vandermonde, evaluations):
+        """
+        Calculate the leave-one-out error of the fit of all rows added so
+        far, without refitting.
+
+        Parameters
+        ----------
+        vandermonde : array_like
+            All rows added so far, with shape ``(nr_nodes, nr_polynomials)``.
+            Only the normal equations are stored, so the rows must be given
+            again.
+        evaluations : array_like
+            All evaluations added so far, with shape ``(nr_nodes, ...)``.
+
+        Returns
+        -------
+        error : {None, float}
+            The relative leave-one-out error, as in
+            ``UncertaintyCalculations.leave_one_out_error``, or None if no
+            rows are added.
+
+        Raises
+        ------
+        ValueError
+            If the number of rows differs from the number of rows added.
+
+        Notes
+        -----
+        The hat matrix of the regularized fit is
+        ``H = A Vt.T diag(filters/s**2) Vt A.T``, so the leverages and the
+        residuals only cost ``O(nr_nodes*nr_polynomials**2)``.
+        """
+        if self.nr_nodes == 0:
+            return None
+
+        vandermonde = np.asarray(vandermonde, dtype=float)
+        evaluations = np.asarray(evaluations, dtype=float)
+
+        if len(vandermonde) != self.nr_nodes or len(evaluations) != self.nr_nodes:
+            raise ValueError("Got {} rows, {} rows are added".format(len(vandermonde), self.nr_nodes))
+
+        s, Vt, projection, outside = self._decomposition()
+
+        alpha = tikhonov_parameter(s, projection, outside, self.nr_nodes)
+        filters = s**2/(s**2 + alpha)
+
+        rhs = evaluations.reshape(self.nr_nodes, -1)
+        coefficients = Vt.T.dot((s/(s**2 + alpha))[:, np.newaxis]*projection)
+
+        residual = rhs - vandermonde.dot(coefficients)
+        leverage = np.sum(vandermonde.dot(Vt.T)**2*filters/s**2, axis=1)
+
+        return leave_one_out_error(rhs, residual, leverage)
+
+
+    def _decomposition(self):
+        """
+        Find the singular values, the right singular vectors and the
+        projections of the evaluations from the normal equations.
+        """
+        eigenvalues, eigenvectors = np.linalg.eigh(self._gram)
+
+        # Eigenvalues this small are dominated by round-off errors
+        tolerance = max(np.max(eigenvalues), 0)*1000*self.nr_polynomials*np.finfo(float).eps
+        keep = eigenvalues > tolerance
+
+        s = np.sqrt(eigenvalues[keep])
+        Vt = eigenvectors[:, keep].T
+
+        projection = Vt.dot(self._moments)/s[:, np.newaxis]
+        outside = np.sum(np.maximum(self._squares - np.sum(projection**2, axis=0), 0))
+
+        return s, Vt, projection, outside
@@ -0,0 +1,176 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+
+
+class ModelParameters(object):
+    """
+    The model parameters of a series of model evaluations, stored as a
+    header with the names of the uncertain parameters and a 2D array with
+    the values of the uncertain parameters in each evaluation.
+
+    ModelParameters behaves as a list of model parameter dictionaries, one
+    for each evaluation, but the dictionaries are only created when they are
+    needed. Slicing ModelParameters gives a new ModelParameters with a slice
+    of the array, which is sent to a worker as a single array instead of a
+    dictionary for each evaluation.
+
+    Parameters
+    ----------
+    names : list
+        The names of the uncertain parameters, one for each column of
+        `values`.
+    values : array_like
+        The values of the uncertain parameters, with shape
+        ``(nr_evaluations, len(names))``.
+    constants : {None, dict}, optional
+        The parameters that have the same value in all evaluations, as a
+        dictionary ``{name: value}``. If None, there are no constant
+        parameters. Default is None.
+
+    Attributes
+    ----------
+    names : list
+        The names of the uncertain parameters.
+    values : array
+        The values of the uncertain parameters, with shape
+        ``(nr_evaluations, len(names))``.
+    constants : dict
+        The parameters that have the same value in all evaluations.
+
+    Notes
+    -----
+    The model parameter dictionary of an evaluation contains the uncertain
+    parameters, in the order given by `names`, followed by the constant
+    parameters that are not uncertain. The values of the uncertain
+    parameters have the data type of `values`.
+
+    See Also
+    --------
+    uncertainpy.core.RunModel.create_model_parameters
+    """
+    def __init__(self, names, values, constants=None):
+        self.names = list(names)
+        self.values = np.asarray(values)
+
+        if self.values.ndim != 2 or self.values.shape[1] != len(self.names):
+            raise ValueError("values must have shape (nr_evaluations, {}), not {}".format(len(self.names),
+                                                                                        self.values.shape))
+
+        if constants is None:
+            constants = {}
+
+        self.constants = constants
+
+
+    def __len__(self):
+        """
+        Get the number of evaluations.
+
+        Returns
+        -------
+        nr_evaluations : int
+            The number of evaluations.
+        """
+        return len(self.values)
+
+
+    def __getitem__(self, index):
+        """
+        Get the model parameters of one evaluation, or a ModelParameters with
+        a subset of the evaluations.
+
+        Parameters
+        ----------
+        index : {int, slice, list, array}
+            The index of an evaluation, or a slice or list of indices of
+            evaluations.
+
+        Returns
+        -------
+        model_parameters : {dict, ModelParameters}
+            The model parameter dictionary if `index` is an integer, otherwise
+            a ModelParameters with the selected evaluations.
+        """
+        if isinstance(index, (int, np.integer)):
+            return self.parameters(index)
+
+        return ModelParameters(self.names, self.values[index], self.constants)
+
+
+    def __iter__(self):
+        """
+        Iterate over the model parameter dictionaries of the evaluations.
+
+        Yields
+        ------
+        model_parameters : dict
+            The model parameter dictionary of each evaluation.
+        """
+        for i in range(len(self)):
+            yield self.parameters(i)
+
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return False
+
+
+    def __ne__(self, other):
+        return not self == other
+
+
+    def parameters(self, index):
+        """
+        Create the model parameter dictionary of an evaluation.
+
+        Parameters
+        ----------
+        index : int
+            The index of the evaluation.
+
+        Returns
+        -------
+        model_parameters : dict
+            A dictionary with all model parameters of the evaluation,
+            ``{"parameter 1": value 1, "parameter 2": value 2, ...}``.
+        """
+        row = self.values[index]
+
+        parameters = {}
+        for j, name in enumerate(self.names):
+            parameters[name] = row[j]
+
+        for name in self.constants:
+            if name not in parameters:
+                parameters[name] = self.constants[name]
+
+        return parameters
+
+
+    def arrays(self):
+        """
+        Get each model parameter as an array with the value of the parameter
+        in each evaluation, as required by a vectorized model.
+
+        Returns
+        -------
+        arrays : dict
+            A dictionary ``{name: array}`` with all model parameters, where
+            each array has one value for each evaluation.
+
+        See also
+        --------
+        uncertainpy.models.Model.evaluate_batch
+        """
+        arrays = {}
+        for j, name in enumerate(self.names):
+            arrays[name] = self.values[:, j]
+
+        for name in self.constants:
+            if name not in arrays:
+                arrays[name] = np.array([self.constants[name]]*len(self))
+
+        return arrays
@@ -0,0 +1,278 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+
+
+class OnlineStatistics(object):
+    """
+    Running estimates of the mean, variance and Sobol indices, updated with
+    batches of model evaluations from Saltelli's sampling scheme.
+
+    Only the running sums needed for the estimates are stored, so each batch
+    of evaluations is only used once and the estimates are available after
+    each batch.
+
+    Parameters
+    ----------
+    nr_uncertain_parameters : int
+        Number of uncertain parameters.
+    nr_bootstrap : int, optional
+        The number of online bootstrap replicates used for the confidence
+        intervals. If 0, no confidence intervals are calculated.
+        Default is 0.
+
+    Attributes
+    ----------
+    nr_uncertain_parameters : int
+        Number of uncertain parameters.
+    nr_bootstrap : int
+        The number of online bootstrap replicates.
+    nr_samples : int
+        The number of rows of the base sample matrices A and B added so far.
+    mean : {None, array}
+        The running mean of the evaluations of A and B.
+    variance : {None, array}
+        The running variance of the evaluations of A and B.
+    sobol_first : {None, array}
+        The running first order Sobol indices, with shape
+        ``(nr_uncertain_parameters, ...)``.
+    sobol_total : {None, array}
+        The running total order Sobol indices, with shape
+        ``(nr_uncertain_parameters, ...)``.
+
+    Notes
+    -----
+    The mean and variance are merged between batches with the parallel
+    algorithm of Chan et al. ([1]_), which is numerically stable. The Sobol
+    indices use the same estimators as
+    ``UncertaintyCalculations.mc_sobol``, where the running means of
+    ``B*(AB - A)`` and ``(A - AB)**2/2`` are divided by the running variance.
+    After all batches are added, the estimates are equal to the estimates
+    from all evaluations at once, up to round-off errors.
+
+    The confidence intervals use the online (Poisson) bootstrap ([2]_).
+    Instead of resampling all rows after each batch, each row of a batch is
+    given a Poisson(1) distributed weight in each replicate, which is the
+    number of times the row is drawn in that replicate, and the weighted sums
+    of each replicate are added to its running sums. The cost of each batch
+    therefore does not depend on the number of earlier evaluations.
+
+    References
+    ----------
+    .. [1] Chan, T. F., G. H. Golub, and R. J. LeVeque (1983). "Algorithms for
+        computing the sample variance: analysis and recommendations."
+        The American Statistician, 37(3):242-247.
+    .. [2] Oza, N. C. and S. Russell (2001). "Online bagging and boosting."
+        Proceedings of the Eighth International Workshop on Artificial
+        Intelligence and Statistics, 105-112.
+
+    See Also
+    --------
+    uncertainpy.core.UncertaintyCalculations.monte_carlo_adaptive
+    """
+    def __init__(self, nr_uncertain_parameters, nr_bootstrap=0):
+        self.nr_uncertain_parameters = nr_uncertain_parameters
+        self.nr_bootstrap = nr_bootstrap
+        self.nr_samples = 0
+
+        self.mean = None
+        self._M2 = None
+        self._first = None
+        self._total = None
+
+        self._bootstrap = None
+
+
+    def update(self, A, B, AB):
+        """
+        Add a batch of evaluations.
+
+        Parameters
+        ----------
+        A : array_like
+            The evaluations of the A sample matrix, with shape
+            ``(nr_samples, ...)``.
+        B : array_like
+            The evaluations of the B sample matrix, with shape
+            ``(nr_samples, ...)``.
+        AB : array_like
+            The evaluations of the AB sample matrices, with shape
+            ``(nr_samples, nr_uncertain_parameters, ...)``.
+        """
+        A = np.asarray(A, dtype=float)
+        B = np.asarray(B, dtype=float)
+        AB = np.asarray(AB, dtype=float)
+
+        nr_samples = len(A)
+        if nr_samples == 0:
+            return
+
+        values = np.concatenate([A, B])
+
+        batch_mean = np.mean(values, axis=0)
+        batch_M2 = np.sum((values - batch_mean)**2, axis=0)
+
+        batch_first = np.mean(B[:, np.newaxis]*(AB - A[:, np.newaxis]), axis=0)
+        batch_total = 0.5*np.mean((A[:, np.newaxis] - AB)**2, axis=0)
+
+        if self.nr_samples == 0:
+            self.mean = batch_mean
+            self._M2 = batch_M2
+            self._first = batch_first
+            self._total = batch_total
+
+        else:
+            count = 2*self.nr_samples
+            batch_count = 2*nr_samples
+            total_count = count + batch_count
+
+            delta = batch_mean - self.mean
+
+            self.mean = self.mean + delta*batch_count/total_count
+            self._M2 = self._M2 + batch_M2 + delta**2*count*batch_count/total_count
+
+            weight = nr_samples/(self.nr_samples + nr_samples)
+            self._first = self._first + weight*(batch_first - self._first)
+            self._total = self._total + weight*(batch_total - self._total)
+
+        self.nr_samples += nr_samples
+
+        if self.nr_bootstrap > 0:
+            self._update_bootstrap(A, B, AB)
+
+
+    def _update_bootstrap(self, A, B, AB):
+        """
+        Add a batch of evaluations to the running sums of each bootstrap
+        replicate.
+        """
+        nr_samples = len(A)
+
+        A = A.reshape(nr_samples, -1)
+        B = B.reshape(nr_samples, -1)
+        AB = AB.reshape(nr_samples, self.nr_uncertain_parameters, -1)
+
+        # The number of times each row is drawn in each replicate
+        weights = np.random.poisson(1., size=(self.nr_bootstrap, nr_samples)).astype(float)
+
+        sums = {"count": np.sum(weights, axis=1),
+                "values": 0.5*(weights.dot(A) + weights.dot(B)),
+                "squares": 0.5*(weights.dot(A**2) + weights.dot(B**2))}
+
+        if self.nr_uncertain_parameters > 1:
+            sums["first"] = np.einsum("rn,ndt->rdt", weights, B[:, np.newaxis]*(AB - A[:, np.newaxis]))
+            sums["total"] = 0.5*np.einsum("rn,ndt->rdt", weights, (A[:, np.newaxis] - AB)**2)
+
+        if self._bootstrap is None:
+            self._bootstrap = sums
+        else:
+            for name in sums:
+                self._bootstrap[name] += sums[name]
+
+
+    def confidence_intervals(self, confidence_level=0.95):
+        """
+        The online bootstrap confidence intervals of the running estimates.
+
+        Parameters
+        ----------
+        confidence_level : float, optional
+            The confidence level of the intervals.
+            Default is 0.95.
+
+        Returns
+        -------
+        confidence_intervals : {None, dict}
+            The lower and upper limit of the confidence interval of
+            "mean", "variance", and if there are more than one uncertain
+            parameter "sobol_first" and "sobol_total". Each limit has the same
+            shape as the corresponding estimate. None if no evaluations are
+            added or `nr_bootstrap` is 0.
+        """
+        if self._bootstrap is None:
+            return None
+
+        shape = self.mean.shape
+        sums = self._bootstrap
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            count = sums["count"][:, np.newaxis]
+
+            mean = sums["values"]/count
+            variance = sums["squares"]/count - mean**2
+
+            estimates = {"mean": (mean, shape),
+                         "variance": (variance, shape)}
+
+            if self.nr_uncertain_parameters > 1:
+                sobol_shape = (self.nr_uncertain_parameters,) + shape
+
+                estimates["sobol_first"] = (sums["first"]/count[:, np.newaxis]/variance[:, np.newaxis],
+                                            sobol_shape)
+                estimates["sobol_total"] = (sums["total"]/count[:, np.newaxis]/variance[:, np.newaxis],
+                                            sobol_shape)
+
+        alpha = 100*(1 - confidence_level)/2.
+
+        # Replicates where no row is drawn are numpy.nan
+        valid = sums["count"] > 0
+
+        confidence_intervals = {}
+        for metric in estimates:
+            values, metric_shape = estimates[metric]
+
+            lower, upper = np.percentile(values[valid], [alpha, 100 - alpha], axis=0)
+            confidence_intervals[metric] = (lower.reshape(metric_shape),
+                                            upper.reshape(metric_shape))
+
+        return confidence_intervals
+
+
+    @property
+    def variance(self):
+        """
+        The running variance of the evaluations of A and B.
+
+        Returns
+        -------
+        variance : {None, array}
+            The variance, or None if no evaluations are added.
+        """
+        if self.nr_samples == 0:
+            return None
+
+        return self._M2/(2*self.nr_samples)
+
+
+    @property
+    def sobol_first(self):
+        """
+        The running first order Sobol indices.
+
+        Returns
+        -------
+        sobol_first : {None, array}
+            The first order Sobol indices, or None if no evaluations are added.
+        """
+        if self.nr_samples == 0:
+            return None
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self._first/self.variance
+
+
+    @property
+    def sobol_total(self):
+        """
+        The running total order Sobol indices.
+
+        Returns
+        -------
+        sobol_total : {None, array}
+            The total order Sobol indices, or None if no evaluations are added.
+        """
+        if self.nr_samples == 0:
+            return None
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self._total/self.variance
@@ -0,0 +1,240 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+
+class SharedArray(object):
+    """
+    A small descriptor that replaces a model or feature result that is stored
+    in an OutputArena.
+
+    Parameters
+    ----------
+    feature : str
+        Name of a feature or the model.
+    data : {"values", "time"}
+        Which part of the result the descriptor replaces.
+
+    Attributes
+    ----------
+    feature : str
+        Name of a feature or the model.
+    data : {"values", "time"}
+        Which part of the result the descriptor replaces.
+    """
+    def __init__(self, feature, data):
+        self.feature = feature
+        self.data = data
+
+
+
+class OutputArena(object):
+    """
+    Memory-mapped files where the workers write the model and feature results,
+    so only small descriptors are sent back to the parent process.
+
+    The arena is preallocated from the results of one evaluation, with one
+    file for the values of each model/feature, with a row for each evaluation,
+    and one file for the time of each model/feature. A worker writes the
+    values of an evaluation into its row, and replaces the values by a
+    ``SharedArray`` descriptor. If the time is equal to the time of the first
+    evaluation, it is also replaced by a descriptor.
+
+    Parameters
+    ----------
+    result : dict
+        The result dictionary of one evaluation, as returned by
+        ``Parallel.run``, used to find the shape of the values of the model
+        and each feature.
+    nr_rows : int
+        The number of evaluations the arena has room for.
+    folder : {None, str}, optional
+        The folder where the temporary folder with the memory-mapped files is
+        created. If None, the default folder for temporary files is used,
+        which can be set with the ``TMPDIR`` environment variable, for
+        example to ``/dev/shm`` to keep the files in shared memory.
+        Default is None.
+
+    Attributes
+    ----------
+    folder : str
+        The folder with the memory-mapped files.
+    nr_rows : int
+        The number of evaluations the arena has room for.
+    layout : dict
+        The file, shape and data type of the values, and the file of the
+        time, for each model/feature stored in the arena.
+
+    Notes
+    -----
+    Only regular numerical values with at least one dimension, and results
+    without an interpolation, are stored in the arena. Everything else,
+    such as 0D features, numpy.nan results with a different shape, and
+    interpolation objects, are sent back as before. If a worker is unable
+    to open the files, for example if it runs on a different computer,
+    the results are also sent back as before.
+
+    The files are removed by ``close``. OutputArena can be used as a context
+    manager.
+
+    See Also
+    --------
+    uncertainpy.core.Parallel.run_batch_shared
+    uncertainpy.core.RunModel.map_batches
+    """
+    def __init__(self, result, nr_rows, folder=None):
+        self.folder = tempfile.mkdtemp(prefix="uncertainpy_arena_", dir=folder)
+        self.nr_rows = nr_rows
+        self.layout = {}
+
+        self._arrays = {}
+        self._times = {}
+
+        for i, feature in enumerate(result):
+            if "interpolation" in result[feature]:
+                continue
+
+            values = result[feature]["values"]
+            if not isinstance(values, np.ndarray) or values.ndim == 0 or \
+                    values.dtype.kind not in "biuf" or np.any(np.isnan(values)):
+                continue
+
+            dtype = np.result_type(values.dtype, np.float64)
+            filename = os.path.join(self.folder, "values_{}.npy".format(i))
+
+            self._arrays[feature] = np.lib.format.open_memmap(filename,
+                                                              mode="w+",
+                                                              dtype=dtype,
+                                                              shape=(nr_rows,) + values.shape)
+
+            time_filename = None
+            time = result[feature]["time"]
+            if isinstance(time, np.ndarray) and time.ndim > 0 and \
+                    time.dtype.kind in "biuf" and not np.any(np.isnan(time)):
+                time_filename = os.path.join(self.folder, "time_{}.npy".format(i))
+                np.save(time_filename, time)
+                self._times[feature] = time
+
+            self.layout[feature] = {"values": filename,
+                                    "shape": values.shape,
+                                    "dtype": dtype.str,
+                                    "time": time_filename}
+
+
+    def __getstate__(self):
+        # Only the layout is sent to the workers
+        state = self.__dict__.copy()
+        state["_arrays"] = {}
+        state["_times"] = {}
+
+        return state
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def store(self, results, position):
+        """
+        Write the values of `results` into the arena, and replace them by
+        descriptors. Called in the worker.
+
+        Parameters
+        ----------
+        results : list
+            The result dictionaries of consecutive evaluations.
+        position : int
+            The row of the first result in `results`.
+
+        Returns
+        -------
+        results : list
+            The result dictionaries, where the values and time stored in the
+            arena are replaced by ``SharedArray`` descriptors.
+        """
+        if not self.layout:
+            return results
+
+        arrays = {}
+        times = {}
+        try:
+            for feature in self.layout:
+                arrays[feature] = np.load(self.layout[feature]["values"], mmap_mode="r+")
+
+                if self.layout[feature]["time"] is not None:
+                    times[feature] = np.load(self.layout[feature]["time"])
+        except (IOError, OSError):
+            return results
+
+        for row, result in enumerate(results, position):
+            for feature in result:
+                if feature not in arrays or "interpolation" in result[feature]:
+                    continue
+
+                values = result[feature]["values"]
+                if np.shape(values) != self.layout[feature]["shape"] or \
+                        np.asarray(values).dtype.kind not in "biuf":
+                    continue
+
+                arrays[feature][row] = values
+                result[feature]["values"] = SharedArray(feature, "values")
+
+                time = result[feature]["time"]
+                if feature in times and np.shape(time) == times[feature].shape and \
+                        np.array_equal(time, times[feature]):
+                    result[feature]["time"] = SharedArray(feature, "time")
+
+        # Unmap the files
+        del arrays
+
+        return results
+
+
+    def load(self, results, position):
+        """
+        Replace the descriptors in `results` by the values and time stored
+        in the arena. Called in the parent process.
+
+        Parameters
+        ----------
+        results : list
+            The result dictionaries of consecutive evaluations, as returned
+            by ``store``.
+        position : int
+            The row of the first result in `results`.
+
+        Returns
+        -------
+        results : list
+            The result dictionaries with the values and time from the arena.
+            The values are copied, so they can be used after the arena is
+            closed.
+        """
+        for row, result in enumerate(results, position):
+            for feature in result:
+                if isinstance(result[feature]["values"], SharedArray):
+                    result[feature]["values"] = np.array(self._arrays[feature][row])
+
+                if isinstance(result[feature]["time"], SharedArray):
+                    result[feature]["time"] = self._times[feature]
+
+        return results
+
+
+    def close(self):
+        """
+        Remove the memory-mapped files.
+        """
+        self._arrays = {}
+        self._times = {}
+
+        if os.path.isdir(self.folder):
+            shutil.rmtree(self.folder, ignore_errors=True)
@@ -1,13 +1,17 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import time
 import traceback
 import warnings
 import logging
+import six
 
 import numpy as np
 import scipy.interpolate as scpi
 
 from .base import Base
+from .evaluation_cache import EvaluationCache
+from .model_parameters import ModelParameters
 from ..utils.utility import none_to_nan, contains_nan, is_regular
 from ..utils.logger import get_logger
 
@@ -31,18 +35,111 @@ class Parallel(Base):
         Set the threshold for the logging level. Logging messages less severe
         than this level is ignored. If None, no logging to file is performed
         Default logger level is "info".
+    cache : {None, str, EvaluationCache}, optional
+        Cache of the raw model evaluations. If a string, an EvaluationCache
+        stored in the folder with that name is used. If None, no caching is
+        performed.
+        Default is None.
+    interpolation_time : {None, array_like, dict}, optional
+        The common time grid the irregular model/feature results are
+        interpolated at. If None, the interpolation objects are returned and
+        the results are interpolated at the longest time array after all
+        evaluations are finished. If an array, the results of the model and
+        all features that are interpolated are evaluated at this time grid
+        inside ``run``. If a dictionary, ``{name: time}``, each model/feature
+        in the dictionary is evaluated at its own time grid, while the
+        remaining are interpolated as if `interpolation_time` is None.
+        Default is None.
 
     Attributes
     ----------
     model : uncertainpy.Parallel.model
     features : uncertainpy.Parallel.features
+    cache : {None, EvaluationCache}
+        Cache of the raw model evaluations.
+    interpolation_time : {None, array_like, dict}
+        The common time grid the irregular model/feature results are
+        interpolated at.
 
     See Also
     --------
     uncertainpy.features.Features
     uncertainpy.models.Model
     uncertainpy.models.Model.run : Requirements for the model run function.
+    uncertainpy.core.EvaluationCache
     """
+    def __init__(self,
+                 model=None,
+                 features=None,
+                 logger_level="info",
+                 cache=None,
+                 interpolation_time=None):
+
+        super(Parallel, self).__init__(model=model,
+                                       features=features,
+                                       logger_level=logger_level)
+
+        self.cache = cache
+        self.interpolation_time = interpolation_time
+
+
+    @property
+    def cache(self):
+        """
+        Cache of the raw model evaluations.
+
+        Parameters
+        ----------
+        new_cache : {None, str, EvaluationCache}
+            If a string, an EvaluationCache stored in the folder with that name
+            is used. If None, no caching is performed.
+
+        Returns
+        -------
+        cache : {None, EvaluationCache}
+            Cache of the raw model evaluations.
+        """
+        return self._cache
+
+
+    @cache.setter
+    def cache(self, new_cache):
+        if isinstance(new_cache, six.string_types):
+            self._cache = EvaluationCache(folder=new_cache)
+        elif new_cache is None or isinstance(new_cache, EvaluationCache):
+            self._cache = new_cache
+        else:
+            raise TypeError("cache must be None, a folder name or an EvaluationCache")
+
+
+    def evaluate_model(self, model_parameters):
+        """
+        Evaluate the model, or get the model result from the cache if the
+        model has already been evaluated for `model_parameters`.
+
+        Parameters
+        ----------
+        model_parameters : dictionary
+            All model parameters as a dictionary. These parameters are sent to
+            model.evaluate().
+
+        Returns
+        -------
+        model_result : tuple
+            The raw output of the model, ``(time, values, info)``.
+        """
+        if self.cache is None:
+            return self.model.evaluate(**model_parameters)
+
+        key = self.cache.key(self.model, model_parameters)
+
+        model_result = self.cache.get(key)
+        if model_result is None:
+            model_result = self.model.evaluate(**model_parameters)
+            self.cache.set(key, model_result)
+
+        return model_result
+
 
     def create_interpolations(self, result):
         """
@@ -111,6 +208,12 @@ class Parallel(Base):
         interpolated for Chaospy to be able to create the polynomial
         approximation. For 1D results this is done with scipy:
         ``InterpolatedUnivariateSpline(time, U, k=3)``.
+
+        If `interpolation_time` gives a time grid for a model/feature, the
+        interpolation is evaluated at that time grid, and the interpolated
+        values and the time grid replace `"values"` and `"time"` instead of
+        adding the interpolation object. If the interpolation fails, the
+        values are numpy.nan.
         """
         logger = get_logger(self)
 
@@ -134,7 +237,21 @@ class Parallel(Base):
 
 
                 elif np.ndim(result[feature]["values"]) == 1:
-                    result[feature]["interpolation"] = self.interpolation_1d(result, feature)
+                    interpolation = self.interpolation_1d(result, feature)
+                    time = self.target_time(feature)
+
+                    if time is None:
+                        result[feature]["interpolation"] = interpolation
+
+                    # Interpolate at the common time grid, so only an array
+                    # with a fixed length is returned
+                    elif interpolation is None:
+                        result[feature]["values"] = np.full(len(time), np.nan)
+                        result[feature]["time"] = time
+
+                    else:
+                        result[feature]["values"] = interpolation(time)
+                        result[feature]["time"] = time
 
 
 
@@ -146,6 +263,35 @@ class Parallel(Base):
         return result
 
 
+    def target_time(self, feature):
+        """
+        Get the common time grid a model/feature is interpolated at.
+
+        Parameters
+        ----------
+        feature : str
+            Name of a feature or the model.
+
+        Returns
+        -------
+        time : {None, array}
+            The time grid of `feature`, or None if `feature` has no common time
+            grid and the interpolation object should be returned.
+        """
+        if self.interpolation_time is None:
+            return None
+
+        if isinstance(self.interpolation_time, dict):
+            time = self.interpolation_time.get(feature)
+        else:
+            time = self.interpolation_time
+
+        if time is None:
+            return None
+
+        return np.asarray(time)
+
+
     def interpolation_1d(self, result, feature):
         """
         Create an interpolation for an 1D result.
@@ -285,16 +431,45 @@ class Parallel(Base):
         uncertainpy.features.Features.preprocess : preprocessing model results before features are calculated
         uncertainpy.models.Model.postprocess : posteprocessing of model results
         """
-        # logger = get_logger(self)
-
         # Try-except to catch exceptions and print stack trace
         try:
+            model_result = self.evaluate_model(model_parameters)
 
-            # model_result = self.model.run(**model_parameters, **self.model.model_kwargs)
-            # self.model.validate_run(model_result)
+        except Exception as error:
+            print("")
+            print("Caught exception when running/postprocessing model: {} in parallel:".format(self.model.name))
+            print("===================================================================")
+            traceback.print_exc()
+            print("===================================================================")
+            print("")
+            raise
 
-            model_result = self.model.evaluate(**model_parameters)
+        return self.process_result(model_result)
 
+
+
+    def process_result(self, model_result):
+        """
+        Postprocess a model result and calculate the features from it.
+
+        Parameters
+        ----------
+        model_result : tuple
+            The raw output of the model for a single set of model parameters,
+            ``(time, values, info)``.
+
+        Returns
+        -------
+        result : dictionary
+            The model and feature results, on the same form as the result
+            from ``run``.
+
+        See also
+        --------
+        uncertainpy.core.Parallel.run
+        """
+        # Try-except to catch exceptions and print stack trace
+        try:
             results = {}
 
             if self.model.ignore:
@@ -351,3 +526,182 @@ class Parallel(Base):
             print("")
             raise
 
+
+
+    def evaluate_model_batch(self, batch):
+        """
+        Evaluate a vectorized model for a batch of model parameters in a
+        single call, or get the model results from the cache for the model
+        parameters that have already been evaluated.
+
+        Parameters
+        ----------
+        batch : {list, ModelParameters}
+            A list where each element is a dictionary with all model parameters
+            for a single evaluation, or the ModelParameters of the evaluations.
+
+        Returns
+        -------
+        model_results : list
+            The raw output of the model, ``(time, values, info)``, for each
+            set of model parameters in `batch`, in the same order as `batch`.
+
+        See also
+        --------
+        uncertainpy.models.Model.evaluate_batch : Requirements for a vectorized model.
+        """
+        model_results = [None]*len(batch)
+
+        if self.cache is None:
+            indices = list(range(len(batch)))
+        else:
+            keys = [self.cache.key(self.model, model_parameters) for model_parameters in batch]
+
+            indices = []
+            for i, key in enumerate(keys):
+                model_results[i] = self.cache.get(key)
+                if model_results[i] is None:
+                    indices.append(i)
+
+        if not indices:
+            return model_results
+
+        # Each parameter as an array with one value for each evaluation
+        if isinstance(batch, ModelParameters):
+            parameters = batch[indices].arrays()
+        else:
+            parameters = {}
+            for name in batch[indices[0]]:
+                parameters[name] = np.array([batch[i][name] for i in indices])
+
+        batch_results = self.model.evaluate_batch(**parameters)
+
+        for i, model_result in zip(indices, batch_results):
+            model_results[i] = model_result
+
+            if self.cache is not None:
+                self.cache.set(keys[i], model_result)
+
+        return model_results
+
+
+
+    def run_batch(self, batch):
+        """
+        Run the model and calculate features for a batch of model parameters.
+
+        The batch is received as a single message from the parent process,
+        and the results for the batch are returned as a single message.
+
+        Parameters
+        ----------
+        batch : {list, ModelParameters}
+            A list where each element is a dictionary with all model parameters
+            for a single evaluation, or the ModelParameters of the evaluations.
+            Each dictionary is sent to ``run``.
+
+        Returns
+        -------
+        results : list
+            A list with the result dictionary from ``run`` for each set of
+            model parameters in `batch`, in the same order as `batch`.
+
+        Notes
+        -----
+        If the model is vectorized, the model is evaluated for the whole batch
+        in a single call, before each model result is postprocessed and the
+        features are calculated.
+
+        See also
+        --------
+        uncertainpy.core.Parallel.run : Run the model for a single set of model parameters
+        uncertainpy.models.Model.evaluate_batch : Requirements for a vectorized model.
+        """
+        if not getattr(self.model, "vectorized", False):
+            results = []
+            for model_parameters in batch:
+                results.append(self.run(model_parameters))
+
+            return results
+
+        # Try-except to catch exceptions and print stack trace
+        try:
+            model_results = self.evaluate_model_batch(batch)
+
+        except Exception as error:
+            print("")
+            print("Caught exception when running vectorized model: {} in parallel:".format(self.model.name))
+            print("===================================================================")
+            traceback.print_exc()
+            print("===================================================================")
+            print("")
+            raise
+
+        results = []
+        for model_result in model_results:
+            results.append(self.process_result(model_result))
+
+        return results
+
+
+
+    def run_batch_timed(self, batch):
+        """
+        Run the model and calculate features for a batch of model parameters,
+        and measure the time spent in the worker.
+
+        Parameters
+        ----------
+        batch : {list, ModelParameters}
+            A list where each element is a dictionary with all model parameters
+            for a single evaluation, or the ModelParameters of the evaluations.
+            Sent to ``run_batch``.
+
+        Returns
+        -------
+        results : list
+            The results of ``run_batch``.
+        evaluation_time : float
+            The time in seconds spent evaluating the batch in the worker.
+            Does not include starting the worker or sending the batch and
+            results between processes.
+
+        See also
+        --------
+        uncertainpy.core.Parallel.run_batch
+        """
+        start_time = time.time()
+        results = self.run_batch(batch)
+
+        return results, time.time() - start_time
+
+
+
+    def run_batch_shared(self, task):
+        """
+        Run the model and calculate features for a batch of model parameters,
+        and write the results into an OutputArena.
+
+        Parameters
+        ----------
+        task : tuple
+            A tuple ``(batch, position, arena)``, where `batch` is sent to
+            ``run_batch``, `position` is the row in `arena` of the first
+            evaluation in `batch`, and `arena` is the OutputArena
+            the results are written into.
+
+        Returns
+        -------
+        results : list
+            A list with the result dictionary for each set of model parameters
+            in `batch`, where the values and time stored in `arena` are
+            replaced by small descriptors.
+
+        See also
+        --------
+        uncertainpy.core.Parallel.run_batch
+        uncertainpy.core.OutputArena
+        """
+        batch, position, arena = task
+
+        return arena.store(self.run_batch(batch), position)
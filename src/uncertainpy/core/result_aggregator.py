@@ -0,0 +1,456 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import six
+import numpy as np
+
+from ..data import Data
+from ..utils.utility import contains_nan
+from ..utils.logger import get_logger, setup_module_logger
+
+
+class ResultAggregator(object):
+    """
+    Store the model and feature results in a Data object as the results
+    arrive from the workers.
+
+    Each result is written into a preallocated array for each model/feature
+    as soon as it is added, and the result dictionary can then be discarded.
+    The peak memory use is therefore about one copy of the final evaluations,
+    instead of one copy in the list of results and one in the Data object.
+
+    Parameters
+    ----------
+    model : Model or Model subclass instance
+        The model that is evaluated.
+    features : Features or Features subclass instance
+        The features that are calculated.
+    nr_results : int
+        The total number of results that are added.
+    logger_level : {"info", "debug", "warning", "error", "critical", None}, optional
+        Set the threshold for the logging level. Logging messages less severe
+        than this level is ignored. If None, no logging to file is performed.
+        Default logger level is "info".
+
+    Attributes
+    ----------
+    model : Model or Model subclass instance
+        The model that is evaluated.
+    features : Features or Features subclass instance
+        The features that are calculated.
+    nr_results : int
+        The total number of results that are added.
+
+    Notes
+    -----
+    Regular results, where each evaluation has the same shape, are stored in
+    an array with shape ``(nr_results, ) + shape``. Evaluations that
+    contain numpy.nan and have a different shape, are stored as a row of
+    numpy.nan. If a result with a different shape is added, the feature is
+    irregular and the evaluations are stored in a list instead.
+
+    Results that are interpolated are stored as their interpolation objects,
+    and are interpolated when the Data object is created, since the
+    interpolation requires the time array with the greatest number of time
+    steps.
+
+    See Also
+    --------
+    uncertainpy.core.RunModel.results_to_data
+    uncertainpy.Data
+    """
+    def __init__(self, model, features, nr_results, logger_level="info"):
+        self.model = model
+        self.features = features
+        self.nr_results = nr_results
+
+        self._storage = {}
+        self._feature_names = []
+
+        self._logger_level = logger_level
+        setup_module_logger(class_instance=self, level=logger_level)
+
+
+    def storage_mode(self, feature, values, interpolation=True):
+        """
+        Find how the results of `feature` should be stored.
+
+        Parameters
+        ----------
+        feature : str
+            Name of a feature or the model.
+        values : array_like
+            The first values received for `feature`.
+        interpolation : bool, optional
+            False if the results are already interpolated at a common time
+            grid in ``Parallel``, so no interpolation objects are received.
+            Default is True.
+
+        Returns
+        -------
+        mode : {"list", "interpolate", "array"}
+            "list" stores the results in a list, "interpolate" stores the
+            interpolation objects, and "array" stores the results in a
+            preallocated array.
+        """
+        logger = get_logger(self)
+
+        if feature == self.model.name and self.model.ignore:
+            return "list"
+
+        if not interpolation and np.ndim(values) == 1:
+            return "array"
+
+        if feature in self.features.interpolate or \
+                (feature == self.model.name and self.model.interpolate and not self.model.ignore):
+            # TODO implement interpolation of >= 2d data, part2
+            if np.ndim(values) >= 2:
+                logger.error("{feature}:".format(feature=feature)
+                             + " no support for >= 2D interpolation implemented")
+
+                return "list"
+
+            elif np.ndim(values) == 1:
+                return "interpolate"
+
+            # Interpolating a 0D result makes no sense, so if a 0D feature
+            # is supposed to be interpolated store it as normal
+            else:
+                logger.warning("{feature}: ".format(feature=feature) +
+                               "returns a 0D result. No interpolation is performed.")
+
+        return "array"
+
+
+    def create_storage(self, feature, values, interpolation=True):
+        """
+        Create the storage for the results of `feature`.
+
+        Parameters
+        ----------
+        feature : str
+            Name of a feature or the model.
+        values : array_like
+            The first values received for `feature`.
+        interpolation : bool, optional
+            False if the results are already interpolated at a common time
+            grid in ``Parallel``, so no interpolation objects are received.
+            Default is True.
+
+        Returns
+        -------
+        storage : dict
+            The storage of `feature`.
+        """
+        storage = {"mode": self.storage_mode(feature, values, interpolation=interpolation),
+                   "time": None,              # Time of the first evaluation
+                   "reference_time": None,    # First time received
+                   "times": {},               # Times that differ from reference_time
+                   "values": None,            # Preallocated array
+                   "filled": np.zeros(self.nr_results, dtype=bool),
+                   "pending": {},             # nan results received before the array
+                   "nan_values": {},          # nan results with a different shape
+                   "list": None,              # Evaluations of irregular results
+                   "interpolations": None,
+                   "longest_time": None}
+
+        if storage["mode"] == "list":
+            storage["list"] = [None]*self.nr_results
+
+        elif storage["mode"] == "interpolate":
+            storage["interpolations"] = [None]*self.nr_results
+
+        return storage
+
+
+    def add(self, index, result):
+        """
+        Add the result of evaluation number `index`.
+
+        Parameters
+        ----------
+        index : int
+            The index of the node the result was evaluated for.
+        result : dict
+            The result dictionary from the evaluation. An example:
+
+            .. code-block:: Python
+
+                result = {self.model.name: {"values": array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10]),
+                                            "time": array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9])},
+                          "feature1d": {"values": array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9]),
+                                        "time": array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9])},
+                          "feature0d": {"values": 1,
+                                        "time": np.nan},
+                          "feature_adaptive": {"values": array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10]),
+                                               "time": array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9]),
+                                               "interpolation": scipy interpolation object},
+                          "feature_invalid": {"values": np.nan,
+                                              "time": np.nan}}
+        """
+        for feature in result:
+            values = result[feature]["values"]
+            time = result[feature]["time"]
+
+            if feature not in self._storage:
+                self._storage[feature] = self.create_storage(feature,
+                                                             values,
+                                                             interpolation="interpolation" in result[feature])
+                self._feature_names.append(feature)
+
+            storage = self._storage[feature]
+
+            if index == 0:
+                storage["time"] = time
+
+            if storage["mode"] == "interpolate":
+                storage["interpolations"][index] = result[feature].get("interpolation")
+
+                # The longest time array is used for the interpolation,
+                # the first one if several have the same length
+                length = len(time)
+                longest = storage["longest_time"]
+                if longest is None or length > longest[0] or \
+                        (length == longest[0] and index < longest[1]):
+                    storage["longest_time"] = (length, index, time)
+
+                continue
+
+            self._add_time(storage, index, time)
+
+            if storage["mode"] == "list":
+                storage["list"][index] = values
+            else:
+                self._add_values(storage, index, values)
+
+
+    def _add_time(self, storage, index, time):
+        """
+        Store the time of an evaluation if it differs from the first time.
+        """
+        if storage["reference_time"] is None:
+            storage["reference_time"] = time
+
+        elif not equal(time, storage["reference_time"]):
+            storage["times"][index] = time
+
+
+    def _add_values(self, storage, index, values):
+        """
+        Write the values of an evaluation into the preallocated array.
+        """
+        if storage["list"] is not None:
+            storage["list"][index] = values
+            return
+
+        try:
+            array = np.asarray(values)
+        except ValueError:
+            array = None
+
+        if array is None or array.dtype.kind not in "biufc":
+            self._make_irregular(storage)
+            storage["list"][index] = values
+            return
+
+        nan = contains_nan(values)
+
+        if storage["values"] is None:
+            if nan:
+                storage["pending"][index] = values
+                return
+
+            dtype = np.result_type(array.dtype, np.float64)
+            storage["values"] = np.full((self.nr_results,) + array.shape, np.nan, dtype=dtype)
+
+            pending = storage["pending"]
+            storage["pending"] = {}
+            for pending_index in pending:
+                self._add_values(storage, pending_index, pending[pending_index])
+
+        if array.shape == storage["values"].shape[1:]:
+            storage["values"][index] = array
+            storage["filled"][index] = True
+
+        elif nan:
+            storage["nan_values"][index] = values
+            storage["filled"][index] = True
+
+        else:
+            self._make_irregular(storage)
+            storage["list"][index] = values
+
+
+    def _make_irregular(self, storage):
+        """
+        Move the values stored so far into a list.
+        """
+        if storage["list"] is not None:
+            return
+
+        storage["list"] = [None]*self.nr_results
+
+        for index in np.where(storage["filled"])[0]:
+            if index in storage["nan_values"]:
+                storage["list"][index] = storage["nan_values"][index]
+            else:
+                storage["list"][index] = storage["values"][index]
+
+        for index in storage["pending"]:
+            storage["list"][index] = storage["pending"][index]
+
+        storage["values"] = None
+        storage["pending"] = {}
+        storage["nan_values"] = {}
+
+
+    def interpolate(self, feature):
+        """
+        Interpolate all evaluations of `feature` at the longest time array.
+
+        Parameters
+        ----------
+        feature : str
+            Name of a feature or the model.
+
+        Returns
+        -------
+        time : array_like
+            The time array with the greatest number of time steps.
+        evaluations : array
+            The interpolated results, with a row of numpy.nan for each
+            evaluation where the interpolation failed.
+        """
+        logger = get_logger(self)
+
+        storage = self._storage[feature]
+        time = storage["longest_time"][2]
+
+        evaluations = np.full((self.nr_results, len(time)), np.nan)
+
+        for index, interpolation in enumerate(storage["interpolations"]):
+            if interpolation is None:
+                logger.error("{}: Unknown error while creating the interpolation".format(feature))
+
+            elif isinstance(interpolation, six.string_types):
+                logger.error(interpolation)
+
+            else:
+                evaluations[index] = interpolation(time)
+
+            # The interpolation object is no longer needed
+            storage["interpolations"][index] = None
+
+        return time, evaluations
+
+
+    def to_data(self):
+        """
+        Create a Data object from the added results.
+
+        Returns
+        -------
+        data : Data object
+            A Data object with time and (interpolated) results for the model and
+            each feature.
+        """
+        logger = get_logger(self)
+
+        data = Data(logger_level=self._logger_level)
+
+        data.model_name = self.model.name
+        data.model_ignore = self.model.ignore
+
+        for feature in self._feature_names:
+            data.add_features(feature)
+
+            if feature == self.model.name:
+                data[feature]["labels"] = self.model.labels
+            elif feature in self.features.labels:
+                data[feature]["labels"] = self.features.labels[feature]
+
+            storage = self._storage[feature]
+
+            if storage["mode"] == "interpolate":
+                data[feature].time, data[feature].evaluations = self.interpolate(feature)
+
+            elif storage["mode"] == "list":
+                data[feature].evaluations = storage["list"]
+                data[feature].time = self.times(feature)
+
+            elif storage["list"] is not None:
+                data.error.append(feature)
+
+                data[feature].evaluations = storage["list"]
+                data[feature].time = self.times(feature)
+
+                if feature == self.model.name:
+                    msg = "{}: The number of points varies between evaluations. ".format(feature) + \
+                          "Make sure {} returns the same number of points with different parameters, ".format(feature) + \
+                          "implement Model.postprocess, or try to set interpolate=True."
+                else:
+                    msg = "{}: The number of points varies between evaluations. ".format(feature) + \
+                          "Make sure {} returns the same number of points, ".format(feature) + \
+                          "or try add {} to interpolate=[].".format(feature)
+
+                logger.error(msg)
+
+            elif storage["values"] is None:
+                # Every evaluation contains nan
+                pending = storage["pending"]
+                data[feature].evaluations = [pending.get(index, np.nan) for index in range(self.nr_results)]
+                data[feature].time = storage["time"]
+
+            else:
+                data[feature].evaluations = storage["values"]
+                data[feature].time = storage["time"]
+
+        return data
+
+
+    def times(self, feature):
+        """
+        Get the time of each evaluation of `feature`.
+
+        Parameters
+        ----------
+        feature : str
+            Name of a feature or the model.
+
+        Returns
+        -------
+        times : list
+            The time array of each evaluation.
+        """
+        storage = self._storage[feature]
+
+        return [storage["times"].get(index, storage["reference_time"])
+                for index in range(self.nr_results)]
+
+
+
+def equal(time_1, time_2):
+    """
+    Test if two time arrays are equal, where numpy.nan values are equal.
+
+    Parameters
+    ----------
+    time_1 : array_like
+        The first time array.
+    time_2 : array_like
+        The second time array.
+
+    Returns
+    -------
+    bool
+        True if the arrays have the same shape and values.
+    """
+    if time_1 is time_2:
+        return True
+
+    try:
+        return bool(np.array_equal(time_1, time_2, equal_nan=True))
+    except (TypeError, ValueError):
+        try:
+            return bool(np.array_equal(time_1, time_2))
+        except ValueError:
+            return False
@@ -3,11 +3,6 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import warnings
 import six
 
-try:
-    from itertools import imap
-except ImportError:
-    imap = map
-
 from tqdm import tqdm
 import numpy as np
 
@@ -18,11 +13,16 @@ try:
 except ImportError:
     prerequisites = False
 
-from ..data import Data
 from ..utils.utility import lengths, contains_nan
 from ..utils.logger import get_logger
 from .base import ParameterBase
 from .parallel import Parallel
+from .executors import Executor, SerialExecutor, ProcessExecutor
+from .executors import ThreadExecutor, DistributedExecutor
+from .checkpoint import Checkpoint
+from .result_aggregator import ResultAggregator
+from .model_parameters import ModelParameters
+from .output_arena import OutputArena
 
 
 
@@ -60,9 +60,61 @@ class RunModel(ParameterBase):
         The number of CPUs to use when calculating the model and features.
         If None, no multiprocessing is used.
         If "max", the maximum number of CPUs on the computer
-        (multiprocess.cpu_count()) is used.
+        (multiprocess.cpu_count()) is used. The workers are created
+        the first time they are needed, and are reused by all later
+        evaluations until ``close`` is called.
         Default is "max".
-
+    chunksize : {int, "auto"}, optional
+        The number of model evaluations sent to each worker process as a
+        single batch, if multiprocessing is used. The parameters of a batch
+        are sent to a worker as one message, and the results are returned as
+        one message. If "auto", the chunksize is estimated from the measured
+        time of the first model evaluations, or for a vectorized model, the
+        evaluations are split evenly between the workers. A vectorized model
+        is evaluated for each batch in a single call.
+        Default is "auto".
+    executor : {None, "process", "thread", "serial", "distributed", Executor instance}, optional
+        How the model evaluations are distributed. "process" uses a pool of
+        `CPUs` worker processes, "thread" uses a pool of `CPUs` threads (for
+        models that release the global interpreter lock), "serial" evaluates
+        the model in the current process, and "distributed" submits the
+        evaluations to a ``concurrent.futures`` compatible executor
+        (a local process pool with `CPUs` workers). An Executor instance, for
+        example a DistributedExecutor wrapping an MPI or cluster executor, is
+        used as is, and is not closed by ``close``. If None, "process" is
+        used, or "serial" if `CPUs` is None.
+        Default is None.
+    cache : {None, str, EvaluationCache}, optional
+        Opt-in cache of the raw model evaluations. If a string, an
+        EvaluationCache stored in the folder with that name is used.
+        Rerunning with the same model and nodes then only evaluates the
+        nodes that are not in the cache. If None, no caching is performed.
+        Default is None.
+    checkpoint : {None, str, Checkpoint}, optional
+        File where the results are stored as soon as they are evaluated, so
+        an interrupted run can be resumed by evaluating only the nodes that
+        are missing from the file. If a string, a Checkpoint with that
+        filename is used, with the file format given by the file extension
+        (".h5" or ".exdir"). If None, no checkpointing is performed.
+        Default is None.
+    shared_memory : bool, optional
+        If True, the workers write the values of the model and features into
+        memory-mapped files preallocated by RunModel, and only send small
+        descriptors back, instead of sending the values back through the pipe
+        of the pool. Reduces the communication for long model results with
+        many workers. The files are stored in the folder for temporary files,
+        and require that the workers run on the same computer.
+        Default is False.
+    interpolation_time : {None, array_like, dict}, optional
+        The common time grid the irregular model/feature results are
+        interpolated at. If an array, the model and each feature that is
+        interpolated are interpolated at this time grid in the workers, and
+        only arrays with a fixed length are sent back. If a dictionary,
+        ``{name: time}``, each model/feature in the dictionary is interpolated
+        at its own time grid. If None, or for the model/features not in the
+        dictionary, the interpolation objects are sent back, and the results
+        are interpolated at the longest time array after all evaluations.
+        Default is None.
 
     Attributes
     ----------
@@ -74,6 +126,19 @@ class RunModel(ParameterBase):
         The features of the model to perform uncertainty quantification on.
     CPUs : int
         The number of CPUs used when calculating the model and features.
+    chunksize : {int, "auto"}
+        The number of model evaluations sent to each worker process as a
+        single batch.
+    executor : Executor
+        The executor that evaluates the model and features.
+    cache : {None, EvaluationCache}
+        Cache of the raw model evaluations.
+    checkpoint : {None, Checkpoint}
+        Checkpoint of the completed evaluations.
+    shared_memory : bool
+        If the workers write the values into memory-mapped files.
+    interpolation_time : {None, array_like, dict}
+        The common time grid the irregular results are interpolated at.
 
     See Also
     --------
@@ -82,6 +147,18 @@ class RunModel(ParameterBase):
     uncertainpy.Parameters
     uncertainpy.models.Model
     uncertainpy.models.Model.run : Requirements for the model run function.
+    uncertainpy.core.Executor : Base class for executors.
+    uncertainpy.core.Checkpoint : Checkpointing of the evaluations.
+
+    Notes
+    -----
+    The workers of the executor are kept alive between calls to
+    ``evaluate_nodes``, so repeated uncertainty quantifications do not pay for
+    starting the processes each time. Call ``close`` when the model
+    evaluations are finished, or use RunModel as a context manager::
+
+        with RunModel(model, parameters) as runmodel:
+            data = runmodel.run(nodes, uncertain_parameters)
     """
 
     def __init__(self,
@@ -89,7 +166,13 @@ class RunModel(ParameterBase):
                  parameters,
                  features=None,
                  logger_level="info",
-                 CPUs="max"):
+                 CPUs="max",
+                 chunksize="auto",
+                 executor=None,
+                 cache=None,
+                 checkpoint=None,
+                 shared_memory=False,
+                 interpolation_time=None):
 
         if CPUs == "max":
             import multiprocess
@@ -99,7 +182,9 @@ class RunModel(ParameterBase):
 
         self._parallel = Parallel(model=model,
                                   features=features,
-                                  logger_level=logger_level)
+                                  logger_level=logger_level,
+                                  cache=cache,
+                                  interpolation_time=interpolation_time)
 
         super(RunModel, self).__init__(model=model,
                                        parameters=parameters,
@@ -107,6 +192,219 @@ class RunModel(ParameterBase):
                                        logger_level=logger_level)
 
         self.CPUs = CPUs
+        self.chunksize = chunksize
+
+        self._executor = None
+        self._executor_CPUs = None
+        self.executor = executor
+
+        self.checkpoint = checkpoint
+        self.shared_memory = shared_memory
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    @property
+    def executor(self):
+        """
+        The executor that evaluates the model and features.
+
+        Parameters
+        ----------
+        new_executor : {None, "process", "thread", "serial", "distributed", Executor instance}
+            How the model evaluations are distributed. If a string or None,
+            the executor is created the first time it is used, with the
+            current number of `CPUs`. It is recreated if `CPUs` changes.
+
+        Returns
+        -------
+        executor : Executor
+            The executor that evaluates the model and features.
+
+        Raises
+        ------
+        ValueError
+            If `new_executor` is an unknown executor name.
+        TypeError
+            If `new_executor` is not None, a string or an Executor instance.
+
+        See Also
+        --------
+        uncertainpy.core.Executor
+        """
+        if isinstance(self._executor_type, Executor):
+            return self._executor_type
+
+        if self._executor is not None and self._executor_CPUs != self.CPUs:
+            self._executor.close()
+            self._executor = None
+
+        if self._executor is None:
+            self._executor = self.create_executor(self._executor_type, self.CPUs)
+            self._executor_CPUs = self.CPUs
+
+        return self._executor
+
+
+    @executor.setter
+    def executor(self, new_executor):
+        if isinstance(new_executor, six.string_types):
+            if new_executor not in ["process", "thread", "serial", "distributed"]:
+                raise ValueError("executor {} not supported. ".format(new_executor) +
+                                 "Supported executors are: process, thread, serial, and distributed")
+
+        elif new_executor is not None and not isinstance(new_executor, Executor):
+            raise TypeError("executor must be None, a string or an Executor instance")
+
+        self.close()
+
+        self._executor_type = new_executor
+
+
+    @property
+    def cache(self):
+        """
+        Cache of the raw model evaluations.
+
+        Parameters
+        ----------
+        new_cache : {None, str, EvaluationCache}
+            If a string, an EvaluationCache stored in the folder with that name
+            is used. If None, no caching is performed.
+
+        Returns
+        -------
+        cache : {None, EvaluationCache}
+            Cache of the raw model evaluations.
+
+        See Also
+        --------
+        uncertainpy.core.EvaluationCache
+        """
+        return self._parallel.cache
+
+
+    @cache.setter
+    def cache(self, new_cache):
+        self._parallel.cache = new_cache
+
+
+    @property
+    def interpolation_time(self):
+        """
+        The common time grid the irregular model/feature results are
+        interpolated at in the workers.
+
+        Parameters
+        ----------
+        new_interpolation_time : {None, array_like, dict}
+            The time grid of the model and all interpolated features, or a
+            dictionary with the time grid of each model/feature. If None, the
+            results are interpolated at the longest time array after all
+            evaluations.
+
+        Returns
+        -------
+        interpolation_time : {None, array_like, dict}
+            The common time grid the irregular results are interpolated at.
+
+        See Also
+        --------
+        uncertainpy.core.Parallel.create_interpolations
+        """
+        return self._parallel.interpolation_time
+
+
+    @interpolation_time.setter
+    def interpolation_time(self, new_interpolation_time):
+        self._parallel.interpolation_time = new_interpolation_time
+
+
+    @property
+    def checkpoint(self):
+        """
+        Checkpoint of the completed evaluations.
+
+        Parameters
+        ----------
+        new_checkpoint : {None, str, Checkpoint}
+            If a string, a Checkpoint stored in the file with that name
+            is used. If None, no checkpointing is performed.
+
+        Returns
+        -------
+        checkpoint : {None, Checkpoint}
+            Checkpoint of the completed evaluations.
+
+        Raises
+        ------
+        TypeError
+            If `new_checkpoint` is not None, a string or a Checkpoint instance.
+
+        See Also
+        --------
+        uncertainpy.core.Checkpoint
+        """
+        return self._checkpoint
+
+
+    @checkpoint.setter
+    def checkpoint(self, new_checkpoint):
+        if isinstance(new_checkpoint, six.string_types):
+            self._checkpoint = Checkpoint(filename=new_checkpoint)
+        elif new_checkpoint is None or isinstance(new_checkpoint, Checkpoint):
+            self._checkpoint = new_checkpoint
+        else:
+            raise TypeError("checkpoint must be None, a string or a Checkpoint instance")
+
+
+    def create_executor(self, executor_type, CPUs):
+        """
+        Create an executor from its name.
+
+        Parameters
+        ----------
+        executor_type : {None, "process", "thread", "serial", "distributed"}
+            Name of the executor. If None, "process" is used, or "serial" if
+            `CPUs` is None.
+        CPUs : {int, None}
+            The number of workers.
+
+        Returns
+        -------
+        executor : Executor
+            The created executor.
+        """
+        if executor_type is None:
+            executor_type = "serial" if not CPUs else "process"
+
+        if executor_type == "serial":
+            return SerialExecutor(CPUs=CPUs)
+        elif executor_type == "process":
+            return ProcessExecutor(CPUs=CPUs)
+        elif executor_type == "thread":
+            return ThreadExecutor(CPUs=CPUs)
+        elif executor_type == "distributed":
+            return DistributedExecutor(CPUs=CPUs)
+
+
+    def close(self):
+        """
+        Close the workers used to evaluate the model.
+
+        The workers are recreated the next time the model is evaluated.
+        Executor instances given by the user are not closed, and must be
+        closed by the user.
+        """
+        if self._executor is not None:
+            self._executor.close()
+            self._executor = None
 
 
     @ParameterBase.features.setter
@@ -253,118 +551,17 @@ class RunModel(ParameterBase):
         See Also
         --------
         uncertainpy.Data
+        uncertainpy.core.ResultAggregator
         """
-        logger = get_logger(self)
-
-        data = Data(logger_level=self._logger_level)
-
-        # Add features and labels
-        for feature in results[0]:
-            data.add_features(feature)
-
-            if feature == self.model.name:
-                data[feature]["labels"] = self.model.labels
-            elif feature in self.features.labels:
-                data[feature]["labels"] = self.features.labels[feature]
-
-        data.model_name = self.model.name
-        data.model_ignore = self.model.ignore
-
-        def add_results(results, data, feature):
-            data[feature].time = []
-            data[feature].evaluations = []
-
-            for result in results:
-                data[feature].evaluations.append(result[feature]["values"])
-                data[feature].time.append(result[feature]["time"])
-
-        # results = self.regularize_nan_results(results)
-
-        # Check if features are irregular without being specified as a interpolate
-        # TODO if the feature is irregular, perform the complete interpolation here instead
-        # for feature in data:
-        #     if (feature == self.model.name and not (self.model.ignore or self.model.interpolate)) \
-        #         or (feature != self.model.name and feature not in self.features.interpolate):
-        #             if not self.is_regular(results, feature):
-        #                 data.error.append(feature)
-        #                 data[feature].time = []
-        #                 data[feature].evaluations = []
-
-        #                 for result in results:
-        #                     data[feature].evaluations.append(result[feature]["values"])
-        #                     data[feature].time.append(result[feature]["time"])
-
-                        # raise ValueError("{}: The number of points varies between evaluations.".format(feature)
-                        #                  + " Try setting interpolate".format(feature))
-
-
-        # Store all results in data, interpolate as needed
-        # TODO: save raw result instead of interpolated result?
-        for feature in data:
-            # Interpolate the data if it is irregular, and ignore the model if required
-            if feature in self.features.interpolate or \
-                    (feature == self.model.name and self.model.interpolate and not self.model.ignore):
-                # TODO implement interpolation of >= 2d data, part2
-                if np.ndim(results[0][feature]["values"]) >= 2:
-                    # raise NotImplementedError("Feature: {feature},".format(feature=feature)
-                    #                           + " no support for >= 2D interpolation")
-                    logger.error("{feature}:".format(feature=feature)
-                                 + " no support for >= 2D interpolation implemented")
+        aggregator = ResultAggregator(model=self.model,
+                                      features=self.features,
+                                      nr_results=len(results),
+                                      logger_level=self._logger_level)
 
-                    add_results(results, data, feature)
+        for i, result in enumerate(results):
+            aggregator.add(i, result)
 
-
-                elif np.ndim(results[0][feature]["values"]) == 1:
-                    data[feature].time, data[feature].evaluations = self.apply_interpolation(results, feature)
-
-                # Interpolating a 0D result makes no sense, so if a 0D feature
-                # is supposed to be interpolated store it as normal
-                elif np.ndim(results[0][feature]["values"]) == 0:
-                    logger.warning("{feature}: ".format(feature=feature) +
-                                   "returns a 0D result. No interpolation is performed.")
-
-                    data[feature].time = results[0][feature]["time"]
-
-                    data[feature].evaluations = []
-                    for result in results:
-                        data[feature].evaluations.append(result[feature]["values"])
-
-
-            elif feature == self.model.name and self.model.ignore:
-                add_results(results, data, feature)
-
-            else:
-                # Check if features are irregular without being specified as a interpolate
-                # TODO if the feature is irregular, perform the complete interpolation here instead
-                if not self.is_regular(results, feature):
-                    data.error.append(feature)
-
-                    add_results(results, data, feature)
-
-                    if feature == self.model.name:
-                        msg = "{}: The number of points varies between evaluations. ".format(feature) + \
-                              "Make sure {} returns the same number of points with different parameters, ".format(feature) + \
-                              "implement Model.postprocess, or try to set interpolate=True."
-                    else:
-                        msg = "{}: The number of points varies between evaluations. ".format(feature) + \
-                              "Make sure {} returns the same number of points, ".format(feature) + \
-                              "or try add {} to interpolate=[].".format(feature)
-
-                    logger.error(msg)
-
-                    # raise ValueError("{}: The number of points varies between evaluations.".format(feature)
-                    #                  + " Try setting interpolate".format(feature))
-
-
-                else:
-                    # Store data from results in a Data object
-                    data[feature].time = results[0][feature]["time"]
-
-                    data[feature].evaluations = []
-                    for result in results:
-                        data[feature].evaluations.append(result[feature]["values"])
-
-        return data
+        return aggregator.to_data()
 
 
 
@@ -412,6 +609,49 @@ class RunModel(ParameterBase):
         ------
         ImportError
             If xvfbwrapper is not installed.
+
+        See Also
+        --------
+        uncertainpy.core.RunModel.iterate_nodes
+        """
+        results = dict(self.iterate_nodes(nodes, uncertain_parameters))
+
+        return [results[i] for i in range(len(results))]
+
+
+    def iterate_nodes(self, nodes, uncertain_parameters):
+        """
+        Evaluate the the model and calculate the features for the nodes
+        (values) for the uncertain parameters, and yield each result as soon
+        as it is received from the workers.
+
+        Parameters
+        ----------
+        nodes : array
+            The values for the uncertain parameters
+            to evaluate the model and features for.
+        uncertain_parameters : list
+            A list of the names of all uncertain parameters.
+
+        Yields
+        ------
+        index : int
+            The index of the node the result belongs to.
+        result : dict
+            The result dictionary for the node, as returned by
+            ``Parallel.run``.
+
+        Raises
+        ------
+        ImportError
+            If xvfbwrapper is not installed.
+
+        Notes
+        -----
+        The results are not necessarily yielded in the same order as the
+        nodes. If a checkpoint is used, the results already stored in the
+        checkpoint are loaded instead of being evaluated, and the results of
+        each batch are added to the checkpoint as soon as they are received.
         """
         if self.model.suppress_graphics:
             if not prerequisites:
@@ -420,47 +660,221 @@ class RunModel(ParameterBase):
             vdisplay = Xvfb()
             vdisplay.start()
 
-        results = []
-
         model_parameters = self.create_model_parameters(nodes, uncertain_parameters)
 
-        if self.CPUs:
-            import multiprocess as mp
+        progress = tqdm(desc="Running model", total=len(model_parameters))
 
-            pool = mp.Pool(processes=self.CPUs)
+        try:
+            # Indices of the nodes that must be evaluated
+            indices = list(range(len(model_parameters)))
 
-            # pool.map(self._parallel.run, model_parameters)
-            # chunksize = int(np.ceil(len(model_parameters)/self.CPUs))
-            chunksize = 1
-            for result in tqdm(pool.imap(self._parallel.run, model_parameters, chunksize),
-                               desc="Running model",
-                               total=len(nodes.T)):
+            if self.checkpoint is not None:
+                keys = [self.checkpoint.key(self.model, self.features, parameters)
+                        for parameters in model_parameters]
+
+                completed = self.checkpoint.load(keys)
+
+                indices = []
+                for i, key in enumerate(keys):
+                    if key in completed:
+                        progress.update(1)
+                        yield i, self._parallel.create_interpolations(completed[key])
+                    else:
+                        indices.append(i)
+
+                del completed
+
+            remaining_parameters = model_parameters[indices]
+
+            position = 0
+            for batch_results in self.map_batches(remaining_parameters):
+                batch_indices = indices[position:position + len(batch_results)]
+                position += len(batch_results)
+
+                if self.checkpoint is not None:
+                    self.checkpoint.save([keys[i] for i in batch_indices], batch_results)
+
+                progress.update(len(batch_results))
+
+                for i, result in zip(batch_indices, batch_results):
+                    yield i, result
+
+        finally:
+            progress.close()
+
+            if self.model.suppress_graphics:
+                vdisplay.stop()
 
-                results.append(result)
 
-            pool.close()
+    def map_batches(self, model_parameters):
+        """
+        Evaluate the model and features for `model_parameters` in batches
+        using the executor.
+
+        Parameters
+        ----------
+        model_parameters : {list, ModelParameters}
+            A list where each element is a dictionary with all model parameters
+            for a single evaluation, or the ModelParameters of the evaluations.
 
+        Yields
+        ------
+        batch_results : list
+            The results of each batch, in the same order as `model_parameters`.
+
+        Notes
+        -----
+        If `chunksize` is "auto", the first round of evaluations is sent as
+        one evaluation to each worker, and the mean time the workers spent
+        evaluating them is used to estimate the chunksize of the remaining
+        evaluations.
+        For a vectorized model, the evaluations are instead split evenly
+        between the workers, so each worker evaluates the model in as few
+        calls as possible.
+
+        If `shared_memory` is True, the results of the first batch are used to
+        preallocate an OutputArena, and the workers write the values of the
+        remaining evaluations into the arena instead of sending them back.
+        """
+        executor = self.executor
+
+        # Each batch is sent to a worker as a single task
+        start = 0
+        if self.chunksize == "auto" and getattr(self.model, "vectorized", False):
+            chunksize = max(int(np.ceil(len(model_parameters)/executor.nr_workers)), 1)
+        elif self.chunksize == "auto" and executor.nr_workers > 1:
+            # Measure the time of the first round of evaluations,
+            # one evaluation for each worker, to estimate the chunksize
+            start = min(executor.nr_workers, len(model_parameters))
+            batches = self.create_batches(model_parameters[:start], chunksize=1)
+
+            # The time is measured inside the workers, so starting the
+            # workers and sending the evaluations is not included
+            evaluation_times = []
+            for batch_results, evaluation_time in executor.map(self._parallel.run_batch_timed, batches):
+                evaluation_times.append(evaluation_time)
+                yield batch_results
+
+            evaluation_time = np.mean(evaluation_times)
+
+            chunksize = self.estimate_chunksize(evaluation_time,
+                                                len(model_parameters) - start)
+        elif self.chunksize == "auto":
+            chunksize = 1
         else:
-            for result in tqdm(imap(self._parallel.run, model_parameters),
-                               desc="Running model",
-                               total=len(nodes.T)):
+            chunksize = self.chunksize
 
-                results.append(result)
+        batches = self.create_batches(model_parameters[start:], chunksize=chunksize)
 
+        if not self.shared_memory or not batches:
+            for batch_results in executor.map(self._parallel.run_batch, batches):
+                yield batch_results
 
+            return
 
-        if self.model.suppress_graphics:
-            vdisplay.stop()
+        # The results of the first batch are sent back as usual,
+        # and used to preallocate the arena of the remaining results
+        if start == 0:
+            batch_results = list(executor.map(self._parallel.run_batch, batches[:1]))[0]
+            yield batch_results
 
-        return results
+            start = len(batches[0])
+            batches = batches[1:]
+
+        with OutputArena(batch_results[0], len(model_parameters) - start) as arena:
+            tasks = []
+            position = 0
+            for batch in batches:
+                tasks.append((batch, position, arena))
+                position += len(batch)
+
+            for task, batch_results in zip(tasks, executor.map(self._parallel.run_batch_shared, tasks)):
+                yield arena.load(batch_results, task[1])
+
+
+
+    def create_batches(self, model_parameters, chunksize=1):
+        """
+        Split the model parameters into batches that are sent to the worker
+        processes as single tasks.
+
+        Parameters
+        ----------
+        model_parameters : {list, ModelParameters}
+            A list where each element is a dictionary with the model parameters
+            for a single evaluation, or the ModelParameters of the evaluations.
+        chunksize : int, optional
+            The number of model evaluations in each batch. The last batch
+            contains the remaining model evaluations.
+            Default is 1.
+
+        Returns
+        -------
+        batches : list
+            A list of batches, where each batch is a slice of
+            `model_parameters` with at most `chunksize` evaluations.
+
+        Raises
+        ------
+        ValueError
+            If `chunksize` is less than 1.
+        """
+        chunksize = int(chunksize)
+
+        if chunksize < 1:
+            raise ValueError("chunksize must be a positive integer, not {}".format(chunksize))
+
+        batches = []
+        for i in range(0, len(model_parameters), chunksize):
+            batches.append(model_parameters[i:i + chunksize])
+
+        return batches
+
+
+    def estimate_chunksize(self, evaluation_time, nr_evaluations, batch_time=0.2):
+        """
+        Estimate the chunksize from the measured time of a single model
+        evaluation.
+
+        Parameters
+        ----------
+        evaluation_time : float
+            The time of a single model evaluation in seconds.
+        nr_evaluations : int
+            The number of remaining model evaluations.
+        batch_time : float, optional
+            The targeted time of each batch in seconds.
+            Default is 0.2.
+
+        Returns
+        -------
+        chunksize : int
+            The estimated chunksize.
+
+        Notes
+        -----
+        The chunksize is chosen so each batch takes around `batch_time` seconds,
+        which makes the communication between processes cheap compared to the
+        model evaluations. The chunksize is limited so each CPU receives at
+        least four batches to balance the load between the processes.
+        """
+        CPUs = self.executor.nr_workers
+
+        max_chunksize = int(np.ceil(nr_evaluations/(4.*CPUs)))
+
+        if evaluation_time <= 0:
+            chunksize = max_chunksize
+        else:
+            chunksize = min(int(batch_time/evaluation_time), max_chunksize)
+
+        return max(chunksize, 1)
 
 
 
     def create_model_parameters(self, nodes, uncertain_parameters):
         """
-        Combine nodes (values) with the uncertain parameter names to create a
-        list of dictionaries corresponding to the model values for each
-        model evaluation.
+        Combine nodes (values) with the uncertain parameter names to create
+        the model parameters for each model evaluation.
 
         Parameters
         ----------
@@ -472,9 +886,9 @@ class RunModel(ParameterBase):
 
         Returns
         -------
-        model_parameters : list
-            A list where each element is a dictionary with the model parameters
-            for a single evaluation.
+        model_parameters : ModelParameters
+            The model parameters, which behaves as a list where each element
+            is a dictionary with the model parameters for a single evaluation.
             An example:
 
             .. code-block:: Python
@@ -482,25 +896,29 @@ class RunModel(ParameterBase):
                 model_parameter = {"parameter 1": value 1, "parameter 2": value 2, ...}
                 model_parameters = [model_parameter 1, model_parameter 2, ...]
 
-        """
-
-        model_parameters = []
-        for node in nodes.T:
-            if node.ndim == 0:
-                node = [node]
-
-            # New set parameters
-            parameters = {}
-            for j, parameter in enumerate(uncertain_parameters):
-                parameters[parameter] = node[j]
+        Notes
+        -----
+        The nodes are stored as a single array with one row for each
+        evaluation, together with the names of the uncertain parameters and
+        the values of the remaining parameters. The dictionaries are only
+        created when they are needed, in the worker evaluating the model.
 
-            for parameter in self.parameters:
-                if parameter.name not in parameters:
-                    parameters[parameter.name] = parameter.value
+        See also
+        --------
+        uncertainpy.core.ModelParameters
+        """
+        nodes = np.asarray(nodes)
+        if nodes.ndim < 2:
+            nodes = nodes.reshape(1, -1)
 
-            model_parameters.append(parameters)
+        constants = {}
+        for parameter in self.parameters:
+            if parameter.name not in uncertain_parameters:
+                constants[parameter.name] = parameter.value
 
-        return model_parameters
+        return ModelParameters(uncertain_parameters,
+                               np.ascontiguousarray(nodes.T),
+                               constants)
 
 
     def is_regular(self, results, feature):
@@ -605,7 +1023,7 @@ class RunModel(ParameterBase):
         -------
         data : Data object
             A Data object with time and (interpolated) results for
-            the model and each feature.
+            the model and each feature, and the nodes in ``data.nodes``.
 
         See Also
         --------
@@ -615,10 +1033,19 @@ class RunModel(ParameterBase):
         if isinstance(uncertain_parameters, six.string_types):
             uncertain_parameters = [uncertain_parameters]
 
-        results = self.evaluate_nodes(nodes, uncertain_parameters)
+        # Each result is stored as soon as it is received,
+        # so the list of all results is never created
+        aggregator = ResultAggregator(model=self.model,
+                                      features=self.features,
+                                      nr_results=len(nodes.T),
+                                      logger_level=self._logger_level)
+
+        for index, result in self.iterate_nodes(nodes, uncertain_parameters):
+            aggregator.add(index, result)
 
-        data = self.results_to_data(results)
+        data = aggregator.to_data()
         data.uncertain_parameters = uncertain_parameters
+        data.nodes = nodes
 
         return data
 
@@ -1,16 +1,19 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import re
 import six
 import numpy as np
 from tqdm import tqdm
 import chaospy as cp
 import types
-from SALib.sample import saltelli
-from SALib.analyze.sobol import first_order, total_order
 
 from .run_model import RunModel
+from .basis_cache import BasisCache
+from .online_statistics import OnlineStatistics
+from .least_squares import IncrementalLeastSquares, tikhonov_coefficients, tikhonov_parameter, leave_one_out_error
+from .executors import SerialExecutor, ThreadExecutor
 from .base import ParameterBase
-from ..utils.utility import contains_nan
+from ..utils.utility import valid_mask
 from ..utils.logger import get_logger
 
 
@@ -65,6 +68,59 @@ class UncertaintyCalculations(ParameterBase):
         If "max", the maximum number of CPUs on the computer
         (multiprocess.cpu_count()) is used.
         Default is "max".
+    chunksize : {int, "auto"}, optional
+        The number of model evaluations sent to each worker process as a
+        single batch, if multiprocessing is used. If "auto", the chunksize is
+        estimated from the measured time of the first model evaluations.
+        Default is "auto".
+    executor : {None, "process", "thread", "serial", "distributed", Executor instance}, optional
+        How the model evaluations are distributed. "process" uses a pool of
+        `CPUs` worker processes, "thread" uses a pool of `CPUs` threads,
+        "serial" evaluates the model in the current process, and
+        "distributed" submits the evaluations to a ``concurrent.futures``
+        compatible executor. An Executor instance, for example a
+        DistributedExecutor wrapping an MPI or cluster executor, is used as is.
+        If None, "process" is used, or "serial" if `CPUs` is None.
+        Default is None.
+    cache : {None, str, EvaluationCache}, optional
+        Opt-in cache of the raw model evaluations, keyed by the model, the
+        model keyword arguments and the exact parameter values. If a string,
+        an EvaluationCache stored in the folder with that name is used.
+        Rerunning with new features or a new polynomial order then only
+        evaluates the model for nodes that are not in the cache.
+        If None, no caching is performed.
+        Default is None.
+    checkpoint : {None, str, Checkpoint}, optional
+        File where the model and feature results are stored as soon as they
+        are evaluated. If the uncertainty quantification is interrupted, for
+        example by a crash or a preempted node, running it again only
+        evaluates the nodes that are missing from the file. If a string, a
+        Checkpoint with that filename is used, and the file format is given
+        by the file extension (".h5" or ".exdir"). If None, no checkpointing
+        is performed.
+        Default is None.
+    basis_cache : {bool, str, BasisCache}, optional
+        Memoization of the orthogonal polynomial bases, quadrature rules and
+        Sobol samples, keyed by the distribution and order. If True, they are
+        stored in memory, and if a string, they are also stored on disk in
+        the folder with that name, so they are reused between runs. If False,
+        nothing is stored.
+        Default is True.
+    shared_memory : bool, optional
+        If True, the workers write the values of the model and features into
+        memory-mapped files, and only send small descriptors back to the
+        main process. Reduces the communication for long model results with
+        many workers on the same computer.
+        Default is False.
+    interpolation_time : {None, array_like, dict}, optional
+        The common time grid the irregular model/feature results are
+        interpolated at. If an array, the model and the features that are
+        interpolated are interpolated at this time grid in the workers,
+        instead of sending the interpolation objects back to the main
+        process. If a dictionary, ``{name: time}``, each model/feature in the
+        dictionary is interpolated at its own time grid. If None, the results
+        are interpolated at the longest time array of all evaluations.
+        Default is None.
     logger_level : {"info", "debug", "warning", "error", "critical", None}, optional
         Set the threshold for the logging level. Logging messages less severe
         than this level is ignored. If None, no logging to file is performed.
@@ -80,6 +136,8 @@ class UncertaintyCalculations(ParameterBase):
         The features of the model to perform uncertainty quantification on.
     runmodel : RunModel
         Runmodel object responsible for evaluating the model and calculating features.
+    basis_cache : BasisCache
+        Memoization of the polynomial bases, quadrature rules and Sobol samples.
 
     See Also
     --------
@@ -97,6 +155,13 @@ class UncertaintyCalculations(ParameterBase):
                  create_PCE_custom=None,
                  custom_uncertainty_quantification=None,
                  CPUs="max",
+                 chunksize="auto",
+                 executor=None,
+                 cache=None,
+                 checkpoint=None,
+                 basis_cache=True,
+                 shared_memory=False,
+                 interpolation_time=None,
                  logger_level="info"):
 
 
@@ -104,9 +169,17 @@ class UncertaintyCalculations(ParameterBase):
                                  parameters=parameters,
                                  features=features,
                                  logger_level=logger_level,
-                                 CPUs=CPUs)
+                                 CPUs=CPUs,
+                                 chunksize=chunksize,
+                                 executor=executor,
+                                 cache=cache,
+                                 checkpoint=checkpoint,
+                                 shared_memory=shared_memory,
+                                 interpolation_time=interpolation_time)
 
 
+        self.basis_cache = basis_cache
+
         if create_PCE_custom is not None:
             self.create_PCE_custom = create_PCE_custom
 
@@ -119,6 +192,61 @@ class UncertaintyCalculations(ParameterBase):
                                                       logger_level=logger_level)
 
 
+    @property
+    def basis_cache(self):
+        """
+        Memoization of the orthogonal polynomial bases, quadrature rules and
+        Sobol samples.
+
+        Parameters
+        ----------
+        new_basis_cache : {bool, str, BasisCache}
+            If True, the bases are stored in memory. If a string, they are
+            also stored on disk in the folder with that name. If False or
+            None, nothing is stored.
+
+        Returns
+        -------
+        basis_cache : BasisCache
+            Memoization of the polynomial bases, quadrature rules and Sobol
+            samples.
+        """
+        return self._basis_cache
+
+
+    @basis_cache.setter
+    def basis_cache(self, new_basis_cache):
+        if isinstance(new_basis_cache, BasisCache):
+            self._basis_cache = new_basis_cache
+        elif isinstance(new_basis_cache, six.string_types):
+            self._basis_cache = BasisCache(folder=new_basis_cache)
+        elif new_basis_cache is True:
+            self._basis_cache = BasisCache()
+        elif new_basis_cache is False or new_basis_cache is None:
+            self._basis_cache = BasisCache(max_items=0)
+        else:
+            raise TypeError("basis_cache must be a bool, str or BasisCache instance")
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def close(self):
+        """
+        Close the worker processes used to evaluate the model.
+
+        See also
+        --------
+        uncertainpy.core.RunModel.close
+        """
+        self.runmodel.close()
+
+
     @ParameterBase.features.setter
     def features(self, new_features):
         ParameterBase.features.fset(self, new_features)
@@ -266,20 +394,24 @@ class UncertaintyCalculations(ParameterBase):
 
         Returns
         -------
-        masked_evaluations : list
-            The evaluations that have results (not numpy.nan or None).
+        masked_evaluations : {array, list}
+            The evaluations that have results (not numpy.nan or None). An
+            array if `evaluations` is an array, otherwise a list.
         mask : boolean array
             The mask itself, used to create the masked arrays.
+
+        Notes
+        -----
+        If `evaluations` is a numeric array, with the evaluations along the
+        first axis, the mask is found with a single vectorized call and the
+        evaluations are masked by boolean indexing.
         """
-        masked_evaluations = []
-        mask = np.ones(len(evaluations), dtype=bool)
+        mask = valid_mask(evaluations)
 
-        for i, result in enumerate(evaluations):
-            # if np.any(np.isnan(result)):
-            if contains_nan(result):
-                mask[i] = False
-            else:
-                masked_evaluations.append(result)
+        if isinstance(evaluations, np.ndarray):
+            masked_evaluations = evaluations[mask]
+        else:
+            masked_evaluations = [evaluation for evaluation, valid in zip(evaluations, mask) if valid]
 
         return masked_evaluations, mask
 
@@ -396,6 +528,497 @@ class UncertaintyCalculations(ParameterBase):
 
 
 
+    def vandermonde_svd(self, P, nodes):
+        """
+        Evaluate the polynomials in the nodes and factorize the resulting
+        Vandermonde matrix with a singular value decomposition.
+
+        Parameters
+        ----------
+        P : chaospy.Poly
+            The polynomial expansion, with ``len(P)`` polynomials.
+        nodes : array_like
+            The nodes, with shape ``(nr_uncertain_parameters, nr_nodes)`` or
+            ``(nr_nodes,)`` for a single uncertain parameter.
+
+        Returns
+        -------
+        U : array
+            The left singular vectors, with shape ``(nr_nodes, K)``,
+            where ``K = min(nr_nodes, len(P))``.
+        s : array
+            The singular values, with shape ``(K,)``.
+        Vt : array
+            The right singular vectors, with shape ``(K, len(P))``.
+        """
+        nodes = np.asarray(nodes)
+        if nodes.ndim == 1:
+            nodes = nodes.reshape(1, -1)
+
+        vandermonde = np.asarray(P(*nodes), dtype=float).T
+
+        return np.linalg.svd(vandermonde, full_matrices=False)
+
+
+    def fit_regression(self, P, nodes, evaluations, svd=None):
+        """
+        Fit polynomial approximations to several sets of evaluations in the
+        same nodes, using least squares with Tikhonov regularization.
+
+        Gives the same result as the Tikhonov regularized
+        ``chaospy.fit_regression(P, nodes, evaluations, rule="T")`` of
+        chaospy < 3.3 for each set of evaluations, but the Vandermonde matrix
+        is only created and factorized once, and all evaluations are solved
+        for as one system with multiple right hand sides.
+
+        Parameters
+        ----------
+        P : chaospy.Poly
+            The polynomial expansion.
+        nodes : array_like
+            The nodes the model was evaluated in, with shape
+            ``(nr_uncertain_parameters, nr_nodes)``.
+        evaluations : list
+            A list of evaluations to fit. Each element is an array with
+            shape ``(nr_nodes, ...)``.
+        svd : {None, tuple}, optional
+            The singular value decomposition of the Vandermonde matrix, as
+            returned by ``vandermonde_svd``. Calculated if None.
+            Default is None.
+
+        Returns
+        -------
+        U_hat : list
+            The polynomial approximation of each set of evaluations, with the
+            same shape as the evaluations of a single node.
+
+        Notes
+        -----
+        As in chaospy < 3.3, the regularization parameter of each set of
+        evaluations is chosen among ``10**-arange(0, 16)`` by robust
+        generalized cross-validation. With the singular value decomposition
+        ``A = U diag(s) Vt`` of the Vandermonde matrix, the regularized
+        solution is ``Vt.T diag(s/(s**2 + alpha)) U.T b``, and the
+        cross-validation error of every alpha is found from the projections
+        ``U.T b`` without solving any additional systems.
+        """
+        if svd is None:
+            svd = self.vandermonde_svd(P, nodes)
+
+        U, s, Vt = svd
+        nr_nodes = U.shape[0]
+
+        # Stack all evaluations as columns of one right hand side
+        shapes = []
+        columns = []
+        for evaluation in evaluations:
+            evaluation = np.asarray(evaluation, dtype=float)
+            shapes.append(evaluation.shape[1:])
+            columns.append(evaluation.reshape(nr_nodes, -1))
+
+        sizes = [column.shape[1] for column in columns]
+        rhs = np.concatenate(columns, axis=1)
+
+        projection = U.T.dot(rhs)
+
+        # Squared norm of the part of each column outside the range of U
+        outside = np.maximum(np.sum(rhs**2, axis=0) - np.sum(projection**2, axis=0), 0)
+
+        U_hat = []
+        start = 0
+        for shape, size in zip(shapes, sizes):
+            coefficients = tikhonov_coefficients(s,
+                                                 Vt,
+                                                 projection[:, start:start + size],
+                                                 np.sum(outside[start:start + size]),
+                                                 nr_nodes)
+            start += size
+
+            polynomial = cp.sum(P*coefficients.T, -1)
+            U_hat.append(polynomial.reshape(shape))
+
+        return U_hat
+
+
+    def leave_one_out_error(self, P, nodes, evaluations, svd=None):
+        """
+        Calculate the leave-one-out cross-validation error of the polynomial
+        approximations from ``fit_regression``, without refitting.
+
+        Parameters
+        ----------
+        P : chaospy.Poly
+            The polynomial expansion.
+        nodes : array_like
+            The nodes the model was evaluated in, with shape
+            ``(nr_uncertain_parameters, nr_nodes)``.
+        evaluations : list
+            A list of evaluations. Each element is an array with
+            shape ``(nr_nodes, ...)``.
+        svd : {None, tuple}, optional
+            The singular value decomposition of the Vandermonde matrix, as
+            returned by ``vandermonde_svd``. Calculated if None.
+            Default is None.
+
+        Returns
+        -------
+        errors : list
+            The relative leave-one-out error of each set of evaluations.
+
+        Notes
+        -----
+        The fit with Tikhonov regularization is linear in the evaluations,
+        with the hat matrix ``H = U diag(s**2/(s**2 + alpha)) U.T``. The
+        residual in node i of the fit without node i is then
+        ``r_i/(1 - H_ii)``, where ``r_i`` is the residual of the fit with
+        all nodes, so no refits are needed ([1]_). The error is the sum of the
+        squared leave-one-out residuals divided by the sum of the squared
+        deviations of the evaluations from their mean, over all values of
+        each evaluation. An error close to 0 means the polynomial
+        approximation predicts unseen nodes well, while an error close to 1
+        means it is no better than the mean. Constant evaluations have an
+        error of 0.
+
+        References
+        ----------
+        .. [1] Blatman, G. and B. Sudret (2010). "An adaptive algorithm to
+            build up sparse polynomial chaos expansions for stochastic finite
+            element analysis." Probabilistic Engineering Mechanics,
+            25(2):183-197.
+        """
+        if svd is None:
+            svd = self.vandermonde_svd(P, nodes)
+
+        U, s, Vt = svd
+        nr_nodes = U.shape[0]
+
+        errors = []
+        for evaluation in evaluations:
+            rhs = np.asarray(evaluation, dtype=float).reshape(nr_nodes, -1)
+
+            projection = U.T.dot(rhs)
+            outside = np.sum(np.maximum(np.sum(rhs**2, axis=0) - np.sum(projection**2, axis=0), 0))
+
+            alpha = tikhonov_parameter(s, projection, outside, nr_nodes)
+            filters = s**2/(s**2 + alpha)
+
+            residual = rhs - U.dot(filters[:, np.newaxis]*projection)
+            leverage = np.sum(U**2*filters, axis=1)
+
+            errors.append(leave_one_out_error(rhs, residual, leverage))
+
+        return errors
+
+
+    def fit_sparse(self, P, nodes, evaluations, max_terms=None, patience=20):
+        """
+        Fit polynomial approximations to several sets of evaluations in the
+        same nodes, using a sparse subset of the polynomials selected by
+        orthogonal matching pursuit and leave-one-out cross-validation.
+
+        Parameters
+        ----------
+        P : chaospy.Poly
+            The polynomial expansion.
+        nodes : array_like
+            The nodes the model was evaluated in, with shape
+            ``(nr_uncertain_parameters, nr_nodes)``.
+        evaluations : list
+            A list of evaluations to fit. Each element is an array with
+            shape ``(nr_nodes, ...)``.
+        max_terms : {None, int}, optional
+            The maximum number of polynomials in each approximation. If None,
+            ``max_terms = min(len(P), nr_nodes - 1)``.
+            Default is None.
+        patience : int, optional
+            The selection stops when the cross-validation error has not
+            improved for `patience` added polynomials.
+            Default is 20.
+
+        Returns
+        -------
+        U_hat : list
+            The polynomial approximation of each set of evaluations, with the
+            same shape as the evaluations of a single node.
+
+        Notes
+        -----
+        Orthogonal matching pursuit adds one polynomial at the time, the one
+        most correlated with the current residual, summed over all time
+        points, so all time points of an evaluation share the same
+        polynomials. The least squares fit is updated with an orthonormal
+        basis of the selected columns of the Vandermonde matrix, which also
+        gives the diagonal of the hat matrix, so the leave-one-out error of
+        each number of polynomials is found without refitting. The number of
+        polynomials with the lowest leave-one-out error is used, and the
+        coefficients are found with ordinary least squares on these
+        polynomials. The number of nodes can therefore be much lower than
+        the number of polynomials when only a few of them are important.
+        """
+        nodes = np.asarray(nodes)
+        if nodes.ndim == 1:
+            nodes = nodes.reshape(1, -1)
+
+        vandermonde = np.asarray(P(*nodes), dtype=float).T
+        nr_nodes, nr_polynomials = vandermonde.shape
+
+        column_norms = np.linalg.norm(vandermonde, axis=0)
+        column_norms[column_norms == 0] = 1
+        normalized = vandermonde/column_norms
+
+        if max_terms is None:
+            max_terms = min(nr_polynomials, nr_nodes - 1)
+        max_terms = max(min(max_terms, nr_polynomials, nr_nodes - 1), 1)
+
+        U_hat = []
+        for evaluation in evaluations:
+            evaluation = np.asarray(evaluation, dtype=float)
+            shape = evaluation.shape[1:]
+            rhs = evaluation.reshape(nr_nodes, -1)
+
+            support = self._omp_support(normalized, rhs, max_terms, patience)
+
+            coefficients = np.linalg.lstsq(vandermonde[:, support], rhs, rcond=None)[0]
+
+            polynomial = cp.sum(P[support]*coefficients.T, -1)
+            U_hat.append(polynomial.reshape(shape))
+
+        return U_hat
+
+
+    def _omp_support(self, normalized, rhs, max_terms, patience):
+        """
+        Select the columns of the normalized Vandermonde matrix with
+        orthogonal matching pursuit, and return the selection with the lowest
+        leave-one-out error, see ``fit_sparse``.
+        """
+        nr_nodes = len(normalized)
+
+        # The correlations and errors summed over the columns of rhs are
+        # unchanged by an orthogonal transformation of the columns, so at
+        # most nr_nodes columns are needed
+        if rhs.shape[1] > nr_nodes:
+            u, s = np.linalg.svd(rhs, full_matrices=False)[:2]
+            rhs = u*s
+
+        residual = rhs.copy()
+        Q = np.empty((nr_nodes, max_terms))
+        leverage = np.zeros(nr_nodes)
+        available = np.ones(normalized.shape[1], dtype=bool)
+
+        support = []
+        best_error = np.inf
+        best_size = 1
+
+        while len(support) < max_terms and np.any(available):
+            correlation = np.sum(normalized.T.dot(residual)**2, axis=1)
+            correlation[~available] = -1
+
+            k = int(np.argmax(correlation))
+            available[k] = False
+
+            size = len(support)
+            q = normalized[:, k] - Q[:, :size].dot(Q[:, :size].T.dot(normalized[:, k]))
+            q -= Q[:, :size].dot(Q[:, :size].T.dot(q))
+
+            norm = np.linalg.norm(q)
+            if norm < 1e-10:
+                # Linearly dependent on the selected columns
+                continue
+
+            q /= norm
+            Q[:, size] = q
+            support.append(k)
+
+            residual -= np.outer(q, q.dot(residual))
+            leverage += q**2
+
+            if np.any(leverage > 1 - 1e-10):
+                break
+
+            error = np.sum((residual/(1 - leverage)[:, np.newaxis])**2)
+
+            if error < best_error:
+                best_error = error
+                best_size = len(support)
+
+            elif len(support) - best_size >= patience:
+                break
+
+        return support[:best_size]
+
+
+    def fit_collocation(self, P, data, nodes, allow_incomplete=True, sparse=False,
+                        loo_error=False):
+        """
+        Fit the polynomial approximations of the model and all features with
+        point collocation.
+
+        The features with evaluations in the same nodes share the
+        factorization of the Vandermonde matrix, and are fitted together.
+
+        Parameters
+        ----------
+        P : chaospy.Poly
+            The polynomial expansion.
+        data : Data
+            A Data object with evaluations for the model and each feature.
+        nodes : array_like
+            The nodes the model was evaluated in.
+        allow_incomplete : bool, optional
+            If the polynomial approximation should be performed for features or
+            models with incomplete evaluations.
+            Default is True.
+        sparse : bool, optional
+            If the polynomial approximations should be fitted with sparse
+            regression, see ``fit_sparse``, instead of least squares with
+            Tikhonov regularization, see ``fit_regression``.
+            Default is False.
+        loo_error : bool, optional
+            If the leave-one-out error of the least squares fits, see
+            ``leave_one_out_error``, is calculated and stored in
+            ``data[feature].loo_error``. Not used with sparse regression.
+            Default is False.
+
+        Returns
+        -------
+        U_hat : dict
+            A dictionary containing the polynomial approximations for the
+            model and each feature as chaospy.Poly objects.
+        """
+        logger = get_logger(self)
+
+        # Features that are fitted together, grouped by their mask
+        groups = {}
+        group_order = []
+
+        for feature in tqdm(data,
+                            desc="Calculating PC for each feature",
+                            total=len(data)):
+            if feature == self.model.name and self.model.ignore:
+                continue
+
+            masked_evaluations, mask, masked_nodes = self.create_masked_nodes(data, feature, nodes)
+
+            if (np.all(mask) or allow_incomplete) and sum(mask) > 0:
+                key = mask.tobytes()
+
+                if key not in groups:
+                    groups[key] = {"nodes": masked_nodes,
+                                   "features": [],
+                                   "evaluations": []}
+                    group_order.append(key)
+
+                groups[key]["features"].append(feature)
+                groups[key]["evaluations"].append(masked_evaluations)
+
+            elif not allow_incomplete:
+                logger.warning("{}: not all parameter combinations give results.".format(feature) +
+                               " No uncertainty quantification is performed since allow_incomplete=False")
+
+            else:
+                logger.warning("{}: not all parameter combinations give results.".format(feature))
+
+
+            if not np.all(mask):
+                data.incomplete.append(feature)
+
+
+        U_hat = {}
+        for key in group_order:
+            group = groups[key]
+
+            if sparse:
+                polynomials = self.fit_sparse(P,
+                                              group["nodes"],
+                                              group["evaluations"])
+            else:
+                svd = self.vandermonde_svd(P, group["nodes"])
+
+                polynomials = self.fit_regression(P,
+                                                  group["nodes"],
+                                                  group["evaluations"],
+                                                  svd=svd)
+
+                if loo_error:
+                    errors = self.leave_one_out_error(P,
+                                                      group["nodes"],
+                                                      group["evaluations"],
+                                                      svd=svd)
+
+                    for feature, error in zip(group["features"], errors):
+                        data[feature].loo_error = error
+
+            for feature, polynomial in zip(group["features"], polynomials):
+                U_hat[feature] = polynomial
+
+        return U_hat
+
+
+    def select_polynomial_order(self, data, nodes, distribution, polynomial_order,
+                                tolerance, allow_incomplete=True):
+        """
+        Fit the polynomial approximations of the model and all features with
+        point collocation for increasing polynomial orders, and stop at the
+        smallest order with a leave-one-out error below `tolerance`.
+
+        Parameters
+        ----------
+        data : Data
+            A Data object with evaluations for the model and each feature.
+        nodes : array_like
+            The nodes the model was evaluated in.
+        distribution : chaospy.Dist
+            The distribution of the orthogonal polynomials.
+        polynomial_order : int
+            The largest polynomial order that is tried.
+        tolerance : float
+            The largest acceptable leave-one-out error of the model and the
+            features, see ``leave_one_out_error``.
+        allow_incomplete : bool, optional
+            If the polynomial approximation should be performed for features or
+            models with incomplete evaluations.
+            Default is True.
+
+        Returns
+        -------
+        U_hat : dict
+            A dictionary containing the polynomial approximations for the
+            model and each feature as chaospy.Poly objects.
+        polynomial_order : int
+            The polynomial order of `U_hat`. The smallest order where the
+            leave-one-out error of the model and all features are below
+            `tolerance`, or the largest order if no order is accurate enough.
+
+        Notes
+        -----
+        All orders are fitted in the same nodes, so no additional model
+        evaluations are needed, and the leave-one-out error of the selected
+        order is stored in ``data[feature].loo_error``.
+        """
+        logger = get_logger(self)
+
+        incomplete = list(data.incomplete)
+
+        for order in range(1, polynomial_order + 1):
+            data.incomplete = list(incomplete)
+
+            P = self.basis_cache.orth_ttr(order, distribution)
+
+            U_hat = self.fit_collocation(P, data, nodes,
+                                         allow_incomplete=allow_incomplete,
+                                         loo_error=True)
+
+            errors = [data[feature].loo_error for feature in U_hat]
+            if not errors or np.max(errors) <= tolerance:
+                return U_hat, order
+
+        logger.warning("No polynomial order up to {} gives a leave-one-out error below {}".format(
+            polynomial_order, tolerance))
+
+        return U_hat, polynomial_order
+
+
     def create_PCE_spectral(self,
                             uncertain_parameters=None,
                             polynomial_order=4,
@@ -483,16 +1106,16 @@ class UncertaintyCalculations(ParameterBase):
 
         distribution = self.create_distribution(uncertain_parameters=uncertain_parameters)
 
-        P = cp.orth_ttr(polynomial_order, distribution)
+        P = self.basis_cache.orth_ttr(polynomial_order, distribution)
 
         if quadrature_order is None:
             quadrature_order = polynomial_order + 2
 
 
-        nodes, weights = cp.generate_quadrature(quadrature_order,
-                                                distribution,
-                                                rule="J",
-                                                sparse=True)
+        nodes, weights = self.basis_cache.generate_quadrature(quadrature_order,
+                                                              distribution,
+                                                              rule="J",
+                                                              sparse=True)
 
         # Running the model
         data = self.runmodel.run(nodes, uncertain_parameters)
@@ -534,7 +1157,10 @@ class UncertaintyCalculations(ParameterBase):
                                uncertain_parameters=None,
                                polynomial_order=4,
                                nr_collocation_nodes=None,
-                               allow_incomplete=True):
+                               allow_incomplete=True,
+                               loo_error=False,
+                               sampling_rule="hammersley",
+                               tolerance=None):
         """
         Create the polynomial approximation `U_hat` using pseudo-spectral
         projection.
@@ -556,6 +1182,23 @@ class UncertaintyCalculations(ParameterBase):
             If the polynomial approximation should be performed for features or
             models with incomplete evaluations.
             Default is True.
+        loo_error : bool, optional
+            If the leave-one-out error of the polynomial approximation of the
+            model and each feature is calculated, and stored in
+            ``data["model/features"].loo_error``.
+            Default is False.
+        sampling_rule : {"hammersley", "halton"}, optional
+            The low-discrepancy sequence the collocation nodes are drawn from.
+            Only nodes from the Halton sequence can later be extended with
+            ``extend_PCE_collocation``.
+            Default is "hammersley".
+        tolerance : {None, float}, optional
+            If given, the smallest polynomial order up to `polynomial_order`
+            with a leave-one-out error below `tolerance` for the model and all
+            features is used, see ``select_polynomial_order``. The nodes are
+            chosen for `polynomial_order`. If None, `polynomial_order` is
+            used.
+            Default is None.
 
         Returns
         -------
@@ -573,6 +1216,8 @@ class UncertaintyCalculations(ParameterBase):
         ValueError
             If a common multivariate distribution is given in
             Parameters.distribution and not all uncertain parameters are used.
+        ValueError
+            If `sampling_rule` is not "hammersley" or "halton".
 
         Notes
         -----
@@ -585,6 +1230,8 @@ class UncertaintyCalculations(ParameterBase):
             5. ``data.incomplete``
             6. ``data.method``
             7. ``data.errored``
+            8. ``data.nodes``
+            9. ``data.sampling_rule``
 
         The model and feature do not necessarily give results for each
         node. The collocation method is robust towards missing values as long as
@@ -609,6 +1256,12 @@ class UncertaintyCalculations(ParameterBase):
         and solve the resulting set of linear equations with Tikhonov
         regularization.
 
+        The leave-one-out error is found from the hat matrix of the
+        regularized least squares fit, see ``leave_one_out_error``, so no
+        additional fits or model evaluations are needed. With `tolerance`,
+        it is used to choose the smallest polynomial order that gives an
+        adequate approximation.
+
         See also
         --------
         uncertainpy.Data
@@ -619,43 +1272,34 @@ class UncertaintyCalculations(ParameterBase):
 
         distribution = self.create_distribution(uncertain_parameters=uncertain_parameters)
 
-        P = cp.orth_ttr(polynomial_order, distribution)
+        P = self.basis_cache.orth_ttr(polynomial_order, distribution)
         if nr_collocation_nodes is None:
             nr_collocation_nodes = 2*len(P) + 2
 
-        nodes = distribution.sample(nr_collocation_nodes, "M")
+        nodes = distribution.sample(nr_collocation_nodes,
+                                    self.collocation_rule(sampling_rule))
 
 
         # Running the model
         data = self.runmodel.run(nodes, uncertain_parameters)
 
-        data.method = "polynomial chaos expansion with point collocation. polynomial_order={}, nr_collocation_nodes={}".format(polynomial_order, nr_collocation_nodes)
-
-        logger = get_logger(self)
-
-        U_hat = {}
-        # Calculate PC for each feature
-        for feature in tqdm(data,
-                            desc="Calculating PC for each feature",
-                            total=len(data)):
-            if feature == self.model.name and self.model.ignore:
-                continue
-
-            masked_evaluations, mask, masked_nodes = self.create_masked_nodes(data, feature, nodes)
-
-            if (np.all(mask) or allow_incomplete) and sum(mask) > 0:
-                U_hat[feature] = cp.fit_regression(P, masked_nodes,
-                                                   masked_evaluations, rule="T")
-            elif not allow_incomplete:
-                logger.warning("{}: not all parameter combinations give results.".format(feature) +
-                               " No uncertainty quantification is performed since allow_incomplete=False")
-
-            else:
-                logger.warning("{}: not all parameter combinations give results.".format(feature))
-
+        if tolerance is None:
+            U_hat = self.fit_collocation(P, data, nodes,
+                                         allow_incomplete=allow_incomplete,
+                                         loo_error=loo_error)
+        else:
+            U_hat, polynomial_order = \
+                self.select_polynomial_order(data, nodes, distribution,
+                                             polynomial_order=polynomial_order,
+                                             tolerance=tolerance,
+                                             allow_incomplete=allow_incomplete)
 
-            if not np.all(mask):
-                data.incomplete.append(feature)
+        data.method = "polynomial chaos expansion with point collocation. polynomial_order={}, nr_collocation_nodes={}".format(polynomial_order, nr_collocation_nodes)
+        if sampling_rule != "hammersley":
+            data.method += ", sampling_rule={}".format(sampling_rule)
+        if tolerance is not None:
+            data.method += ", tolerance={}".format(tolerance)
+        data.sampling_rule = sampling_rule
 
         return U_hat, distribution, data
 
@@ -763,15 +1407,15 @@ class UncertaintyCalculations(ParameterBase):
 
         dist_R = cp.J(*dist_R)
 
-        P = cp.orth_ttr(polynomial_order, dist_R)
+        P = self.basis_cache.orth_ttr(polynomial_order, dist_R)
 
         if quadrature_order is None:
             quadrature_order = polynomial_order + 2
 
-        nodes_R, weights_R = cp.generate_quadrature(quadrature_order,
-                                                    dist_R,
-                                                    rule="J",
-                                                    sparse=True)
+        nodes_R, weights_R = self.basis_cache.generate_quadrature(quadrature_order,
+                                                                  dist_R,
+                                                                  rule="J",
+                                                                  sparse=True)
 
 
         nodes = distribution.inv(dist_R.fwd(nodes_R))
@@ -781,6 +1425,7 @@ class UncertaintyCalculations(ParameterBase):
         data = self.runmodel.run(nodes, uncertain_parameters)
 
         data.method = "polynomial chaos expansion with the pseudo-spectral method and the Rosenblatt transformation. polynomial_order={}, quadrature_order={}".format(polynomial_order, quadrature_order)
+        data.rosenblatt = True
 
         logger = get_logger(self)
 
@@ -829,7 +1474,10 @@ class UncertaintyCalculations(ParameterBase):
                                           uncertain_parameters=None,
                                           polynomial_order=4,
                                           nr_collocation_nodes=None,
-                                          allow_incomplete=True):
+                                          allow_incomplete=True,
+                                          loo_error=False,
+                                          sampling_rule="hammersley",
+                                          tolerance=None):
         """
         Create the polynomial approximation `U_hat` using pseudo-spectral
         projection and the Rosenblatt transformation. Works for dependend
@@ -852,6 +1500,23 @@ class UncertaintyCalculations(ParameterBase):
             If the polynomial approximation should be performed for features or
             models with incomplete evaluations.
             Default is True.
+        loo_error : bool, optional
+            If the leave-one-out error of the polynomial approximation of the
+            model and each feature is calculated, and stored in
+            ``data["model/features"].loo_error``.
+            Default is False.
+        sampling_rule : {"hammersley", "halton"}, optional
+            The low-discrepancy sequence the collocation nodes are drawn from.
+            Only nodes from the Halton sequence can later be extended with
+            ``extend_PCE_collocation``.
+            Default is "hammersley".
+        tolerance : {None, float}, optional
+            If given, the smallest polynomial order up to `polynomial_order`
+            with a leave-one-out error below `tolerance` for the model and all
+            features is used, see ``select_polynomial_order``. The nodes are
+            chosen for `polynomial_order`. If None, `polynomial_order` is
+            used.
+            Default is None.
 
         Returns
         -------
@@ -869,6 +1534,8 @@ class UncertaintyCalculations(ParameterBase):
         ValueError
             If a common multivariate distribution is given in
             Parameters.distribution and not all uncertain parameters are used.
+        ValueError
+            If `sampling_rule` is not "hammersley" or "halton".
 
         Notes
         -----
@@ -880,6 +1547,9 @@ class UncertaintyCalculations(ParameterBase):
             4. ``data.model_name``
             5. ``data.incomplete``
             6. ``data.method``
+            7. ``data.nodes``
+            8. ``data.sampling_rule``
+            9. ``data.rosenblatt``
 
         The model and feature do not necessarily give results for each node. The
         collocation method is robust towards missing values as long as the number
@@ -907,6 +1577,12 @@ class UncertaintyCalculations(ParameterBase):
         feature in parallel. We solve the resulting set of linear equations
         with Tikhonov regularization.
 
+        The leave-one-out error is found from the hat matrix of the
+        regularized least squares fit, see ``leave_one_out_error``, so no
+        additional fits or model evaluations are needed. With `tolerance`,
+        it is used to choose the smallest polynomial order that gives an
+        adequate approximation.
+
         See also
         --------
         uncertainpy.Data
@@ -925,50 +1601,839 @@ class UncertaintyCalculations(ParameterBase):
 
         dist_R = cp.J(*dist_R)
 
-        P = cp.orth_ttr(polynomial_order, dist_R)
+        P = self.basis_cache.orth_ttr(polynomial_order, dist_R)
 
         if nr_collocation_nodes is None:
             nr_collocation_nodes = 2*len(P) + 2
 
-        nodes_R = dist_R.sample(nr_collocation_nodes, "M")
+        nodes_R = dist_R.sample(nr_collocation_nodes,
+                                self.collocation_rule(sampling_rule))
         nodes = distribution.inv(dist_R.fwd(nodes_R))
 
         # Running the model
         data = self.runmodel.run(nodes, uncertain_parameters)
 
-        data.method = "polynomial chaos expansion with point collocation and the Rosenblatt transformation. polynomial_order={}, nr_collocation_nodes={}".format(polynomial_order, nr_collocation_nodes)
+        if tolerance is None:
+            U_hat = self.fit_collocation(P, data, nodes_R,
+                                         allow_incomplete=allow_incomplete,
+                                         loo_error=loo_error)
+        else:
+            U_hat, polynomial_order = \
+                self.select_polynomial_order(data, nodes_R, dist_R,
+                                             polynomial_order=polynomial_order,
+                                             tolerance=tolerance,
+                                             allow_incomplete=allow_incomplete)
+
+        data.method = "polynomial chaos expansion with point collocation and the Rosenblatt transformation. polynomial_order={}, nr_collocation_nodes={}".format(polynomial_order, nr_collocation_nodes)
+        if sampling_rule != "hammersley":
+            data.method += ", sampling_rule={}".format(sampling_rule)
+        if tolerance is not None:
+            data.method += ", tolerance={}".format(tolerance)
+        data.sampling_rule = sampling_rule
+        data.rosenblatt = True
+
+        return U_hat, dist_R, data
+
+
+    def collocation_rule(self, sampling_rule):
+        """
+        Get the chaospy sampling rule of the collocation nodes.
+
+        Parameters
+        ----------
+        sampling_rule : {"hammersley", "halton"}
+            The low-discrepancy sequence the collocation nodes are drawn from.
+
+        Returns
+        -------
+        rule : str
+            The chaospy name of `sampling_rule`, "M" or "H".
+
+        Raises
+        ------
+        ValueError
+            If `sampling_rule` is not "hammersley" or "halton".
+        """
+        rules = {"hammersley": "M",
+                 "halton": "H"}
+
+        if sampling_rule not in rules:
+            raise ValueError("sampling_rule must be one of: {}, not {}".format(
+                ", ".join(sorted(rules)), sampling_rule))
+
+        return rules[sampling_rule]
+
+
+    def extend_PCE_collocation(self,
+                               data,
+                               nr_new_nodes,
+                               polynomial_order=4,
+                               rosenblatt="auto",
+                               allow_incomplete=True,
+                               fits=None,
+                               loo_error=False):
+        """
+        Add collocation nodes to an existing point collocation polynomial
+        chaos expansion, evaluate the model only in the new nodes, and refit
+        the polynomial approximations.
+
+        Parameters
+        ----------
+        data : Data
+            A Data object from ``create_PCE_collocation`` or
+            ``create_PCE_collocation_rosenblatt`` with
+            ``sampling_rule="halton"``, or from a previous extension, with
+            the nodes in ``data.nodes``.
+        nr_new_nodes : int
+            The number of collocation nodes to add.
+        polynomial_order : int, optional
+            The polynomial order of the polynomial approximation. Must be the
+            same as the order used to create `data`.
+            Default is 4.
+        rosenblatt : {"auto", bool}, optional
+            If the Rosenblatt transformation was used to create `data`. If
+            "auto", ``data.rosenblatt`` is used.
+            Default is "auto".
+        allow_incomplete : bool, optional
+            If the polynomial approximation should be performed for features or
+            models with incomplete evaluations.
+            Default is True.
+        fits : {None, dict}, optional
+            A dictionary with the least squares fits of the model and each
+            feature, which is updated in place with the new nodes so it can be
+            given to the next call with the same `data`. If None or empty, the
+            fits are created from the existing nodes and evaluations.
+            Default is None.
+        loo_error : bool, optional
+            If the leave-one-out error of the polynomial approximation of the
+            model and each feature is calculated with all nodes, and stored
+            in ``data["model/features"].loo_error``.
+            Default is False.
+
+        Returns
+        -------
+        U_hat : dict
+            A dictionary containing the polynomial approximations for the
+            model and each feature as chaospy.Poly objects.
+        distribution : chaospy.Dist
+            The multivariate distribution for the uncertain parameters, or the
+            independent distribution if the Rosenblatt transformation is used.
+        data : Data
+            The `data` parameter given as input, with the evaluations in the
+            new nodes added.
+
+        Raises
+        ------
+        ValueError
+            If `data` does not contain the nodes.
+        ValueError
+            If the nodes of `data` are not drawn from the Halton sequence,
+            given by ``data.sampling_rule``.
+        ValueError
+            If `fits` are created for another polynomial order.
+
+        Notes
+        -----
+        The new nodes continue the Halton sequence the existing nodes are
+        drawn from, so the extended set of nodes is the same as if all nodes
+        were drawn at once, and remains a low-discrepancy set. A set of
+        Hammersley nodes depends on the number of nodes and can not be
+        extended this way, so `data` must be created with
+        ``sampling_rule="halton"``.
+
+        Only the normal equations of each fit are updated with the new
+        nodes, see ``uncertainpy.core.IncrementalLeastSquares``, so the cost
+        of refitting does not grow with the number of existing nodes when
+        `fits` are given. The result is the same as fitting all nodes at once
+        with ``fit_collocation``, up to round-off errors. The leave-one-out
+        error is found from the normal equations and the Vandermonde matrix
+        of all nodes, see ``IncrementalLeastSquares.leave_one_out_error``.
+
+        See also
+        --------
+        uncertainpy.Data
+        uncertainpy.core.IncrementalLeastSquares
+        uncertainpy.core.UncertaintyCalculations.create_PCE_collocation
+        """
+        logger = get_logger(self)
+
+        if data.nodes is None:
+            raise ValueError("data does not contain the nodes the model was evaluated in.")
+
+        if data.sampling_rule != "halton":
+            raise ValueError("Only collocation nodes drawn from the Halton sequence can be extended. "
+                             "Create data with sampling_rule=\"halton\".")
+
+        uncertain_parameters = data.uncertain_parameters
+        distribution = self.create_distribution(uncertain_parameters=uncertain_parameters)
+
+        if rosenblatt == "auto":
+            rosenblatt = data.rosenblatt
+
+        if rosenblatt:
+            dist_R = []
+            for parameter in uncertain_parameters:
+                dist_R.append(cp.Normal())
+
+            dist_R = cp.J(*dist_R)
+
+            nodes_R = dist_R.inv(distribution.fwd(data.nodes))
+        else:
+            dist_R = distribution
+            nodes_R = data.nodes
+
+        P = self.basis_cache.orth_ttr(polynomial_order, dist_R)
+        nr_nodes = np.shape(data.nodes)[-1]
+
+        if fits is None:
+            fits = {}
+
+        if not fits:
+            self.update_collocation_fits(P, data, nodes_R, fits)
+
+        for fit in fits.values():
+            if fit.nr_polynomials != len(P):
+                raise ValueError("fits are created with {} polynomials, ".format(fit.nr_polynomials) +
+                                 "polynomial_order={} gives {}".format(polynomial_order, len(P)))
+
+        # Continue the Halton sequence after the existing nodes
+        new_nodes_R = dist_R.sample(nr_nodes + nr_new_nodes, "H")[..., nr_nodes:]
+
+        if rosenblatt:
+            new_nodes = distribution.inv(dist_R.fwd(new_nodes_R))
+        else:
+            new_nodes = new_nodes_R
+
+        # Running the model in the new nodes only
+        new_data = self.evaluate_new_nodes(new_nodes, uncertain_parameters, data)
+        data = self.concatenate_data(data, new_data)
+
+        self.update_collocation_fits(P, data, new_nodes_R, fits, start=nr_nodes)
+
+        nr_collocation_nodes = nr_nodes + nr_new_nodes
+        if rosenblatt:
+            data.method = "polynomial chaos expansion with point collocation and the Rosenblatt transformation. polynomial_order={}, nr_collocation_nodes={}".format(polynomial_order, nr_collocation_nodes)
+        else:
+            data.method = "polynomial chaos expansion with point collocation. polynomial_order={}, nr_collocation_nodes={}".format(polynomial_order, nr_collocation_nodes)
+        data.method += ", sampling_rule={}".format(data.sampling_rule)
+        data.rosenblatt = rosenblatt
+
+        data.incomplete = [feature for feature in data.incomplete if feature not in fits]
+
+        if loo_error:
+            nodes_R = np.concatenate([np.atleast_2d(nodes_R), np.atleast_2d(new_nodes_R)], axis=-1)
+            vandermonde = np.asarray(P(*nodes_R), dtype=float).T
+
+        U_hat = {}
+        for feature in fits:
+            mask = valid_mask(data[feature].evaluations)
+
+            if (np.all(mask) or allow_incomplete) and fits[feature].nr_nodes > 0:
+                coefficients = fits[feature].solve()
+                coefficients = coefficients.reshape(len(P), -1)
+
+                U_hat[feature] = cp.sum(P*coefficients.T, -1).reshape(fits[feature].shape)
+
+                if loo_error:
+                    masked_evaluations, mask = self.create_mask(data[feature].evaluations)
+                    data[feature].loo_error = fits[feature].leave_one_out_error(vandermonde[mask],
+                                                                                masked_evaluations)
+
+            elif not allow_incomplete:
+                logger.warning("{}: not all parameter combinations give results.".format(feature) +
+                               " No uncertainty quantification is performed since allow_incomplete=False")
+
+            else:
+                logger.warning("{}: not all parameter combinations give results.".format(feature))
+
+            if not np.all(mask):
+                data.incomplete.append(feature)
+
+        return U_hat, dist_R, data
+
+
+    def update_collocation_fits(self, P, data, nodes, fits, start=0):
+        """
+        Add the evaluations in `nodes` to the least squares fits of the model
+        and each feature.
+
+        Parameters
+        ----------
+        P : chaospy.Poly
+            The polynomial expansion.
+        data : Data
+            A Data object with evaluations for the model and each feature.
+        nodes : array_like
+            The nodes of the evaluations ``data[feature].evaluations[start:]``.
+        fits : dict
+            The IncrementalLeastSquares object of the model and each feature.
+            Fits are created for the model and features that are missing, and
+            removed for the features in ``data.error``.
+        start : int, optional
+            The index of the first evaluation that is added.
+            Default is 0.
+        """
+        vandermonde = np.asarray(P(*np.atleast_2d(nodes)), dtype=float).T
+
+        for feature in data:
+            if feature == self.model.name and self.model.ignore:
+                continue
+
+            if feature in data.error:
+                fits.pop(feature, None)
+                continue
+
+            masked_evaluations, mask = self.create_mask(data[feature].evaluations[start:])
+
+            if feature not in fits:
+                fits[feature] = IncrementalLeastSquares(len(P))
+
+            if np.any(mask):
+                fits[feature].update(vandermonde[mask], masked_evaluations)
+
+
+    def create_PCE_sparse(self,
+                          uncertain_parameters=None,
+                          polynomial_order=4,
+                          nr_collocation_nodes=None,
+                          rosenblatt=False,
+                          allow_incomplete=True):
+        """
+        Create the polynomial approximation `U_hat` using point collocation
+        with sparse regression.
+
+        Parameters
+        ----------
+        uncertain_parameters : {None, str, list}, optional
+            The uncertain parameter(s) to use when creating the polynomial
+            approximation. If None, all uncertain parameters are used.
+            Default is None.
+        polynomial_order : int, optional
+            The polynomial order of the polynomials the sparse polynomial
+            approximation is selected from.
+            Default is 4.
+        nr_collocation_nodes : {int, None}, optional
+            The number of collocation nodes to choose. If None,
+            ``nr_collocation_nodes = min(2*len(P) + 2, 10*nr_uncertain_parameters*polynomial_order)``,
+            where ``len(P)`` is the number of polynomials.
+            Default is None.
+        rosenblatt : bool, optional
+            If the Rosenblatt transformation should be used.
+            Default is False.
+        allow_incomplete : bool, optional
+            If the polynomial approximation should be performed for features or
+            models with incomplete evaluations.
+            Default is True.
+
+        Returns
+        -------
+        U_hat : dict
+            A dictionary containing the polynomial approximations for the
+            model and each feature as chaospy.Poly objects.
+        distribution : chaospy.Dist
+            The multivariate distribution for the uncertain parameters, or the
+            independent standard normal distribution if `rosenblatt` is True.
+        data : Data
+            A data object containing the values from the model evaluation
+            and feature calculations.
+
+        Raises
+        ------
+        ValueError
+            If a common multivariate distribution is given in
+            Parameters.distribution and not all uncertain parameters are used.
+
+        Notes
+        -----
+        The returned `data` should contain (but not necessarily) the following:
+
+            1. ``data["model/features"].evaluations``
+            2. ``data["model/features"].time``
+            3. ``data["model/features"].labels``
+            4. ``data.model_name``
+            5. ``data.incomplete``
+            6. ``data.method``
+            7. ``data.errored``
+
+        As in ``create_PCE_collocation`` we choose collocation nodes with
+        Hammersley sampling and evaluate the model and each feature in
+        parallel. Instead of fitting all polynomials up to
+        `polynomial_order`, which requires more nodes than polynomials, a
+        small subset of the polynomials is selected for the model and each
+        feature with orthogonal matching pursuit, and the size of the subset
+        is chosen by leave-one-out cross-validation, see ``fit_sparse``.
+        For models where only a few parameters and interactions are
+        important, this requires far fewer model evaluations when there are
+        many uncertain parameters.
+
+        See also
+        --------
+        uncertainpy.Data
+        uncertainpy.Parameters
+        uncertainpy.core.UncertaintyCalculations.create_PCE_collocation
+        """
+        uncertain_parameters = self.convert_uncertain_parameters(uncertain_parameters)
+
+        distribution = self.create_distribution(uncertain_parameters=uncertain_parameters)
+
+        if rosenblatt:
+            dist_R = []
+            for parameter in uncertain_parameters:
+                dist_R.append(cp.Normal())
+
+            dist_R = cp.J(*dist_R)
+        else:
+            dist_R = distribution
+
+        P = self.basis_cache.orth_ttr(polynomial_order, dist_R)
+
+        if nr_collocation_nodes is None:
+            nr_collocation_nodes = min(2*len(P) + 2,
+                                       10*len(uncertain_parameters)*polynomial_order)
+
+        nodes_R = dist_R.sample(nr_collocation_nodes, "M")
+
+        if rosenblatt:
+            nodes = distribution.inv(dist_R.fwd(nodes_R))
+        else:
+            nodes = nodes_R
+
+        # Running the model
+        data = self.runmodel.run(nodes, uncertain_parameters)
+
+        data.method = "polynomial chaos expansion with sparse point collocation"
+        if rosenblatt:
+            data.method += " and the Rosenblatt transformation"
+        data.method += ". polynomial_order={}, nr_collocation_nodes={}".format(polynomial_order, nr_collocation_nodes)
+        data.sampling_rule = "hammersley"
+        data.rosenblatt = rosenblatt
+
+        U_hat = self.fit_collocation(P, data, nodes_R,
+                                     allow_incomplete=allow_incomplete,
+                                     sparse=True)
+
+        return U_hat, dist_R, data
+
+
+    def create_PCE_adaptive(self,
+                            uncertain_parameters=None,
+                            tolerance=None,
+                            max_evaluations=None,
+                            rosenblatt=False,
+                            allow_incomplete=True,
+                            loo_error=False):
+        """
+        Create the polynomial approximation `U_hat` using point collocation
+        in an adaptive, anisotropic sparse grid of nested Leja nodes.
+
+        Parameters
+        ----------
+        uncertain_parameters : {None, str, list}, optional
+            The uncertain parameter(s) to use when creating the polynomial
+            approximation. If None, all uncertain parameters are used.
+            Default is None.
+        tolerance : {None, float}, optional
+            The refinement stops when the error indicators of all candidate
+            multi-indices are below `tolerance`. The error indicator is the
+            root mean square interpolation error in the node of the candidate,
+            relative to the standard deviation of the evaluations, for the
+            model and the feature where it is largest. If None,
+            ``tolerance = 1e-3``.
+            Default is None.
+        max_evaluations : {None, int}, optional
+            The maximum number of model evaluations. If None,
+            ``max_evaluations = 100*nr_uncertain_parameters``.
+            Default is None.
+        rosenblatt : bool, optional
+            If the Rosenblatt transformation should be used. Must be True if
+            the uncertain parameters are dependent.
+            Default is False.
+        allow_incomplete : bool, optional
+            If the polynomial approximation should be performed for features or
+            models with incomplete evaluations.
+            Default is True.
+        loo_error : bool, optional
+            If the leave-one-out error of the final least squares fit of the
+            model and each feature is calculated, and stored in
+            ``data["model/features"].loo_error``, see
+            ``leave_one_out_error``.
+            Default is False.
+
+        Returns
+        -------
+        U_hat : dict
+            A dictionary containing the polynomial approximations for the
+            model and each feature as chaospy.Poly objects.
+        distribution : chaospy.Dist
+            The multivariate distribution for the uncertain parameters, or the
+            independent standard normal distribution if `rosenblatt` is True.
+        data : Data
+            A data object containing the values from the model evaluation
+            and feature calculations.
+
+        Raises
+        ------
+        ValueError
+            If the uncertain parameters are dependent and `rosenblatt` is
+            False.
+        ValueError
+            If a common multivariate distribution is given in
+            Parameters.distribution and not all uncertain parameters are used.
+
+        Notes
+        -----
+        The returned `data` should contain (but not necessarily) the following:
+
+            1. ``data["model/features"].evaluations``
+            2. ``data["model/features"].time``
+            3. ``data["model/features"].labels``
+            4. ``data.model_name``
+            5. ``data.incomplete``
+            6. ``data.method``
+            7. ``data.errored``
+
+        The polynomial chaos expansion is created from a downward closed set
+        of multi-indices, where each multi-index k both gives the orthogonal
+        polynomial ``P_k = p_k1(q_1)...p_kd(q_d)`` and the node
+        ``(x_1[k_1], ..., x_d[k_d])``, where ``x_i`` is the Leja sequence of
+        uncertain parameter i. The Leja sequences are nested, so this sparse
+        grid contains one node for each polynomial, and every node is reused
+        when the set is extended.
+
+        The set starts with the constant polynomial. In each step the model is
+        evaluated in the nodes of the candidate multi-indices that can be
+        added while keeping the set downward closed, the current polynomial
+        approximation is compared to these evaluations, and all candidates
+        with an error indicator of at least `tolerance` are added. Uncertain
+        parameters the model is insensitive to therefore keep a low
+        polynomial order, while the important parameters, and their
+        interactions, are refined. When the refinement stops, the polynomial
+        approximations are fitted with point collocation in all evaluated
+        nodes, as in ``create_PCE_collocation``. Interpolated model/features
+        are interpolated at the time grid of the first nodes, see
+        ``evaluate_new_nodes``.
+
+        See also
+        --------
+        uncertainpy.Data
+        uncertainpy.Parameters
+        uncertainpy.core.UncertaintyCalculations.create_PCE_collocation
+        """
+        logger = get_logger(self)
+
+        uncertain_parameters = self.convert_uncertain_parameters(uncertain_parameters)
+
+        distribution = self.create_distribution(uncertain_parameters=uncertain_parameters)
+
+        if rosenblatt:
+            dist_R = []
+            for parameter in uncertain_parameters:
+                dist_R.append(cp.Normal())
+
+            dist_R = cp.J(*dist_R)
+
+        elif self.dependent(distribution):
+            raise ValueError('Dependent parameters require using the Rosenblatt transformation. Set rosenblatt=True')
+
+        else:
+            dist_R = distribution
+
+        marginals = list(dist_R)
+        nr_dimensions = len(marginals)
+
+        if tolerance is None:
+            tolerance = 1e-3
+
+        if max_evaluations is None:
+            max_evaluations = 100*nr_dimensions
+
+        accepted = [(0,)*nr_dimensions]
+        evaluated = []
+        positions = {}
+        nodes_R = np.zeros((nr_dimensions, 0))
+        data = None
+        converged = False
+
+        while True:
+            margin = self._margin(accepted)
+
+            # The accepted multi-indices are always evaluated first
+            new = [index for index in accepted + margin if index not in positions]
+            new = new[:max(max_evaluations - len(evaluated), 0)]
+
+            if new:
+                new_nodes_R = self.leja_nodes(new, marginals)
+
+                if rosenblatt:
+                    new_nodes = distribution.inv(dist_R.fwd(new_nodes_R))
+                else:
+                    new_nodes = new_nodes_R
+
+                batch_data = self.evaluate_new_nodes(new_nodes, uncertain_parameters, data)
+                data = self.concatenate_data(data, batch_data)
+
+                for index in new:
+                    positions[index] = len(evaluated)
+                    evaluated.append(index)
+
+                nodes_R = np.concatenate([nodes_R, new_nodes_R], axis=1)
+
+            candidates = [index for index in margin if index in positions]
+            if not candidates:
+                break
 
-        logger = get_logger(self)
+            indicators = self.adaptive_indicators(data, nodes_R, positions, accepted, candidates, dist_R)
 
-        U_hat = {}
-        # Calculate PC for each feature
-        for feature in tqdm(data,
-                            desc="Calculating PC for each feature",
-                            total=len(data)):
+            logger.info("Adaptive PCE: {} nodes, largest error indicator {:.3g}".format(
+                len(evaluated), np.max(indicators)))
+
+            refine = [index for index, indicator in zip(candidates, indicators) if indicator >= tolerance]
+
+            if not refine:
+                converged = len(candidates) == len(margin)
+                break
+
+            accepted.extend(refine)
+
+        if not converged:
+            logger.warning("The adaptive polynomial chaos expansion did not reach the tolerance " +
+                           "{} with {} model evaluations".format(tolerance, len(evaluated)))
+
+        data.method = "polynomial chaos expansion with adaptive sparse grid point collocation"
+        if rosenblatt:
+            data.method += " and the Rosenblatt transformation"
+        data.method += ". tolerance={}, nr_collocation_nodes={}, converged={}".format(tolerance, len(evaluated), converged)
+        data.rosenblatt = rosenblatt
+
+        basis = self.tensor_basis(self._lower_set(evaluated), dist_R)
+        P = self.basis_polynomials(basis)
+
+        U_hat = self.fit_collocation(P, data, nodes_R,
+                                     allow_incomplete=allow_incomplete,
+                                     loo_error=loo_error)
+
+        return U_hat, dist_R, data
+
+
+    def adaptive_indicators(self, data, nodes, positions, multi_indices, candidates, distribution):
+        """
+        Calculate the error indicators of candidate multi-indices for the
+        adaptive polynomial chaos expansion.
+
+        Parameters
+        ----------
+        data : Data
+            A data object with the model and feature evaluations.
+        nodes : array
+            The nodes the model is evaluated in, with shape
+            ``(nr_uncertain_parameters, nr_nodes)``.
+        positions : dict
+            The position of the node of each multi-index in `nodes` and in
+            the evaluations, with the multi-indices as keys.
+        multi_indices : list
+            The downward closed set of multi-indices of the current
+            polynomial approximation.
+        candidates : list
+            The candidate multi-indices.
+        distribution : chaospy.Dist
+            The independent distribution of the orthogonal polynomials.
+
+        Returns
+        -------
+        indicators : array
+            The error indicator of each candidate. The largest root mean
+            square difference between the evaluations and the current
+            polynomial approximation in the node of the candidate, relative to
+            the standard deviation of all evaluations, for the model and all
+            features. Evaluations that are irregular, or contain numpy.nan, are
+            not used.
+        """
+        basis = self.tensor_basis(np.array(multi_indices), distribution)
+
+        rows = [positions[index] for index in multi_indices]
+        candidate_rows = [positions[index] for index in candidates]
+
+        vandermonde = self._basis_vandermonde(basis, nodes[:, rows + candidate_rows])
+        current = vandermonde[:len(rows)]
+        candidate = vandermonde[len(rows):]
+
+        indicators = np.zeros(len(candidates))
+        for feature in data:
             if feature == self.model.name and self.model.ignore:
                 continue
 
-            masked_evaluations, mask, masked_nodes = self.create_masked_nodes(data, feature, nodes_R)
+            evaluations = data[feature].evaluations
+            if not isinstance(evaluations, np.ndarray) or evaluations.dtype.kind not in "biuf":
+                continue
+
+            evaluations = evaluations.reshape(len(evaluations), -1)
+            mask = data[feature].mask
 
-            if (np.all(mask) or allow_incomplete) and sum(mask) > 0:
-                U_hat[feature] = cp.fit_regression(P,
-                                                masked_nodes,
-                                                masked_evaluations,
-                                                rule="T")
-            elif not allow_incomplete:
-                logger.warning("{}: not all parameter combinations give results.".format(feature) +
-                               " No uncertainty quantification is performed since allow_incomplete=False")
+            scale = np.sqrt(np.mean(np.var(evaluations[mask], axis=0))) if np.any(mask) else 0
+            if not scale > 0:
+                continue
+
+            valid = mask[rows]
+            if not np.any(valid):
+                continue
+
+            coefficients = np.linalg.lstsq(current[valid], evaluations[rows][valid], rcond=None)[0]
+
+            surplus = evaluations[candidate_rows] - candidate.dot(coefficients)
+            error = np.sqrt(np.mean(surplus**2, axis=1))/scale
+
+            error[~mask[candidate_rows]] = 0
+            indicators = np.maximum(indicators, error)
+
+        return indicators
+
+
+    def leja_nodes(self, multi_indices, distributions):
+        """
+        Get the sparse grid nodes of a set of multi-indices, from the nested
+        Leja sequences of univariate distributions.
+
+        Parameters
+        ----------
+        multi_indices : list
+            The multi-indices, each with one element for each distribution.
+        distributions : list
+            The univariate distribution of each uncertain parameter.
+
+        Returns
+        -------
+        nodes : array
+            The nodes, with shape ``(nr_uncertain_parameters, len(multi_indices))``,
+            where node n has element ``k_i`` of the Leja sequence of
+            distribution i, for multi-index ``k = multi_indices[n]``.
+        """
+        multi_indices = np.asarray(multi_indices, dtype=int).reshape(-1, len(distributions))
+
+        nodes = np.empty(multi_indices.T.shape)
+        for i, distribution in enumerate(distributions):
+            sequence = self.leja_sequence(int(multi_indices[:, i].max()) + 1, distribution)
+            nodes[i] = sequence[multi_indices[:, i]]
+
+        return nodes
+
+
+    def leja_sequence(self, length, distribution):
+        """
+        Get the first points of the Leja sequence of a univariate
+        distribution.
+
+        Parameters
+        ----------
+        length : int
+            The number of points.
+        distribution : chaospy.Dist
+            A univariate distribution.
+
+        Returns
+        -------
+        sequence : array
+            The points, in the order they are added to the Leja quadrature
+            rules of increasing order.
+        """
+        key = self.basis_cache.key("leja_sequence", distribution, length)
+
+        return self.basis_cache.memoize(key, self._leja_sequence, length, distribution)
 
+
+    def _leja_sequence(self, length, distribution):
+        """
+        Get the first points of the Leja sequence of a univariate
+        distribution, see ``leja_sequence``.
+        """
+        sequence = []
+        for order in range(length):
+            nodes = self.basis_cache.generate_quadrature(order, distribution, rule="J", sparse=False)[0]
+            nodes = np.asarray(nodes, dtype=float).reshape(-1)
+
+            if sequence:
+                # The rule of order n contains the nodes of order n - 1,
+                # the new node is the one furthest from the previous nodes
+                distance = np.min(np.abs(nodes[:, np.newaxis] - np.array(sequence)), axis=1)
+                sequence.append(nodes[np.argmax(distance)])
             else:
-                logger.warning("{}: not all parameter combinations give results.".format(feature))
+                sequence.append(nodes[0])
 
-            if not np.all(mask):
-                data.incomplete.append(feature)
+        return np.array(sequence)
 
-        return U_hat, dist_R, data
 
+    def basis_polynomials(self, basis):
+        """
+        Create the orthogonal polynomials of a basis as a chaospy polynomial.
+
+        Parameters
+        ----------
+        basis : dict
+            The basis, as returned by ``tensor_basis``.
+
+        Returns
+        -------
+        P : chaospy.Poly
+            The orthogonal polynomials, in the order of
+            ``basis["multi_indices"]``.
+        """
+        multi_indices = basis["multi_indices"]
+        nr_monomials, dimensions = multi_indices.shape
+
+        variables = cp.variable(dimensions)
+        if dimensions == 1:
+            variables = [variables]
+
+        # Build the monomials q**a as an array of polynomials, one uncertain
+        # parameter at the time, using only elementwise chaospy operations
+        monomials = np.ones(nr_monomials)
+        for i, variable in enumerate(variables):
+            factor = 0
+            for power in np.unique(multi_indices[:, i]):
+                factor = factor + variable**int(power)*(multi_indices[:, i] == power).astype(float)
+
+            monomials = monomials*factor
+
+        return cp.sum(monomials*basis["transform"].T, -1)
+
+
+    def _basis_vandermonde(self, basis, nodes):
+        """
+        Evaluate the orthogonal polynomials of a basis in the nodes.
+        """
+        exponents = basis["multi_indices"]
+
+        monomials = np.prod(nodes[:, :, np.newaxis]**exponents.T[:, np.newaxis, :], axis=0)
+
+        return monomials.dot(basis["transform"])
+
+
+    def _margin(self, multi_indices):
+        """
+        Get the multi-indices that can be added to the downward closed set
+        `multi_indices` while keeping it downward closed.
+        """
+        lower_set = set(multi_indices)
+
+        margin = []
+        found = set()
+        for index in multi_indices:
+            for i in range(len(index)):
+                candidate = index[:i] + (index[i] + 1,) + index[i + 1:]
+
+                if candidate in lower_set or candidate in found:
+                    continue
+
+                admissible = all(candidate[:j] + (candidate[j] - 1,) + candidate[j + 1:] in lower_set
+                                 for j in range(len(candidate)) if candidate[j] > 0)
 
-    def analyse_PCE(self, U_hat, distribution, data, nr_samples=10**4):
+                if admissible:
+                    margin.append(candidate)
+                    found.add(candidate)
+
+        return margin
+
+
+    def analyse_PCE(self, U_hat, distribution, data, nr_samples=10**4, sobol_second=False):
         """
         Calculate the statistical metrics from the polynomial chaos
         approximation.
@@ -987,6 +2452,9 @@ class UncertaintyCalculations(ParameterBase):
             Number of samples for the Monte Carlo sampling of the polynomial
             chaos approximation.
             Default is 10**4.
+        sobol_second : bool, optional
+            If the second order Sobol indices should be calculated.
+            Default is False.
 
         Returns
         -------
@@ -1015,41 +2483,440 @@ class UncertaintyCalculations(ParameterBase):
             13. ``data["model/features"].sobol_total``, if more than 1 parameter
             14. ``data["model/features"].sobol_first_average``, if more than 1 parameter
             15. ``data["model/features"].sobol_total_average``, if more than 1 parameter
+            16. ``data["model/features"].sobol_second``, if more than 1 parameter
+                and `sobol_second` is True
+
+        The Sobol indices are calculated directly from the expansion
+        coefficients in the orthogonal basis, see ``sobol_PCE``. For
+        dependent distributions, or polynomials that are not on the
+        form this requires, chaospy is used instead, and the second order Sobol
+        indices are not calculated.
 
         See also
         --------
         uncertainpy.Data
         """
+        logger = get_logger(self)
+
+        if len(data.uncertain_parameters) == 1:
+            logger.info("Only 1 uncertain parameter. Sensitivities are not calculated")
+
+        # The same samples are used for all features
+        key = self.basis_cache.key("sample", distribution, nr_samples, "M")
+        samples = self.basis_cache.memoize(key, distribution.sample, nr_samples, "M")
+
+        # Monomials evaluated in the samples, shared between the features
+        monomials = {}
+
+        for feature in tqdm(data,
+                            desc="Calculating statistics from PCE",
+                            total=len(data)):
+            if feature in U_hat:
+                data[feature].mean = cp.E(U_hat[feature], distribution)
+                data[feature].variance = cp.Var(U_hat[feature], distribution)
+
+                if len(data.uncertain_parameters) > 1:
+                    sensitivities = self.sobol_PCE(U_hat[feature],
+                                                   distribution,
+                                                   sobol_second=sobol_second)
+
+                    if sensitivities is None:
+                        if sobol_second:
+                            logger.warning("{}: the second order Sobol indices are ".format(feature) +
+                                           "only calculated from polynomials in an independent distribution")
+
+                        data[feature].sobol_first = cp.Sens_m(U_hat[feature], distribution)
+                        data[feature].sobol_total = cp.Sens_t(U_hat[feature], distribution)
+
+                    else:
+                        data[feature].sobol_first = sensitivities[0]
+                        data[feature].sobol_total = sensitivities[1]
+
+                        if sobol_second:
+                            data[feature].sobol_second = sensitivities[2]
+
+                U_mc = self.evaluate_PCE(U_hat[feature], samples, monomials)
+
+                data[feature].percentile_5, data[feature].percentile_95 = \
+                    np.percentile(U_mc, [5, 95], -1)
+
+        if len(data.uncertain_parameters) > 1:
+            data = self.average_sensitivity(data, sensitivity="sobol_first")
+            data = self.average_sensitivity(data, sensitivity="sobol_total")
+
+        return data
+
+
+    def orthogonal_basis(self, polynomial_order, distribution):
+        """
+        Find the orthogonal polynomials of `distribution` up to a total
+        polynomial order in the monomial basis, together with their
+        multi-indices and squared norms.
+
+        Parameters
+        ----------
+        polynomial_order : int
+            The polynomial order of the orthogonal polynomials.
+        distribution : chaospy.Dist
+            An independent multivariate distribution.
+
+        Returns
+        -------
+        basis : dict
+            The basis, as returned by ``tensor_basis``, for all multi-indices
+            with a total order of at most `polynomial_order`.
+        """
+        multi_indices = self._total_order(polynomial_order, len(distribution))
+
+        return self.tensor_basis(multi_indices, distribution)
+
+
+    def tensor_basis(self, multi_indices, distribution):
+        """
+        Find the orthogonal polynomials of `distribution` with the given
+        multi-indices in the monomial basis, together with their squared
+        norms.
+
+        Parameters
+        ----------
+        multi_indices : array_like
+            A downward closed set of multi-indices, with shape
+            ``(nr_polynomials, nr_uncertain_parameters)``, with the order of
+            each orthogonal polynomial in each of the uncertain parameters.
+        distribution : chaospy.Dist
+            An independent multivariate distribution.
+
+        Returns
+        -------
+        basis : dict
+            A dictionary with:
+
+            * ``"exponents"`` - a dictionary with the index of each monomial,
+              with the exponents as keys.
+            * ``"transform"`` - an array with shape
+              ``(nr_monomials, nr_polynomials)``, where column k contains the
+              monomial coefficients of orthogonal polynomial k.
+            * ``"multi_indices"`` - an array with shape
+              ``(nr_polynomials, nr_uncertain_parameters)`` with the order of
+              each orthogonal polynomial in each of the uncertain parameters.
+            * ``"norms"`` - the squared norm of each orthogonal polynomial.
+
+        Notes
+        -----
+        For an independent distribution, each orthogonal polynomial is a
+        product of univariate orthogonal polynomials,
+        ``P_k = p_k1(q_1)...p_kd(q_d)``, so the coefficient of monomial
+        ``q**a`` in ``P_k`` is the product of the coefficients of
+        ``q_i**a_i`` in ``p_ki``, and the squared norm is the product of
+        the univariate squared norms. Only the univariate polynomials are
+        created with chaospy, and the monomials are the same multi-indices
+        as the polynomials, since the set is downward closed.
+        """
+        multi_indices = np.asarray(multi_indices, dtype=int)
+
+        key = self.basis_cache.key("tensor_basis", distribution, multi_indices.tolist())
+
+        return self.basis_cache.memoize(key, self._tensor_basis,
+                                        multi_indices, distribution)
+
+
+    def _tensor_basis(self, multi_indices, distribution):
+        """
+        Find the orthogonal polynomials of `distribution` with the given
+        multi-indices, see ``tensor_basis``.
+        """
+        nr_polynomials = len(multi_indices)
+
+        transform = np.ones((nr_polynomials, nr_polynomials))
+        norms = np.ones(nr_polynomials)
+
+        for i, marginal in enumerate(distribution):
+            order = multi_indices[:, i]
+            coefficients, univariate_norms = self.univariate_basis(int(order.max()), marginal)
+
+            transform *= coefficients[np.ix_(order, order)]
+            norms *= univariate_norms[order]
+
+        return {"exponents": dict((tuple(index), i) for i, index in enumerate(multi_indices)),
+                "transform": transform,
+                "multi_indices": multi_indices,
+                "norms": norms}
+
+
+    def univariate_basis(self, polynomial_order, distribution):
+        """
+        Find the univariate orthogonal polynomials of `distribution` in the
+        monomial basis.
+
+        Parameters
+        ----------
+        polynomial_order : int
+            The polynomial order of the orthogonal polynomials.
+        distribution : chaospy.Dist
+            A univariate distribution.
+
+        Returns
+        -------
+        coefficients : array
+            An array with shape ``(polynomial_order + 1, polynomial_order + 1)``,
+            where element ``[j, k]`` is the coefficient of ``q**j`` in
+            orthogonal polynomial k.
+        norms : array
+            The squared norm of each orthogonal polynomial.
+        """
+        key = self.basis_cache.key("univariate_basis", distribution, polynomial_order)
+
+        return self.basis_cache.memoize(key, self._univariate_basis,
+                                        polynomial_order, distribution)
+
+
+    def _univariate_basis(self, polynomial_order, distribution):
+        """
+        Find the univariate orthogonal polynomials of `distribution`, see
+        ``univariate_basis``.
+        """
+        P = self.basis_cache.orth_ttr(polynomial_order, distribution)
+
+        coefficients = np.zeros((polynomial_order + 1, polynomial_order + 1))
+        for exponent, coefficient in zip(np.asarray(P.exponents, dtype=int)[:, 0], P.coefficients):
+            coefficients[exponent] = np.reshape(coefficient, -1)
+
+        norms = np.asarray(cp.E(P*P, distribution), dtype=float).reshape(-1)
+
+        return coefficients, norms
+
+
+    def _total_order(self, polynomial_order, nr_dimensions):
+        """
+        Get all multi-indices with `nr_dimensions` elements and a total order
+        of at most `polynomial_order`, sorted by the total order.
+        """
+        multi_indices = [()]
+        for dimension in range(nr_dimensions):
+            multi_indices = [index + (order,) for index in multi_indices
+                             for order in range(polynomial_order + 1 - sum(index))]
+
+        return np.array(sorted(multi_indices, key=lambda index: (sum(index), index[::-1])),
+                        dtype=int).reshape(-1, nr_dimensions)
+
+
+    def _lower_set(self, multi_indices):
+        """
+        Get the smallest downward closed set of multi-indices that contains
+        `multi_indices`, sorted by the total order.
+        """
+        multi_indices = np.asarray(multi_indices, dtype=int)
+        nr_dimensions = multi_indices.shape[1]
+
+        lower_set = set()
+        remaining = [tuple(index) for index in multi_indices]
+
+        while remaining:
+            index = remaining.pop()
+            if index in lower_set:
+                continue
+
+            lower_set.add(index)
+            for i in range(nr_dimensions):
+                if index[i] > 0:
+                    remaining.append(index[:i] + (index[i] - 1,) + index[i + 1:])
+
+        return np.array(sorted(lower_set, key=lambda index: (sum(index), index[::-1])),
+                        dtype=int).reshape(-1, nr_dimensions)
+
+
+    def _indeterminant_dimensions(self, polynomial, nr_dimensions):
+        """
+        Get the uncertain parameter of each indeterminant of `polynomial`, or
+        None if the indeterminants are not among ``q0, ..., q{nr_dimensions - 1}``.
+        """
+        dimensions = []
+        for name in polynomial.names:
+            match = re.match(r"^q(\d+)$", name)
+
+            if match is None or int(match.group(1)) >= nr_dimensions:
+                return None
+
+            dimensions.append(int(match.group(1)))
+
+        return dimensions
+
+
+    def _full_exponents(self, polynomial, dimensions, nr_dimensions):
+        """
+        Get the exponents of `polynomial` for all `nr_dimensions`
+        indeterminants ``q0, q1, ...``, including the ones that are not used.
+        `dimensions` is the uncertain parameter of each indeterminant, see
+        ``_indeterminant_dimensions``.
+        """
+        exponents = np.asarray(polynomial.exponents, dtype=int)
+        exponents = exponents.reshape(len(polynomial.coefficients), len(dimensions))
+
+        full_exponents = np.zeros((len(exponents), nr_dimensions), dtype=int)
+        full_exponents[:, dimensions] = exponents
+
+        return full_exponents
+
+
+    def sobol_PCE(self, U_hat, distribution, sobol_second=False):
+        """
+        Calculate the Sobol indices of a polynomial chaos approximation
+        directly from its expansion coefficients.
+
+        Parameters
+        ----------
+        U_hat : chaospy.Poly
+            The polynomial approximation of the model or a feature.
+        distribution : chaospy.Dist
+            The multivariate distribution of the uncertain parameters.
+        sobol_second : bool, optional
+            If the second order Sobol indices should be calculated.
+            Default is False.
+
+        Returns
+        -------
+        sobol : {tuple, None}
+            ``(sobol_first, sobol_total, sobol_second)``, where
+            ``sobol_first`` and ``sobol_total`` have shape
+            ``(nr_uncertain_parameters,) + U_hat.shape`` and ``sobol_second``
+            has shape ``(nr_uncertain_parameters, nr_uncertain_parameters) + U_hat.shape``,
+            or is None if `sobol_second` is False. Returns None if the
+            distribution is dependent, or `U_hat` is not a polynomial in the
+            indeterminants ``q0, q1, ...``.
+
+        Notes
+        -----
+        For an independent distribution the orthogonal polynomials are
+        products of univariate polynomials, ``P_k = p_k1(q_1)...p_kd(q_d)``,
+        and with the expansion ``U_hat = sum_k c_k P_k`` the variance is
+        ``sum_k c_k**2 E[P_k**2]`` over all non-constant polynomials. The first
+        order Sobol index of parameter i is the part of this sum from the
+        polynomials that only depend on parameter i, the total order index
+        from all polynomials that depend on parameter i, and the second order
+        index of parameters i and j from the polynomials that depend on only
+        i and j. The second order indices are symmetric, with zeros on the
+        diagonal.
+
+        The expansion coefficients of all time points are found as one linear
+        solve from the monomial coefficients of `U_hat`, and the indices of
+        all time points are calculated at once. Only the orthogonal
+        polynomials in the smallest downward closed set of multi-indices that
+        contains the exponents of `U_hat` are created, see ``tensor_basis``,
+        so polynomials of a high order in only a few parameters are handled
+        efficiently.
+        """
+        if self.dependent(distribution):
+            return None
+
+        nr_dimensions = len(distribution)
+
+        dimensions = self._indeterminant_dimensions(U_hat, nr_dimensions)
+        if dimensions is None:
+            return None
+
+        exponents = self._full_exponents(U_hat, dimensions, nr_dimensions)
+        basis = self.tensor_basis(self._lower_set(exponents), distribution)
+
+        rows = [basis["exponents"][tuple(exponent)] for exponent in exponents]
+
+        shape = U_hat.shape
+
+        monomial_coefficients = np.zeros((len(basis["exponents"]), int(np.prod(shape))))
+        for row, coefficient in zip(rows, U_hat.coefficients):
+            monomial_coefficients[row] = np.reshape(coefficient, -1)
+
+        coefficients = np.linalg.solve(basis["transform"], monomial_coefficients)
+
+        # Contribution of each orthogonal polynomial to the variance
+        weighted = coefficients**2*basis["norms"][:, np.newaxis]
+
+        active = (basis["multi_indices"] > 0).astype(float)
+        nr_active = active.sum(axis=1)
+
+        variance = weighted[nr_active > 0].sum(axis=0)
+        scale = (variance != 0)/(variance + (variance == 0))
+
+        only = active*(nr_active == 1)[:, np.newaxis]
+
+        sobol_first = only.T.dot(weighted)*scale
+        sobol_total = active.T.dot(weighted)*scale
+
+        sobol_first = sobol_first.reshape((nr_dimensions,) + shape)
+        sobol_total = sobol_total.reshape((nr_dimensions,) + shape)
+
+        if sobol_second:
+            pairs = active*(nr_active == 2)[:, np.newaxis]
+
+            sobol_second = np.einsum("ki,kj,ko->ijo", pairs, pairs, weighted)*scale
+            sobol_second[np.arange(nr_dimensions), np.arange(nr_dimensions)] = 0
+            sobol_second = sobol_second.reshape((nr_dimensions, nr_dimensions) + shape)
+
+        else:
+            sobol_second = None
+
+        return sobol_first, sobol_total, sobol_second
+
+
+    def evaluate_PCE(self, polynomial, samples, monomials=None):
+        """
+        Evaluate a polynomial approximation in a set of samples, as a single
+        matrix product between its coefficients and the monomials evaluated
+        in the samples.
+
+        Parameters
+        ----------
+        polynomial : chaospy.Poly
+            The polynomial approximation.
+        samples : array
+            The samples, with shape ``(nr_uncertain_parameters, nr_samples)``
+            or ``(nr_samples,)`` for a single uncertain parameter.
+        monomials : {None, dict}, optional
+            The monomials already evaluated in `samples`, with the exponents
+            as keys. The monomials evaluated by this method are added, so
+            several polynomials evaluated in the same samples share the
+            evaluations. If None, the monomials are not shared.
+            Default is None.
+
+        Returns
+        -------
+        U_mc : array
+            The polynomial evaluated in the samples, with shape
+            ``polynomial.shape + (nr_samples,)``.
+
+        Notes
+        -----
+        Polynomials with indeterminants that are not among ``q0, q1, ...``,
+        one for each uncertain parameter, are evaluated directly.
+        """
+        samples = np.asarray(samples)
+        if samples.ndim == 1:
+            samples = samples.reshape(1, -1)
 
-        if len(data.uncertain_parameters) == 1:
-            logger = get_logger(self)
-            logger.info("Only 1 uncertain parameter. Sensitivities are not calculated")
+        if monomials is None:
+            monomials = {}
 
-        U_mc = {}
-        for feature in tqdm(data,
-                            desc="Calculating statistics from PCE",
-                            total=len(data)):
-            if feature in U_hat:
-                data[feature].mean = cp.E(U_hat[feature], distribution)
-                data[feature].variance = cp.Var(U_hat[feature], distribution)
+        dimensions = self._indeterminant_dimensions(polynomial, len(samples))
+        if dimensions is None:
+            return np.asarray(polynomial(*samples))
 
-                samples = distribution.sample(nr_samples, "M")
+        exponents = self._full_exponents(polynomial, dimensions, len(samples))
 
-                if len(data.uncertain_parameters) > 1:
-                    U_mc[feature] = U_hat[feature](*samples)
+        basis = np.empty((len(exponents), samples.shape[1]))
+        for i, exponent in enumerate(exponents):
+            power = tuple(exponent)
 
-                    data[feature].sobol_first = cp.Sens_m(U_hat[feature], distribution)
-                    data[feature].sobol_total = cp.Sens_t(U_hat[feature], distribution)
-                    data = self.average_sensitivity(data, sensitivity="sobol_first")
-                    data = self.average_sensitivity(data, sensitivity="sobol_total")
+            if power not in monomials:
+                monomials[power] = np.prod(samples**exponent[:, np.newaxis], axis=0)
 
-                else:
-                    U_mc[feature] = U_hat[feature](samples)
+            basis[i] = monomials[power]
 
-                data[feature].percentile_5 = np.percentile(U_mc[feature], 5, -1)
-                data[feature].percentile_95 = np.percentile(U_mc[feature], 95, -1)
+        shape = polynomial.shape
+        coefficients = np.array([np.reshape(coefficient, -1) for coefficient in polynomial.coefficients],
+                                dtype=float)
 
-        return data
+        U_mc = coefficients.T.dot(basis)
+
+        return U_mc.reshape(shape + (samples.shape[1],))
 
 
 
@@ -1195,6 +3062,10 @@ class UncertaintyCalculations(ParameterBase):
                          quadrature_order=None,
                          nr_pc_mc_samples=10**4,
                          allow_incomplete=True,
+                         sobol_second=False,
+                         tolerance=None,
+                         loo_error=False,
+                         sampling_rule="hammersley",
                          seed=None,
                          **custom_kwargs):
         """
@@ -1203,10 +3074,12 @@ class UncertaintyCalculations(ParameterBase):
 
         Parameters
         ----------
-        method : {"collocation", "spectral", "custom"}, optional
+        method : {"collocation", "spectral", "sparse", "adaptive", "custom"}, optional
             The method to use when creating the polynomial chaos approximation.
             "collocation" is the point collocation method "spectral" is
-            pseudo-spectral projection, and "custom" is the custom polynomial
+            pseudo-spectral projection, "sparse" is point collocation with
+            sparse regression, "adaptive" is point collocation in an
+            adaptive sparse grid, and "custom" is the custom polynomial
             method.
             Default is "collocation".
         rosenblatt : {"auto", bool}, optional
@@ -1225,6 +3098,9 @@ class UncertaintyCalculations(ParameterBase):
         nr_collocation_nodes : {int, None}, optional
             The number of collocation nodes to choose, if point collocation is
             used. If None, `nr_collocation_nodes` = 2* number of expansion factors + 2.
+            For the sparse method the default is given in
+            ``create_PCE_sparse``, and for the adaptive method it is the
+            maximum number of nodes, see ``create_PCE_adaptive``.
             Default is None.
         quadrature_order : {int, None}, optional
             The order of the Leja quadrature method, if pseudo-spectral
@@ -1237,6 +3113,27 @@ class UncertaintyCalculations(ParameterBase):
             If the polynomial approximation should be performed for features or
             models with incomplete evaluations.
             Default is True.
+        sobol_second : bool, optional
+            If the second order Sobol indices should be calculated.
+            Default is False.
+        tolerance : {None, float}, optional
+            The tolerance of the error indicators of the adaptive method, see
+            ``create_PCE_adaptive``. For the collocation method, the smallest
+            polynomial order up to `polynomial_order` with a leave-one-out
+            error below `tolerance` is used, see ``select_polynomial_order``.
+            Not used by the other methods.
+            Default is None.
+        loo_error : bool, optional
+            If the leave-one-out error of the polynomial approximations should
+            be calculated, see ``leave_one_out_error``. Only used by the
+            collocation and adaptive methods.
+            Default is False.
+        sampling_rule : {"hammersley", "halton"}, optional
+            The low-discrepancy sequence the collocation nodes are drawn from,
+            if `method` is "collocation". Use "halton" if the polynomial chaos
+            expansion should be extended with more nodes later, see
+            ``extend_polynomial_chaos``.
+            Default is "hammersley".
         seed : int, optional
             Set a random seed. If None, no seed is set. Default is None.
 
@@ -1252,7 +3149,7 @@ class UncertaintyCalculations(ParameterBase):
             If a common multivariate distribution is given in
             Parameters.distribution and not all uncertain parameters are used.
         ValueError
-            If `method` not one of "collocation", "spectral" or "custom".
+            If `method` not one of "collocation", "spectral", "sparse", "adaptive" or "custom".
         NotImplementedError
             If "custom" is chosen and have not been implemented.
 
@@ -1275,6 +3172,8 @@ class UncertaintyCalculations(ParameterBase):
             13. ``data["model/features"].sobol_total``, if more than 1 parameter
             14. ``data["model/features"].sobol_first_average``, if more than 1 parameter
             15. ``data["model/features"].sobol_total_average``, if more than 1 parameter
+            16. ``data["model/features"].sobol_second``, if more than 1 parameter
+                and `sobol_second` is True
 
         The model and feature do not necessarily give results for each
         node. The collocation method is robust towards missing values as long as
@@ -1308,6 +3207,17 @@ class UncertaintyCalculations(ParameterBase):
         required. For each of the nodes we evaluate the model and calculate the
         features, and the polynomial approximation is created from these results.
 
+        The sparse method uses the same collocation nodes as point
+        collocation, but selects a small subset of the polynomials with
+        orthogonal matching pursuit and leave-one-out cross-validation, so
+        fewer nodes than polynomials can be used, see ``create_PCE_sparse``.
+
+        The adaptive method refines an anisotropic sparse grid of nested Leja
+        nodes one polynomial at the time, and only increases the polynomial
+        order of the uncertain parameters, and the interactions, where the
+        error indicators are above `tolerance`. Every node is reused when the
+        grid is refined, see ``create_PCE_adaptive``.
+
         If we have dependent uncertain parameters we must use the Rosenblatt
         transformation. We use the Rosenblatt transformation to transform from
         dependent to independent variables before we create the polynomial chaos
@@ -1347,13 +3257,19 @@ class UncertaintyCalculations(ParameterBase):
                     self.create_PCE_collocation_rosenblatt(uncertain_parameters=uncertain_parameters,
                                                            polynomial_order=polynomial_order,
                                                            nr_collocation_nodes=nr_collocation_nodes,
-                                                           allow_incomplete=allow_incomplete)
+                                                           allow_incomplete=allow_incomplete,
+                                                           loo_error=loo_error,
+                                                           sampling_rule=sampling_rule,
+                                                           tolerance=tolerance)
             else:
                 U_hat, distribution, data = \
                     self.create_PCE_collocation(uncertain_parameters=uncertain_parameters,
                                                 polynomial_order=polynomial_order,
                                                 nr_collocation_nodes=nr_collocation_nodes,
-                                                allow_incomplete=allow_incomplete)
+                                                allow_incomplete=allow_incomplete,
+                                                loo_error=loo_error,
+                                                sampling_rule=sampling_rule,
+                                                tolerance=tolerance)
 
         elif method == "spectral":
             if rosenblatt:
@@ -1369,6 +3285,23 @@ class UncertaintyCalculations(ParameterBase):
                                              quadrature_order=quadrature_order,
                                              allow_incomplete=allow_incomplete)
 
+        elif method == "sparse":
+            U_hat, distribution, data = \
+                self.create_PCE_sparse(uncertain_parameters=uncertain_parameters,
+                                       polynomial_order=polynomial_order,
+                                       nr_collocation_nodes=nr_collocation_nodes,
+                                       rosenblatt=rosenblatt,
+                                       allow_incomplete=allow_incomplete)
+
+        elif method == "adaptive":
+            U_hat, distribution, data = \
+                self.create_PCE_adaptive(uncertain_parameters=uncertain_parameters,
+                                         tolerance=tolerance,
+                                         max_evaluations=nr_collocation_nodes,
+                                         rosenblatt=rosenblatt,
+                                         allow_incomplete=allow_incomplete,
+                                         loo_error=loo_error)
+
         elif method == "custom":
             U_hat, distribution, data = \
                 self.create_PCE_custom(uncertain_parameters, **custom_kwargs)
@@ -1382,7 +3315,105 @@ class UncertaintyCalculations(ParameterBase):
         else:
             raise ValueError("No polynomial chaos method with name {}".format(method))
 
-        data = self.analyse_PCE(U_hat, distribution, data, nr_samples=nr_pc_mc_samples)
+        data = self.analyse_PCE(U_hat,
+                                distribution,
+                                data,
+                                nr_samples=nr_pc_mc_samples,
+                                sobol_second=sobol_second)
+
+        data.seed = seed
+
+        return data
+
+
+    def extend_polynomial_chaos(self,
+                                data,
+                                nr_new_nodes,
+                                polynomial_order=4,
+                                rosenblatt="auto",
+                                nr_pc_mc_samples=10**4,
+                                allow_incomplete=True,
+                                sobol_second=False,
+                                fits=None,
+                                loo_error=False,
+                                seed=None):
+        """
+        Add collocation nodes to an existing uncertainty quantification with
+        point collocation, and perform the uncertainty quantification and
+        sensitivity analysis again.
+
+        Parameters
+        ----------
+        data : Data
+            A data object from ``polynomial_chaos`` with
+            ``sampling_rule="halton"``, from a previous extension, or loaded
+            from such a file.
+        nr_new_nodes : int
+            The number of collocation nodes to add.
+        polynomial_order : int, optional
+            The polynomial order of the polynomial approximation. Must be the
+            same as the order used to create `data`.
+            Default is 4.
+        rosenblatt : {"auto", bool}, optional
+            If the Rosenblatt transformation was used to create `data`. If
+            "auto", ``data.rosenblatt`` is used.
+            Default is "auto".
+        nr_pc_mc_samples : int, optional
+            Number of samples for the Monte Carlo sampling of the polynomial
+            chaos approximation.
+        allow_incomplete : bool, optional
+            If the polynomial approximation should be performed for features or
+            models with incomplete evaluations.
+            Default is True.
+        sobol_second : bool, optional
+            If the second order Sobol indices should be calculated.
+            Default is False.
+        fits : {None, dict}, optional
+            The least squares fits of the model and each feature, updated in
+            place, see ``extend_PCE_collocation``.
+            Default is None.
+        loo_error : bool, optional
+            If the leave-one-out error of the polynomial approximations should
+            be calculated, see ``extend_PCE_collocation``.
+            Default is False.
+        seed : int, optional
+            Set a random seed. If None, no seed is set. Default is None.
+
+        Returns
+        -------
+        data : Data
+            The `data` parameter given as input, with the model and feature
+            values in the new nodes added, and the statistical metrics
+            calculated again.
+
+        Raises
+        ------
+        ValueError
+            If `data` does not contain the nodes, or the nodes are not drawn
+            from the Halton sequence.
+
+        See also
+        --------
+        uncertainpy.core.UncertaintyCalculations.extend_PCE_collocation
+        uncertainpy.core.UncertaintyCalculations.polynomial_chaos
+        """
+        if seed is not None:
+            np.random.seed(seed)
+
+        U_hat, distribution, data = \
+            self.extend_PCE_collocation(data,
+                                        nr_new_nodes=nr_new_nodes,
+                                        polynomial_order=polynomial_order,
+                                        rosenblatt=rosenblatt,
+                                        allow_incomplete=allow_incomplete,
+                                        fits=fits,
+                                        loo_error=loo_error)
+
+        data = self.analyse_PCE(U_hat,
+                                distribution,
+                                data,
+                                nr_samples=nr_pc_mc_samples,
+                                sobol_second=sobol_second)
 
         data.seed = seed
 
@@ -1393,7 +3424,13 @@ class UncertaintyCalculations(ParameterBase):
                     uncertain_parameters=None,
                     nr_samples=10**4,
                     seed=None,
-                    allow_incomplete=True):
+                    allow_incomplete=True,
+                    sobol_second=False,
+                    sobol_chunksize=None,
+                    sampling_rule="saltelli",
+                    random_shift=True,
+                    nr_bootstrap=None,
+                    confidence_level=0.95):
         """
         Perform an uncertainty quantification using the quasi-Monte Carlo method.
 
@@ -1413,6 +3450,33 @@ class UncertaintyCalculations(ParameterBase):
             If the uncertainty quantification should be performed for features
             or models with incomplete evaluations.
             Default is True.
+        sobol_second : bool, optional
+            If the second order Sobol indices should be calculated. This
+            requires ``(nr_samples/2)*(2*nr_uncertain_parameters + 2)`` model
+            evaluations instead of ``(nr_samples/2)*(nr_uncertain_parameters + 2)``.
+            Default is False.
+        sobol_chunksize : {None, int}, optional
+            The number of time points the Sobol indices are calculated for at
+            the same time, to limit the memory used for features with many
+            time points. If None, all time points are calculated at once.
+            Default is None.
+        sampling_rule : {"saltelli", "sobol", "halton", "latin_hypercube", "random"}, optional
+            The rule used to draw the base sample matrices A and B of
+            Saltelli's scheme, see ``create_sobol_samples``.
+            Default is "saltelli".
+        random_shift : bool, optional
+            If the "sobol" and "halton" sequences should be randomized with a
+            random shift, using the random seed.
+            Default is True.
+        nr_bootstrap : {None, int}, optional
+            The number of bootstrap resamples used to calculate confidence
+            intervals for the mean, variance, percentiles and Sobol indices,
+            see ``mc_confidence_intervals``. If None, no confidence intervals
+            are calculated.
+            Default is None.
+        confidence_level : float, optional
+            The confidence level of the intervals.
+            Default is 0.95.
 
         Returns
         -------
@@ -1445,84 +3509,598 @@ class UncertaintyCalculations(ParameterBase):
             13. ``data["model/features"].sobol_total``, if more than 1 parameter
             14. ``data["model/features"].sobol_first_average``, if more than 1 parameter
             15. ``data["model/features"].sobol_total_average``, if more than 1 parameter
+            16. ``data["model/features"].sobol_second``, if more than 1 parameter
+                and `sobol_second` is True
+            17. ``data["model/features"].mean_confidence_interval``, and the
+                confidence intervals of the other statistical metrics, if
+                `nr_bootstrap` is given
+
+
+        In the quasi-Monte Carlo method we quasi-randomly draw
+        ``(nr_samples/2)*(nr_uncertain_parameters + 2)`` (nr_samples=10**4 by default)
+        parameter samples using Saltelli's sampling scheme ([1]_). We require
+        this number of samples to be able to calculate the Sobol indices. We
+        evaluate the model for each of these parameter samples and calculate the
+        features from each of the model results. This step is performed in
+        parallel to speed up the calculations. Then we use nr_samples` of
+        the model and feature results to calculate the mean, variance, and 5th
+        and 95th percentile for the model and each feature. Lastly, we use all
+        calculated model and each feature results to calculate the Sobol indices
+        using Saltellie's approach. If `sobol_second` is True, the samples
+        also include the ``BA`` matrices of Saltelli's scheme, and the first,
+        second and total order Sobol indices are calculated for all time
+        points at once by ``mc_calculate_sobol_second``.
+
+        References
+        ----------
+        .. [1] Saltelli, A., P. Annoni, I. Azzini, F. Campolongo, M. Ratto, and
+            S. Tarantola (2010).  "Variance based sensitivity analysis of model
+            output.  Design and estimator for the total sensitivity index."
+            Computer Physics Communications, 181(2):259-270,
+            doi:10.1016/j.cpc.2009.09.018.
+
+        See also
+        --------
+        uncertainpy.Data
+        uncertainpy.Parameters
+        """
+
+        if seed is not None:
+            np.random.seed(seed)
+
+        uncertain_parameters = self.convert_uncertain_parameters(uncertain_parameters)
+
+        distribution = self.create_distribution(uncertain_parameters=uncertain_parameters)
+
+        # nodes = distribution.sample(nr_samples, "M")
+
+        # Create the Multivariate normal distribution
+        dist_R = []
+        for parameter in uncertain_parameters:
+            dist_R.append(cp.Uniform())
+
+        dist_R = cp.J(*dist_R)
+
+        nr_sobol_samples = int(np.round(nr_samples/2.))
+
+        calc_second_order = sobol_second and len(uncertain_parameters) > 1
+
+        nodes_R = self.create_sobol_samples(uncertain_parameters,
+                                            nr_sobol_samples,
+                                            sampling_rule=sampling_rule,
+                                            random_shift=random_shift,
+                                            calc_second_order=calc_second_order)
+
+        nodes = distribution.inv(dist_R.fwd(nodes_R.transpose()))
+
+
+        data = self.runmodel.run(nodes, uncertain_parameters)
+
+        data.method = "monte carlo method. nr_samples={}".format(nr_samples)
+
+        if sampling_rule != "saltelli":
+            data.method += ", sampling_rule={}, random_shift={}".format(sampling_rule, random_shift)
+        data.sampling_rule = sampling_rule
+        data.seed = seed
+
+        data = self.mc_statistics(data,
+                                  nr_sobol_samples,
+                                  allow_incomplete=allow_incomplete,
+                                  calc_second_order=calc_second_order,
+                                  sobol_chunksize=sobol_chunksize,
+                                  nr_bootstrap=nr_bootstrap,
+                                  confidence_level=confidence_level)
+
+        return data
+
+
+    def monte_carlo_adaptive(self,
+                             uncertain_parameters=None,
+                             tolerance=0.05,
+                             batch_size=1000,
+                             max_samples=10**5,
+                             seed=None,
+                             allow_incomplete=True,
+                             sampling_rule="saltelli",
+                             nr_bootstrap=100,
+                             confidence_level=0.95,
+                             sobol_chunksize=None):
+        """
+        Perform an uncertainty quantification using the quasi-Monte Carlo
+        method, where the model is evaluated in batches until the estimates
+        have converged.
+
+        Parameters
+        ----------
+        uncertain_parameters : {None, str, list}, optional
+            The uncertain parameter(s) to use when creating the polynomial
+            approximation. If None, all uncertain parameters are used.
+            Default is None.
+        tolerance : float, optional
+            The largest accepted width of the bootstrap confidence intervals.
+            For more than one uncertain parameter the width of the intervals of
+            the first and total order Sobol indices is used, for one uncertain
+            parameter the width of the interval of the mean divided by the
+            standard deviation.
+            Default is 0.05.
+        batch_size : int, optional
+            Number of samples added in each batch, counted the same way as
+            `nr_samples` in ``monte_carlo``.
+            Default is 1000.
+        max_samples : int, optional
+            The maximum number of samples, counted the same way as
+            `nr_samples` in ``monte_carlo``. The sampling stops when
+            `max_samples` is reached even if the estimates have not converged.
+            Default is 10**5.
+        seed : int, optional
+            Set a random seed. If None, no seed is set.
+            Default is None.
+        allow_incomplete : bool, optional
+            If the uncertainty quantification should be performed for features
+            or models with incomplete evaluations.
+            Default is True.
+        sampling_rule : {"saltelli", "sobol", "halton", "random"}, optional
+            The rule used to draw the base sample matrices A and B of
+            Saltelli's scheme, see ``create_sobol_samples``. Since
+            SALib.sample.saltelli does not give the same first samples for
+            different numbers of samples, "saltelli" uses the "sobol"
+            sequence with the first 1024 points skipped.
+            Default is "saltelli".
+        nr_bootstrap : int, optional
+            The number of bootstrap resamples used for the confidence
+            intervals.
+            Default is 100.
+        confidence_level : float, optional
+            The confidence level of the intervals.
+            Default is 0.95.
+        sobol_chunksize : {None, int}, optional
+            The number of time points the Sobol indices are calculated for at
+            the same time. If None, all time points are calculated at once.
+            Default is None.
+
+        Returns
+        -------
+        data : Data
+            A data object with all model and feature evaluations, as well as all
+            calculated statistical metrics.
+
+        Raises
+        ------
+        ValueError
+            If `sampling_rule` is "latin_hypercube", since a Latin hypercube
+            can not be extended with more samples.
+        ValueError
+            If a common multivariate distribution is given in
+            Parameters.distribution and not all uncertain parameters are used.
+
+        Notes
+        -----
+        The returned `data` contains the same as the `data` returned by
+        ``monte_carlo``, including the confidence intervals of the final
+        statistical metrics.
+
+        Each batch continues the quasi-random sequence where the previous
+        batch stopped, so the samples of all batches together are the same as
+        the samples ``create_sobol_samples`` with ``random_shift=False`` creates
+        for the total number of samples, and every earlier evaluation is
+        reused. The sequences are therefore not randomly shifted. Interpolated
+        model/features are interpolated at the time grid of the first batch,
+        see ``evaluate_new_nodes``.
+
+        After each batch, the running mean, variance and Sobol indices, and
+        their online bootstrap confidence intervals, are updated with only
+        the evaluations of the new batch, see ``OnlineStatistics``. Each
+        evaluation is therefore only used once while checking the
+        convergence, and the cost of each batch does not grow with the number
+        of earlier evaluations. Evaluations that contain numpy.nan are set to
+        the mean of their batch. The sampling stops when the widest confidence
+        interval of the model and all features is at most `tolerance`.
+        Features with irregular evaluations are not used to check the
+        convergence. When the sampling has stopped, the final statistical
+        metrics, including the percentiles and the confidence intervals, are
+        calculated once from all evaluations, as in ``monte_carlo``.
+
+        See also
+        --------
+        uncertainpy.core.UncertaintyCalculations.monte_carlo
+        uncertainpy.core.OnlineStatistics
+        uncertainpy.Data
+        """
+        logger = get_logger(self)
+
+        if sampling_rule == "latin_hypercube":
+            raise ValueError("sampling_rule latin_hypercube can not be used with the adaptive Monte Carlo method")
+
+        if seed is not None:
+            np.random.seed(seed)
+
+        uncertain_parameters = self.convert_uncertain_parameters(uncertain_parameters)
+
+        distribution = self.create_distribution(uncertain_parameters=uncertain_parameters)
+
+        dist_R = []
+        for parameter in uncertain_parameters:
+            dist_R.append(cp.Uniform())
+
+        dist_R = cp.J(*dist_R)
+
+        nr_uncertain_parameters = len(uncertain_parameters)
+        step = nr_uncertain_parameters + 2
+
+        # The Saltelli samples of SALib depend on the total number of
+        # samples, so the Sobol sequence of chaospy is continued instead
+        if sampling_rule == "saltelli":
+            sequence_rule = "sobol"
+            skip_values = 1024
+        else:
+            sequence_rule = sampling_rule
+            skip_values = 0
+
+        batch_sobol_samples = max(int(np.round(batch_size/2.)), 1)
+        max_sobol_samples = max(int(np.round(max_samples/2.)), batch_sobol_samples)
+
+        online = {}
+        data = None
+        nr_sobol_samples = 0
+        converged = False
+
+        while not converged and nr_sobol_samples < max_sobol_samples:
+            new_nr_sobol_samples = min(nr_sobol_samples + batch_sobol_samples, max_sobol_samples)
+
+            if sampling_rule == "random":
+                nodes_R = self.create_sobol_samples(uncertain_parameters,
+                                                    new_nr_sobol_samples - nr_sobol_samples,
+                                                    sampling_rule=sampling_rule)
+            else:
+                nodes_R = self.create_sobol_samples(uncertain_parameters,
+                                                    new_nr_sobol_samples,
+                                                    sampling_rule=sequence_rule,
+                                                    random_shift=False,
+                                                    skip_values=skip_values)[nr_sobol_samples*step:]
+
+            nodes = distribution.inv(dist_R.fwd(nodes_R.transpose()))
+
+            batch_data = self.evaluate_new_nodes(nodes, uncertain_parameters, data)
+            data = self.concatenate_data(data, batch_data)
+
+            nr_batch_samples = new_nr_sobol_samples - nr_sobol_samples
+            nr_sobol_samples = new_nr_sobol_samples
+
+            widths = []
+            for feature in batch_data:
+                if feature == self.model.name and self.model.ignore:
+                    continue
+
+                if feature in data.error:
+                    continue
+
+                # Only the new evaluations are used to update the estimates
+                batch_evaluations = self._mc_regular_evaluations(batch_data[feature])
+                if batch_evaluations is None:
+                    continue
+
+                if feature not in online:
+                    online[feature] = OnlineStatistics(nr_uncertain_parameters,
+                                                       nr_bootstrap=nr_bootstrap)
+
+                statistics = online[feature]
+                if statistics.mean is not None and statistics.mean.shape != batch_evaluations.shape[1:]:
+                    continue
+
+                statistics.update(*self.separate_output_values(batch_evaluations,
+                                                               nr_uncertain_parameters,
+                                                               nr_batch_samples))
+
+                confidence_intervals = statistics.confidence_intervals(confidence_level=confidence_level)
+
+                if nr_uncertain_parameters > 1:
+                    metrics = ["sobol_first", "sobol_total"]
+                    scale = 1
+                else:
+                    metrics = ["mean"]
+                    scale = np.sqrt(statistics.variance)
+
+                for metric in metrics:
+                    lower, upper = confidence_intervals[metric]
+
+                    with np.errstate(divide="ignore", invalid="ignore"):
+                        width = np.abs(upper - lower)/scale
+
+                    width = width[np.isfinite(width)]
+                    widths.append(np.max(width) if width.size else 0)
+
+            if widths:
+                converged = max(widths) <= tolerance
+
+                logger.info("Adaptive Monte Carlo: {} samples, ".format(2*nr_sobol_samples) +
+                            "largest confidence interval width {:.3g}".format(max(widths)))
+
+        if not converged:
+            logger.warning("The adaptive Monte Carlo method did not reach the tolerance " +
+                           "{} with {} samples".format(tolerance, 2*nr_sobol_samples))
+
+        data.method = "adaptive monte carlo method. nr_samples={}, tolerance={}, converged={}".format(
+            2*nr_sobol_samples, tolerance, converged)
+
+        if sampling_rule != "saltelli":
+            data.method += ", sampling_rule={}".format(sampling_rule)
+        data.sampling_rule = sampling_rule
+        data.seed = seed
+
+        data = self.mc_statistics(data,
+                                  nr_sobol_samples,
+                                  allow_incomplete=allow_incomplete,
+                                  sobol_chunksize=sobol_chunksize,
+                                  nr_bootstrap=nr_bootstrap,
+                                  confidence_level=confidence_level)
+
+        return data
+
+
+    def _mc_regular_evaluations(self, feature_data):
+        """
+        Get the evaluations of a feature as a float array, where the
+        evaluations that contain numpy.nan are set to the mean, or None if the
+        evaluations are irregular or no evaluation gives a result.
+        """
+        evaluations = feature_data.evaluations
+
+        if not isinstance(evaluations, np.ndarray) or evaluations.dtype.kind not in "biuf":
+            return None
+
+        mask = feature_data.mask
+        if not np.any(mask):
+            return None
+
+        evaluations = np.array(evaluations, dtype=float)
+        if not np.all(mask):
+            evaluations[~mask] = np.mean(evaluations[mask], axis=0)
+
+        return evaluations
+
+
+    def evaluate_new_nodes(self, nodes, uncertain_parameters, data=None):
+        """
+        Evaluate the model and features in new nodes, so the evaluations can
+        be added to the evaluations in `data`.
+
+        Parameters
+        ----------
+        nodes : array
+            The new nodes to evaluate the model and features in.
+        uncertain_parameters : list
+            A list of the names of all uncertain parameters.
+        data : {None, Data}, optional
+            A data object with the existing evaluations. If None, the model
+            and features are evaluated as by ``RunModel.run``.
+            Default is None.
+
+        Returns
+        -------
+        new_data : Data
+            A data object with the evaluations in the new nodes.
+
+        Notes
+        -----
+        The interpolated model/features of the new nodes are interpolated at
+        the time grid already used in `data`, instead of at the longest time
+        array of the new evaluations, so the new evaluations have the same
+        shape as the existing evaluations and can be concatenated. Time grids
+        given by ``RunModel.interpolation_time`` are used as is.
+        """
+        if data is None:
+            return self.runmodel.run(nodes, uncertain_parameters)
+
+        interpolation_time = self.runmodel.interpolation_time
+
+        self.runmodel.interpolation_time = self.data_interpolation_time(data, interpolation_time)
+        try:
+            new_data = self.runmodel.run(nodes, uncertain_parameters)
+        finally:
+            self.runmodel.interpolation_time = interpolation_time
+
+        return new_data
+
+
+    def data_interpolation_time(self, data, interpolation_time=None):
+        """
+        Get the time grids the interpolated model/features in `data` are
+        interpolated at.
+
+        Parameters
+        ----------
+        data : Data
+            A data object with model and feature evaluations.
+        interpolation_time : {None, array_like, dict}, optional
+            The time grids given by the user, see
+            ``RunModel.interpolation_time``. These are used instead of the
+            time grids in `data`.
+            Default is None.
+
+        Returns
+        -------
+        interpolation_time : {None, array_like, dict}
+            A dictionary with the time grid of each interpolated
+            model/feature, `interpolation_time` if it is an array, or None if
+            no model/feature is interpolated.
+        """
+        if interpolation_time is not None and not isinstance(interpolation_time, dict):
+            return interpolation_time
+
+        times = {}
+        for feature in data:
+            if not self._interpolated(feature):
+                continue
+
+            time = data[feature].time
+            if isinstance(time, np.ndarray) and time.ndim == 1 \
+                    and time.dtype.kind in "biuf" and not np.any(np.isnan(time)):
+                times[feature] = time
+
+        if interpolation_time is not None:
+            times.update(interpolation_time)
+
+        if not times:
+            return None
+
+        return times
+
 
+    def _interpolated(self, feature):
+        """
+        Check if the results of a model/feature are interpolated.
+        """
+        if feature == self.model.name:
+            return self.model.interpolate and not self.model.ignore
 
-        In the quasi-Monte Carlo method we quasi-randomly draw
-        ``(nr_samples/2)*(nr_uncertain_parameters + 2)`` (nr_samples=10**4 by default)
-        parameter samples using Saltelli's sampling scheme ([1]_). We require
-        this number of samples to be able to calculate the Sobol indices. We
-        evaluate the model for each of these parameter samples and calculate the
-        features from each of the model results. This step is performed in
-        parallel to speed up the calculations. Then we use nr_samples` of
-        the model and feature results to calculate the mean, variance, and 5th
-        and 95th percentile for the model and each feature. Lastly, we use all
-        calculated model and each feature results to calculate the Sobol indices
-        using Saltellie's approach.
+        return feature in self.features.interpolate
 
-        References
+
+    def concatenate_data(self, data, new_data):
+        """
+        Add the model and feature evaluations of `new_data` to `data`.
+
+        Parameters
         ----------
-        .. [1] Saltelli, A., P. Annoni, I. Azzini, F. Campolongo, M. Ratto, and
-            S. Tarantola (2010).  "Variance based sensitivity analysis of model
-            output.  Design and estimator for the total sensitivity index."
-            Computer Physics Communications, 181(2):259-270,
-            doi:10.1016/j.cpc.2009.09.018.
+        data : {None, Data}
+            A data object with model and feature evaluations. If None,
+            `new_data` is returned.
+        new_data : Data
+            A data object with model and feature evaluations for new nodes.
 
-        See also
-        --------
-        uncertainpy.Data
-        uncertainpy.Parameters
+        Returns
+        -------
+        data : Data
+            The `data` parameter given as input, with the evaluations of
+            `new_data` added after the existing evaluations. The nodes are
+            concatenated in the same way, if both contain nodes.
+
+        Notes
+        -----
+        Evaluations with the same shape are concatenated into one array. If
+        the shapes differ, or an interpolated model/feature is interpolated at
+        different time grids, the evaluations are stored in a list and the
+        feature is added to ``data.error``. Use ``evaluate_new_nodes`` to
+        evaluate the new nodes at the time grids of `data`.
         """
+        logger = get_logger(self)
 
-        if seed is not None:
-            np.random.seed(seed)
+        if data is None:
+            return new_data
 
-        uncertain_parameters = self.convert_uncertain_parameters(uncertain_parameters)
+        for feature in new_data:
+            if feature not in data:
+                data[feature] = new_data[feature]
+                continue
 
-        distribution = self.create_distribution(uncertain_parameters=uncertain_parameters)
+            evaluations = data[feature].evaluations
+            new_evaluations = new_data[feature].evaluations
 
-        # nodes = distribution.sample(nr_samples, "M")
+            same_time = True
+            if self._interpolated(feature):
+                time = data[feature].time
+                new_time = new_data[feature].time
 
-        problem = {
-            "num_vars": len(uncertain_parameters),
-            "names": uncertain_parameters,
-            "bounds": [[0,1]]*len(uncertain_parameters)
-        }
+                if isinstance(time, np.ndarray) and isinstance(new_time, np.ndarray):
+                    same_time = time.shape == new_time.shape and \
+                        np.allclose(time, new_time, equal_nan=True)
 
-        # Create the Multivariate normal distribution
-        dist_R = []
-        for parameter in uncertain_parameters:
-            dist_R.append(cp.Uniform())
+            if isinstance(evaluations, np.ndarray) and isinstance(new_evaluations, np.ndarray) \
+                    and evaluations.shape[1:] == new_evaluations.shape[1:] and same_time:
+                data[feature].evaluations = np.concatenate([evaluations, new_evaluations])
 
-        dist_R = cp.J(*dist_R)
+            else:
+                if isinstance(evaluations, np.ndarray) and isinstance(new_evaluations, np.ndarray) \
+                        and feature not in data.error:
+                    data.error.append(feature)
 
-        nr_sobol_samples = int(np.round(nr_samples/2.))
+                    if same_time:
+                        logger.error("{}: The number of points varies between batches.".format(feature))
+                    else:
+                        logger.error("{}: The time grid varies between batches.".format(feature))
 
-        nodes_R = saltelli.sample(problem, nr_sobol_samples, calc_second_order=False)
+                data[feature].evaluations = list(evaluations) + list(new_evaluations)
 
-        nodes = distribution.inv(dist_R.fwd(nodes_R.transpose()))
+            if isinstance(data[feature].time, list) and isinstance(new_data[feature].time, list):
+                data[feature].time = data[feature].time + new_data[feature].time
 
+        for feature in new_data.error:
+            if feature not in data.error:
+                data.error.append(feature)
 
-        data = self.runmodel.run(nodes, uncertain_parameters)
+        if data.nodes is not None and new_data.nodes is not None:
+            data.nodes = np.concatenate([data.nodes, new_data.nodes], axis=-1)
 
-        data.method = "monte carlo method. nr_samples={}".format(nr_samples)
-        data.seed = seed
+        return data
+
+
+    def mc_statistics(self,
+                      data,
+                      nr_samples,
+                      allow_incomplete=True,
+                      calc_second_order=False,
+                      sobol_chunksize=None,
+                      nr_bootstrap=None,
+                      confidence_level=0.95):
+        """
+        Calculate the statistical metrics from model and feature evaluations
+        for the samples created by Saltelli's scheme.
+
+        Parameters
+        ----------
+        data : Data
+            A data object with the model and feature evaluations, in the order
+            of the samples created by ``create_sobol_samples``.
+        nr_samples : int
+            The number of rows in each of the base sample matrices A and B.
+        allow_incomplete : bool, optional
+            If the uncertainty quantification should be performed for features
+            or models with incomplete evaluations.
+            Default is True.
+        calc_second_order : bool, optional
+            If the samples contain the BA sample matrices, and the second order
+            Sobol indices should be calculated.
+            Default is False.
+        sobol_chunksize : {None, int}, optional
+            The number of time points the Sobol indices are calculated for at
+            the same time. If None, all time points are calculated at once.
+            Default is None.
+        nr_bootstrap : {None, int}, optional
+            The number of bootstrap resamples used to calculate confidence
+            intervals for the statistical metrics, see
+            ``mc_confidence_intervals``. If None, no confidence intervals are
+            calculated.
+            Default is None.
+        confidence_level : float, optional
+            The confidence level of the intervals.
+            Default is 0.95.
 
+        Returns
+        -------
+        data : Data
+            The `data` parameter given as input with the mean, variance,
+            percentiles and, if there are more than one uncertain parameter,
+            the Sobol indices added, as well as their confidence intervals if
+            `nr_bootstrap` is given.
+        """
         logger = get_logger(self)
+
+        nr_uncertain_parameters = len(data.uncertain_parameters)
+
         for feature in data:
             if feature == self.model.name and self.model.ignore:
                 continue
 
             # Only use A to calculate the mean and variance
-            A, B, AB = self.separate_output_values(data[feature].evaluations,
-                                                   len(uncertain_parameters),
-                                                   nr_sobol_samples)
+            A, B = self.separate_output_values(data[feature].evaluations,
+                                               nr_uncertain_parameters,
+                                               nr_samples,
+                                               calc_second_order=calc_second_order)[:2]
 
             independent_evaluations = np.concatenate([A, B])
 
             masked_evaluations, mask = self.create_mask(independent_evaluations)
 
-            logger = get_logger(self)
-
             if (np.all(mask) or allow_incomplete) and sum(mask) > 0:
                 data[feature].mean = np.mean(masked_evaluations, 0)
                 data[feature].variance = np.var(masked_evaluations, 0)
@@ -1534,14 +4112,16 @@ class UncertaintyCalculations(ParameterBase):
                     # Results cannot be removed when calculating the sensitivity.
                     # Instead NaN results are set to the mean.
                     # see https://github.com/SALib/SALib/issues/134
-                    _, mask = self.create_mask(data[feature].evaluations)
+                    mask = data[feature].mask
                     masked_mean_evaluations = data[feature].evaluations
 
-                    # masked_mean_evaluations[~mask] = data[feature].mean
-                    indices = np.where(mask == 0)[0]
+                    if isinstance(masked_mean_evaluations, np.ndarray):
+                        masked_mean_evaluations[~mask] = data[feature].mean
+                    else:
+                        indices = np.where(mask == 0)[0]
 
-                    for i in indices:
-                        masked_mean_evaluations[i] = data[feature].mean
+                        for i in indices:
+                            masked_mean_evaluations[i] = data[feature].mean
 
                     if not np.all(mask):
                         logger.warning("{}: only yields ".format(feature) +
@@ -1551,9 +4131,21 @@ class UncertaintyCalculations(ParameterBase):
                                        "This might affect the Sobol indices.")
 
 
-                    sobol_first, sobol_total = self.mc_calculate_sobol(masked_mean_evaluations,
-                                                                       len(uncertain_parameters),
-                                                                       nr_sobol_samples)
+                    if calc_second_order:
+                        sobol_first, sobol_total, sobol_second = \
+                            self.mc_calculate_sobol_second(masked_mean_evaluations,
+                                                           nr_uncertain_parameters,
+                                                           nr_samples,
+                                                           chunksize=sobol_chunksize)
+
+                        data[feature].sobol_second = sobol_second
+
+                    else:
+                        sobol_first, sobol_total = self.mc_calculate_sobol(masked_mean_evaluations,
+                                                                           nr_uncertain_parameters,
+                                                                           nr_samples,
+                                                                           chunksize=sobol_chunksize)
+
                     data[feature].sobol_first = sobol_first
                     data[feature].sobol_total = sobol_total
                     data = self.average_sensitivity(data, sensitivity="sobol_first")
@@ -1569,11 +4161,139 @@ class UncertaintyCalculations(ParameterBase):
             if not np.all(mask):
                 data.incomplete.append(feature)
 
+        if nr_bootstrap:
+            data = self.mc_confidence_intervals(data,
+                                                nr_samples,
+                                                nr_bootstrap=nr_bootstrap,
+                                                confidence_level=confidence_level,
+                                                calc_second_order=calc_second_order,
+                                                sobol_chunksize=sobol_chunksize)
 
         return data
 
 
-    def separate_output_values(self, evaluations, nr_uncertain_parameters, nr_samples):
+    def create_sobol_samples(self,
+                             uncertain_parameters,
+                             nr_samples,
+                             sampling_rule="saltelli",
+                             random_shift=True,
+                             calc_second_order=False,
+                             skip_values=0):
+        """
+        Create the samples in the unit hypercube used to calculate the Sobol
+        indices with Saltelli's scheme.
+
+        Parameters
+        ----------
+        uncertain_parameters : list
+            The uncertain parameters.
+        nr_samples : int
+            The number of rows in each of the base sample matrices A and B.
+        sampling_rule : {"saltelli", "sobol", "halton", "latin_hypercube", "random"}, optional
+            The rule used to draw the base sample matrices. "saltelli" uses
+            SALib.sample.saltelli. "sobol" and "halton" use the low-discrepancy
+            sequences, "latin_hypercube" uses Latin hypercube sampling and
+            "random" uses pseudo-random sampling, all from chaospy.
+            Default is "saltelli".
+        random_shift : bool, optional
+            If the "sobol" and "halton" sequences should be randomized with a
+            random shift modulo 1 (Cranley-Patterson rotation), so independent
+            runs with different seeds give independent estimates.
+            Default is True.
+        calc_second_order : bool, optional
+            If the BA sample matrices for the second order Sobol indices
+            should be included.
+            Default is False.
+        skip_values : int, optional
+            The number of points at the start of the "sobol" and "halton"
+            sequences that are skipped. The first points of the Sobol sequence
+            are the same in several dimensions, which gives A = B for the
+            first samples.
+            Default is 0.
+
+        Returns
+        -------
+        samples : array
+            The samples, with shape
+            ``(nr_samples*(nr_uncertain_parameters + 2), nr_uncertain_parameters)``,
+            or ``(nr_samples*(2*nr_uncertain_parameters + 2), nr_uncertain_parameters)``
+            if `calc_second_order` is True, in the same order as
+            SALib.sample.saltelli.
+
+        Raises
+        ------
+        ValueError
+            If `sampling_rule` is not one of the supported rules.
+
+        Notes
+        -----
+        The base matrices A and B are the first and last
+        ``nr_uncertain_parameters`` columns of ``2*nr_uncertain_parameters``
+        dimensional samples, and the AB (BA) matrices are A (B) with column i
+        taken from B (A).
+        """
+        rules = {"sobol": "S",
+                 "halton": "H",
+                 "latin_hypercube": "L",
+                 "random": "R"}
+
+        nr_uncertain_parameters = len(uncertain_parameters)
+
+        if sampling_rule == "saltelli":
+            problem = {
+                "num_vars": nr_uncertain_parameters,
+                "names": uncertain_parameters,
+                "bounds": [[0,1]]*nr_uncertain_parameters
+            }
+
+            return self.basis_cache.saltelli_sample(problem,
+                                                    nr_samples,
+                                                    calc_second_order=calc_second_order)
+
+        if sampling_rule not in rules:
+            raise ValueError("sampling_rule must be one of: saltelli, {}, not {}".format(
+                ", ".join(sorted(rules)), sampling_rule))
+
+        base_distribution = cp.J(*[cp.Uniform() for i in range(2*nr_uncertain_parameters)])
+        if sampling_rule in ["sobol", "halton"]:
+            base = np.asarray(base_distribution.sample(nr_samples + skip_values, rules[sampling_rule]))
+            base = base.reshape(2*nr_uncertain_parameters, nr_samples + skip_values)[:, skip_values:].T
+        else:
+            base = np.asarray(base_distribution.sample(nr_samples, rules[sampling_rule]))
+            base = base.reshape(2*nr_uncertain_parameters, nr_samples).T
+
+        if random_shift and sampling_rule in ["sobol", "halton"]:
+            shift = np.random.uniform(size=2*nr_uncertain_parameters)
+            base = np.mod(base + shift, 1)
+
+        A = base[:, :nr_uncertain_parameters]
+        B = base[:, nr_uncertain_parameters:]
+
+        if calc_second_order:
+            step = 2*nr_uncertain_parameters + 2
+        else:
+            step = nr_uncertain_parameters + 2
+
+        diagonal = np.arange(nr_uncertain_parameters)
+
+        blocks = np.empty((nr_samples, step, nr_uncertain_parameters))
+        blocks[:, 0] = A
+        blocks[:, step - 1] = B
+
+        AB = np.repeat(A[:, np.newaxis], nr_uncertain_parameters, axis=1)
+        AB[:, diagonal, diagonal] = B
+        blocks[:, 1:nr_uncertain_parameters + 1] = AB
+
+        if calc_second_order:
+            BA = np.repeat(B[:, np.newaxis], nr_uncertain_parameters, axis=1)
+            BA[:, diagonal, diagonal] = A
+            blocks[:, nr_uncertain_parameters + 1:2*nr_uncertain_parameters + 1] = BA
+
+        return blocks.reshape(nr_samples*step, nr_uncertain_parameters)
+
+
+    def separate_output_values(self, evaluations, nr_uncertain_parameters, nr_samples,
+                               calc_second_order=False):
         """
         Notes
         -----
@@ -1589,6 +4309,10 @@ class UncertaintyCalculations(ParameterBase):
             Number of uncertain parameters.
         nr_samples : int
             Number of samples used in the Monte Carlo sampling.
+        calc_second_order : bool, optional
+            If the samples were created for calculating the second order
+            Sobol indices, and contain the BA sample matrices.
+            Default is False.
 
         Returns
         ----------
@@ -1598,6 +4322,9 @@ class UncertaintyCalculations(ParameterBase):
             The B sample matrix from saltellie et. al. 2010.
         AB : array_like
             The AB sample matrix from saltellie et. al. 2010.
+        BA : array_like
+            The BA sample matrix from saltellie et. al. 2010. Only returned
+            if `calc_second_order` is True.
 
         Notes
         -----
@@ -1606,22 +4333,30 @@ class UncertaintyCalculations(ParameterBase):
         https://github.com/SALib/SALib/blob/master/SALib/analyze/sobol.py
         """
 
-        evaluations = np.array(evaluations)
+        evaluations = np.asarray(evaluations)
 
-        shape = (nr_samples, nr_uncertain_parameters) + evaluations[0].shape
-        step = nr_uncertain_parameters + 2
-        AB = np.zeros(shape)
+        if calc_second_order:
+            step = 2*nr_uncertain_parameters + 2
+        else:
+            step = nr_uncertain_parameters + 2
 
-        A = evaluations[0:evaluations.shape[0]:step]
-        B = evaluations[(step - 1):evaluations.shape[0]:step]
+        # Each block of `step` evaluations is one row of the Saltelli
+        # samples, so all matrices are views into the evaluations
+        blocks = evaluations[:nr_samples*step].reshape((nr_samples, step) + evaluations.shape[1:])
 
-        for i in range(nr_uncertain_parameters):
-            AB[:, i] = evaluations[(i + 1):evaluations.shape[0]:step]
+        A = blocks[:, 0]
+        B = blocks[:, step - 1]
+        AB = blocks[:, 1:nr_uncertain_parameters + 1]
 
-        return A, B, AB
+        if not calc_second_order:
+            return A, B, AB
 
+        BA = blocks[:, nr_uncertain_parameters + 1:2*nr_uncertain_parameters + 1]
 
-    def mc_calculate_sobol(self, evaluations, nr_uncertain_parameters, nr_samples):
+        return A, B, AB, BA
+
+
+    def mc_calculate_sobol(self, evaluations, nr_uncertain_parameters, nr_samples, chunksize=None):
         """
         Calculate the Sobol indices.
 
@@ -1634,24 +4369,461 @@ class UncertaintyCalculations(ParameterBase):
             Number of uncertain parameters.
         nr_samples : int
             Number of samples used in the Monte Carlo sampling.
+        chunksize : {None, int}, optional
+            The number of time points the Sobol indices are calculated for at
+            the same time, to limit the memory used by the intermediate
+            arrays. If None, all time points are calculated at once.
+            Default is None.
 
         Returns
         ----------
-        sobol_first : list
+        sobol_first : array
             The first order Sobol indices for each uncertain parameter.
-        sobol_total : list
+        sobol_total : array
             The total order Sobol indices for each uncertain parameter.
+
+        Notes
+        -----
+        Uses the same estimators as SALib/analyze/sobol.py, but calculates
+        the indices of all parameters and time points in one broadcasted
+        pass, see ``mc_sobol``.
         """
-        sobol_first = [0]*nr_uncertain_parameters
-        sobol_total = [0]*nr_uncertain_parameters
+        sobol_first, sobol_total, _ = self.mc_sobol(evaluations,
+                                                    nr_uncertain_parameters,
+                                                    nr_samples,
+                                                    calc_second_order=False,
+                                                    chunksize=chunksize)
 
-        A, B, AB = self.separate_output_values(evaluations, nr_uncertain_parameters, nr_samples)
+        return sobol_first, sobol_total
 
-        for i in range(nr_uncertain_parameters):
-            sobol_first[i] = first_order(A, AB[:, i], B)
-            sobol_total[i] = total_order(A, AB[:, i], B)
 
-        return sobol_first, sobol_total
+    def mc_calculate_sobol_second(self, evaluations, nr_uncertain_parameters, nr_samples, chunksize=None):
+        """
+        Calculate the first, second and total order Sobol indices.
+
+        Parameters
+        ----------
+        evaluations : array_like
+            The model evaluations, evaluated for the samples created by
+            SALIB.sample.saltelli with ``calc_second_order=True``.
+        nr_uncertain_parameters : int
+            Number of uncertain parameters.
+        nr_samples : int
+            Number of samples used in the Monte Carlo sampling.
+        chunksize : {None, int}, optional
+            The number of time points the Sobol indices are calculated for at
+            the same time, to limit the memory used by the intermediate
+            arrays. If None, all time points are calculated at once.
+            Default is None.
+
+        Returns
+        ----------
+        sobol_first : array
+            The first order Sobol indices for each uncertain parameter.
+        sobol_total : array
+            The total order Sobol indices for each uncertain parameter.
+        sobol_second : array
+            The second order Sobol indices for each pair of uncertain
+            parameters, with shape
+            ``(nr_uncertain_parameters, nr_uncertain_parameters, ...)``.
+            Symmetric, with zeros on the diagonal.
+
+        Notes
+        -----
+        Uses the same estimators as SALib/analyze/sobol.py, see ``mc_sobol``.
+        The second order index of parameters j and k is
+        ``mean(BA_j*AB_k - A*B)/var - S_j - S_k``, and the indices with
+        ``j < k`` are used for both ``(j, k)`` and ``(k, j)``.
+        """
+        return self.mc_sobol(evaluations,
+                             nr_uncertain_parameters,
+                             nr_samples,
+                             calc_second_order=True,
+                             chunksize=chunksize)
+
+
+    def mc_sobol(self, evaluations, nr_uncertain_parameters, nr_samples,
+                 calc_second_order=False, chunksize=None):
+        """
+        Calculate the Sobol indices for all uncertain parameters and time
+        points at once.
+
+        Parameters
+        ----------
+        evaluations : array_like
+            The model evaluations, evaluated for the samples created by
+            SALIB.sample.saltelli.
+        nr_uncertain_parameters : int
+            Number of uncertain parameters.
+        nr_samples : int
+            Number of samples used in the Monte Carlo sampling.
+        calc_second_order : bool, optional
+            If the second order Sobol indices should be calculated. Requires
+            samples created with ``calc_second_order=True``.
+            Default is False.
+        chunksize : {None, int}, optional
+            The number of time points the Sobol indices are calculated for at
+            the same time. If None, all time points are calculated at once.
+            Default is None.
+
+        Returns
+        ----------
+        sobol_first : array
+            The first order Sobol indices, with shape
+            ``(nr_uncertain_parameters, ...)``.
+        sobol_total : array
+            The total order Sobol indices, with shape
+            ``(nr_uncertain_parameters, ...)``.
+        sobol_second : {array, None}
+            The second order Sobol indices, with shape
+            ``(nr_uncertain_parameters, nr_uncertain_parameters, ...)``, or
+            None if `calc_second_order` is False.
+
+        Notes
+        -----
+        The evaluations are viewed as an array with shape
+        ``(nr_evaluations, nr_time_points)``, without copying, and the
+        indices are calculated for `chunksize` time points at the time.
+        The intermediate arrays therefore have at most
+        ``nr_samples*nr_uncertain_parameters*chunksize`` elements.
+        """
+        evaluations = np.asarray(evaluations, dtype=float)
+
+        shape = evaluations.shape[1:]
+        evaluations = evaluations.reshape(len(evaluations), -1)
+        nr_time_points = evaluations.shape[1]
+
+        if chunksize is None:
+            chunksize = max(nr_time_points, 1)
+
+        sobol_first = np.empty((nr_uncertain_parameters, nr_time_points))
+        sobol_total = np.empty((nr_uncertain_parameters, nr_time_points))
+
+        if calc_second_order:
+            sobol_second = np.empty((nr_uncertain_parameters, nr_uncertain_parameters, nr_time_points))
+        else:
+            sobol_second = None
+
+        for start in range(0, nr_time_points, chunksize):
+            chunk = slice(start, start + chunksize)
+
+            matrices = self.separate_output_values(evaluations[:, chunk],
+                                                   nr_uncertain_parameters,
+                                                   nr_samples,
+                                                   calc_second_order=calc_second_order)
+            A, B, AB = matrices[:3]
+
+            variance = np.var(np.concatenate([A, B]), axis=0)
+
+            A = A[:, np.newaxis]
+            B = B[:, np.newaxis]
+
+            first = np.mean(B*(AB - A), axis=0)/variance
+            sobol_first[:, chunk] = first
+            sobol_total[:, chunk] = 0.5*np.mean((A - AB)**2, axis=0)/variance
+
+            if calc_second_order:
+                BA = matrices[3]
+
+                # V_jk = mean(BA_j*AB_k) - mean(A*B), for all pairs j, k at once
+                V = np.einsum("njt,nkt->jkt", BA, AB)/len(BA) - np.mean(A*B, axis=0)
+
+                sobol_second[:, :, chunk] = V/variance - first[:, np.newaxis] - first[np.newaxis, :]
+
+        if calc_second_order:
+            upper = np.triu_indices(nr_uncertain_parameters, 1)
+            sobol_second[upper[1], upper[0]] = sobol_second[upper]
+            sobol_second[np.arange(nr_uncertain_parameters), np.arange(nr_uncertain_parameters)] = 0
+
+            sobol_second = sobol_second.reshape((nr_uncertain_parameters, nr_uncertain_parameters) + shape)
+
+        sobol_first = sobol_first.reshape((nr_uncertain_parameters,) + shape)
+        sobol_total = sobol_total.reshape((nr_uncertain_parameters,) + shape)
+
+        return sobol_first, sobol_total, sobol_second
+
+
+    def mc_bootstrap(self, evaluations, nr_uncertain_parameters, nr_samples,
+                     nr_bootstrap=100, confidence_level=0.95, indices=None,
+                     percentiles=False, calc_second_order=False, chunksize=None):
+        """
+        Calculate bootstrap confidence intervals for the mean, variance and
+        Sobol indices from the Monte Carlo evaluations.
+
+        Parameters
+        ----------
+        evaluations : array_like
+            The model evaluations, evaluated for the samples created by
+            ``create_sobol_samples``. Must not contain numpy.nan.
+        nr_uncertain_parameters : int
+            Number of uncertain parameters.
+        nr_samples : int
+            The number of rows in each of the base sample matrices A and B.
+        nr_bootstrap : int, optional
+            The number of bootstrap resamples. Not used if `indices` is given.
+            Default is 100.
+        confidence_level : float, optional
+            The confidence level of the intervals.
+            Default is 0.95.
+        indices : {None, array}, optional
+            The rows of the base sample matrices in each resample, with shape
+            ``(nr_bootstrap, nr_samples)``. If None, the rows are drawn with
+            ``numpy.random``. Giving the same indices for several features
+            resamples them together.
+            Default is None.
+        percentiles : bool, optional
+            If the confidence intervals of the 5th and 95th percentiles are
+            calculated.
+            Default is False.
+        calc_second_order : bool, optional
+            If the samples contain the BA sample matrices, and the confidence
+            intervals of the second order Sobol indices should be calculated.
+            Default is False.
+        chunksize : {None, int}, optional
+            The number of time points the Sobol indices are resampled for at
+            the same time, see ``mc_sobol``. If None, all time points are
+            resampled at once.
+            Default is None.
+
+        Returns
+        -------
+        confidence_intervals : dict
+            The lower and upper limit of the confidence interval of
+            "mean", "variance", if `percentiles` is True "percentile_5" and
+            "percentile_95", if there are more than one uncertain parameter
+            "sobol_first" and "sobol_total", and if `calc_second_order` is
+            also True "sobol_second". Each limit has the same shape as the
+            corresponding statistical metric.
+
+        Notes
+        -----
+        The rows of the base sample matrices are resampled with replacement,
+        keeping each row of A together with the corresponding rows of B and
+        AB. Each resample is an array of row indices. The mean, variance and
+        Sobol indices are averages over the rows, so the index arrays are
+        converted to a matrix of the number of times each row is drawn, and
+        the estimates for all resamples are calculated at once as products
+        between this matrix and the evaluations, without creating the
+        resampled evaluations. The Sobol indices are resampled for
+        `chunksize` time points at the time, so the intermediate arrays have
+        at most ``nr_samples*nr_uncertain_parameters*chunksize`` elements,
+        and ``nr_bootstrap*nr_uncertain_parameters**2*chunksize`` for the
+        second order indices. The percentiles are found by indexing the
+        stacked evaluations of A and B with the index arrays, a limited
+        number of resamples at the time. The intervals are the percentile
+        intervals of the bootstrap estimates.
+        """
+        matrices = self.separate_output_values(np.asarray(evaluations, dtype=float),
+                                               nr_uncertain_parameters,
+                                               nr_samples,
+                                               calc_second_order=calc_second_order)
+        A, B, AB = matrices[:3]
+
+        shape = A.shape[1:]
+
+        A = A.reshape(nr_samples, -1)
+        B = B.reshape(nr_samples, -1)
+        AB = AB.reshape(nr_samples, nr_uncertain_parameters, -1)
+        nr_time_points = A.shape[1]
+
+        if indices is None:
+            indices = np.random.randint(0, nr_samples, size=(nr_bootstrap, nr_samples))
+
+        nr_bootstrap = len(indices)
+
+        # Row r contains the fraction of resample r that is each sample
+        offsets = nr_samples*np.arange(nr_bootstrap)[:, np.newaxis]
+        weights = np.bincount((indices + offsets).ravel(),
+                              minlength=nr_bootstrap*nr_samples)
+        weights = weights.reshape(nr_bootstrap, nr_samples)/nr_samples
+
+        mean = 0.5*(weights.dot(A) + weights.dot(B))
+        variance = 0.5*(weights.dot(A**2) + weights.dot(B**2)) - mean**2
+
+        estimates = {"mean": (mean, shape),
+                     "variance": (variance, shape)}
+
+        if percentiles:
+            stacked = np.concatenate([A, B])
+            stacked_indices = np.concatenate([indices, indices + nr_samples], axis=1)
+
+            # Limit the size of the resampled evaluations
+            nr_resamples = max(1, 10**7//stacked.size)
+
+            values = []
+            for start in range(0, nr_bootstrap, nr_resamples):
+                resampled = stacked[stacked_indices[start:start + nr_resamples]]
+                values.append(np.percentile(resampled, [5, 95], axis=1))
+
+            values = np.concatenate(values, axis=1)
+
+            estimates["percentile_5"] = (values[0], shape)
+            estimates["percentile_95"] = (values[1], shape)
+
+        if nr_uncertain_parameters > 1:
+            if chunksize is None:
+                chunksize = max(nr_time_points, 1)
+
+            first = np.empty((nr_bootstrap, nr_uncertain_parameters, nr_time_points))
+            total = np.empty((nr_bootstrap, nr_uncertain_parameters, nr_time_points))
+
+            if calc_second_order:
+                BA = matrices[3].reshape(nr_samples, nr_uncertain_parameters, -1)
+                second = np.empty((nr_bootstrap, nr_uncertain_parameters,
+                                   nr_uncertain_parameters, nr_time_points))
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                for start in range(0, nr_time_points, chunksize):
+                    chunk = slice(start, start + chunksize)
+
+                    A_chunk = A[:, np.newaxis, chunk]
+                    AB_chunk = AB[:, :, chunk]
+                    variance_chunk = variance[:, np.newaxis, chunk]
+
+                    first[:, :, chunk] = np.einsum("rn,ndt->rdt",
+                                                   weights,
+                                                   B[:, np.newaxis, chunk]*(AB_chunk - A_chunk))/variance_chunk
+                    total[:, :, chunk] = 0.5*np.einsum("rn,ndt->rdt",
+                                                       weights,
+                                                       (A_chunk - AB_chunk)**2)/variance_chunk
+
+                    if calc_second_order:
+                        # V_jk = mean(BA_j*AB_k) - mean(A*B) of each resample
+                        V = np.einsum("rn,njt,nkt->rjkt", weights, BA[:, :, chunk], AB_chunk) \
+                            - weights.dot(A[:, chunk]*B[:, chunk])[:, np.newaxis, np.newaxis]
+
+                        second[..., chunk] = V/variance_chunk[:, np.newaxis] \
+                            - first[:, :, np.newaxis, chunk] - first[:, np.newaxis, :, chunk]
+
+            estimates["sobol_first"] = (first, (nr_uncertain_parameters,) + shape)
+            estimates["sobol_total"] = (total, (nr_uncertain_parameters,) + shape)
+
+            if calc_second_order:
+                # As in mc_sobol, the indices with j < k are used for both pairs
+                upper = np.triu_indices(nr_uncertain_parameters, 1)
+                second[:, upper[1], upper[0]] = second[:, upper[0], upper[1]]
+                second[:, np.arange(nr_uncertain_parameters), np.arange(nr_uncertain_parameters)] = 0
+
+                estimates["sobol_second"] = (second,
+                                             (nr_uncertain_parameters, nr_uncertain_parameters) + shape)
+
+        alpha = 100*(1 - confidence_level)/2.
+
+        confidence_intervals = {}
+        for metric in estimates:
+            values, metric_shape = estimates[metric]
+
+            lower, upper = np.percentile(values, [alpha, 100 - alpha], axis=0)
+            confidence_intervals[metric] = (lower.reshape(metric_shape),
+                                            upper.reshape(metric_shape))
+
+        return confidence_intervals
+
+
+    def mc_confidence_intervals(self,
+                                data,
+                                nr_samples,
+                                nr_bootstrap=100,
+                                confidence_level=0.95,
+                                calc_second_order=False,
+                                sobol_chunksize=None):
+        """
+        Calculate bootstrap confidence intervals for the statistical metrics
+        of the model and each feature, and add them to `data`.
+
+        Parameters
+        ----------
+        data : Data
+            A data object with the model and feature evaluations, in the order
+            of the samples created by ``create_sobol_samples``, and the
+            statistical metrics calculated by ``mc_statistics``.
+        nr_samples : int
+            The number of rows in each of the base sample matrices A and B.
+        nr_bootstrap : int, optional
+            The number of bootstrap resamples.
+            Default is 100.
+        confidence_level : float, optional
+            The confidence level of the intervals.
+            Default is 0.95.
+        calc_second_order : bool, optional
+            If the samples contain the BA sample matrices, and the confidence
+            intervals of the second order Sobol indices should be calculated.
+            Default is False.
+        sobol_chunksize : {None, int}, optional
+            The number of time points the Sobol indices are resampled for at
+            the same time, see ``mc_bootstrap``. If None, all time points are
+            resampled at once.
+            Default is None.
+
+        Returns
+        -------
+        data : Data
+            The `data` parameter given as input, where the model and each
+            feature with a mean have ``mean_confidence_interval``,
+            ``variance_confidence_interval``,
+            ``percentile_5_confidence_interval``,
+            ``percentile_95_confidence_interval``, if there are more than
+            one uncertain parameter ``sobol_first_confidence_interval`` and
+            ``sobol_total_confidence_interval``, and if `calc_second_order`
+            is also True ``sobol_second_confidence_interval``. Each contains
+            the lower and upper limit of the interval, with shape
+            ``(2,) + shape`` of the metric.
+
+        Notes
+        -----
+        The same resamples, drawn once as arrays of row indices, are used for
+        the model and all features, see ``mc_bootstrap``. Evaluations that
+        are numpy.nan are set to the mean, and irregular evaluations are
+        skipped. The features are resampled in parallel in a pool of
+        threads, since the calculations are done by NumPy, which releases the
+        global interpreter lock.
+        """
+        nr_uncertain_parameters = len(data.uncertain_parameters)
+
+        features = []
+        evaluations = []
+        for feature in data:
+            if feature == self.model.name and self.model.ignore:
+                continue
+
+            if data[feature].mean is None:
+                continue
+
+            feature_evaluations = self._mc_regular_evaluations(data[feature])
+            if feature_evaluations is None:
+                continue
+
+            features.append(feature)
+            evaluations.append(feature_evaluations)
+
+        if not features:
+            return data
+
+        indices = np.random.randint(0, nr_samples, size=(nr_bootstrap, nr_samples))
+
+        def bootstrap(feature_evaluations):
+            return self.mc_bootstrap(feature_evaluations,
+                                     nr_uncertain_parameters,
+                                     nr_samples,
+                                     confidence_level=confidence_level,
+                                     indices=indices,
+                                     percentiles=True,
+                                     calc_second_order=calc_second_order,
+                                     chunksize=sobol_chunksize)
+
+        if self.runmodel.CPUs and len(features) > 1:
+            executor = ThreadExecutor(CPUs=min(self.runmodel.CPUs, len(features)))
+        else:
+            executor = SerialExecutor()
+
+        with executor:
+            results = list(executor.map(bootstrap, evaluations))
+
+        for feature, confidence_intervals in zip(features, results):
+            for metric in confidence_intervals:
+                data[feature][metric + "_confidence_interval"] = np.array(confidence_intervals[metric])
+
+        return data
 
 
     def average_sensitivity(self, data, sensitivity="sobol_first"):
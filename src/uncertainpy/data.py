@@ -6,7 +6,7 @@ import collections
 
 import numpy as np
 
-from .utils.utility import contains_nan, is_regular
+from .utils.utility import contains_nan, is_regular, valid_mask
 from .utils.logger import setup_module_logger, get_logger
 from ._version import __version__
 
@@ -27,7 +27,8 @@ class DataFeature(collections.MutableMapping):
     name : str
         Name of the model/feature.
     evaluations : {None, array_like}, optional.
-        Feature or model result.
+        Feature or model result. Regular results are stored as a single
+        array, with the evaluations along the first axis.
         Default is None.
     time : {None, array_like}, optional.
         Time evaluations for feature or model.
@@ -57,6 +58,37 @@ class DataFeature(collections.MutableMapping):
         Average of the total effect sensitivity of
         the feature or model results.
         Default is None.
+    sobol_second : {None, array_like}, optional.
+        Second order sensitivity of the feature or model results.
+        Default is None.
+    loo_error : {None, float}, optional.
+        Relative leave-one-out error of the polynomial approximation of the
+        feature or model.
+        Default is None.
+    mean_confidence_interval : {None, array_like}, optional.
+        Lower and upper limit of the confidence interval of the mean.
+        Default is None.
+    variance_confidence_interval : {None, array_like}, optional.
+        Lower and upper limit of the confidence interval of the variance.
+        Default is None.
+    percentile_5_confidence_interval : {None, array_like}, optional.
+        Lower and upper limit of the confidence interval of the 5 percentile.
+        Default is None.
+    percentile_95_confidence_interval : {None, array_like}, optional.
+        Lower and upper limit of the confidence interval of the 95 percentile.
+        Default is None.
+    sobol_first_confidence_interval : {None, array_like}, optional.
+        Lower and upper limit of the confidence interval of the first order
+        Sobol indices.
+        Default is None.
+    sobol_total_confidence_interval : {None, array_like}, optional.
+        Lower and upper limit of the confidence interval of the total order
+        Sobol indices.
+        Default is None.
+    sobol_second_confidence_interval : {None, array_like}, optional.
+        Lower and upper limit of the confidence interval of the second order
+        Sobol indices.
+        Default is None.
     labels : list, optional.
         A list of labels for plotting, ``[x-axis, y-axis, z-axis]``
         Default is ``[]``.
@@ -65,8 +97,12 @@ class DataFeature(collections.MutableMapping):
     ----------
     name : str
         Name of the model/feature.
-    evaluations : {None, array_like}
-        Feature or model output.
+    evaluations : {None, array, list}
+        Feature or model output. An array with the evaluations along the first
+        axis if the results are regular, otherwise a list of the evaluations.
+    mask : {None, array}
+        Boolean array that is True for each evaluation that does not contain
+        numpy.nan.
     time : {None, array_like}
         Time values for feature or model.
     mean : {None, array_like}
@@ -85,6 +121,30 @@ class DataFeature(collections.MutableMapping):
         Total order Sobol indices (sensitivity) of the feature or model results.
     sobol_total_average : {None, array_like}
         Average of the total order Sobol indices of the feature or model results.
+    sobol_second : {None, array_like}
+        Second order Sobol indices (sensitivity) of the feature or model
+        results, with shape ``(nr_uncertain_parameters, nr_uncertain_parameters, ...)``.
+    loo_error : {None, float}
+        Relative leave-one-out error of the polynomial approximation of the
+        feature or model.
+    mean_confidence_interval : {None, array_like}
+        Lower and upper limit of the confidence interval of the mean, with
+        shape ``(2,) + shape`` of the mean.
+    variance_confidence_interval : {None, array_like}
+        Lower and upper limit of the confidence interval of the variance.
+    percentile_5_confidence_interval : {None, array_like}
+        Lower and upper limit of the confidence interval of the 5 percentile.
+    percentile_95_confidence_interval : {None, array_like}
+        Lower and upper limit of the confidence interval of the 95 percentile.
+    sobol_first_confidence_interval : {None, array_like}
+        Lower and upper limit of the confidence interval of the first order
+        Sobol indices.
+    sobol_total_confidence_interval : {None, array_like}
+        Lower and upper limit of the confidence interval of the total order
+        Sobol indices.
+    sobol_second_confidence_interval : {None, array_like}
+        Lower and upper limit of the confidence interval of the second order
+        Sobol indices.
     labels : list
         A list of labels for plotting, ``[x-axis, y-axis, z-axis]``.
 
@@ -106,6 +166,22 @@ class DataFeature(collections.MutableMapping):
           of the model/feature.
         * ``sobol_total_average`` - the average of the total order Sobol
           indices (sensitivity) of the model/feature.
+        * ``sobol_second`` - the second order Sobol indices (sensitivity)
+          of the model/feature, if calculated.
+        * ``loo_error`` - the relative leave-one-out error of the polynomial
+          approximation of the model/feature, if calculated.
+        * ``mean_confidence_interval``, ``variance_confidence_interval``,
+          ``percentile_5_confidence_interval``,
+          ``percentile_95_confidence_interval``,
+          ``sobol_first_confidence_interval``,
+          ``sobol_total_confidence_interval`` and
+          ``sobol_second_confidence_interval`` - the bootstrap confidence
+          intervals of the statistical metrics, if calculated.
+
+    Regular evaluations, where each evaluation has the same shape, are stored
+    as one contiguous float array with shape ``(nr_evaluations, ...)``, so
+    masking and statistics can be calculated with single vectorized calls.
+    Irregular evaluations are stored as a list.
     """
     def __init__(self,
                  name,
@@ -119,6 +195,15 @@ class DataFeature(collections.MutableMapping):
                  sobol_first_average=None,
                  sobol_total=None,
                  sobol_total_average=None,
+                 sobol_second=None,
+                 loo_error=None,
+                 mean_confidence_interval=None,
+                 variance_confidence_interval=None,
+                 percentile_5_confidence_interval=None,
+                 percentile_95_confidence_interval=None,
+                 sobol_first_confidence_interval=None,
+                 sobol_total_confidence_interval=None,
+                 sobol_second_confidence_interval=None,
                  labels=[]):
 
         self.name = name
@@ -132,14 +217,104 @@ class DataFeature(collections.MutableMapping):
         self.sobol_first_average = sobol_first_average
         self.sobol_total = sobol_total
         self.sobol_total_average = sobol_total_average
+        self.sobol_second = sobol_second
+        self.loo_error = loo_error
+        self.mean_confidence_interval = mean_confidence_interval
+        self.variance_confidence_interval = variance_confidence_interval
+        self.percentile_5_confidence_interval = percentile_5_confidence_interval
+        self.percentile_95_confidence_interval = percentile_95_confidence_interval
+        self.sobol_first_confidence_interval = sobol_first_confidence_interval
+        self.sobol_total_confidence_interval = sobol_total_confidence_interval
+        self.sobol_second_confidence_interval = sobol_second_confidence_interval
         self.labels = labels
 
         self._statistical_metrics = ["evaluations", "time", "mean", "variance",
                                      "percentile_5", "percentile_95",
                                      "sobol_first", "sobol_first_average",
-                                     "sobol_total", "sobol_total_average"]
+                                     "sobol_total", "sobol_total_average",
+                                     "sobol_second", "loo_error",
+                                     "mean_confidence_interval",
+                                     "variance_confidence_interval",
+                                     "percentile_5_confidence_interval",
+                                     "percentile_95_confidence_interval",
+                                     "sobol_first_confidence_interval",
+                                     "sobol_total_confidence_interval",
+                                     "sobol_second_confidence_interval"]
 
         self._information = ["name", "labels"]
+        self._derived = ["mask"]
+
+
+    @property
+    def evaluations(self):
+        """
+        The feature or model results.
+
+        Parameters
+        ----------
+        new_evaluations : {None, array_like}
+            The feature or model results. If the results are regular and
+            numeric, they are stored as a float array with the evaluations
+            along the first axis. Otherwise they are stored as given.
+
+        Returns
+        -------
+        evaluations : {None, array, list}
+            The feature or model results.
+        """
+        return self._evaluations
+
+
+    @evaluations.setter
+    def evaluations(self, new_evaluations):
+        self._evaluations = new_evaluations
+
+        if new_evaluations is not None:
+            try:
+                evaluations = np.asarray(new_evaluations)
+            except ValueError:
+                # Irregular evaluations
+                evaluations = None
+
+            if evaluations is not None and evaluations.ndim > 0:
+                if evaluations.dtype.kind in "biu":
+                    self._evaluations = np.ascontiguousarray(evaluations, dtype=float)
+                elif evaluations.dtype.kind in "fc":
+                    self._evaluations = np.ascontiguousarray(evaluations)
+
+        self._mask = self._calculate_mask()
+
+
+    def _calculate_mask(self):
+        """
+        Calculate which evaluations are valid.
+        """
+        evaluations = self._evaluations
+
+        if evaluations is None or np.isscalar(evaluations) or \
+                (isinstance(evaluations, np.ndarray) and evaluations.ndim == 0):
+            return None
+
+        return valid_mask(evaluations)
+
+
+    @property
+    def mask(self):
+        """
+        Which evaluations are valid, meaning they do not contain numpy.nan.
+
+        The mask is calculated once when the evaluations are set. If the
+        evaluations are changed in place, they must be set again to update
+        the mask.
+
+        Returns
+        -------
+        mask : {None, array}
+            Boolean array that is True for each evaluation that does not
+            contain numpy.nan. None if there are no evaluations.
+        """
+        return self._mask
+
 
     def __getitem__(self, statistical_metric):
         """
@@ -171,7 +346,8 @@ class DataFeature(collections.MutableMapping):
 
         for statistical_metric in dir(self):
             if not statistical_metric.startswith('_') and not callable(self[statistical_metric]) \
-                and self[statistical_metric] is not None and statistical_metric not in self._information:
+                and self[statistical_metric] is not None and statistical_metric not in self._information \
+                and statistical_metric not in self._derived:
                 statistical_metrics.append(statistical_metric)
 
         return statistical_metrics
@@ -283,10 +459,18 @@ class DataFeature(collections.MutableMapping):
             The number of dimensions of the data of the data type.
         """
 
-        if self.evaluations is not None:
-            for evaluation in self.evaluations:
-                if not contains_nan(evaluation):
-                    return np.ndim(evaluation)
+        if self.evaluations is None:
+            return None
+
+        if isinstance(self.evaluations, np.ndarray) and self.evaluations.ndim > 0:
+            if np.any(self.mask):
+                return self.evaluations.ndim - 1
+
+            return None
+
+        for evaluation in self.evaluations:
+            if not contains_nan(evaluation):
+                return np.ndim(evaluation)
 
         return None
 
@@ -336,6 +520,18 @@ class Data(collections.MutableMapping):
         A dictionary with a DataFeature for each model/feature.
     data_information : list
         List of attributes containing additional information.
+    nodes : {None, array}
+        The nodes (parameter values) the model was evaluated in, with shape
+        ``(nr_uncertain_parameters, nr_nodes)``, in the same order as the
+        evaluations. Saved to file as the dataset "nodes", so for example the
+        collocation nodes can be extended, see
+        ``UncertaintyCalculations.extend_PCE_collocation``.
+    sampling_rule : str
+        The rule used to draw the nodes, for example "halton", or "" if
+        unknown.
+    rosenblatt : bool
+        If the Rosenblatt transformation was used to create the polynomial
+        chaos expansion.
 
 
     Notes
@@ -357,6 +553,17 @@ class Data(collections.MutableMapping):
           of the model/feature.
         * ``sobol_total_average`` - the average of the total order Sobol
           indices (sensitivity) of the model/feature.
+        * ``sobol_second`` - the second order Sobol indices (sensitivity)
+          of the model/feature, if calculated.
+        * ``loo_error`` - the relative leave-one-out error of the polynomial
+          approximation of the model/feature, if calculated.
+        * ``mean_confidence_interval``, ``variance_confidence_interval``,
+          ``percentile_5_confidence_interval``,
+          ``percentile_95_confidence_interval``,
+          ``sobol_first_confidence_interval``,
+          ``sobol_total_confidence_interval`` and
+          ``sobol_second_confidence_interval`` - the bootstrap confidence
+          intervals of the statistical metrics, if calculated.
 
     Raises
     ------
@@ -374,7 +581,8 @@ class Data(collections.MutableMapping):
 
         self.data_information = ["uncertain_parameters", "model_name",
                                  "incomplete", "method", "version", "seed",
-                                 "model_ignore", "error"]
+                                 "model_ignore", "error", "sampling_rule",
+                                 "rosenblatt"]
 
 
         if backend not in ["auto", "hdf5", "exdir"]:
@@ -390,6 +598,9 @@ class Data(collections.MutableMapping):
         self.method = ""
         self.model_ignore = False
         self._seed = ""
+        self.nodes = None
+        self.sampling_rule = ""
+        self.rosenblatt = False
         self.backend = backend
 
         self.version = __version__
@@ -473,6 +684,9 @@ class Data(collections.MutableMapping):
         self.method = ""
         self._seed = ""
         self.model_ignore = False
+        self.nodes = None
+        self.sampling_rule = ""
+        self.rosenblatt = False
         self.version = __version__
 
 
@@ -692,6 +906,15 @@ class Data(collections.MutableMapping):
         f.attrs["version"] = self.version
         f.attrs["seed"] = self.seed
         f.attrs["model ignore"] = self.model_ignore
+        f.attrs["sampling rule"] = self.sampling_rule
+        f.attrs["rosenblatt"] = self.rosenblatt
+
+        # The features are groups, so the nodes are stored as a dataset
+        if self.nodes is not None:
+            if "nodes" in self.data:
+                logger.warning("A feature is named nodes, the nodes are not saved.")
+            else:
+                f.create_dataset("nodes", data=self.nodes)
 
 
         for feature in self.data:
@@ -801,8 +1024,20 @@ class Data(collections.MutableMapping):
         if "model ignore" in f.attrs:
             self.model_ignore = f.attrs["model ignore"]
 
+        if "sampling rule" in f.attrs:
+            self.sampling_rule = str(f.attrs["sampling rule"])
+
+        if "rosenblatt" in f.attrs:
+            self.rosenblatt = bool(f.attrs["rosenblatt"])
+
 
         for feature in f:
+            if isinstance(f[feature], backend.Dataset):
+                if feature == "nodes":
+                    self.nodes = f[feature][()]
+
+                continue
+
             self.add_features(str(feature))
             for statistical_metric in f[feature]:
 
@@ -839,10 +1074,15 @@ class Data(collections.MutableMapping):
 
         feature_list = list(self.data.keys())
         for feature in feature_list:
-            all_nan = True
-            for U in self[feature].evaluations:
-                if not np.all(np.isnan(U)):
-                    all_nan = False
+            evaluations = self[feature].evaluations
+
+            if isinstance(evaluations, np.ndarray) and evaluations.dtype != object:
+                all_nan = bool(np.all(np.isnan(evaluations)))
+            else:
+                all_nan = True
+                for U in evaluations:
+                    if not np.all(np.isnan(U)):
+                        all_nan = False
 
             if all_nan:
                 logger = get_logger(self)
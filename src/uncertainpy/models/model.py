@@ -43,6 +43,11 @@ class Model(object):
         Set the threshold for the logging level. Logging messages less severe
         than this level is ignored. If None, no logging to file is performed.
         Default logger level is "info".
+    vectorized : bool, optional
+        True if the model evaluates a batch of nodes in a single call, with
+        each parameter given as an array of values for the nodes in the batch.
+        See the ``evaluate_batch`` method for requirements of the run
+        function. Default is False.
     **model_kwargs
         Any number of arguments passed to the model function when it is run.
 
@@ -65,11 +70,14 @@ class Model(object):
         Ignore the model results when calculating uncertainties, which means the
         uncertainty is not calculated for the model. The model results are still
         postprocessed if a postprocessing is implemented. Default is False.
+    vectorized : bool
+        True if the model evaluates a batch of nodes in a single call.
 
     See Also
     --------
     uncertainpy.models.Model.run
     uncertainpy.models.Model.postprocess
+    uncertainpy.models.Model.evaluate_batch
     """
     def __init__(self,
                  run=None,
@@ -79,12 +87,14 @@ class Model(object):
                  ignore=False,
                  suppress_graphics=False,
                  logger_level="info",
+                 vectorized=False,
                  **model_kwargs):
 
         self.interpolate = interpolate
         self.labels = labels
         self.ignore = ignore
         self.suppress_graphics = suppress_graphics
+        self.vectorized = vectorized
 
         self.model_kwargs = model_kwargs
 
@@ -260,6 +270,74 @@ class Model(object):
 
         return model_result
 
+
+    def evaluate_batch(self, **parameters):
+        """
+        Run a vectorized model for a batch of nodes with default
+        model_kwargs options, and validate the result of each node.
+
+        Parameters
+        ----------
+        **parameters : A number of named arguments (name=array).
+            The parameters of the model, where each parameter is an array
+            with the value of the parameter in each node of the batch.
+
+        Returns
+        -------
+        model_results : list
+            A list with the model result of each node in the batch, in the
+            same order as the parameter values. Each model result is on the
+            same form as the result of ``evaluate``.
+
+        Raises
+        ------
+        ValueError
+            If the model does not return one model result for each node.
+
+        Notes
+        -----
+        A vectorized ``run`` receives each parameter as an array with
+        one value for each of the N nodes in the batch, while the model_kwargs
+        are passed on unchanged. The model can then evaluate all nodes at once,
+        for example with NumPy broadcasting, and must return a list of N model
+        results, one for each node. Each model result has the same form as a
+        result from a ``run`` that is not vectorized,
+        ``time, values, info_1, info_2, ...``.
+
+        The model results are postprocessed and used to calculate the features
+        for each node separately.
+
+        See also
+        --------
+        uncertainpy.models.Model.run : Requirements for the model run function.
+        uncertainpy.models.Model.evaluate
+        """
+        nr_nodes = None
+        for parameter in parameters:
+            nr_nodes = len(parameters[parameter])
+            break
+
+        all_parameters = self.model_kwargs.copy()
+        all_parameters.update(parameters)
+
+        model_results = self.run(**all_parameters)
+
+        if isinstance(model_results, (np.ndarray, six.string_types)) or \
+            not hasattr(model_results, "__len__"):
+            raise ValueError("A vectorized model.run() or model function must "
+                             "return a list with one model result for each node "
+                             "(return [(time_1, values_1), (time_2, values_2), ...])")
+
+        if nr_nodes is not None and len(model_results) != nr_nodes:
+            raise ValueError("A vectorized model.run() or model function returned "
+                             "{} model results for {} nodes".format(len(model_results), nr_nodes))
+
+        for model_result in model_results:
+            self.validate_run(model_result)
+
+        return list(model_results)
+
+
     @property
     def postprocess(self, *model_result):
         """
@@ -2,9 +2,11 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 import os
 import platform
+import six
 import numpy as np
 
 from .core.uncertainty_calculations import UncertaintyCalculations
+from .core.checkpoint import Checkpoint
 from .plotting.plot_uncertainty import PlotUncertainty
 from .utils.logger import get_logger, add_file_handler
 from .data import Data
@@ -55,8 +57,63 @@ class UncertaintyQuantification(ParameterBase):
         The number of CPUs to use when calculating the model and features.
         If None, no multiprocessing is used.
         If "max", the maximum number of CPUs on the computer
-        (multiprocess.cpu_count()) is used.
+        (multiprocess.cpu_count()) is used. The worker processes are reused
+        by all uncertainty quantifications until ``close`` is called.
         Default is "max".
+    chunksize : {int, "auto"}, optional
+        The number of model evaluations sent to each worker process as a
+        single batch, if multiprocessing is used. If "auto", the chunksize is
+        estimated from the measured time of the first model evaluations.
+        Default is "auto".
+    executor : {None, "process", "thread", "serial", "distributed", Executor instance}, optional
+        How the model evaluations are distributed. "process" uses a pool of
+        `CPUs` worker processes, "thread" uses a pool of `CPUs` threads,
+        "serial" evaluates the model in the current process, and
+        "distributed" submits the evaluations to a ``concurrent.futures``
+        compatible executor. An Executor instance, for example a
+        DistributedExecutor wrapping an MPI or cluster executor, is used as is,
+        and is not closed by ``close``. If None, "process" is used, or
+        "serial" if `CPUs` is None.
+        Default is None.
+    cache : {None, str, EvaluationCache}, optional
+        Opt-in cache of the raw model evaluations, keyed by the model, the
+        model keyword arguments and the exact parameter values. If a string,
+        an EvaluationCache stored in the folder with that name is used.
+        Rerunning with new features or a new polynomial order then only
+        evaluates the model for nodes that are not in the cache.
+        If None, no caching is performed.
+        Default is None.
+    checkpoint : {None, str, Checkpoint}, optional
+        File where the model and feature results are stored as soon as they
+        are evaluated. If the uncertainty quantification is interrupted, for
+        example by a crash or a preempted node, running it again only
+        evaluates the nodes that are missing from the file. If a string, a
+        Checkpoint with that filename is used, stored in the file format
+        given by `backend`. If None, no checkpointing
+        is performed.
+        Default is None.
+    basis_cache : {bool, str, BasisCache}, optional
+        Memoization of the orthogonal polynomial bases, quadrature rules and
+        Sobol samples, keyed by the distribution and order. If True, they are
+        stored in memory, and if a string, they are also stored on disk in
+        the folder with that name, so they are reused between runs. If False,
+        nothing is stored.
+        Default is True.
+    shared_memory : bool, optional
+        If True, the workers write the values of the model and features into
+        memory-mapped files, and only send small descriptors back to the
+        main process. Reduces the communication for long model results with
+        many workers on the same computer.
+        Default is False.
+    interpolation_time : {None, array_like, dict}, optional
+        The common time grid the irregular model/feature results are
+        interpolated at. If an array, the model and the features that are
+        interpolated are interpolated at this time grid in the workers,
+        instead of sending the interpolation objects back to the main
+        process. If a dictionary, ``{name: time}``, each model/feature in the
+        dictionary is interpolated at its own time grid. If None, the results
+        are interpolated at the longest time array of all evaluations.
+        Default is None.
     logger_level : {"info", "debug", "warning", "error", "critical", None}, optional
         Set the threshold for the logging level. Logging messages less severe
         than this level is ignored. If None, no logging to file is performed
@@ -101,6 +158,16 @@ class UncertaintyQuantification(ParameterBase):
     uncertainpy.core.UncertaintyCalculations
     uncertainpy.core.UncertaintyCalculations.create_PCE_custom : Requirements for create_PCE_custom
     uncertainpy.models.Model.run : Requirements for the model run function.
+
+    Notes
+    -----
+    The worker processes used to evaluate the model are kept alive between
+    uncertainty quantifications. Call ``close`` when finished, or use
+    UncertaintyQuantification as a context manager::
+
+        with UncertaintyQuantification(model, parameters) as UQ:
+            for polynomial_order in range(1, 6):
+                UQ.quantify(polynomial_order=polynomial_order)
     """
     def __init__(self,
                  model,
@@ -110,6 +177,13 @@ class UncertaintyQuantification(ParameterBase):
                  create_PCE_custom=None,
                  custom_uncertainty_quantification=None,
                  CPUs="max",
+                 chunksize="auto",
+                 executor=None,
+                 cache=None,
+                 checkpoint=None,
+                 basis_cache=True,
+                 shared_memory=False,
+                 interpolation_time=None,
                  logger_level="info",
                  logger_filename="uncertainpy.log",
                  backend="auto"):
@@ -126,6 +200,9 @@ class UncertaintyQuantification(ParameterBase):
                         "inside of an if __name__ == '__main__': block in order "
                         "for multiprocess to work." )
 
+        if isinstance(checkpoint, six.string_types):
+            checkpoint = Checkpoint(filename=checkpoint, backend=backend)
+
         if uncertainty_calculations is None:
             self._uncertainty_calculations = UncertaintyCalculations(
                 model=model,
@@ -134,6 +211,13 @@ class UncertaintyQuantification(ParameterBase):
                 create_PCE_custom=create_PCE_custom,
                 custom_uncertainty_quantification=custom_uncertainty_quantification,
                 CPUs=CPUs,
+                chunksize=chunksize,
+                executor=executor,
+                cache=cache,
+                checkpoint=checkpoint,
+                basis_cache=basis_cache,
+                shared_memory=shared_memory,
+                interpolation_time=interpolation_time,
                 logger_level=logger_level,
             )
         else:
@@ -154,6 +238,30 @@ class UncertaintyQuantification(ParameterBase):
         add_file_handler(filename=logger_filename)
 
 
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def close(self):
+        """
+        Close the worker processes used to evaluate the model.
+
+        The worker processes are kept alive between uncertainty
+        quantifications, so repeated calls to ``quantify`` reuse the same
+        processes. They are recreated if the model is evaluated after
+        ``close`` has been called.
+
+        See also
+        --------
+        uncertainpy.core.RunModel.close
+        """
+        self.uncertainty_calculations.close()
+
+
     @ParameterBase.features.setter
     def features(self, new_features):
         ParameterBase.features.fset(self, new_features)
@@ -220,6 +328,12 @@ class UncertaintyQuantification(ParameterBase):
                  nr_pc_mc_samples=10**4,
                  nr_mc_samples=10**4,
                  allow_incomplete=True,
+                 sobol_second=False,
+                 sampling_rule="saltelli",
+                 random_shift=True,
+                 tolerance=None,
+                 loo_error=False,
+                 nr_bootstrap=None,
                  seed=None,
                  single=False,
                  plot="condensed_first",
@@ -241,10 +355,13 @@ class UncertaintyQuantification(ParameterBase):
             "pc" is polynomial chaos method, "mc" is the quasi-Monte Carlo
             method and "custom" are custom uncertainty quantification methods.
             Default is "pc".
-        pc_method : {"collocation", "spectral", "custom"}, optional
+        pc_method : {"collocation", "spectral", "sparse", "adaptive", "custom"}, optional
             The method to use when creating the polynomial chaos approximation,
             if the polynomial chaos method is chosen. "collocation" is the
             point collocation method "spectral" is pseudo-spectral projection,
+            "sparse" is point collocation with sparse regression, for many
+            uncertain parameters, "adaptive" is point collocation in an
+            adaptive sparse grid,
             and "custom" is the custom polynomial method.
             Default is "collocation".
         rosenblatt : {"auto", bool}, optional
@@ -284,6 +401,48 @@ class UncertaintyQuantification(ParameterBase):
             If the polynomial approximation should be performed for features or
             models with incomplete evaluations.
             Default is True.
+        sobol_second : bool, optional
+            If the second order Sobol indices should be calculated. Not used
+            if `single` is True.
+            Default is False.
+        sampling_rule : {"saltelli", "sobol", "halton", "latin_hypercube", "random"}, optional
+            The rule used to draw the base samples of Saltelli's scheme, if
+            the quasi-Monte Carlo method is chosen. "sobol" and "halton" are
+            randomized with a random shift, using `seed`.
+            Default is "saltelli".
+        random_shift : bool, optional
+            If the "sobol" and "halton" sequences should be randomized with a
+            random shift, if the quasi-Monte Carlo method is chosen. Not used
+            if `tolerance` is given, since the adaptive method continues the
+            sequences without a shift.
+            Default is True.
+        tolerance : {None, float}, optional
+            If given, the quasi-Monte Carlo method evaluates the model in
+            batches until the bootstrap confidence intervals are narrower than
+            `tolerance`, using at most `nr_mc_samples` samples, and can not be
+            combined with `sobol_second`. For
+            ``pc_method="adaptive"`` it is the tolerance of the error
+            indicators, see ``UncertaintyCalculations.create_PCE_adaptive``,
+            and for ``pc_method="collocation"`` the smallest polynomial order
+            up to `polynomial_order` with a leave-one-out error below
+            `tolerance` is used, see
+            ``UncertaintyCalculations.select_polynomial_order``.
+            Not used if `single` is True.
+            Default is None.
+        loo_error : bool, optional
+            If the leave-one-out error of the polynomial approximations should
+            be calculated, if `pc_method` is "collocation" or "adaptive", see
+            ``UncertaintyCalculations.leave_one_out_error``. Not used if
+            `single` is True.
+            Default is False.
+        nr_bootstrap : {None, int}, optional
+            The number of bootstrap resamples used to calculate confidence
+            intervals for the statistical metrics, if the quasi-Monte Carlo
+            method is chosen, see ``UncertaintyCalculations.monte_carlo``.
+            If `tolerance` is given, confidence intervals are always
+            calculated, with 100 resamples if `nr_bootstrap` is None. Not used
+            if `single` is True.
+            Default is None.
         seed : int, optional
             Set a random seed. If None, no seed is set.
             Default is None.
@@ -337,7 +496,7 @@ class UncertaintyQuantification(ParameterBase):
         ValueError
             If `method` not one of "pc", "mc" or "custom".
         ValueError
-            If `pc_method` not one of "collocation", "spectral" or "custom".
+            If `pc_method` not one of "collocation", "spectral", "sparse", "adaptive" or "custom".
         NotImplementedError
             If custom method or custom pc method is chosen and have not been
             implemented.
@@ -372,6 +531,13 @@ class UncertaintyQuantification(ParameterBase):
         feature. Lastly, we use all calculated model and each feature results to
         calculate the Sobol indices using Saltellie's approach.
 
+        If UncertaintyQuantification is created with a `checkpoint`, each
+        model and feature result is stored as soon as it is evaluated. Calling
+        quantify again with the same arguments after an interrupted run then
+        resumes the run, and only the nodes missing from the checkpoint are
+        evaluated. The quasi-Monte Carlo method requires `seed` to be set for
+        a run to be resumed.
+
         The plots created are intended as quick way to get an overview of the
         results, and not to create publication ready plots. Custom plots of the
         data can easily be created by retrieving the data from the Data class.
@@ -420,6 +586,9 @@ class UncertaintyQuantification(ParameterBase):
                                              quadrature_order=quadrature_order,
                                              nr_pc_mc_samples=nr_pc_mc_samples,
                                              allow_incomplete=allow_incomplete,
+                                             sobol_second=sobol_second,
+                                             tolerance=tolerance,
+                                             loo_error=loo_error,
                                              seed=seed,
                                              plot=plot,
                                              figure_folder=figure_folder,
@@ -445,6 +614,11 @@ class UncertaintyQuantification(ParameterBase):
             else:
                 data = self.monte_carlo(uncertain_parameters=uncertain_parameters,
                                         nr_samples=nr_mc_samples,
+                                        sobol_second=sobol_second,
+                                        sampling_rule=sampling_rule,
+                                        random_shift=random_shift,
+                                        tolerance=tolerance,
+                                        nr_bootstrap=nr_bootstrap,
                                         plot=plot,
                                         figure_folder=figure_folder,
                                         figureformat=figureformat,
@@ -560,6 +734,10 @@ class UncertaintyQuantification(ParameterBase):
                          quadrature_order=None,
                          nr_pc_mc_samples=10**4,
                          allow_incomplete=True,
+                         sobol_second=False,
+                         tolerance=None,
+                         loo_error=False,
+                         sampling_rule="hammersley",
                          seed=None,
                          plot="condensed_first",
                          figure_folder="figures",
@@ -574,10 +752,13 @@ class UncertaintyQuantification(ParameterBase):
 
         Parameters
         ----------
-        method : {"collocation", "spectral", "custom"}, optional
+        method : {"collocation", "spectral", "sparse", "adaptive", "custom"}, optional
             The method to use when creating the polynomial chaos approximation,
             if the polynomial chaos method is chosen. "collocation" is the
             point collocation method "spectral" is pseudo-spectral projection,
+            "sparse" is point collocation with sparse regression, for many
+            uncertain parameters, "adaptive" is point collocation in an
+            adaptive sparse grid,
             and "custom" is the custom polynomial method.
             Default is "collocation".
         rosenblatt : {"auto", bool}, optional
@@ -597,6 +778,9 @@ class UncertaintyQuantification(ParameterBase):
             The number of collocation nodes to choose, if polynomial chaos with
             point collocation is used. If None,
             `nr_collocation_nodes` = 2* number of expansion factors + 2.
+            For the sparse method the default is smaller, see
+            ``UncertaintyCalculations.create_PCE_sparse``, and for the adaptive
+            method it is the maximum number of nodes.
             Default is None.
         quadrature_order : {int, None}, optional
             The order of the Leja quadrature method, if polynomial chaos with
@@ -610,6 +794,28 @@ class UncertaintyQuantification(ParameterBase):
             If the polynomial approximation should be performed for features or
             models with incomplete evaluations.
             Default is True.
+        sobol_second : bool, optional
+            If the second order Sobol indices should be calculated.
+            Default is False.
+        tolerance : {None, float}, optional
+            The tolerance of the error indicators if `method` is "adaptive",
+            see ``UncertaintyCalculations.create_PCE_adaptive``. If `method`
+            is "collocation", the smallest polynomial order up to
+            `polynomial_order` with a leave-one-out error below `tolerance`
+            is used, see ``UncertaintyCalculations.select_polynomial_order``.
+            Default is None.
+        loo_error : bool, optional
+            If the leave-one-out error of the polynomial approximations should
+            be calculated and stored in ``data["model/features"].loo_error``.
+            Only used if `method` is "collocation" or "adaptive", see
+            ``UncertaintyCalculations.leave_one_out_error``.
+            Default is False.
+        sampling_rule : {"hammersley", "halton"}, optional
+            The low-discrepancy sequence the collocation nodes are drawn from,
+            if `method` is "collocation". Use "halton" if the polynomial chaos
+            expansion should be extended with more nodes later, see
+            ``extend_polynomial_chaos``.
+            Default is "hammersley".
         seed : int, optional
             Set a random seed. If None, no seed is set.
             Default is None.
@@ -655,7 +861,7 @@ class UncertaintyQuantification(ParameterBase):
             If a common multivariate distribution is given in
             Parameters.distribution and not all uncertain parameters are used.
         ValueError
-            If `method` not one of "collocation", "spectral" or "custom".
+            If `method` not one of "collocation", "spectral", "sparse", "adaptive" or "custom".
         NotImplementedError
             If custom pc method is chosen and have not been implemented.
 
@@ -708,6 +914,10 @@ class UncertaintyQuantification(ParameterBase):
             quadrature_order=quadrature_order,
             nr_pc_mc_samples=nr_pc_mc_samples,
             allow_incomplete=allow_incomplete,
+            sobol_second=sobol_second,
+            tolerance=tolerance,
+            loo_error=loo_error,
+            sampling_rule=sampling_rule,
             seed=seed,
             **custom_kwargs
             )
@@ -727,10 +937,143 @@ class UncertaintyQuantification(ParameterBase):
         return self.data
 
 
+    def extend_polynomial_chaos(self,
+                                nr_new_nodes,
+                                data=None,
+                                polynomial_order=4,
+                                rosenblatt="auto",
+                                nr_pc_mc_samples=10**4,
+                                allow_incomplete=True,
+                                sobol_second=False,
+                                loo_error=False,
+                                seed=None,
+                                plot="condensed_first",
+                                figure_folder="figures",
+                                figureformat=".png",
+                                save=True,
+                                data_folder="data",
+                                filename=None):
+        """
+        Add collocation nodes to a polynomial chaos expansion created with
+        point collocation, evaluate the model only in the new nodes, and
+        perform the uncertainty quantification and sensitivity analysis again.
+
+        Parameters
+        ----------
+        nr_new_nodes : int
+            The number of collocation nodes to add.
+        data : {None, Data}, optional
+            The data object to extend. Must be created by ``polynomial_chaos``
+            with ``sampling_rule="halton"``, or by a previous extension. If
+            None, ``self.data`` is used, which can be loaded from file with
+            ``load``.
+            Default is None.
+        polynomial_order : int, optional
+            The polynomial order of the polynomial approximation. Must be the
+            same as the order used to create `data`.
+            Default is 4.
+        rosenblatt : {"auto", bool}, optional
+            If the Rosenblatt transformation was used to create `data`. If
+            "auto", ``data.rosenblatt`` is used.
+            Default is "auto".
+        nr_pc_mc_samples : int, optional
+            Number of samples for the Monte Carlo sampling of the polynomial
+            chaos approximation.
+        allow_incomplete : bool, optional
+            If the polynomial approximation should be performed for features or
+            models with incomplete evaluations.
+            Default is True.
+        sobol_second : bool, optional
+            If the second order Sobol indices should be calculated.
+            Default is False.
+        loo_error : bool, optional
+            If the leave-one-out error of the polynomial approximations should
+            be calculated and stored in ``data["model/features"].loo_error``.
+            Default is False.
+        seed : int, optional
+            Set a random seed. If None, no seed is set.
+            Default is None.
+        plot : {"condensed_first", "condensed_total", "condensed_no_sensitivity", "all", "evaluations", None}, optional
+            Type of plots to be created, see ``polynomial_chaos``.
+            Default is "condensed_first".
+        figure_folder : str, optional
+            Name of the folder where to save all figures.
+            Default is "figures".
+        figureformat : str
+            The figure format to save the plots in. Supports all formats in
+            matplolib.
+            Default is ".png".
+        save : bool, optional
+            If the data should be saved. Default is True.
+        data_folder : str, optional
+            Name of the folder where to save the data.
+            Default is "data".
+        filename : {None, str}, optional
+            Name of the data file. If None the model name is used.
+            Default is None.
+
+        Returns
+        -------
+        data : Data
+            A data object that contains the results from the uncertainty
+            quantification with all collocation nodes.
+
+        Raises
+        ------
+        ValueError
+            If there is no data to extend.
+        ValueError
+            If the data does not contain the nodes, or the nodes are not drawn
+            from the Halton sequence.
+
+        See also
+        --------
+        uncertainpy.core.UncertaintyCalculations.extend_polynomial_chaos
+        uncertainpy.core.UncertaintyCalculations.extend_PCE_collocation
+        """
+        if data is None:
+            data = self.data
+
+        if data is None or isinstance(data, dict):
+            raise ValueError("No polynomial chaos expansion to extend. "
+                             "Run polynomial_chaos with sampling_rule=\"halton\" or load data first.")
+
+        self.data = self.uncertainty_calculations.extend_polynomial_chaos(
+            data,
+            nr_new_nodes=nr_new_nodes,
+            polynomial_order=polynomial_order,
+            rosenblatt=rosenblatt,
+            nr_pc_mc_samples=nr_pc_mc_samples,
+            allow_incomplete=allow_incomplete,
+            sobol_second=sobol_second,
+            loo_error=loo_error,
+            seed=seed
+            )
+
+        self.data.backend = self.backend
+
+        if filename is None:
+            filename = self.model.name
+
+        if save:
+            self.save(filename, folder=data_folder)
+
+        self.plot(type=plot,
+                  folder=figure_folder,
+                  figureformat=figureformat)
+
+        return self.data
+
+
     def monte_carlo(self,
                     uncertain_parameters=None,
                     nr_samples=10**4,
                     seed=None,
+                    sobol_second=False,
+                    sampling_rule="saltelli",
+                    random_shift=True,
+                    tolerance=None,
+                    nr_bootstrap=None,
                     plot="condensed_first",
                     figure_folder="figures",
                     figureformat=".png",
@@ -755,6 +1098,40 @@ class UncertaintyQuantification(ParameterBase):
         seed : int, optional
             Set a random seed. If None, no seed is set.
             Default is None.
+        sobol_second : bool, optional
+            If the second order Sobol indices should be calculated. This
+            requires ``(nr_samples/2)*(2*nr_uncertain_parameters + 2)``
+            samples instead of ``(nr_samples/2)*(nr_uncertain_parameters + 2)``.
+            Default is False.
+        sampling_rule : {"saltelli", "sobol", "halton", "latin_hypercube", "random"}, optional
+            The rule used to draw the base samples of Saltelli's scheme.
+            "saltelli" uses the Sobol sequence from SALib, "sobol" and "halton"
+            the low-discrepancy sequences randomized with a random shift,
+            "latin_hypercube" Latin hypercube sampling and "random"
+            pseudo-random sampling. The rule is recorded in ``data.method`` and
+            ``data.sampling_rule``.
+            Default is "saltelli".
+        random_shift : bool, optional
+            If the "sobol" and "halton" sequences should be randomized with a
+            random shift. Not used if `tolerance` is given, since the
+            adaptive method continues the sequences without a shift.
+            Default is True.
+        tolerance : {None, float}, optional
+            If given, the model is evaluated in batches until the bootstrap
+            confidence intervals of the Sobol indices (or of the mean for one
+            uncertain parameter) are narrower than `tolerance`, and
+            `nr_samples` is the maximum number of samples. Every earlier
+            evaluation is reused. Can not be combined with `sobol_second`.
+            See ``UncertaintyCalculations.monte_carlo_adaptive``.
+            Default is None.
+        nr_bootstrap : {None, int}, optional
+            The number of bootstrap resamples used to calculate confidence
+            intervals for the mean, variance, percentiles and Sobol indices,
+            stored as for example ``data["model/features"].mean_confidence_interval``.
+            If None, no confidence intervals are calculated, except when
+            `tolerance` is given, where they are always calculated with 100
+            resamples. See ``UncertaintyCalculations.mc_confidence_intervals``.
+            Default is None.
         plot : {"condensed_first", "condensed_total", "condensed_no_sensitivity", "all", "evaluations", None}, optional
             Type of plots to be created.
             "condensed_first" is a subset of the most important plots and
@@ -793,6 +1170,8 @@ class UncertaintyQuantification(ParameterBase):
         ValueError
             If a common multivariate distribution is given in
             Parameters.distribution and not all uncertain parameters are used.
+        ValueError
+            If both `tolerance` and `sobol_second` are given.
 
         Notes
         -----
@@ -826,13 +1205,31 @@ class UncertaintyQuantification(ParameterBase):
         uncertainpy.Parameters
         uncertainpy.plotting.PlotUncertainty
         uncertainpy.core.UncertaintyCalculations.monte_carlo : Uncertainty quantification using quasi-Monte Carlo methods
+        uncertainpy.core.UncertaintyCalculations.monte_carlo_adaptive : Adaptive quasi-Monte Carlo method
         """
+        if tolerance is not None and sobol_second:
+            raise ValueError("sobol_second can not be used together with tolerance, "
+                             "the adaptive Monte Carlo method only calculates first "
+                             "and total order Sobol indices")
+
         uncertain_parameters = self.uncertainty_calculations.convert_uncertain_parameters(uncertain_parameters)
 
 
-        self.data = self.uncertainty_calculations.monte_carlo(uncertain_parameters=uncertain_parameters,
-                                                              nr_samples=nr_samples,
-                                                              seed=seed)
+        if tolerance is None:
+            self.data = self.uncertainty_calculations.monte_carlo(uncertain_parameters=uncertain_parameters,
+                                                                  nr_samples=nr_samples,
+                                                                  seed=seed,
+                                                                  sobol_second=sobol_second,
+                                                                  sampling_rule=sampling_rule,
+                                                                  random_shift=random_shift,
+                                                                  nr_bootstrap=nr_bootstrap)
+        else:
+            self.data = self.uncertainty_calculations.monte_carlo_adaptive(uncertain_parameters=uncertain_parameters,
+                                                                           tolerance=tolerance,
+                                                                           max_samples=nr_samples,
+                                                                           seed=seed,
+                                                                           sampling_rule=sampling_rule,
+                                                                           nr_bootstrap=100 if nr_bootstrap is None else nr_bootstrap)
 
         self.data.backend = self.backend
 
@@ -871,11 +1268,13 @@ class UncertaintyQuantification(ParameterBase):
 
         Parameters
         ----------
-        method : {"collocation", "spectral", "custom"}, optional
+        method : {"collocation", "spectral", "sparse", "adaptive", "custom"}, optional
             The method to use when creating the polynomial chaos approximation,
             if the polynomial chaos method is chosen. "collocation" is the
             point collocation method "spectral" is pseudo-spectral projection,
-            and "custom" is the custom polynomial method.
+            "sparse" is point collocation with sparse regression, for many
+            uncertain parameters, "adaptive" is point collocation in an
+            adaptive sparse grid, and "custom" is the custom polynomial method.
             Default is "collocation".
         rosenblatt : {"auto", bool}, optional
             If the Rosenblatt transformation should be used. The Rosenblatt
@@ -951,7 +1350,7 @@ class UncertaintyQuantification(ParameterBase):
             If a common multivariate distribution is given in
             Parameters.distribution and not all uncertain parameters are used.
         ValueError
-            If `method` not one of "collocation", "spectral" or "custom".
+            If `method` not one of "collocation", "spectral", "sparse", "adaptive" or "custom".
         NotImplementedError
             If custom pc method is chosen and have not been implemented.
 
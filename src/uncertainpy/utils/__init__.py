@@ -4,7 +4,7 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 Small utility functions for various purposes.
 """
 
-__all__ = ["lengths", "none_to_nan", "contains_nan", "is_regular",
+__all__ = ["lengths", "none_to_nan", "contains_nan", "is_regular", "valid_mask",
             "MyFormatter", "TqdmLoggingHandler", "MultiprocessLoggingHandler",
             "setup_module_logger", "setup_logger",
            "has_handlers", "add_file_handler", "add_screen_handler"]
@@ -13,4 +13,4 @@ from .logger import setup_module_logger, setup_logger
 from .logger import has_handlers, add_file_handler, add_screen_handler
 from .logger import MyFormatter, TqdmLoggingHandler, MultiprocessLoggingHandler
 from .utility import lengths, none_to_nan, contains_nan
-from .utility import is_regular, set_nan
+from .utility import is_regular, set_nan, valid_mask
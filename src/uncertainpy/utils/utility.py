@@ -149,6 +149,43 @@ def contains_nan(values):
 
 
 
+def valid_mask(evaluations):
+    """
+    Find the evaluations that do not contain ``None`` or ``numpy.nan``.
+
+    Parameters
+    ----------
+    evaluations : array_like, list
+        A series of evaluations. If an array, the evaluations are along the
+        first axis. Can be irregular and have any number of nested elements.
+
+    Returns
+    -------
+    mask : boolean array
+        Array that is ``True`` for each evaluation that does not contain
+        ``None`` or ``numpy.nan``.
+
+    Notes
+    -----
+    For numeric arrays the mask is calculated with a single vectorized call.
+    Other evaluations are checked one at the time with ``contains_nan``.
+    """
+    if isinstance(evaluations, np.ndarray) and evaluations.ndim > 0 \
+            and evaluations.dtype.kind in "biufc":
+        axis = tuple(range(1, evaluations.ndim))
+
+        return ~np.isnan(evaluations).any(axis=axis)
+
+    mask = np.ones(len(evaluations), dtype=bool)
+    for i, evaluation in enumerate(evaluations):
+        if contains_nan(evaluation):
+            mask[i] = False
+
+    return mask
+
+
+
+
 def lengths(values):
     """
     Get the lengths of a list and all its sublists.
@@ -81,20 +81,25 @@ testing_base = [TestBase, TestParameterBase]
 testing_data = [TestData, TestDataFeature]
 
 testing_utils = [TestLogger, TestNoneToNan, TestLengths, TestContainsNoneOrNan,
-                 TestIsRegular, TestSetNan]
+                 TestIsRegular, TestSetNan, TestValidMask]
 
 # TODO: several tests crashes when several tests with Xvfb is run one after another
 testing_models = [TestTestingModel0d, TestTestingModel1d, TestTestingModel2d,
                   TestModel, TestHodgkinHuxleyModel, TestCoffeeCupModel,
                   TestIzhikevichModel, TestNestModel, TestNeuronModel,
-                  TestRunModel, TestParallel]
+                  TestRunModel, TestParallel, TestExecutors,
+                  TestEvaluationCache, TestCheckpoint,
+                  TestResultAggregator, TestModelParameters,
+                  TestOutputArena]
 
 testing_parameters = [TestParameter, TestParameters]
 
 testing_exact = testing_spikes + [TestUncertainty, TestPlotUncertainpy]
 
 testing_all = testing_parameters + testing_models + testing_base\
-              + testing_features + testing_data + [TestUncertaintyCalculations, TestDistribution]\
+              + testing_features + testing_data + [TestUncertaintyCalculations, TestBasisCache,
+                                                     TestOnlineStatistics, TestIncrementalLeastSquares,
+                                                     TestTikhonovCoefficients, TestDistribution]\
               + testing_utils
 
 testing_complete = testing_all + [TestExamples]
@@ -260,6 +265,51 @@ def parallel():
     run(TestParallel)
 
 
+@cli.command()
+def executors():
+    run(TestExecutors)
+
+
+@cli.command()
+def evaluation_cache():
+    run(TestEvaluationCache)
+
+
+@cli.command()
+def checkpoint():
+    run(TestCheckpoint)
+
+
+@cli.command()
+def result_aggregator():
+    run(TestResultAggregator)
+
+
+@cli.command()
+def model_parameters():
+    run(TestModelParameters)
+
+
+@cli.command()
+def output_arena():
+    run(TestOutputArena)
+
+
+@cli.command()
+def basis_cache():
+    run(TestBasisCache)
+
+
+@cli.command()
+def online_statistics():
+    run(TestOnlineStatistics)
+
+
+@cli.command()
+def least_squares():
+    run([TestIncrementalLeastSquares, TestTikhonovCoefficients])
+
+
 @cli.command()
 def run_model():
     run(TestRunModel)
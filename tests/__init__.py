@@ -17,6 +17,15 @@ from .test_data import TestData, TestDataFeature
 from .test_run_model import TestRunModel
 from .test_uncertainty_calculations import TestUncertaintyCalculations
 from .test_parallel import TestParallel
+from .test_executors import TestExecutors
+from .test_evaluation_cache import TestEvaluationCache
+from .test_checkpoint import TestCheckpoint
+from .test_result_aggregator import TestResultAggregator
+from .test_model_parameters import TestModelParameters
+from .test_output_arena import TestOutputArena
+from .test_basis_cache import TestBasisCache
+from .test_online_statistics import TestOnlineStatistics
+from .test_least_squares import TestIncrementalLeastSquares, TestTikhonovCoefficients
 from .test_examples import TestExamples
 from .test_base import TestBase, TestParameterBase
 from .test_utility import TestLengths, TestNoneToNan, TestContainsNoneOrNan
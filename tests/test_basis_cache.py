@@ -0,0 +1,179 @@
+import unittest
+import os
+import shutil
+
+import numpy as np
+import chaospy as cp
+
+from uncertainpy.core import BasisCache
+from uncertainpy.core.basis_cache import distribution_signature
+
+
+class TestBasisCache(unittest.TestCase):
+    def setUp(self):
+        self.output_test_dir = ".tests/"
+
+        if os.path.isdir(self.output_test_dir):
+            shutil.rmtree(self.output_test_dir)
+        os.makedirs(self.output_test_dir)
+
+        self.folder = os.path.join(self.output_test_dir, "basis_cache")
+        self.basis_cache = BasisCache()
+
+        self.distribution = cp.J(cp.Uniform(0.5, 1.5), cp.Normal(1, 2))
+
+
+    def tearDown(self):
+        if os.path.isdir(self.output_test_dir):
+            shutil.rmtree(self.output_test_dir)
+
+
+    def test_init(self):
+        basis_cache = BasisCache(folder="test", max_items=10, max_size=100)
+
+        self.assertEqual(basis_cache.folder, "test")
+        self.assertEqual(basis_cache.max_items, 10)
+        self.assertEqual(basis_cache.disk.folder, "test")
+        self.assertEqual(basis_cache.disk.max_size, 100)
+
+
+    def test_init_memory(self):
+        self.assertIsNone(self.basis_cache.disk)
+        self.assertEqual(len(self.basis_cache), 0)
+
+
+    def test_distribution_signature(self):
+        signature = distribution_signature(self.distribution)
+
+        self.assertEqual(signature,
+                         distribution_signature(cp.J(cp.Uniform(0.5, 1.5), cp.Normal(1, 2))))
+        self.assertNotEqual(signature,
+                            distribution_signature(cp.J(cp.Uniform(0.5, 1.5 + 1e-12), cp.Normal(1, 2))))
+        self.assertNotEqual(signature,
+                            distribution_signature(cp.J(cp.Normal(1, 2), cp.Uniform(0.5, 1.5))))
+
+
+    def test_distribution_signature_unknown(self):
+        class UnknownDistribution(object):
+            prm = {"function": len}
+
+        self.assertIsNone(distribution_signature(object()))
+        self.assertIsNone(distribution_signature(UnknownDistribution()))
+        self.assertIsNone(self.basis_cache.key("orth_ttr", UnknownDistribution(), 2))
+
+
+    def test_key(self):
+        key = self.basis_cache.key("orth_ttr", self.distribution, 2)
+
+        self.assertEqual(key, self.basis_cache.key("orth_ttr", self.distribution, 2))
+        self.assertNotEqual(key, self.basis_cache.key("orth_ttr", self.distribution, 3))
+        self.assertNotEqual(key, self.basis_cache.key("generate_quadrature", self.distribution, 2))
+
+
+    def test_memoize(self):
+        calls = []
+
+        def function(x):
+            calls.append(x)
+            return 2*x
+
+        self.assertEqual(self.basis_cache.memoize("key", function, 2), 4)
+        self.assertEqual(self.basis_cache.memoize("key", function, 2), 4)
+
+        self.assertEqual(calls, [2])
+        self.assertIn("key", self.basis_cache)
+
+
+    def test_memoize_none(self):
+        calls = []
+
+        def function(x):
+            calls.append(x)
+            return 2*x
+
+        self.assertEqual(self.basis_cache.memoize(None, function, 2), 4)
+        self.assertEqual(self.basis_cache.memoize(None, function, 2), 4)
+
+        self.assertEqual(calls, [2, 2])
+        self.assertEqual(len(self.basis_cache), 0)
+
+
+    def test_memoize_lru(self):
+        basis_cache = BasisCache(max_items=2)
+
+        basis_cache.memoize("a", lambda: 1)
+        basis_cache.memoize("b", lambda: 2)
+        basis_cache.memoize("a", lambda: 1)
+        basis_cache.memoize("c", lambda: 3)
+
+        self.assertEqual(len(basis_cache), 2)
+        self.assertIn("a", basis_cache)
+        self.assertNotIn("b", basis_cache)
+        self.assertIn("c", basis_cache)
+
+
+    def test_memoize_disabled(self):
+        basis_cache = BasisCache(max_items=0)
+
+        basis_cache.memoize("a", lambda: 1)
+
+        self.assertEqual(len(basis_cache), 0)
+        self.assertNotIn("a", basis_cache)
+
+
+    def test_memoize_disk(self):
+        basis_cache = BasisCache(folder=self.folder)
+        basis_cache.memoize("a", lambda: np.arange(3))
+
+        basis_cache = BasisCache(folder=self.folder)
+        self.assertIn("a", basis_cache)
+
+        result = basis_cache.memoize("a", lambda: None)
+        self.assertTrue(np.array_equal(result, np.arange(3)))
+
+
+    def test_orth_ttr(self):
+        P = self.basis_cache.orth_ttr(2, self.distribution)
+        P_2 = self.basis_cache.orth_ttr(2, self.distribution)
+
+        self.assertIs(P, P_2)
+        self.assertEqual(len(self.basis_cache), 1)
+
+        expected = cp.orth_ttr(2, self.distribution)
+        samples = self.distribution.sample(5)
+        self.assertTrue(np.allclose(P(*samples), expected(*samples)))
+
+
+    def test_generate_quadrature(self):
+        nodes, weights = self.basis_cache.generate_quadrature(3, self.distribution,
+                                                              rule="J", sparse=True)
+
+        expected_nodes, expected_weights = cp.generate_quadrature(3, self.distribution,
+                                                                  rule="J", sparse=True)
+
+        self.assertTrue(np.array_equal(nodes, expected_nodes))
+        self.assertTrue(np.array_equal(weights, expected_weights))
+
+        self.basis_cache.generate_quadrature(3, self.distribution, rule="J", sparse=False)
+        self.assertEqual(len(self.basis_cache), 2)
+
+
+    def test_saltelli_sample(self):
+        problem = {"num_vars": 2,
+                   "names": ["a", "b"],
+                   "bounds": [[0, 1]]*2}
+
+        samples = self.basis_cache.saltelli_sample(problem, 8)
+
+        self.assertEqual(samples.shape, (8*4, 2))
+        self.assertIs(samples, self.basis_cache.saltelli_sample(problem, 8))
+
+
+    def test_clear(self):
+        basis_cache = BasisCache(folder=self.folder)
+        basis_cache.memoize("a", lambda: 1)
+
+        basis_cache.clear()
+
+        self.assertEqual(len(basis_cache), 0)
+        self.assertNotIn("a", basis_cache)
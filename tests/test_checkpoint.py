@@ -0,0 +1,124 @@
+import unittest
+import os
+import shutil
+
+import numpy as np
+
+from uncertainpy.core import Checkpoint, Parallel
+from uncertainpy.features import Features
+
+from .testing_classes import TestingFeatures, TestingModel1d
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.output_test_dir = ".tests/"
+
+        if os.path.isdir(self.output_test_dir):
+            shutil.rmtree(self.output_test_dir)
+        os.makedirs(self.output_test_dir)
+
+        self.model = TestingModel1d()
+        self.features = TestingFeatures(features_to_run=["feature0d",
+                                                         "feature1d",
+                                                         "feature2d",
+                                                         "feature_invalid"])
+
+        self.parallel = Parallel(model=self.model,
+                                 features=self.features)
+
+        self.model_parameters = [{"a": 0, "b": 1}, {"a": 1, "b": 2}]
+        self.results = [self.parallel.run(parameters) for parameters in self.model_parameters]
+
+        self.filename = os.path.join(self.output_test_dir, "checkpoint.h5")
+        self.checkpoint = Checkpoint(self.filename)
+
+        self.keys = [self.checkpoint.key(self.model, self.features, parameters)
+                     for parameters in self.model_parameters]
+
+
+    def tearDown(self):
+        if os.path.isdir(self.output_test_dir):
+            shutil.rmtree(self.output_test_dir)
+
+
+    def test_init(self):
+        checkpoint = Checkpoint("test.exdir", backend="exdir")
+
+        self.assertEqual(checkpoint.filename, "test.exdir")
+        self.assertEqual(checkpoint.backend, "exdir")
+
+
+    def test_init_error(self):
+        with self.assertRaises(ValueError):
+            Checkpoint("test.h5", backend="not_existing")
+
+
+    def test_key(self):
+        self.assertNotEqual(self.keys[0], self.keys[1])
+
+        key = self.checkpoint.key(self.model, Features(), self.model_parameters[0])
+        self.assertNotEqual(self.keys[0], key)
+
+
+    def test_load_missing_file(self):
+        self.assertEqual(self.checkpoint.load(self.keys), {})
+
+
+    def assert_results(self, result, correct_result):
+        for feature in correct_result:
+            self.assertTrue(np.array_equal(result[feature]["values"],
+                                           correct_result[feature]["values"],
+                                           equal_nan=True))
+            self.assertTrue(np.array_equal(result[feature]["time"],
+                                           correct_result[feature]["time"],
+                                           equal_nan=True))
+
+
+    def test_save_load(self):
+        self.checkpoint.save(self.keys[:1], self.results[:1])
+
+        results = self.checkpoint.load(self.keys)
+
+        self.assertEqual(list(results.keys()), self.keys[:1])
+        self.assert_results(results[self.keys[0]], self.results[0])
+
+
+    def test_save_append(self):
+        self.checkpoint.save(self.keys[:1], self.results[:1])
+        self.checkpoint.save(self.keys, self.results)
+
+        results = self.checkpoint.load(self.keys)
+
+        self.assertEqual(len(results), 2)
+        self.assert_results(results[self.keys[0]], self.results[0])
+        self.assert_results(results[self.keys[1]], self.results[1])
+
+
+    def test_save_load_irregular(self):
+        result = {"feature_irregular": {"values": [np.arange(2), np.arange(3)],
+                                        "time": np.nan}}
+
+        self.checkpoint.save(["irregular"], [result])
+        loaded = self.checkpoint.load(["irregular"])["irregular"]
+
+        self.assertTrue(np.array_equal(loaded["feature_irregular"]["values"][0], np.arange(2)))
+        self.assertTrue(np.array_equal(loaded["feature_irregular"]["values"][1], np.arange(3)))
+        self.assertTrue(np.isnan(loaded["feature_irregular"]["time"]))
+
+
+    def test_save_load_exdir(self):
+        checkpoint = Checkpoint(os.path.join(self.output_test_dir, "checkpoint.exdir"))
+
+        checkpoint.save(self.keys, self.results)
+        results = checkpoint.load(self.keys)
+
+        self.assert_results(results[self.keys[1]], self.results[1])
+
+
+    def test_clear(self):
+        self.checkpoint.save(self.keys, self.results)
+        self.checkpoint.clear()
+
+        self.assertFalse(os.path.exists(self.filename))
+        self.assertEqual(self.checkpoint.load(self.keys), {})
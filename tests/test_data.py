@@ -24,7 +24,15 @@ class TestDataFeature(unittest.TestCase):
         self.statistical_metrics = ["evaluations", "time", "mean", "variance",
                                     "percentile_5", "percentile_95",
                                     "sobol_first", "sobol_first_average",
-                                    "sobol_total", "sobol_total_average"]
+                                    "sobol_total", "sobol_total_average",
+                                    "sobol_second", "loo_error",
+                                    "mean_confidence_interval",
+                                    "variance_confidence_interval",
+                                    "percentile_5_confidence_interval",
+                                    "percentile_95_confidence_interval",
+                                    "sobol_first_confidence_interval",
+                                    "sobol_total_confidence_interval",
+                                    "sobol_second_confidence_interval"]
 
 
     def tearDown(self):
@@ -125,6 +133,53 @@ class TestDataFeature(unittest.TestCase):
         self.assertIsNone(self.data_feature.ndim())
 
 
+    def test_evaluations_regular(self):
+        self.data_feature.evaluations = [[1, 2, 3], [4, 5, 6]]
+
+        self.assertIsInstance(self.data_feature.evaluations, np.ndarray)
+        self.assertEqual(self.data_feature.evaluations.dtype, np.float64)
+        self.assertTrue(self.data_feature.evaluations.flags["C_CONTIGUOUS"])
+        self.assertTrue(np.array_equal(self.data_feature.evaluations,
+                                       [[1, 2, 3], [4, 5, 6]]))
+
+
+    def test_evaluations_irregular(self):
+        evaluations = [[1, 2, 3], [4, 5]]
+        self.data_feature.evaluations = evaluations
+
+        self.assertIsInstance(self.data_feature.evaluations, list)
+        self.assertEqual(self.data_feature.evaluations, evaluations)
+
+
+    def test_mask(self):
+        self.assertIsNone(self.data_feature.mask)
+
+        self.data_feature.evaluations = [[1, 2, 3], [np.nan, 5, 6], [7, 8, 9]]
+        self.assertTrue(np.array_equal(self.data_feature.mask, [True, False, True]))
+
+        self.data_feature.evaluations = [1, np.nan, 2]
+        self.assertTrue(np.array_equal(self.data_feature.mask, [True, False, True]))
+
+        self.data_feature.evaluations = [[1, 2, 3], np.nan, [4, 5]]
+        self.assertTrue(np.array_equal(self.data_feature.mask, [True, False, True]))
+
+        self.data_feature.evaluations = None
+        self.assertIsNone(self.data_feature.mask)
+
+
+    def test_mask_stored(self):
+        self.data_feature.evaluations = [[1, 2, 3], [np.nan, 5, 6]]
+        mask = self.data_feature.mask
+
+        self.assertIs(self.data_feature.mask, mask)
+
+
+    def test_mask_not_metric(self):
+        self.data_feature.evaluations = [1, 2]
+
+        self.assertNotIn("mask", self.data_feature.get_metrics())
+
+
     def test_contains(self):
         self.assertFalse("error" in self.data_feature)
 
@@ -244,6 +299,42 @@ class TestData(unittest.TestCase):
         return data
 
 
+    def test_save_load_nodes(self):
+        self.setup_mock_data(self.data)
+        self.data.nodes = np.array([[0.1, 0.2, 0.3], [1., 2., 3.]])
+        self.data.sampling_rule = "halton"
+        self.data.rosenblatt = True
+
+        for backend, extension in [("hdf5", ".h5"), ("exdir", ".exdir")]:
+            self.data.backend = backend
+            filename = os.path.join(self.output_test_dir, "test_save_nodes" + extension)
+
+            self.data.save(filename)
+
+            new_data = Data(filename, backend=backend, logger_level="error")
+
+            self.assertTrue(np.array_equal(new_data.nodes, self.data.nodes))
+            self.assertEqual(new_data.sampling_rule, "halton")
+            self.assertTrue(new_data.rosenblatt)
+            self.assertNotIn("nodes", new_data)
+            self.assertEqual(sorted(new_data.data.keys()), sorted(self.data.data.keys()))
+
+
+    def test_save_nodes_hammersley(self):
+        self.setup_mock_data(self.data)
+        self.data.nodes = np.array([[0.1, 0.2, 0.3], [1., 2., 3.]])
+        self.data.sampling_rule = "hammersley"
+
+        filename = os.path.join(self.output_test_dir, "test_save_nodes.h5")
+        self.data.save(filename)
+
+        new_data = Data(filename, logger_level="error")
+
+        self.assertTrue(np.array_equal(new_data.nodes, self.data.nodes))
+        self.assertEqual(new_data.sampling_rule, "hammersley")
+        self.assertFalse(new_data.rosenblatt)
+
+
     def test_save_irregular(self):
         self.data.add_features(["feature1d", "TestingModel1d"])
 
@@ -542,6 +633,9 @@ class TestData(unittest.TestCase):
         self.data.incomplete = -1
         self.data.method = -1
         self.data.seed = -1
+        self.data.nodes = -1
+        self.data.sampling_rule = -1
+        self.data.rosenblatt = -1
 
         self.data.clear()
 
@@ -552,6 +646,9 @@ class TestData(unittest.TestCase):
         self.assertEqual(self.data.model_name, "")
         self.assertEqual(self.data.method, "")
         self.assertEqual(self.data.seed, "")
+        self.assertIsNone(self.data.nodes)
+        self.assertEqual(self.data.sampling_rule, "")
+        self.assertFalse(self.data.rosenblatt)
 
 
     def test_ndim(self):
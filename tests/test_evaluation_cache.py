@@ -0,0 +1,137 @@
+import unittest
+import os
+import shutil
+
+import numpy as np
+
+from uncertainpy.core import EvaluationCache
+from uncertainpy.models import Model
+
+from .testing_classes import TestingModel1d, model_function
+
+
+class TestEvaluationCache(unittest.TestCase):
+    def setUp(self):
+        self.output_test_dir = ".tests/"
+
+        if os.path.isdir(self.output_test_dir):
+            shutil.rmtree(self.output_test_dir)
+        os.makedirs(self.output_test_dir)
+
+        self.folder = os.path.join(self.output_test_dir, "cache")
+        self.cache = EvaluationCache(folder=self.folder)
+
+        self.model = TestingModel1d()
+        self.model_result = self.model.evaluate(a=1, b=2)
+
+
+    def tearDown(self):
+        if os.path.isdir(self.output_test_dir):
+            shutil.rmtree(self.output_test_dir)
+
+
+    def test_init(self):
+        cache = EvaluationCache(folder="test", max_size=10)
+
+        self.assertEqual(cache.folder, "test")
+        self.assertEqual(cache.max_size, 10)
+
+
+    def test_key(self):
+        key = self.cache.key(self.model, {"a": 1, "b": 2})
+
+        self.assertEqual(key, self.cache.key(self.model, {"b": 2, "a": 1}))
+        self.assertEqual(key, self.cache.key(self.model, {"a": np.float64(1), "b": 2}))
+        self.assertNotEqual(key, self.cache.key(self.model, {"a": 1, "b": 2 + 1e-15}))
+
+
+    def test_key_model_kwargs(self):
+        model = Model(model_function, c=1)
+        key = self.cache.key(model, {"a": 1, "b": 2})
+
+        model.model_kwargs = {"c": 2}
+        self.assertNotEqual(key, self.cache.key(model, {"a": 1, "b": 2}))
+
+
+    def test_key_model(self):
+        key = self.cache.key(self.model, {"a": 1, "b": 2})
+
+        self.assertNotEqual(key, self.cache.key(Model(model_function), {"a": 1, "b": 2}))
+
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get("missing"))
+
+
+    def test_set_get(self):
+        key = self.cache.key(self.model, {"a": 1, "b": 2})
+        self.cache.set(key, self.model_result)
+
+        self.assertIn(key, self.cache)
+        self.assertEqual(len(self.cache), 1)
+
+        time, values = self.cache.get(key)
+
+        self.assertTrue(np.array_equal(time, self.model_result[0]))
+        self.assertTrue(np.array_equal(values, self.model_result[1]))
+
+
+    def test_evict(self):
+        self.cache.set("a", self.model_result)
+        size = self.cache.size()
+
+        os.utime(self.cache.path("a"), (0, 0))
+
+        self.cache.max_size = size + size//2
+        self.cache.set("b", self.model_result)
+
+        self.assertNotIn("a", self.cache)
+        self.assertIn("b", self.cache)
+
+
+    def test_evict_running_size(self):
+        self.cache.set("a", self.model_result)
+        size = self.cache.size()
+
+        scans = []
+        entries = self.cache._entries
+
+        def count_entries():
+            scans.append(1)
+            return entries()
+
+        self.cache._entries = count_entries
+
+        self.cache.set("b", self.model_result)
+        self.cache.set("b", self.model_result)
+        self.assertEqual(len(scans), 0)
+
+        os.utime(self.cache.path("a"), (0, 0))
+        os.utime(self.cache.path("b"), (0, 0))
+
+        self.cache.max_size = size + size//2
+        self.cache.set("c", self.model_result)
+
+        self.assertEqual(len(scans), 1)
+        self.assertNotIn("a", self.cache)
+        self.assertLessEqual(self.cache.size(), self.cache.max_size)
+        self.assertIn("c", self.cache)
+
+
+    def test_evict_none(self):
+        self.cache.max_size = None
+
+        self.cache.set("a", self.model_result)
+        self.cache.set("b", self.model_result)
+
+        self.assertEqual(len(self.cache), 2)
+
+
+    def test_clear(self):
+        self.cache.set("a", self.model_result)
+        self.cache.set("b", self.model_result)
+
+        self.cache.clear()
+
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.size(), 0)
@@ -0,0 +1,121 @@
+import unittest
+
+import numpy as np
+import multiprocess as mp
+
+from uncertainpy.core import Executor, SerialExecutor, ProcessExecutor
+from uncertainpy.core import ThreadExecutor, DistributedExecutor
+from uncertainpy.core import Parallel
+
+from .testing_classes import TestingModel1d
+
+
+def square(x):
+    return x**2
+
+
+class TestExecutors(unittest.TestCase):
+    def setUp(self):
+        self.arguments = [0, 1, 2, 3, 4]
+        self.correct = [0, 1, 4, 9, 16]
+
+
+    def test_executor_map(self):
+        with self.assertRaises(NotImplementedError):
+            Executor().map(square, self.arguments)
+
+
+    def test_executor_nr_workers(self):
+        self.assertEqual(Executor().nr_workers, 1)
+        self.assertEqual(Executor(CPUs=3).nr_workers, 3)
+
+
+    def test_serial_executor(self):
+        executor = SerialExecutor(CPUs=4)
+
+        self.assertEqual(list(executor.map(square, self.arguments)), self.correct)
+        self.assertEqual(executor.nr_workers, 1)
+
+
+    def test_process_executor(self):
+        with ProcessExecutor(CPUs=2) as executor:
+            self.assertEqual(list(executor.map(square, self.arguments)), self.correct)
+            self.assertEqual(executor.nr_workers, 2)
+
+        self.assertIsNone(executor._pool)
+
+
+    def test_process_executor_cpus_none(self):
+        executor = ProcessExecutor()
+
+        self.assertEqual(executor.CPUs, mp.cpu_count())
+
+
+    def test_process_executor_reuse_pool(self):
+        executor = ProcessExecutor(CPUs=2)
+
+        list(executor.map(square, self.arguments))
+        pool = executor.pool
+
+        self.assertEqual(list(executor.map(square, self.arguments)), self.correct)
+        self.assertIs(executor.pool, pool)
+
+        executor.close()
+        self.assertIsNone(executor._pool)
+
+        # Closing twice should not fail
+        executor.close()
+
+
+    def test_thread_executor(self):
+        with ThreadExecutor(CPUs=2) as executor:
+            self.assertEqual(list(executor.map(square, self.arguments)), self.correct)
+
+
+    def test_distributed_executor(self):
+        with DistributedExecutor(CPUs=2) as executor:
+            self.assertEqual(list(executor.map(square, self.arguments)), self.correct)
+
+        self.assertIsNone(executor._executor)
+
+
+    def test_distributed_executor_external(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        external = ThreadPoolExecutor(max_workers=2)
+
+        executor = DistributedExecutor(executor=external, CPUs=2)
+        self.assertEqual(list(executor.map(square, self.arguments)), self.correct)
+
+        # An executor given by the user is not shut down
+        executor.close()
+        self.assertIs(executor.executor, external)
+
+        external.shutdown()
+
+
+    def test_distributed_executor_nr_workers(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        external = ThreadPoolExecutor(max_workers=3)
+
+        executor = DistributedExecutor(executor=external)
+        self.assertEqual(executor.nr_workers, 3)
+
+        external.shutdown()
+
+        with self.assertRaises(ValueError):
+            DistributedExecutor(executor=object())
+
+
+    def test_distributed_executor_parallel(self):
+        parallel = Parallel(model=TestingModel1d(), logger_level="error")
+
+        with DistributedExecutor(CPUs=2) as executor:
+            results = list(executor.map(parallel.run_batch, [[{"a": 0, "b": 1}],
+                                                             [{"a": 1, "b": 2}]]))
+
+        self.assertTrue(np.array_equal(results[0][0]["TestingModel1d"]["values"],
+                                       np.arange(0, 10) + 1))
+        self.assertTrue(np.array_equal(results[1][0]["TestingModel1d"]["values"],
+                                       np.arange(0, 10) + 3))
@@ -0,0 +1,149 @@
+import unittest
+
+import numpy as np
+
+from uncertainpy.core import IncrementalLeastSquares
+from uncertainpy.core.least_squares import tikhonov_coefficients, tikhonov_parameter
+from uncertainpy.core.least_squares import leave_one_out_error
+
+
+class TestIncrementalLeastSquares(unittest.TestCase):
+    def setUp(self):
+        self.nr_polynomials = 4
+        self.nr_nodes = 40
+
+        np.random.seed(10)
+        self.vandermonde = np.random.rand(self.nr_nodes, self.nr_polynomials)
+        self.evaluations = np.random.rand(self.nr_nodes, 3, 2)
+
+        self.least_squares = IncrementalLeastSquares(self.nr_polynomials)
+
+
+    def solve_svd(self, vandermonde, evaluations):
+        U, s, Vt = np.linalg.svd(vandermonde, full_matrices=False)
+
+        rhs = evaluations.reshape(len(evaluations), -1)
+        projection = U.T.dot(rhs)
+        outside = np.sum(np.maximum(np.sum(rhs**2, axis=0) - np.sum(projection**2, axis=0), 0))
+
+        coefficients = tikhonov_coefficients(s, Vt, projection, outside, len(vandermonde))
+
+        return coefficients.reshape((vandermonde.shape[1],) + evaluations.shape[1:])
+
+
+    def test_init(self):
+        self.assertEqual(self.least_squares.nr_polynomials, 4)
+        self.assertEqual(self.least_squares.nr_nodes, 0)
+        self.assertIsNone(self.least_squares.shape)
+        self.assertIsNone(self.least_squares.solve())
+
+
+    def test_update(self):
+        self.least_squares.update(self.vandermonde, self.evaluations)
+
+        self.assertEqual(self.least_squares.nr_nodes, 40)
+        self.assertEqual(self.least_squares.shape, (3, 2))
+
+
+    def test_update_empty(self):
+        self.least_squares.update(np.zeros((0, 4)), np.zeros((0, 3, 2)))
+
+        self.assertEqual(self.least_squares.nr_nodes, 0)
+        self.assertIsNone(self.least_squares.shape)
+
+
+    def test_update_shape_error(self):
+        self.least_squares.update(self.vandermonde, self.evaluations)
+
+        with self.assertRaises(ValueError):
+            self.least_squares.update(self.vandermonde, self.evaluations[:, 0])
+
+
+    def test_solve(self):
+        self.least_squares.update(self.vandermonde, self.evaluations)
+
+        coefficients = self.least_squares.solve()
+        expected = self.solve_svd(self.vandermonde, self.evaluations)
+
+        self.assertEqual(coefficients.shape, (4, 3, 2))
+        self.assertTrue(np.allclose(coefficients, expected))
+
+
+    def test_solve_batches(self):
+        for start in range(0, self.nr_nodes, 7):
+            self.least_squares.update(self.vandermonde[start:start + 7],
+                                      self.evaluations[start:start + 7])
+
+        coefficients = self.least_squares.solve()
+        expected = self.solve_svd(self.vandermonde, self.evaluations)
+
+        self.assertEqual(self.least_squares.nr_nodes, 40)
+        self.assertTrue(np.allclose(coefficients, expected))
+
+
+    def test_solve_exact(self):
+        coefficients = np.arange(1, 5, dtype=float)
+        evaluations = self.vandermonde.dot(coefficients)
+
+        self.least_squares.update(self.vandermonde, evaluations)
+
+        self.assertTrue(np.allclose(self.least_squares.solve(), coefficients, atol=1e-6))
+
+
+
+    def test_leave_one_out_error(self):
+        for start in range(0, self.nr_nodes, 7):
+            self.least_squares.update(self.vandermonde[start:start + 7],
+                                      self.evaluations[start:start + 7])
+
+        error = self.least_squares.leave_one_out_error(self.vandermonde, self.evaluations)
+
+        U, s, Vt = np.linalg.svd(self.vandermonde, full_matrices=False)
+        rhs = self.evaluations.reshape(self.nr_nodes, -1)
+        projection = U.T.dot(rhs)
+        outside = np.sum(np.maximum(np.sum(rhs**2, axis=0) - np.sum(projection**2, axis=0), 0))
+
+        alpha = tikhonov_parameter(s, projection, outside, self.nr_nodes)
+        filters = s**2/(s**2 + alpha)
+
+        residual = rhs - U.dot(filters[:, np.newaxis]*projection)
+        leverage = np.sum(U**2*filters, axis=1)
+
+        self.assertTrue(np.isclose(error, leave_one_out_error(rhs, residual, leverage)))
+
+
+    def test_leave_one_out_error_exact(self):
+        evaluations = self.vandermonde.dot(np.arange(1, 5, dtype=float))
+
+        self.least_squares.update(self.vandermonde, evaluations)
+
+        self.assertLess(self.least_squares.leave_one_out_error(self.vandermonde, evaluations), 1e-6)
+
+
+    def test_leave_one_out_error_empty(self):
+        self.assertIsNone(self.least_squares.leave_one_out_error(self.vandermonde, self.evaluations))
+
+
+    def test_leave_one_out_error_rows(self):
+        self.least_squares.update(self.vandermonde, self.evaluations)
+
+        with self.assertRaises(ValueError):
+            self.least_squares.leave_one_out_error(self.vandermonde[:10], self.evaluations[:10])
+
+
+
+class TestTikhonovCoefficients(unittest.TestCase):
+    def test_tikhonov_coefficients(self):
+        np.random.seed(10)
+        vandermonde = np.random.rand(20, 3)
+        rhs = vandermonde.dot(np.random.rand(3, 2))
+
+        U, s, Vt = np.linalg.svd(vandermonde, full_matrices=False)
+        projection = U.T.dot(rhs)
+        outside = np.sum(rhs**2) - np.sum(projection**2)
+
+        coefficients = tikhonov_coefficients(s, Vt, projection, outside, 20)
+        expected = np.linalg.lstsq(vandermonde, rhs, rcond=None)[0]
+
+        self.assertEqual(coefficients.shape, (3, 2))
+        self.assertTrue(np.allclose(coefficients, expected, atol=1e-6))
@@ -0,0 +1,94 @@
+import unittest
+import pickle
+
+import numpy as np
+
+from uncertainpy.core import ModelParameters
+
+
+class TestModelParameters(unittest.TestCase):
+    def setUp(self):
+        self.values = np.array([[0., 1.], [1., 2.], [2., 3.]])
+
+        self.model_parameters = ModelParameters(["a", "b"],
+                                                self.values,
+                                                {"c": 4})
+
+
+    def test_init(self):
+        self.assertEqual(self.model_parameters.names, ["a", "b"])
+        self.assertTrue(np.array_equal(self.model_parameters.values, self.values))
+        self.assertEqual(self.model_parameters.constants, {"c": 4})
+
+        model_parameters = ModelParameters(["a"], [[0], [1]])
+        self.assertEqual(model_parameters.constants, {})
+
+
+    def test_init_error(self):
+        with self.assertRaises(ValueError):
+            ModelParameters(["a", "b"], [0, 1, 2])
+
+        with self.assertRaises(ValueError):
+            ModelParameters(["a"], self.values)
+
+
+    def test_len(self):
+        self.assertEqual(len(self.model_parameters), 3)
+
+
+    def test_getitem(self):
+        self.assertEqual(self.model_parameters[1], {"a": 1, "b": 2, "c": 4})
+        self.assertEqual(self.model_parameters[-1], {"a": 2, "b": 3, "c": 4})
+
+
+    def test_getitem_slice(self):
+        model_parameters = self.model_parameters[1:]
+
+        self.assertIsInstance(model_parameters, ModelParameters)
+        self.assertEqual(model_parameters, [{"a": 1, "b": 2, "c": 4},
+                                            {"a": 2, "b": 3, "c": 4}])
+
+
+    def test_getitem_indices(self):
+        model_parameters = self.model_parameters[[2, 0]]
+
+        self.assertIsInstance(model_parameters, ModelParameters)
+        self.assertEqual(model_parameters, [{"a": 2, "b": 3, "c": 4},
+                                            {"a": 0, "b": 1, "c": 4}])
+
+        self.assertEqual(len(self.model_parameters[[]]), 0)
+
+
+    def test_iter(self):
+        self.assertEqual(list(self.model_parameters), [{"a": 0, "b": 1, "c": 4},
+                                                       {"a": 1, "b": 2, "c": 4},
+                                                       {"a": 2, "b": 3, "c": 4}])
+
+
+    def test_eq(self):
+        self.assertEqual(self.model_parameters, ModelParameters(["a", "b"], self.values, {"c": 4}))
+        self.assertNotEqual(self.model_parameters, [{"a": 0, "b": 1, "c": 4}])
+        self.assertNotEqual(self.model_parameters, 2)
+
+
+    def test_uncertain_before_constants(self):
+        model_parameters = ModelParameters(["a"], [[0], [1]], {"a": 10, "b": 2})
+
+        self.assertEqual(model_parameters[0], {"a": 0, "b": 2})
+        self.assertTrue(np.array_equal(model_parameters.arrays()["a"], [0, 1]))
+
+
+    def test_arrays(self):
+        arrays = self.model_parameters[:2].arrays()
+
+        self.assertEqual(sorted(arrays.keys()), ["a", "b", "c"])
+        self.assertTrue(np.array_equal(arrays["a"], [0, 1]))
+        self.assertTrue(np.array_equal(arrays["b"], [1, 2]))
+        self.assertTrue(np.array_equal(arrays["c"], [4, 4]))
+
+
+    def test_pickle(self):
+        model_parameters = pickle.loads(pickle.dumps(self.model_parameters[1:]))
+
+        self.assertEqual(model_parameters, [{"a": 1, "b": 2, "c": 4},
+                                            {"a": 2, "b": 3, "c": 4}])
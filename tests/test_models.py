@@ -17,6 +17,7 @@ from .models import brunel_network
 
 from .testing_classes import TestingModel0d, TestingModel1d, TestingModel2d
 from .testing_classes import TestingModelAdaptive, model_function
+from .testing_classes import model_function_vectorized
 
 
 folder = os.path.dirname(os.path.realpath(__file__))
@@ -81,6 +82,7 @@ class TestModel(unittest.TestCase):
         self.assertTrue(model.interpolate)
         self.assertEqual(model.name, "f")
         self.assertEqual(model.suppress_graphics, False)
+        self.assertEqual(model.vectorized, False)
         self.assertEqual(model.model_kwargs, {"test": 12})
 
 
@@ -121,6 +123,48 @@ class TestModel(unittest.TestCase):
 
 
 
+    def test_evaluate_batch(self):
+        model = Model(model_function_vectorized, vectorized=True, logger_level="error")
+
+        model_results = model.evaluate_batch(a=np.array([0, 1, 2]), b=np.array([1, 2, 3]))
+
+        self.assertTrue(model.vectorized)
+        self.assertEqual(len(model_results), 3)
+        for i, (time, values) in enumerate(model_results):
+            self.assertTrue(np.array_equal(time, np.arange(0, 10)))
+            self.assertTrue(np.array_equal(values, np.arange(0, 10) + 2*i + 1))
+
+
+    def test_evaluate_batch_kwargs(self):
+        def test_model(a=10, b=11, c=12):
+            return [(a_i + b_i, c) for a_i, b_i in zip(a, b)]
+
+        model = Model(test_model, vectorized=True, c=22)
+
+        model_results = model.evaluate_batch(a=np.array([0, 1]), b=np.array([1, 1]))
+
+        self.assertEqual(model_results, [(1, 22), (2, 22)])
+
+
+    def test_evaluate_batch_error(self):
+        def test_model(a=10, b=11):
+            return [(a[0], b[0])]
+
+        model = Model(test_model, vectorized=True)
+
+        with self.assertRaises(ValueError):
+            model.evaluate_batch(a=np.array([0, 1]), b=np.array([1, 1]))
+
+        def test_model(a=10, b=11):
+            return np.array([a, b])
+
+        model = Model(test_model, vectorized=True)
+
+        with self.assertRaises(ValueError):
+            model.evaluate_batch(a=np.array([0, 1]), b=np.array([1, 1]))
+
+
+
     def test_validate_run(self):
         self.model.validate_run(("t", "U"))
         self.model.validate_run((1, 2, 3))
@@ -0,0 +1,120 @@
+import unittest
+
+import numpy as np
+
+from uncertainpy.core import OnlineStatistics, UncertaintyCalculations
+from uncertainpy.models import Model
+
+
+class TestOnlineStatistics(unittest.TestCase):
+    def setUp(self):
+        self.nr_uncertain_parameters = 3
+        self.nr_samples = 30
+
+        np.random.seed(10)
+        self.evaluations = np.random.rand(self.nr_samples*(self.nr_uncertain_parameters + 2), 4)
+
+        self.uncertainty_calculations = UncertaintyCalculations(model=Model(lambda: None),
+                                                                logger_level="error")
+
+        self.online_statistics = OnlineStatistics(self.nr_uncertain_parameters)
+
+
+    def separate(self, evaluations, nr_samples):
+        return self.uncertainty_calculations.separate_output_values(evaluations,
+                                                                    self.nr_uncertain_parameters,
+                                                                    nr_samples)
+
+
+    def test_init(self):
+        self.assertEqual(self.online_statistics.nr_uncertain_parameters, 3)
+        self.assertEqual(self.online_statistics.nr_samples, 0)
+        self.assertIsNone(self.online_statistics.mean)
+        self.assertIsNone(self.online_statistics.variance)
+        self.assertIsNone(self.online_statistics.sobol_first)
+        self.assertIsNone(self.online_statistics.sobol_total)
+
+
+    def test_update(self):
+        self.online_statistics.update(*self.separate(self.evaluations, self.nr_samples))
+
+        A, B = self.separate(self.evaluations, self.nr_samples)[:2]
+        values = np.concatenate([A, B])
+
+        self.assertEqual(self.online_statistics.nr_samples, self.nr_samples)
+        self.assertTrue(np.allclose(self.online_statistics.mean, np.mean(values, 0)))
+        self.assertTrue(np.allclose(self.online_statistics.variance, np.var(values, 0)))
+
+
+    def test_update_batches(self):
+        step = self.nr_uncertain_parameters + 2
+
+        for start, stop in [(0, 10), (10, 11), (11, 30)]:
+            batch = self.evaluations[start*step:stop*step]
+            self.online_statistics.update(*self.separate(batch, stop - start))
+
+        A, B = self.separate(self.evaluations, self.nr_samples)[:2]
+        values = np.concatenate([A, B])
+
+        sobol_first, sobol_total = self.uncertainty_calculations.mc_calculate_sobol(self.evaluations,
+                                                                                    self.nr_uncertain_parameters,
+                                                                                    self.nr_samples)
+
+        self.assertEqual(self.online_statistics.nr_samples, self.nr_samples)
+        self.assertTrue(np.allclose(self.online_statistics.mean, np.mean(values, 0)))
+        self.assertTrue(np.allclose(self.online_statistics.variance, np.var(values, 0)))
+        self.assertTrue(np.allclose(self.online_statistics.sobol_first, sobol_first))
+        self.assertTrue(np.allclose(self.online_statistics.sobol_total, sobol_total))
+
+
+    def test_update_empty(self):
+        self.online_statistics.update(np.zeros((0, 4)), np.zeros((0, 4)), np.zeros((0, 3, 4)))
+
+        self.assertEqual(self.online_statistics.nr_samples, 0)
+        self.assertIsNone(self.online_statistics.mean)
+
+
+    def test_confidence_intervals_none(self):
+        self.assertIsNone(self.online_statistics.confidence_intervals())
+
+        self.online_statistics.update(*self.separate(self.evaluations, self.nr_samples))
+        self.assertIsNone(self.online_statistics.confidence_intervals())
+
+
+    def test_confidence_intervals(self):
+        np.random.seed(10)
+        online_statistics = OnlineStatistics(self.nr_uncertain_parameters, nr_bootstrap=200)
+
+        step = self.nr_uncertain_parameters + 2
+        for start, stop in [(0, 10), (10, 30)]:
+            batch = self.evaluations[start*step:stop*step]
+            online_statistics.update(*self.separate(batch, stop - start))
+
+        confidence_intervals = online_statistics.confidence_intervals(confidence_level=0.95)
+
+        self.assertEqual(sorted(confidence_intervals.keys()),
+                         ["mean", "sobol_first", "sobol_total", "variance"])
+
+        for metric in confidence_intervals:
+            lower, upper = confidence_intervals[metric]
+            estimate = getattr(online_statistics, metric)
+
+            self.assertEqual(lower.shape, estimate.shape)
+            self.assertTrue(np.all(lower <= upper))
+
+        lower, upper = confidence_intervals["mean"]
+        self.assertTrue(np.all(lower <= online_statistics.mean))
+        self.assertTrue(np.all(upper >= online_statistics.mean))
+
+
+    def test_confidence_intervals_one_parameter(self):
+        online_statistics = OnlineStatistics(1, nr_bootstrap=50)
+
+        evaluations = np.random.rand(3*20)
+        A, B, AB = self.uncertainty_calculations.separate_output_values(evaluations, 1, 20)[:3]
+        online_statistics.update(A, B, AB)
+
+        confidence_intervals = online_statistics.confidence_intervals()
+
+        self.assertEqual(sorted(confidence_intervals.keys()), ["mean", "variance"])
+        self.assertEqual(confidence_intervals["mean"][0].shape, ())
@@ -0,0 +1,130 @@
+import unittest
+import os
+import pickle
+
+import numpy as np
+
+from uncertainpy.core import OutputArena, SharedArray
+
+
+class TestOutputArena(unittest.TestCase):
+    def setUp(self):
+        self.result = {"model": {"values": np.arange(0, 10) + 1.,
+                                 "time": np.arange(0, 10)},
+                       "feature0d": {"values": 1,
+                                     "time": np.nan},
+                       "feature2d": {"values": np.ones((2, 3)),
+                                     "time": np.nan},
+                       "feature_interpolate": {"values": np.arange(0, 10),
+                                               "time": np.arange(0, 10),
+                                               "interpolation": "spline"},
+                       "feature_invalid": {"values": np.nan,
+                                           "time": np.nan}}
+
+        self.arena = OutputArena(self.result, 4)
+
+
+    def tearDown(self):
+        self.arena.close()
+
+
+    def create_result(self, i):
+        return {"model": {"values": np.arange(0, 10) + i,
+                          "time": np.arange(0, 10)},
+                "feature0d": {"values": i,
+                              "time": np.nan},
+                "feature2d": {"values": i*np.ones((2, 3)),
+                              "time": np.nan},
+                "feature_interpolate": {"values": np.arange(0, 10),
+                                        "time": np.arange(0, 10),
+                                        "interpolation": "spline"},
+                "feature_invalid": {"values": np.nan,
+                                    "time": np.nan}}
+
+
+    def test_init(self):
+        self.assertEqual(sorted(self.arena.layout.keys()), ["feature2d", "model"])
+        self.assertEqual(self.arena.layout["model"]["shape"], (10,))
+        self.assertEqual(self.arena.layout["feature2d"]["shape"], (2, 3))
+        self.assertIsNone(self.arena.layout["feature2d"]["time"])
+        self.assertEqual(self.arena.nr_rows, 4)
+        self.assertTrue(os.path.isdir(self.arena.folder))
+
+
+    def test_init_nan(self):
+        self.result["model"]["values"] = np.array([np.nan, 1])
+
+        with OutputArena(self.result, 4) as arena:
+            self.assertEqual(list(arena.layout.keys()), ["feature2d"])
+
+
+    def test_store(self):
+        results = self.arena.store([self.create_result(1), self.create_result(2)], 2)
+
+        self.assertIsInstance(results[0]["model"]["values"], SharedArray)
+        self.assertIsInstance(results[1]["model"]["time"], SharedArray)
+        self.assertIsInstance(results[1]["feature2d"]["values"], SharedArray)
+        self.assertTrue(np.isnan(results[1]["feature2d"]["time"]))
+        self.assertEqual(results[1]["feature0d"]["values"], 2)
+        self.assertTrue(np.array_equal(results[0]["feature_interpolate"]["values"], np.arange(0, 10)))
+        self.assertTrue(np.isnan(results[0]["feature_invalid"]["values"]))
+
+
+    def test_store_different(self):
+        result = self.create_result(1)
+        result["model"]["values"] = np.arange(0, 11)
+        result["feature2d"]["values"] = np.nan
+
+        time = np.arange(0, 10) + 0.5
+        result_time = self.create_result(2)
+        result_time["model"]["time"] = time
+
+        results = self.arena.store([result, result_time], 0)
+
+        self.assertTrue(np.array_equal(results[0]["model"]["values"], np.arange(0, 11)))
+        self.assertTrue(np.isnan(results[0]["feature2d"]["values"]))
+        self.assertIsInstance(results[1]["model"]["values"], SharedArray)
+        self.assertTrue(np.array_equal(results[1]["model"]["time"], time))
+
+
+    def test_load(self):
+        results = self.arena.store([self.create_result(1), self.create_result(2)], 2)
+        results = self.arena.load(results, 2)
+
+        for i, result in enumerate(results):
+            self.assertTrue(np.array_equal(result["model"]["values"], np.arange(0, 10) + i + 1))
+            self.assertTrue(np.array_equal(result["model"]["time"], np.arange(0, 10)))
+            self.assertTrue(np.array_equal(result["feature2d"]["values"], (i + 1)*np.ones((2, 3))))
+            self.assertEqual(result["feature0d"]["values"], i + 1)
+
+        self.arena.close()
+
+        self.assertTrue(np.array_equal(results[1]["model"]["values"], np.arange(0, 10) + 2))
+
+
+    def test_store_pickled(self):
+        arena = pickle.loads(pickle.dumps(self.arena))
+
+        self.assertEqual(arena._arrays, {})
+
+        results = arena.store([self.create_result(3)], 1)
+        results = self.arena.load(results, 1)
+
+        self.assertTrue(np.array_equal(results[0]["model"]["values"], np.arange(0, 10) + 3))
+
+
+    def test_store_missing_files(self):
+        self.arena.close()
+
+        results = self.arena.store([self.create_result(1)], 0)
+
+        self.assertTrue(np.array_equal(results[0]["model"]["values"], np.arange(0, 10) + 1))
+
+
+    def test_close(self):
+        self.arena.close()
+
+        self.assertFalse(os.path.isdir(self.arena.folder))
+
+        # Closing twice should not fail
+        self.arena.close()
@@ -6,12 +6,13 @@ import scipy.interpolate
 import numpy as np
 
 from xvfbwrapper import Xvfb
-from uncertainpy.core import Parallel
+from uncertainpy.core import Parallel, ModelParameters, OutputArena, SharedArray
 from uncertainpy.models import Model
 from uncertainpy.features import Features
 
 from .testing_classes import TestingFeatures
 from .testing_classes import TestingModel1d, model_function
+from .testing_classes import model_function_vectorized
 from .testing_classes import TestingModelNoTime
 from .testing_classes import TestingModelAdaptive
 from .testing_classes import PostprocessErrorNumpy
@@ -263,6 +264,68 @@ class TestParallel(unittest.TestCase):
 
 
 
+    def test_create_interpolations_interpolation_time(self):
+        results = {"TestingModel1d": {"values": np.arange(0, 10) + 1,
+                                      "time": np.arange(0, 10)},
+                   "feature_interpolate": {"values": np.arange(0, 10) + 1,
+                                           "time": np.arange(0, 10)},
+                   "feature_invalid": {"values": np.nan,
+                                       "time": np.nan}}
+
+        self.parallel.model.interpolate = True
+        self.parallel.interpolation_time = np.linspace(0, 9, 19)
+
+        results = self.parallel.create_interpolations(results)
+
+        for feature in ["TestingModel1d", "feature_interpolate"]:
+            self.assertNotIn("interpolation", results[feature])
+            self.assertTrue(np.array_equal(results[feature]["time"], np.linspace(0, 9, 19)))
+            self.assertTrue(np.allclose(results[feature]["values"], np.linspace(0, 9, 19) + 1))
+
+        self.assertNotIn("interpolation", results["feature_invalid"])
+
+
+    def test_create_interpolations_interpolation_time_dict(self):
+        results = {"TestingModel1d": {"values": np.arange(0, 10) + 1,
+                                      "time": np.arange(0, 10)},
+                   "feature_interpolate": {"values": np.arange(0, 10) + 1,
+                                           "time": np.arange(0, 10)}}
+
+        self.parallel.model.interpolate = True
+        self.parallel.interpolation_time = {"feature_interpolate": [0, 4.5]}
+
+        results = self.parallel.create_interpolations(results)
+
+        self.assertIsInstance(results["TestingModel1d"]["interpolation"],
+                              scipy.interpolate.fitpack2.UnivariateSpline)
+        self.assertNotIn("interpolation", results["feature_interpolate"])
+        self.assertTrue(np.allclose(results["feature_interpolate"]["values"], [1, 5.5]))
+
+
+    def test_create_interpolations_interpolation_time_nan(self):
+        results = {"feature_interpolate": {"values": np.array([1, np.nan, 3]),
+                                           "time": np.arange(0, 3)}}
+
+        self.parallel.interpolation_time = np.arange(0, 5)
+
+        results = self.parallel.create_interpolations(results)
+
+        self.assertTrue(np.array_equal(results["feature_interpolate"]["time"], np.arange(0, 5)))
+        self.assertEqual(len(results["feature_interpolate"]["values"]), 5)
+        self.assertTrue(np.all(np.isnan(results["feature_interpolate"]["values"])))
+
+
+    def test_target_time(self):
+        self.assertIsNone(self.parallel.target_time("feature_interpolate"))
+
+        self.parallel.interpolation_time = [0, 1]
+        self.assertTrue(np.array_equal(self.parallel.target_time("feature_interpolate"), [0, 1]))
+
+        self.parallel.interpolation_time = {"feature_interpolate": [0, 2]}
+        self.assertTrue(np.array_equal(self.parallel.target_time("feature_interpolate"), [0, 2]))
+        self.assertIsNone(self.parallel.target_time("TestingModel1d"))
+
+
     def test_interpolation_1d(self):
         results = {"TestingModel1d": {"values": np.arange(0, 10) + 1,
                                       "time": np.arange(0, 10)}}
@@ -404,6 +467,137 @@ class TestParallel(unittest.TestCase):
                               scipy.interpolate.fitpack2.UnivariateSpline)
 
 
+    def test_run_batch(self):
+        results = self.parallel.run_batch([{"a": 0, "b": 1}, {"a": 1, "b": 2}])
+
+        self.assertEqual(len(results), 2)
+        self.assertTrue(np.array_equal(results[0]["TestingModel1d"]["values"], np.arange(0, 10) + 1))
+        self.assertTrue(np.array_equal(results[1]["TestingModel1d"]["values"], np.arange(0, 10) + 3))
+        self.assertEqual(results[0]["feature0d"]["values"], 1)
+
+
+    def test_run_batch_vectorized(self):
+        calls = []
+
+        def vectorized_model(a=1, b=2):
+            calls.append((a, b))
+            return model_function_vectorized(a=a, b=b)
+
+        self.parallel.model = Model(vectorized_model, vectorized=True)
+
+        results = self.parallel.run_batch([{"a": 0, "b": 1}, {"a": 1, "b": 2}])
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(np.array_equal(calls[0][0], [0, 1]))
+        self.assertTrue(np.array_equal(calls[0][1], [1, 2]))
+
+        self.assertEqual(len(results), 2)
+        self.assertTrue(np.array_equal(results[0]["vectorized_model"]["values"], np.arange(0, 10) + 1))
+        self.assertTrue(np.array_equal(results[1]["vectorized_model"]["values"], np.arange(0, 10) + 3))
+        self.assertTrue(np.array_equal(results[1]["feature1d"]["values"], np.arange(0, 10)))
+        self.assertEqual(results[0]["feature0d"]["values"], 1)
+        self.assertIsInstance(results[1]["feature_interpolate"]["interpolation"],
+                              scipy.interpolate.fitpack2.UnivariateSpline)
+
+
+    def test_run_batch_model_parameters(self):
+        batch = ModelParameters(["a"], np.array([[0], [1]]), {"b": 1})
+
+        results = self.parallel.run_batch(batch)
+
+        self.assertEqual(len(results), 2)
+        self.assertTrue(np.array_equal(results[0]["TestingModel1d"]["values"], np.arange(0, 10) + 1))
+        self.assertTrue(np.array_equal(results[1]["TestingModel1d"]["values"], np.arange(0, 10) + 2))
+
+        self.parallel.model = Model(model_function_vectorized, vectorized=True)
+
+        results = self.parallel.run_batch(batch)
+
+        self.assertTrue(np.array_equal(results[0]["model_function_vectorized"]["values"], np.arange(0, 10) + 1))
+        self.assertTrue(np.array_equal(results[1]["model_function_vectorized"]["values"], np.arange(0, 10) + 2))
+
+
+    def test_run_batch_timed(self):
+        results, evaluation_time = self.parallel.run_batch_timed([{"a": 0, "b": 1}])
+
+        self.assertEqual(len(results), 1)
+        self.assertTrue(np.array_equal(results[0]["TestingModel1d"]["values"], np.arange(0, 10) + 1))
+        self.assertGreaterEqual(evaluation_time, 0)
+
+
+    def test_run_batch_vectorized_cache(self):
+        calls = []
+
+        def vectorized_model(a=1, b=2):
+            calls.append(len(a))
+            return model_function_vectorized(a=a, b=b)
+
+        folder = os.path.join(self.output_test_dir, "cache")
+
+        self.parallel.model = Model(vectorized_model, vectorized=True)
+        self.parallel.cache = folder
+
+        self.parallel.run_batch([{"a": 0, "b": 1}, {"a": 1, "b": 2}])
+        results = self.parallel.run_batch([{"a": 0, "b": 1}, {"a": 2, "b": 2},
+                                           {"a": 1, "b": 2}])
+
+        self.assertEqual(calls, [2, 1])
+        self.assertTrue(np.array_equal(results[0]["vectorized_model"]["values"], np.arange(0, 10) + 1))
+        self.assertTrue(np.array_equal(results[1]["vectorized_model"]["values"], np.arange(0, 10) + 4))
+        self.assertTrue(np.array_equal(results[2]["vectorized_model"]["values"], np.arange(0, 10) + 3))
+
+        self.parallel.run_batch([{"a": 0, "b": 1}])
+        self.assertEqual(calls, [2, 1])
+
+
+    def test_run_batch_shared(self):
+        result = self.parallel.run(self.model_parameters)
+
+        with OutputArena(result, 2) as arena:
+            results = self.parallel.run_batch_shared(([{"a": 0, "b": 1}, {"a": 1, "b": 2}], 0, arena))
+
+            self.assertEqual(len(results), 2)
+            self.assertIsInstance(results[1]["TestingModel1d"]["values"], SharedArray)
+            self.assertIsInstance(results[1]["feature2d"]["values"], SharedArray)
+            self.assertEqual(results[0]["feature0d"]["values"], 1)
+
+            results = arena.load(results, 0)
+
+        self.assertTrue(np.array_equal(results[0]["TestingModel1d"]["values"], np.arange(0, 10) + 1))
+        self.assertTrue(np.array_equal(results[1]["TestingModel1d"]["values"], np.arange(0, 10) + 3))
+        self.assertTrue(np.array_equal(results[1]["TestingModel1d"]["time"], np.arange(0, 10)))
+        self.assertIsInstance(results[1]["feature_interpolate"]["interpolation"],
+                              scipy.interpolate.fitpack2.UnivariateSpline)
+
+
+    def test_run_cache(self):
+        calls = []
+
+        def counting_model(a=1, b=2):
+            calls.append((a, b))
+            return np.arange(0, 10), np.arange(0, 10) + a + b
+
+        folder = os.path.join(self.output_test_dir, "cache")
+
+        self.parallel.model = Model(counting_model)
+        self.parallel.cache = folder
+
+        results_1 = self.parallel.run(self.model_parameters)
+        results_2 = self.parallel.run(self.model_parameters)
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(np.array_equal(results_1["counting_model"]["values"],
+                                       results_2["counting_model"]["values"]))
+
+        self.parallel.run({"a": 1, "b": 1})
+        self.assertEqual(len(calls), 2)
+
+
+    def test_cache_error(self):
+        with self.assertRaises(TypeError):
+            self.parallel.cache = 2
+
+
     def test_run_kwargs(self):
         def test_model(a=10, b=11, c=12):
             return a + b, c
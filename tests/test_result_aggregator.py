@@ -0,0 +1,141 @@
+import unittest
+
+import numpy as np
+
+from uncertainpy.core import ResultAggregator, Parallel
+from uncertainpy.features import Features
+
+from .testing_classes import TestingFeatures
+from .testing_classes import TestingModel1d, TestingModelAdaptive
+
+
+class TestResultAggregator(unittest.TestCase):
+    def setUp(self):
+        self.model = TestingModel1d()
+        self.features = TestingFeatures(features_to_run=["feature0d",
+                                                         "feature1d",
+                                                         "feature2d",
+                                                         "feature_invalid"])
+
+        self.parallel = Parallel(model=self.model,
+                                 features=self.features)
+
+        self.results = [self.parallel.run({"a": a, "b": a + 1}) for a in range(3)]
+
+        self.aggregator = ResultAggregator(model=self.model,
+                                           features=self.features,
+                                           nr_results=3,
+                                           logger_level="error")
+
+
+    def test_init(self):
+        self.assertEqual(self.aggregator.model, self.model)
+        self.assertEqual(self.aggregator.features, self.features)
+        self.assertEqual(self.aggregator.nr_results, 3)
+
+
+    def test_storage_mode(self):
+        self.assertEqual(self.aggregator.storage_mode("feature1d", np.arange(10)), "array")
+
+        self.aggregator.features.interpolate = ["feature1d", "feature2d", "feature0d"]
+
+        self.assertEqual(self.aggregator.storage_mode("feature1d", np.arange(10)), "interpolate")
+        self.assertEqual(self.aggregator.storage_mode("feature2d", np.ones((2, 10))), "list")
+        self.assertEqual(self.aggregator.storage_mode("feature0d", 1), "array")
+
+
+    def test_storage_mode_interpolation_time(self):
+        self.aggregator.features.interpolate = ["feature1d", "feature2d"]
+
+        self.assertEqual(self.aggregator.storage_mode("feature1d", np.arange(10), interpolation=False), "array")
+        self.assertEqual(self.aggregator.storage_mode("feature2d", np.ones((2, 10)), interpolation=False), "list")
+
+
+    def test_storage_mode_ignore(self):
+        self.model.ignore = True
+
+        self.assertEqual(self.aggregator.storage_mode("TestingModel1d", np.arange(10)), "list")
+
+
+    def test_to_data(self):
+        # Add the results out of order
+        for i in [2, 0, 1]:
+            self.aggregator.add(i, self.results[i])
+
+        data = self.aggregator.to_data()
+
+        self.assertEqual(data.model_name, "TestingModel1d")
+        self.assertEqual(data.error, [])
+        self.assertEqual(set(data.keys()),
+                         set(["TestingModel1d", "feature0d", "feature1d",
+                              "feature2d", "feature_invalid"]))
+
+        evaluations = data["TestingModel1d"].evaluations
+        self.assertIsInstance(evaluations, np.ndarray)
+        self.assertEqual(evaluations.shape, (3, 10))
+        for i in range(3):
+            self.assertTrue(np.array_equal(evaluations[i], np.arange(0, 10) + 2*i + 1))
+
+        self.assertTrue(np.array_equal(data["TestingModel1d"].time, np.arange(0, 10)))
+
+        self.assertTrue(np.array_equal(data["feature0d"].evaluations, [1, 1, 1]))
+        self.assertTrue(np.isnan(data["feature0d"].time))
+
+        self.assertEqual(data["feature2d"].evaluations.shape, (3, 2, 10))
+        self.assertEqual(data["feature1d"]["labels"], ["feature1d x", "feature1d y"])
+
+        self.assertTrue(np.all(np.isnan(data["feature_invalid"].evaluations)))
+
+
+    def test_nan_different_shape(self):
+        self.results[0]["feature1d"]["values"] = np.nan
+
+        for i, result in enumerate(self.results):
+            self.aggregator.add(i, result)
+
+        data = self.aggregator.to_data()
+
+        self.assertEqual(data.error, [])
+        self.assertEqual(data["feature1d"].evaluations.shape, (3, 10))
+        self.assertTrue(np.all(np.isnan(data["feature1d"].evaluations[0])))
+        self.assertTrue(np.array_equal(data["feature1d"].evaluations[1], np.arange(0, 10)))
+
+
+    def test_irregular(self):
+        self.results[1]["feature1d"]["values"] = np.arange(0, 5)
+        self.results[1]["feature1d"]["time"] = np.arange(0, 5)
+
+        for i, result in enumerate(self.results):
+            self.aggregator.add(i, result)
+
+        data = self.aggregator.to_data()
+
+        self.assertEqual(data.error, ["feature1d"])
+        self.assertIsInstance(data["feature1d"].evaluations, list)
+
+        self.assertTrue(np.array_equal(data["feature1d"].evaluations[0], np.arange(0, 10)))
+        self.assertTrue(np.array_equal(data["feature1d"].evaluations[1], np.arange(0, 5)))
+        self.assertTrue(np.array_equal(data["feature1d"].time[1], np.arange(0, 5)))
+        self.assertTrue(np.array_equal(data["feature1d"].time[2], np.arange(0, 10)))
+
+
+    def test_interpolate(self):
+        model = TestingModelAdaptive()
+        parallel = Parallel(model=model)
+
+        aggregator = ResultAggregator(model=model,
+                                      features=Features(),
+                                      nr_results=3,
+                                      logger_level="error")
+
+        for i in [1, 2, 0]:
+            aggregator.add(i, parallel.run({"a": i, "b": i + 1}))
+
+        data = aggregator.to_data()
+
+        self.assertTrue(np.array_equal(data["TestingModelAdaptive"].time, np.arange(0, 15)))
+        self.assertEqual(data["TestingModelAdaptive"].evaluations.shape, (3, 15))
+        self.assertTrue(np.allclose(data["TestingModelAdaptive"].evaluations[0],
+                                    np.arange(0, 15) + 1))
+        self.assertTrue(np.allclose(data["TestingModelAdaptive"].evaluations[2],
+                                    np.arange(0, 15) + 5))
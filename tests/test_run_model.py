@@ -8,10 +8,14 @@ import multiprocess as mp
 
 from uncertainpy import Parameters
 from uncertainpy.core import RunModel
+from uncertainpy.core import SerialExecutor, ProcessExecutor
+from uncertainpy.core import ThreadExecutor, DistributedExecutor
+from uncertainpy.core import EvaluationCache, Checkpoint, ModelParameters
 from uncertainpy.models import Model
 from uncertainpy.features import Features, SpikingFeatures
 
 from .testing_classes import TestingFeatures, model_function
+from .testing_classes import model_function_vectorized
 from .testing_classes import TestingModel0d, TestingModel1d, TestingModel2d
 from .testing_classes import TestingModelAdaptive
 
@@ -80,6 +84,110 @@ class TestRunModel(unittest.TestCase):
 
         self.assertIsNone(runmodel.CPUs)
 
+    def test_init_chunksize(self):
+        runmodel = RunModel(model=TestingModel1d(),
+                            parameters=self.parameters,
+                            logger_level="error",
+                            chunksize=5)
+
+        self.assertEqual(runmodel.chunksize, 5)
+
+
+    def test_init_chunksize_default(self):
+        self.assertEqual(self.runmodel.chunksize, "auto")
+
+
+    def test_init_cache(self):
+        folder = os.path.join(self.output_test_dir, "cache")
+        runmodel = RunModel(model=TestingModel1d(),
+                            parameters=self.parameters,
+                            logger_level="error",
+                            cache=folder)
+
+        self.assertIsInstance(runmodel.cache, EvaluationCache)
+        self.assertEqual(runmodel.cache.folder, folder)
+        self.assertIs(runmodel._parallel.cache, runmodel.cache)
+
+
+    def test_evaluate_nodes_cache(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+        self.runmodel.CPUs = 2
+        self.runmodel.cache = os.path.join(self.output_test_dir, "cache")
+
+        self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+        self.assertEqual(len(self.runmodel.cache), 3)
+
+        nodes = np.array([[0, 1, 2, 3], [1, 2, 3, 4]])
+        results = self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+        self.assertEqual(len(self.runmodel.cache), 4)
+        for i, result in enumerate(results):
+            self.assertTrue(np.array_equal(result["TestingModel1d"]["values"],
+                                           np.arange(0, 10) + 2*i + 1))
+
+        self.runmodel.close()
+
+
+    def test_init_checkpoint(self):
+        filename = os.path.join(self.output_test_dir, "checkpoint.h5")
+        runmodel = RunModel(model=TestingModel1d(),
+                            parameters=self.parameters,
+                            logger_level="error",
+                            checkpoint=filename)
+
+        self.assertIsInstance(runmodel.checkpoint, Checkpoint)
+        self.assertEqual(runmodel.checkpoint.filename, filename)
+
+
+    def test_checkpoint_error(self):
+        with self.assertRaises(TypeError):
+            self.runmodel.checkpoint = 2
+
+
+    def test_evaluate_nodes_checkpoint(self):
+        calls = []
+
+        def counting_model(a=1, b=2):
+            calls.append((a, b))
+            return np.arange(0, 10), np.arange(0, 10) + a + b
+
+        self.runmodel.model = counting_model
+        self.runmodel.CPUs = None
+        self.runmodel.checkpoint = os.path.join(self.output_test_dir, "checkpoint.h5")
+
+        nodes = np.array([[0, 1], [1, 2]])
+        self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+        self.assertEqual(len(calls), 2)
+
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+        results = self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(calls[-1], (2, 3))
+
+        for i, result in enumerate(results):
+            self.assertTrue(np.array_equal(result["counting_model"]["values"],
+                                           np.arange(0, 10) + 2*i + 1))
+            self.assertIn("interpolation", result["feature_interpolate"])
+
+
+    def test_iterate_nodes(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+        self.runmodel.CPUs = 2
+
+        indices = []
+        for index, result in self.runmodel.iterate_nodes(nodes, ["a", "b"]):
+            indices.append(index)
+
+            self.assertTrue(np.array_equal(result["TestingModel1d"]["values"],
+                                           np.arange(0, 10) + 2*index + 1))
+
+        self.assertEqual(sorted(indices), [0, 1, 2])
+
+        self.runmodel.close()
+
+
     def test_set_feature(self):
         self.runmodel.features = Features(logger_level="error")
         self.assertIsInstance(self.runmodel._features, Features)
@@ -247,6 +355,27 @@ class TestRunModel(unittest.TestCase):
         self.assertEqual(result, [{"a": 0, "b": 2}, {"a": 1, "b": 2}, {"a": 2, "b": 2}])
 
 
+    def test_create_model_parameters_array(self):
+        result = self.runmodel.create_model_parameters(np.array([0, 1, 2]), ["a"])
+
+        self.assertIsInstance(result, ModelParameters)
+        self.assertEqual(result.names, ["a"])
+        self.assertEqual(result.values.shape, (3, 1))
+        self.assertEqual(result.constants, {"b": 2})
+
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+        result = self.runmodel.create_model_parameters(nodes, ["a", "b"])
+
+        self.assertEqual(result.values.shape, (3, 2))
+        self.assertTrue(result.values.flags["C_CONTIGUOUS"])
+        self.assertEqual(result.constants, {})
+
+        batches = self.runmodel.create_batches(result, chunksize=2)
+
+        self.assertIsInstance(batches[0], ModelParameters)
+        self.assertEqual(batches[1], [{"a": 2, "b": 3}])
+
+
 
     def test_evaluate_nodes_sequential_model_0d(self):
         nodes = np.array([[0, 1, 2], [1, 2, 3]])
@@ -412,6 +541,256 @@ class TestRunModel(unittest.TestCase):
 
 
 
+    def test_evaluate_nodes_parallel_chunksize(self):
+        nodes = np.array([[0, 1, 2, 3, 4], [1, 2, 3, 4, 5]])
+        self.runmodel.CPUs = 2
+        self.runmodel.chunksize = 2
+
+        results = self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+        self.assertEqual(len(results), 5)
+        for i, result in enumerate(results):
+            self.assertTrue(np.array_equal(result["TestingModel1d"]["values"],
+                                           np.arange(0, 10) + 2*i + 1))
+
+
+    def test_evaluate_nodes_parallel_chunksize_auto(self):
+        nodes = np.array([[0, 1, 2, 3, 4], [1, 2, 3, 4, 5]])
+        self.runmodel.CPUs = 2
+        self.runmodel.chunksize = "auto"
+
+        results = self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+        self.assertEqual(len(results), 5)
+        for i, result in enumerate(results):
+            self.assertTrue(np.array_equal(result["TestingModel1d"]["values"],
+                                           np.arange(0, 10) + 2*i + 1))
+
+
+    def test_evaluate_nodes_reuse_executor(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+        self.runmodel.CPUs = 2
+
+        self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+        executor = self.runmodel.executor
+        pool = executor.pool
+
+        results = self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+        self.assertIs(self.runmodel.executor, executor)
+        self.assertIs(self.runmodel.executor.pool, pool)
+        self.assertEqual(len(results), 3)
+
+        self.runmodel.close()
+
+
+    def test_executor_cpus_changed(self):
+        self.runmodel.CPUs = 2
+        executor = self.runmodel.executor
+
+        self.runmodel.CPUs = 3
+        self.assertIsNot(self.runmodel.executor, executor)
+        self.assertEqual(self.runmodel.executor.CPUs, 3)
+
+        self.runmodel.close()
+
+
+    def test_executor_default(self):
+        self.runmodel.CPUs = 2
+        self.assertIsInstance(self.runmodel.executor, ProcessExecutor)
+
+        self.runmodel.CPUs = None
+        self.assertIsInstance(self.runmodel.executor, SerialExecutor)
+
+
+    def test_executor_names(self):
+        self.runmodel.CPUs = 2
+
+        self.runmodel.executor = "serial"
+        self.assertIsInstance(self.runmodel.executor, SerialExecutor)
+
+        self.runmodel.executor = "process"
+        self.assertIsInstance(self.runmodel.executor, ProcessExecutor)
+
+        self.runmodel.executor = "thread"
+        self.assertIsInstance(self.runmodel.executor, ThreadExecutor)
+
+        self.runmodel.executor = "distributed"
+        self.assertIsInstance(self.runmodel.executor, DistributedExecutor)
+
+
+    def test_executor_instance(self):
+        executor = ThreadExecutor(CPUs=2)
+        self.runmodel.executor = executor
+
+        self.assertIs(self.runmodel.executor, executor)
+
+
+    def test_executor_error(self):
+        with self.assertRaises(ValueError):
+            self.runmodel.executor = "gpu"
+
+        with self.assertRaises(TypeError):
+            self.runmodel.executor = 2
+
+
+    def test_evaluate_nodes_executors(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+        self.runmodel.CPUs = 2
+
+        for executor in ["serial", "process", "thread", "distributed"]:
+            self.runmodel.executor = executor
+            results = self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+            self.assertEqual(len(results), 3)
+            for i, result in enumerate(results):
+                self.assertTrue(np.array_equal(result["TestingModel1d"]["values"],
+                                               np.arange(0, 10) + 2*i + 1))
+
+        self.runmodel.close()
+
+
+    def test_close(self):
+        self.runmodel.CPUs = 2
+        self.runmodel.executor.pool
+
+        self.runmodel.close()
+        self.assertIsNone(self.runmodel._executor)
+
+        # Closing twice should not fail
+        self.runmodel.close()
+
+
+    def test_close_executor_instance(self):
+        executor = ThreadExecutor(CPUs=2)
+        self.runmodel.executor = executor
+        executor.pool
+
+        # Executors given by the user are not closed
+        self.runmodel.close()
+        self.assertIsNotNone(executor._pool)
+
+        executor.close()
+
+
+    def test_context_manager(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+
+        with RunModel(model=TestingModel1d(),
+                      parameters=self.parameters,
+                      logger_level="error",
+                      CPUs=2) as runmodel:
+            results = runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+        self.assertEqual(len(results), 3)
+        self.assertIsNone(runmodel._executor)
+
+
+    def test_create_batches(self):
+        model_parameters = [{"a": 0}, {"a": 1}, {"a": 2}, {"a": 3}, {"a": 4}]
+
+        batches = self.runmodel.create_batches(model_parameters, chunksize=2)
+
+        self.assertEqual(batches, [[{"a": 0}, {"a": 1}],
+                                   [{"a": 2}, {"a": 3}],
+                                   [{"a": 4}]])
+
+
+    def test_create_batches_error(self):
+        with self.assertRaises(ValueError):
+            self.runmodel.create_batches([{"a": 0}], chunksize=0)
+
+
+    def test_map_batches_vectorized(self):
+        self.runmodel.model = Model(model_function_vectorized, vectorized=True)
+        self.runmodel.CPUs = None
+        model_parameters = [{"a": i, "b": 1} for i in range(5)]
+
+        batches = list(self.runmodel.map_batches(model_parameters))
+
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(len(batches[0]), 5)
+
+        self.runmodel.CPUs = 2
+        self.runmodel.executor = "thread"
+
+        batches = list(self.runmodel.map_batches(model_parameters))
+
+        self.assertEqual([len(batch) for batch in batches], [3, 2])
+
+        self.runmodel.close()
+
+
+    def test_evaluate_nodes_vectorized(self):
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+        self.runmodel.model = Model(model_function_vectorized, vectorized=True)
+        self.runmodel.CPUs = 2
+
+        for executor in ["serial", "process"]:
+            self.runmodel.executor = executor
+            results = self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+            self.assertEqual(len(results), 3)
+            for i, result in enumerate(results):
+                self.assertTrue(np.array_equal(result["model_function_vectorized"]["values"],
+                                               np.arange(0, 10) + 2*i + 1))
+
+        self.runmodel.close()
+
+
+    def test_evaluate_nodes_shared_memory(self):
+        nodes = np.array([[0, 1, 2, 3, 4], [1, 2, 3, 4, 5]])
+        expected = self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+        self.runmodel.shared_memory = True
+        self.runmodel.chunksize = 2
+        self.runmodel.CPUs = 2
+
+        for executor in ["serial", "process", "thread"]:
+            self.runmodel.executor = executor
+            results = self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+            self.assertEqual(len(results), 5)
+            for result, expected_result in zip(results, expected):
+                self.assertEqual(sorted(result.keys()), sorted(expected_result.keys()))
+                self.assertTrue(np.array_equal(result["TestingModel1d"]["values"],
+                                               expected_result["TestingModel1d"]["values"]))
+                self.assertTrue(np.array_equal(result["TestingModel1d"]["time"],
+                                               expected_result["TestingModel1d"]["time"]))
+                self.assertTrue(np.array_equal(result["feature2d"]["values"],
+                                               expected_result["feature2d"]["values"]))
+                self.assertEqual(result["feature0d"]["values"], expected_result["feature0d"]["values"])
+
+        self.runmodel.close()
+
+
+    def test_run_shared_memory(self):
+        nodes = np.array([[0, 1, 2, 3, 4], [1, 2, 3, 4, 5]])
+        expected = self.runmodel.run(nodes, ["a", "b"])
+
+        self.runmodel.shared_memory = True
+        self.runmodel.chunksize = 2
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        for feature in expected:
+            self.assertTrue(np.array_equal(data[feature].evaluations,
+                                           expected[feature].evaluations,
+                                           equal_nan=True))
+
+
+    def test_estimate_chunksize(self):
+        self.runmodel.CPUs = 2
+
+        # Cheap models are limited by the load balancing
+        self.assertEqual(self.runmodel.estimate_chunksize(1e-6, 80), 10)
+
+        # Expensive models are sent one at the time
+        self.assertEqual(self.runmodel.estimate_chunksize(10, 80), 1)
+
+        self.assertEqual(self.runmodel.estimate_chunksize(0.01, 10**4, batch_time=0.2), 20)
+
+
     def test_evaluate_nodes_not_supress_graphics(self):
         nodes = np.array([[0, 1, 2], [1, 2, 3]])
         self.runmodel.model.suppress_graphics = False
@@ -480,6 +859,47 @@ class TestRunModel(unittest.TestCase):
 
 
 
+    def test_run_interpolation_time(self):
+        features = TestingFeatures(features_to_run=["feature0d",
+                                                    "feature1d",
+                                                    "feature_interpolate"],
+                                   interpolate="feature_interpolate")
+
+        self.runmodel = RunModel(model=TestingModelAdaptive(),
+                                 parameters=self.parameters,
+                                 features=features,
+                                 logger_level="error",
+                                 interpolation_time=np.arange(0, 15))
+
+        nodes = np.array([[0, 1, 2], [1, 2, 3]])
+        results = self.runmodel.evaluate_nodes(nodes, ["a", "b"])
+
+        for result in results:
+            self.assertNotIn("interpolation", result["TestingModelAdaptive"])
+            self.assertNotIn("interpolation", result["feature_interpolate"])
+            self.assertEqual(len(result["TestingModelAdaptive"]["values"]), 15)
+
+        data = self.runmodel.run(nodes, ["a", "b"])
+
+        for feature in ["TestingModelAdaptive", "feature_interpolate"]:
+            self.assertTrue(np.array_equal(data[feature]["time"], np.arange(0, 15)))
+            self.assertEqual(np.shape(data[feature].evaluations), (3, 15))
+
+            for i in range(3):
+                self.assertTrue(np.allclose(data[feature].evaluations[i],
+                                            np.arange(0, 15) + 2*i + 1))
+
+        self.assert_feature_0d(data)
+
+
+    def test_interpolation_time(self):
+        self.runmodel.interpolation_time = {"feature_interpolate": np.arange(0, 5)}
+
+        self.assertEqual(list(self.runmodel.interpolation_time.keys()), ["feature_interpolate"])
+        self.assertIs(self.runmodel._parallel.interpolation_time,
+                      self.runmodel.interpolation_time)
+
+
     def test_results_to_data_model_1d_features_all_interpolate(self):
 
         features = TestingFeatures(features_to_run=["feature0d",
@@ -15,7 +15,7 @@ from uncertainpy import UncertaintyQuantification
 from uncertainpy.parameters import Parameters
 from uncertainpy.features import Features
 from uncertainpy import uniform, normal
-from uncertainpy.core import UncertaintyCalculations
+from uncertainpy.core import UncertaintyCalculations, ThreadExecutor
 from uncertainpy import Data
 from uncertainpy import Model
 from uncertainpy import SpikingFeatures
@@ -84,6 +84,43 @@ class TestUncertainty(TestCasePlot):
         self.assertEqual(uncertainty.uncertainty_calculations.runmodel.CPUs, 34)
 
 
+    def test_close(self):
+        uncertainty = UncertaintyQuantification(model=self.model,
+                                                parameters=self.parameters,
+                                                logger_level="error",
+                                                logger_filename=None,
+                                                CPUs=2)
+
+        runmodel = uncertainty.uncertainty_calculations.runmodel
+        runmodel.executor.pool
+
+        uncertainty.close()
+        self.assertIsNone(runmodel._executor)
+
+
+    def test_context_manager(self):
+        with UncertaintyQuantification(model=self.model,
+                                       parameters=self.parameters,
+                                       logger_level="error",
+                                       logger_filename=None,
+                                       CPUs=2) as uncertainty:
+            runmodel = uncertainty.uncertainty_calculations.runmodel
+            runmodel.executor.pool
+
+        self.assertIsNone(runmodel._executor)
+
+
+    def test_init_executor(self):
+        uncertainty = UncertaintyQuantification(model=self.model,
+                                                parameters=self.parameters,
+                                                logger_level="error",
+                                                logger_filename=None,
+                                                executor="thread")
+
+        self.assertIsInstance(uncertainty.uncertainty_calculations.runmodel.executor,
+                              ThreadExecutor)
+
+
     def test_init_parameter_list(self):
         uncertainty = UncertaintyQuantification(self.model,
                                                 self.parameter_list,
@@ -439,6 +476,36 @@ class TestUncertainty(TestCasePlot):
         self.assertEqual(result, 0)
 
 
+    def test_extend_polynomial_chaos(self):
+        self.uncertainty.polynomial_chaos(polynomial_order=2,
+                                          nr_collocation_nodes=8,
+                                          sampling_rule="halton",
+                                          plot=None,
+                                          data_folder=self.output_test_dir,
+                                          seed=self.seed)
+
+        filename = os.path.join(self.output_test_dir, "TestingModel1d.h5")
+        self.uncertainty.load(filename)
+
+        data = self.uncertainty.extend_polynomial_chaos(nr_new_nodes=6,
+                                                        polynomial_order=2,
+                                                        plot=None,
+                                                        data_folder=self.output_test_dir,
+                                                        filename="extended",
+                                                        seed=self.seed)
+
+        self.assertIs(data, self.uncertainty.data)
+        self.assertEqual(data.nodes.shape, (2, 14))
+        self.assertEqual(len(data["TestingModel1d"].evaluations), 14)
+        self.assertIsNotNone(data["TestingModel1d"].mean)
+        self.assertTrue(os.path.isfile(os.path.join(self.output_test_dir, "extended.h5")))
+
+
+    def test_extend_polynomial_chaos_error(self):
+        with self.assertRaises(ValueError):
+            self.uncertainty.extend_polynomial_chaos(nr_new_nodes=6)
+
+
     def test_PC_plot(self):
         parameter_list = [["a", 1, None],
                          ["b", 2, None]]
@@ -600,6 +667,25 @@ class TestUncertainty(TestCasePlot):
         self.assertEqual(result, 0)
 
 
+    def test_monte_carlo_tolerance_sobol_second(self):
+        parameter_list = [["a", 1, None],
+                         ["b", 2, None]]
+
+        parameters = Parameters(parameter_list)
+        parameters.set_all_distributions(uniform(0.5))
+
+        self.uncertainty = UncertaintyQuantification(TestingModel1d(),
+                                                     parameters=parameters,
+                                                     logger_level="error",
+                                                     logger_filename=None)
+
+        with self.assertRaises(ValueError):
+            self.uncertainty.monte_carlo(tolerance=0.1,
+                                         sobol_second=True,
+                                         plot=None,
+                                         save=False)
+
+
     def test_load(self):
         folder = os.path.dirname(os.path.realpath(__file__))
         self.uncertainty.load(os.path.join(folder, "data", "test_save_mock"))
@@ -10,7 +10,8 @@ import chaospy as cp
 import numpoly
 import multiprocess as mp
 
-from uncertainpy.core import UncertaintyCalculations
+from uncertainpy.core import UncertaintyCalculations, BasisCache
+from uncertainpy.core.least_squares import tikhonov_parameter
 from uncertainpy.parameters import Parameters
 from uncertainpy.features import Features
 from uncertainpy import uniform, normal
@@ -18,7 +19,9 @@ from uncertainpy import Data
 from uncertainpy.models import Model
 from uncertainpy import SpikingFeatures
 
+from SALib.sample import saltelli
 from SALib.analyze.sobol import separate_output_values
+from SALib.analyze.sobol import first_order, total_order, second_order
 
 
 from .testing_classes import TestingFeatures
@@ -95,6 +98,41 @@ class TestUncertaintyCalculations(unittest.TestCase):
 
         self.assertIsNone(uncertainty_calculations.runmodel.CPUs)
 
+    def test_init_chunksize(self):
+        uncertainty_calculations = UncertaintyCalculations(model=self.model,
+                                                            parameters=self.parameters,
+                                                            logger_level="error",
+                                                            chunksize=3)
+
+        self.assertEqual(uncertainty_calculations.runmodel.chunksize, 3)
+
+
+    def test_init_basis_cache(self):
+        self.assertIsInstance(self.uncertainty_calculations.basis_cache, BasisCache)
+        self.assertGreater(self.uncertainty_calculations.basis_cache.max_items, 0)
+
+        uncertainty_calculations = UncertaintyCalculations(model=self.model,
+                                                            parameters=self.parameters,
+                                                            logger_level="error",
+                                                            basis_cache=os.path.join(self.output_test_dir, "bases"))
+
+        self.assertEqual(uncertainty_calculations.basis_cache.folder,
+                         os.path.join(self.output_test_dir, "bases"))
+
+        uncertainty_calculations.basis_cache = False
+        self.assertEqual(uncertainty_calculations.basis_cache.max_items, 0)
+
+        with self.assertRaises(TypeError):
+            uncertainty_calculations.basis_cache = 2
+
+
+    def test_create_PCE_collocation_basis_cache(self):
+        self.uncertainty_calculations.create_PCE_collocation(polynomial_order=2)
+        nr_bases = len(self.uncertainty_calculations.basis_cache)
+
+        self.uncertainty_calculations.create_PCE_collocation(polynomial_order=2)
+        self.assertEqual(len(self.uncertainty_calculations.basis_cache), nr_bases)
+
     def test_intit_features(self):
         uncertainty_calculations = UncertaintyCalculations(model=self.model,
                                                            logger_level="error")
@@ -296,6 +334,25 @@ class TestUncertaintyCalculations(unittest.TestCase):
         self.assertTrue(np.all(mask))
 
 
+    def test_create_mask_array(self):
+        evaluations = np.array([[1, 2, 3], [np.nan, 2, 3], [4, 5, 6]])
+
+        masked_evaluations, mask = self.uncertainty_calculations.create_mask(evaluations)
+
+        self.assertIsInstance(masked_evaluations, np.ndarray)
+        self.assertTrue(np.array_equal(masked_evaluations, [[1, 2, 3], [4, 5, 6]]))
+        self.assertTrue(np.array_equal(mask, [True, False, True]))
+
+
+    def test_create_mask_irregular(self):
+        evaluations = [[1, 2, 3], np.nan, [4, 5]]
+
+        masked_evaluations, mask = self.uncertainty_calculations.create_mask(evaluations)
+
+        self.assertEqual(masked_evaluations, [[1, 2, 3], [4, 5]])
+        self.assertTrue(np.array_equal(mask, [True, False, True]))
+
+
     def test_create_masked_evaluations(self):
         nodes = np.array([[0, 1, 2], [1, 2, 3]])
         uncertain_parameters = ["a", "b"]
@@ -635,6 +692,162 @@ class TestUncertaintyCalculations(unittest.TestCase):
         self.assertTrue(np.array_equal(mask, np.array([True, False, True])))
 
 
+    def test_vandermonde_svd(self):
+        distribution = cp.J(cp.Uniform(), cp.Uniform())
+        P = cp.orth_ttr(2, distribution)
+        nodes = distribution.sample(20, "M")
+
+        U, s, Vt = self.uncertainty_calculations.vandermonde_svd(P, nodes)
+
+        vandermonde = np.asarray(P(*nodes)).T
+
+        self.assertEqual(U.shape, (20, len(P)))
+        self.assertEqual(Vt.shape, (len(P), len(P)))
+        self.assertTrue(np.allclose(U.dot(np.diag(s)).dot(Vt), vandermonde))
+
+
+    def test_vandermonde_svd_1d(self):
+        distribution = cp.Uniform()
+        P = cp.orth_ttr(2, distribution)
+        nodes = distribution.sample(10, "M")
+
+        U, s, Vt = self.uncertainty_calculations.vandermonde_svd(P, nodes)
+
+        self.assertEqual(U.shape, (10, len(P)))
+
+
+    def test_fit_regression(self):
+        distribution = cp.J(cp.Uniform(), cp.Uniform())
+        P = cp.orth_ttr(2, distribution)
+        nodes = distribution.sample(20, "M")
+
+        evaluations_0d = nodes[0] + 2*nodes[1]**2
+        evaluations_1d = np.array([i*nodes[0] + nodes[1] for i in range(3)]).T
+
+        U_hat = self.uncertainty_calculations.fit_regression(P, nodes,
+                                                             [evaluations_0d, evaluations_1d])
+
+        U_hat_0d = cp.fit_regression(P, nodes, evaluations_0d, )
+        U_hat_1d = cp.fit_regression(P, nodes, evaluations_1d, )
+
+        samples = distribution.sample(10)
+
+        self.assertEqual(len(U_hat), 2)
+        self.assertTrue(np.allclose(U_hat[0](*samples), U_hat_0d(*samples)))
+        self.assertTrue(np.allclose(U_hat[1](*samples), U_hat_1d(*samples)))
+
+
+    def test_fit_collocation(self):
+        distribution = cp.J(cp.Uniform(), cp.Uniform())
+        P = cp.orth_ttr(2, distribution)
+        nodes = distribution.sample(12, "M")
+
+        data = self.uncertainty_calculations.runmodel.run(nodes, ["a", "b"])
+
+        evaluations = data["feature0d"].evaluations.copy()
+        evaluations[3] = np.nan
+        data["feature0d"].evaluations = evaluations
+
+        U_hat = self.uncertainty_calculations.fit_collocation(P, data, nodes)
+
+        self.assertEqual(set(U_hat.keys()),
+                         set(["TestingModel1d", "feature0d", "feature1d", "feature2d"]))
+        self.assertEqual(data.incomplete, ["feature0d"])
+
+        mask = np.ones(12, dtype=bool)
+        mask[3] = False
+        expected = cp.fit_regression(P, nodes[:, mask], evaluations[mask], )
+
+        samples = distribution.sample(10)
+        self.assertTrue(np.allclose(U_hat["feature0d"](*samples), expected(*samples)))
+
+        expected = cp.fit_regression(P, nodes, data["feature1d"].evaluations, )
+        self.assertTrue(np.allclose(U_hat["feature1d"](*samples), expected(*samples)))
+
+
+    def test_fit_collocation_not_allow_incomplete(self):
+        distribution = cp.J(cp.Uniform(), cp.Uniform())
+        P = cp.orth_ttr(2, distribution)
+        nodes = distribution.sample(12, "M")
+
+        data = self.uncertainty_calculations.runmodel.run(nodes, ["a", "b"])
+
+        evaluations = data["feature0d"].evaluations.copy()
+        evaluations[3] = np.nan
+        data["feature0d"].evaluations = evaluations
+
+        U_hat = self.uncertainty_calculations.fit_collocation(P, data, nodes,
+                                                              allow_incomplete=False)
+
+        self.assertNotIn("feature0d", U_hat)
+        self.assertIn("feature1d", U_hat)
+        self.assertEqual(data.incomplete, ["feature0d"])
+
+
+    def test_fit_collocation_loo_error(self):
+        distribution = cp.J(cp.Uniform(), cp.Uniform())
+        P = cp.orth_ttr(2, distribution)
+        nodes = distribution.sample(12, "M")
+
+        data = self.uncertainty_calculations.runmodel.run(nodes, ["a", "b"])
+
+        self.uncertainty_calculations.fit_collocation(P, data, nodes)
+        self.assertIsNone(data["feature1d"].loo_error)
+
+        self.uncertainty_calculations.fit_collocation(P, data, nodes, loo_error=True)
+
+        for feature in ["TestingModel1d", "feature0d", "feature1d", "feature2d"]:
+            self.assertIsInstance(data[feature].loo_error, float)
+            self.assertGreaterEqual(data[feature].loo_error, 0)
+
+
+    def test_leave_one_out_error(self):
+        distribution = cp.J(cp.Uniform(), cp.Uniform())
+        P = cp.orth_ttr(2, distribution)
+        nodes = distribution.sample(15, "M")
+
+        np.random.seed(self.seed)
+        evaluations = np.random.rand(15, 3)
+
+        errors = self.uncertainty_calculations.leave_one_out_error(P, nodes,
+                                                                   [evaluations, evaluations[:, 0]])
+
+        self.assertEqual(len(errors), 2)
+
+        # Refit without each node, with the same regularization parameter
+        U, s, Vt = self.uncertainty_calculations.vandermonde_svd(P, nodes)
+        vandermonde = np.asarray(P(*nodes), dtype=float).T
+
+        projection = U.T.dot(evaluations)
+        outside = np.sum(np.maximum(np.sum(evaluations**2, axis=0) - np.sum(projection**2, axis=0), 0))
+        alpha = tikhonov_parameter(s, projection, outside, 15)
+
+        loo_residuals = []
+        for i in range(15):
+            keep = np.arange(15) != i
+            gram = vandermonde[keep].T.dot(vandermonde[keep]) + alpha*np.eye(len(P))
+            coefficients = np.linalg.solve(gram, vandermonde[keep].T.dot(evaluations[keep]))
+
+            loo_residuals.append(evaluations[i] - vandermonde[i].dot(coefficients))
+
+        expected = np.sum(np.array(loo_residuals)**2)/np.sum((evaluations - np.mean(evaluations, axis=0))**2)
+
+        self.assertAlmostEqual(errors[0], expected)
+
+
+    def test_leave_one_out_error_exact(self):
+        distribution = cp.J(cp.Uniform(), cp.Uniform())
+        P = cp.orth_ttr(2, distribution)
+        nodes = distribution.sample(15, "M")
+
+        evaluations = [nodes[0]**2 + nodes[1], np.ones(15)]
+
+        errors = self.uncertainty_calculations.leave_one_out_error(P, nodes, evaluations)
+
+        self.assertLess(errors[0], 1e-6)
+        self.assertEqual(errors[1], 0)
+
+
     def test_convert_uncertain_parameters_list(self):
         result = self.uncertainty_calculations.convert_uncertain_parameters(["a", "b"])
 
@@ -1080,258 +1293,932 @@ class TestUncertaintyCalculations(unittest.TestCase):
 
 
 
-    def test_polynomial_chaos_collocation(self):
-        features = TestingFeatures(features_to_run=["feature0d_var",
-                                                    "feature1d_var",
-                                                    "feature2d_var"])
-        self.uncertainty_calculations.features = features
+    def test_orthogonal_basis(self):
+        distribution = cp.J(cp.Uniform(-1, 1), cp.Uniform(-1, 1))
 
-        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
-                                                              seed=self.seed)
+        basis = self.uncertainty_calculations.orthogonal_basis(2, distribution)
 
-        filename = os.path.join(self.output_test_dir, "TestingModel1d.h5")
-        data.save(filename)
+        self.assertEqual(basis["transform"].shape, (6, 6))
+        self.assertEqual(len(basis["exponents"]), 6)
+        self.assertEqual(set(tuple(index) for index in basis["multi_indices"]),
+                         set([(0, 0), (1, 0), (0, 1), (2, 0), (1, 1), (0, 2)]))
+        self.assertTrue(np.all(basis["norms"] > 0))
 
-        folder = os.path.dirname(os.path.realpath(__file__))
-        compare_file = os.path.join(folder, "data/TestingModel1d.h5")
-        result = subprocess.call(["h5diff", "-d", str(self.threshold), filename, compare_file])
 
-        self.assertEqual(result, 0)
+    def test_tensor_basis(self):
+        distribution = cp.J(cp.Uniform(-1, 1), cp.Normal(1, 2))
 
+        basis = self.uncertainty_calculations.tensor_basis([[0, 0], [1, 0], [2, 0], [0, 1], [1, 1]],
+                                                           distribution)
 
+        self.assertEqual(basis["transform"].shape, (5, 5))
 
-    def test_PC_collocation_rosenblatt(self):
-        features = TestingFeatures(features_to_run=["feature0d_var",
-                                                    "feature1d_var",
-                                                    "feature2d_var"])
-        self.uncertainty_calculations.features = features
+        P = self.uncertainty_calculations.basis_polynomials(basis)
+        self.assertEqual(len(P), 5)
 
-        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
-                                                              rosenblatt=True,
-                                                              seed=self.seed)
+        gram = np.asarray(cp.E(P[:, np.newaxis]*P, distribution), dtype=float)
+        self.assertTrue(np.allclose(gram, np.diag(basis["norms"])))
 
-        filename = os.path.join(self.output_test_dir, "TestingModel1d_Rosenblatt.h5")
-        data.save(filename)
 
-        folder = os.path.dirname(os.path.realpath(__file__))
-        compare_file = os.path.join(folder, "data/TestingModel1d_Rosenblatt.h5")
-        result = subprocess.call(["h5diff", "-d", str(self.threshold), filename, compare_file])
+    def test_orthogonal_basis_orth_ttr(self):
+        distribution = cp.J(cp.Uniform(0.5, 1.5), cp.Normal(1, 0.5))
 
-        self.assertEqual(result, 0)
+        basis = self.uncertainty_calculations.orthogonal_basis(3, distribution)
+        P = self.uncertainty_calculations.basis_polynomials(basis)
 
+        samples = distribution.sample(5)
+        expected = cp.orth_ttr(3, distribution)
 
-    def test_PC_collocation_auto(self):
-        features = TestingFeatures(features_to_run=[])
-        self.uncertainty_calculations.features = features
+        self.assertEqual(len(P), len(expected))
+        self.assertTrue(np.allclose(np.sort(P(*samples), axis=0),
+                                    np.sort(expected(*samples), axis=0)))
 
-        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
-                                                              rosenblatt="auto",
-                                                              seed=self.seed)
 
-        self.assertNotIn("Rosenblatt", data.method)
+    def test_sobol_PCE(self):
+        q0, q1 = cp.variable(2)
+        distribution = cp.J(cp.Uniform(-1, 1), cp.Uniform(-1, 1))
 
-        a = cp.Uniform(1, 2)
-        b = cp.Uniform(1, 2) + a
+        U_hat = numpoly.polynomial([q0 + q1 + q0*q1, 2*q0 + 1])
 
-        parameter_dict = {"a": a, "b": b}
+        sobol_first, sobol_total, sobol_second = \
+            self.uncertainty_calculations.sobol_PCE(U_hat, distribution, sobol_second=True)
 
-        self.uncertainty_calculations.parameters = Parameters(parameter_dict)
+        self.assertEqual(sobol_first.shape, (2, 2))
+        self.assertEqual(sobol_total.shape, (2, 2))
+        self.assertEqual(sobol_second.shape, (2, 2, 2))
 
-        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
-                                                              rosenblatt="auto",
-                                                              seed=self.seed)
+        self.assertTrue(np.allclose(sobol_first[:, 0], [3/7., 3/7.]))
+        self.assertTrue(np.allclose(sobol_total[:, 0], [4/7., 4/7.]))
+        self.assertTrue(np.allclose(sobol_second[:, :, 0], [[0, 1/7.], [1/7., 0]]))
 
-        self.assertIn("Rosenblatt", data.method)
+        self.assertTrue(np.allclose(sobol_first[:, 1], [1, 0]))
+        self.assertTrue(np.allclose(sobol_total[:, 1], [1, 0]))
+        self.assertTrue(np.allclose(sobol_second[:, :, 1], 0))
 
 
-        self.uncertainty_calculations.parameters.distribution = cp.J(cp.Uniform(), cp.Uniform())
+    def test_sobol_PCE_chaospy(self):
+        distribution = cp.J(cp.Uniform(0.5, 1.5), cp.Normal(1, 0.5))
+        P = cp.orth_ttr(3, distribution)
 
-        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
-                                                              rosenblatt="auto",
-                                                              seed=self.seed)
+        U_hat = cp.sum(P*np.linspace(0.1, 1, len(P)), -1)
 
-        self.assertNotIn("Rosenblatt", data.method)
+        sobol_first, sobol_total, sobol_second = \
+            self.uncertainty_calculations.sobol_PCE(U_hat, distribution)
 
+        self.assertIsNone(sobol_second)
+        self.assertTrue(np.allclose(sobol_first, cp.Sens_m(U_hat, distribution)))
+        self.assertTrue(np.allclose(sobol_total, cp.Sens_t(U_hat, distribution)))
 
-        self.uncertainty_calculations.parameters.distribution = cp.J(a, b)
 
-        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
-                                                              rosenblatt="auto",
-                                                              seed=self.seed)
+    def test_sobol_PCE_dependent(self):
+        q0, q1 = cp.variable(2)
 
-        self.assertIn("Rosenblatt", data.method)
+        a = cp.Uniform(1, 2)
+        b = cp.Uniform(1, 2) + a
 
+        distribution = cp.J(a, b)
 
-        self.uncertainty_calculations.parameters.distribution = cp.J(a, b)
-        with self.assertRaises(ValueError):
-            data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
-                                                                rosenblatt=False,
-                                                                seed=self.seed)
+        self.assertIsNone(self.uncertainty_calculations.sobol_PCE(q0 + q1, distribution))
 
 
+    def test_sobol_PCE_names(self):
+        distribution = cp.J(cp.Uniform(-1, 1), cp.Uniform(-1, 1))
 
-    def test_create_PCE_collocation_rosenblatt_dependent(self):
-        a = cp.Uniform(1, 2)
-        b = cp.Uniform(1, 2) + a
+        with numpoly.global_options(varname_filter=r"\w+"):
+            x, y = numpoly.symbols("x y")
 
-        parameter_dict = {"a": a, "b": b}
+            self.assertIsNone(self.uncertainty_calculations.sobol_PCE(x + y, distribution))
 
-        self.uncertainty_calculations.parameters = Parameters(parameter_dict)
+        q0, q1, q2 = cp.variable(3)
+        self.assertIsNone(self.uncertainty_calculations.sobol_PCE(q0 + q2, distribution))
 
 
-        U_hat, distribution, data = \
-            self.uncertainty_calculations.create_PCE_collocation_rosenblatt()
+    def test_sobol_PCE_unused_parameter(self):
+        q0, q1 = cp.variable(2)
+        distribution = cp.J(cp.Uniform(-1, 1), cp.Uniform(-1, 1))
 
-        self.assertEqual(data.uncertain_parameters, ["a", "b"])
-        self.assertIsInstance(U_hat["feature0d"], numpoly.ndpoly)
-        self.assertIsInstance(U_hat["feature1d"], numpoly.ndpoly)
-        self.assertIsInstance(U_hat["feature2d"], numpoly.ndpoly)
-        self.assertIsInstance(U_hat["TestingModel1d"], numpoly.ndpoly)
+        sobol_first, sobol_total, sobol_second = \
+            self.uncertainty_calculations.sobol_PCE(2*q1 + 1, distribution)
 
+        self.assertTrue(np.allclose(sobol_first, [0, 1]))
+        self.assertTrue(np.allclose(sobol_total, [0, 1]))
 
 
-    def test_polynomial_chaos_spectral(self):
-        features = TestingFeatures(features_to_run=["feature0d_var",
-                                                    "feature1d_var",
-                                                    "feature2d_var"])
-        self.uncertainty_calculations.features = features
+    def test_indeterminant_dimensions(self):
+        q0, q1, q2 = cp.variable(3)
 
-        data = self.uncertainty_calculations.polynomial_chaos(method="spectral",
-                                                              seed=self.seed)
+        self.assertEqual(self.uncertainty_calculations._indeterminant_dimensions(q0*q2, 3), [0, 2])
+        self.assertIsNone(self.uncertainty_calculations._indeterminant_dimensions(q0*q2, 2))
 
-        filename = os.path.join(self.output_test_dir, "TestingModel1d_spectral.h5")
-        data.save(filename)
+        with numpoly.global_options(varname_filter=r"\w+"):
+            x = numpoly.symbols("x")
+            self.assertIsNone(self.uncertainty_calculations._indeterminant_dimensions(x, 2))
 
-        folder = os.path.dirname(os.path.realpath(__file__))
-        compare_file = os.path.join(folder, "data/TestingModel1d_spectral.h5")
 
-        result = subprocess.call(["h5diff", "-d", str(self.threshold), filename, compare_file])
+    def test_evaluate_PCE(self):
+        q0, q1 = cp.variable(2)
+        polynomial = numpoly.polynomial([[1 + q0, q1*q0**2], [q1, 2.5]])
 
-        self.assertEqual(result, 0)
+        samples = np.array([[0.1, 0.5, 1.2, 2],
+                            [1, 0.3, -0.5, 4]])
 
+        result = self.uncertainty_calculations.evaluate_PCE(polynomial, samples)
 
+        self.assertEqual(result.shape, (2, 2, 4))
+        self.assertTrue(np.allclose(result, polynomial(*samples)))
 
-    def test_polynomial_chaos_spectral_rosenblatt(self):
-        features = TestingFeatures(features_to_run=["feature0d_var",
-                                                    "feature1d_var",
-                                                    "feature2d_var"])
-        self.uncertainty_calculations.features = features
-        data = self.uncertainty_calculations.polynomial_chaos(method="spectral",
-                                                              rosenblatt=True,
-                                                              seed=self.seed)
 
-        filename = os.path.join(self.output_test_dir, "TestingModel1d_Rosenblatt_spectral.h5")
-        data.save(filename)
+    def test_evaluate_PCE_shared(self):
+        q0, q1 = cp.variable(2)
 
-        folder = os.path.dirname(os.path.realpath(__file__))
-        compare_file = os.path.join(folder, "data/TestingModel1d_Rosenblatt_spectral.h5")
+        samples = np.array([[0.1, 0.5, 1.2, 2],
+                            [1, 0.3, -0.5, 4]])
 
-        result = subprocess.call(["h5diff", "-d", str(self.threshold), filename, compare_file])
+        monomials = {}
+        self.uncertainty_calculations.evaluate_PCE(q0*q1, samples, monomials)
+        self.assertIn((1, 1), monomials)
 
-        self.assertEqual(result, 0)
+        result = self.uncertainty_calculations.evaluate_PCE(3*q0*q1 + q1, samples, monomials)
+        self.assertTrue(np.allclose(result, 3*samples[0]*samples[1] + samples[1]))
 
 
+    def test_evaluate_PCE_1d(self):
+        q0 = cp.variable(1)
+        polynomial = numpoly.polynomial([q0**2, 1 + q0])
 
-    def test_ignore_model(self):
-        self.uncertainty_calculations.model.ignore = True
+        samples = np.array([0.1, 0.5, 1.2])
 
-        data = self.uncertainty_calculations.polynomial_chaos(method="spectral",
-                                                              rosenblatt=True,
-                                                              seed=self.seed)
-        self.assertEqual(set(data["TestingModel1d"].get_metrics()),
-                         set(["evaluations", "time"]))
+        result = self.uncertainty_calculations.evaluate_PCE(polynomial, samples)
 
+        self.assertEqual(result.shape, (2, 3))
+        self.assertTrue(np.allclose(result, polynomial(samples)))
 
-        data = self.uncertainty_calculations.polynomial_chaos(method="spectral",
-                                                              rosenblatt=False,
-                                                              seed=self.seed)
-        self.assertEqual(set(data["TestingModel1d"].get_metrics()),
-                             set(["evaluations", "time"]))
 
+    def test_evaluate_PCE_names(self):
+        samples = np.array([[0.1, 0.5, 1.2, 2],
+                            [1, 0.3, -0.5, 4]])
 
-        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
-                                                              rosenblatt=True,
-                                                              seed=self.seed)
-        self.assertEqual(set(data["TestingModel1d"].get_metrics()),
-                         set(["evaluations", "time"]))
+        monomials = {}
+        with numpoly.global_options(varname_filter=r"\w+"):
+            x, y = numpoly.symbols("x y")
+            polynomial = 2*x + x*y
 
+            result = self.uncertainty_calculations.evaluate_PCE(polynomial, samples, monomials)
 
-        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
-                                                              rosenblatt=False,
-                                                              seed=self.seed)
-        self.assertEqual(set(data["TestingModel1d"].get_metrics()),
-                         set(["evaluations", "time"]))
+        self.assertEqual(monomials, {})
+        self.assertTrue(np.allclose(result, 2*samples[0] + samples[0]*samples[1]))
 
 
-        data = self.uncertainty_calculations.monte_carlo(seed=self.seed,
-                                                         nr_samples=self.nr_mc_samples)
-        self.assertEqual(set(data["TestingModel1d"].get_metrics()),
-                         set(["evaluations", "time"]))
+    def test_fit_sparse(self):
+        distribution = cp.J(cp.Uniform(-1, 1), cp.Uniform(-1, 1), cp.Uniform(-1, 1))
+        P = cp.orth_ttr(3, distribution)
 
+        nodes = distribution.sample(15, "M")
 
-    def test_ignore_model_create_PCE_spectral(self):
-        np.random.seed(self.seed)
+        polynomial = 2*P[3] + P[7] - 0.5
+        evaluations = polynomial(*nodes)
+        evaluations_1d = np.array([evaluations, 3*evaluations]).T
 
-        self.uncertainty_calculations.model.ignore = True
+        U_hat = self.uncertainty_calculations.fit_sparse(P, nodes, [evaluations, evaluations_1d])
 
-        U_hat, distribution, data = self.uncertainty_calculations.create_PCE_spectral()
+        self.assertEqual(U_hat[0].shape, ())
+        self.assertEqual(U_hat[1].shape, (2,))
 
-        self.assertEqual(data.uncertain_parameters, ["a", "b"])
-        self.assertIsInstance(U_hat["feature0d"], numpoly.ndpoly)
-        self.assertIsInstance(U_hat["feature1d"], numpoly.ndpoly)
-        self.assertIsInstance(U_hat["feature2d"], numpoly.ndpoly)
-        self.assertNotIn("TestingModel1d", U_hat)
+        samples = distribution.sample(10)
+        self.assertTrue(np.allclose(U_hat[0](*samples), polynomial(*samples)))
+        self.assertTrue(np.allclose(U_hat[1](*samples)[1], 3*polynomial(*samples)))
 
-        self.assertIn("TestingModel1d", data)
 
+    def test_fit_sparse_max_terms(self):
+        distribution = cp.J(cp.Uniform(-1, 1), cp.Uniform(-1, 1))
+        P = cp.orth_ttr(3, distribution)
 
-    def test_ignore_model_create_PCE_spectral_rosenblatt(self):
-        np.random.seed(self.seed)
+        nodes = distribution.sample(20, "M")
+        evaluations = np.sin(nodes[0]) + nodes[1]**2
 
-        self.uncertainty_calculations.model.ignore = True
+        U_hat = self.uncertainty_calculations.fit_sparse(P, nodes, [evaluations], max_terms=2)[0]
 
-        U_hat, distribution, data = self.uncertainty_calculations.create_PCE_spectral_rosenblatt()
+        self.assertLessEqual(len(U_hat.exponents), 4)
+
+
+    def test_create_PCE_sparse(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_sparse(polynomial_order=2,
+                                                            nr_collocation_nodes=5)
 
         self.assertEqual(data.uncertain_parameters, ["a", "b"])
+        self.assertEqual(len(data["TestingModel1d"].evaluations), 5)
         self.assertIsInstance(U_hat["feature0d"], numpoly.ndpoly)
         self.assertIsInstance(U_hat["feature1d"], numpoly.ndpoly)
         self.assertIsInstance(U_hat["feature2d"], numpoly.ndpoly)
-        self.assertNotIn("TestingModel1d", U_hat)
+        self.assertIsInstance(U_hat["TestingModel1d"], numpoly.ndpoly)
+        self.assertIn("sparse", data.method)
 
-        self.assertIn("TestingModel1d", data)
 
+    def test_create_PCE_sparse_rosenblatt(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_sparse(polynomial_order=2,
+                                                            rosenblatt=True)
 
+        self.assertIsInstance(U_hat["TestingModel1d"], numpoly.ndpoly)
+        self.assertIn("Rosenblatt", data.method)
 
-    def test_ignore_model_create_PCE_collocation(self):
-        np.random.seed(self.seed)
 
-        self.uncertainty_calculations.model.ignore = True
+    def test_polynomial_chaos_sparse(self):
+        data = self.uncertainty_calculations.polynomial_chaos(method="sparse",
+                                                              polynomial_order=2,
+                                                              seed=self.seed)
 
-        U_hat, distribution, data = self.uncertainty_calculations.create_PCE_collocation()
+        self.assertIn("sparse", data.method)
+        self.assertEqual(np.shape(data["TestingModel1d"].mean), (10,))
+        self.assertEqual(np.shape(data["TestingModel1d"].sobol_first), (2, 10))
 
-        self.assertEqual(data.uncertain_parameters, ["a", "b"])
-        self.assertIsInstance(U_hat["feature0d"], numpoly.ndpoly)
-        self.assertIsInstance(U_hat["feature1d"], numpoly.ndpoly)
-        self.assertIsInstance(U_hat["feature2d"], numpoly.ndpoly)
-        self.assertNotIn("TestingModel1d", U_hat)
 
-        self.assertIn("TestingModel1d", data)
+    def test_polynomial_chaos_adaptive(self):
+        data = self.uncertainty_calculations.polynomial_chaos(method="adaptive",
+                                                              nr_collocation_nodes=20,
+                                                              sobol_second=True,
+                                                              seed=self.seed)
 
+        self.assertIn("adaptive", data.method)
+        self.assertLessEqual(len(data["TestingModel1d"].evaluations), 20)
 
-    def test_ignore_model_create_PCE_collocation_rosenblatt(self):
-        np.random.seed(self.seed)
+        for feature in ["TestingModel1d", "feature0d", "feature1d", "feature2d"]:
+            self.assertIsNotNone(data[feature].mean)
+            self.assertIsNotNone(data[feature].variance)
+            self.assertIsNotNone(data[feature].percentile_5)
+            self.assertIsNotNone(data[feature].sobol_first)
+            self.assertIsNotNone(data[feature].sobol_second)
 
-        self.uncertainty_calculations.model.ignore = True
+        # The model is time + a + b, which is additive
+        self.assertTrue(np.allclose(data["TestingModel1d"].mean, np.arange(0, 10) + 3))
+        self.assertTrue(np.allclose(np.sum(data["TestingModel1d"].sobol_first, axis=0), 1))
 
-        U_hat, distribution, data = self.uncertainty_calculations.create_PCE_collocation_rosenblatt()
 
-        self.assertEqual(data.uncertain_parameters, ["a", "b"])
-        self.assertIsInstance(U_hat["feature0d"], numpoly.ndpoly)
-        self.assertIsInstance(U_hat["feature1d"], numpoly.ndpoly)
-        self.assertIsInstance(U_hat["feature2d"], numpoly.ndpoly)
-        self.assertNotIn("TestingModel1d", U_hat)
+    def test_univariate_basis(self):
+        distribution = cp.Normal(1, 2)
 
-        self.assertIn("TestingModel1d", data)
+        coefficients, norms = self.uncertainty_calculations.univariate_basis(3, distribution)
+
+        self.assertEqual(coefficients.shape, (4, 4))
+        self.assertEqual(norms.shape, (4,))
+
+        samples = distribution.sample(5)
+        expected = np.asarray(cp.orth_ttr(3, distribution)(samples), dtype=float)
+        result = (samples[:, np.newaxis]**np.arange(4)).dot(coefficients).T
+
+        self.assertTrue(np.allclose(result, expected))
+
+
+    def test_create_PCE_collocation_loo_error(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_collocation(polynomial_order=2,
+                                                                 loo_error=True)
+
+        for feature in ["TestingModel1d", "feature0d", "feature1d", "feature2d"]:
+            self.assertIsInstance(data[feature].loo_error, float)
+
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_collocation(polynomial_order=2)
+
+        self.assertIsNone(data["TestingModel1d"].loo_error)
+
+
+    def test_create_PCE_collocation_rosenblatt_loo_error(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_collocation_rosenblatt(polynomial_order=2,
+                                                                            loo_error=True)
+
+        for feature in ["TestingModel1d", "feature0d", "feature1d", "feature2d"]:
+            self.assertIsInstance(data[feature].loo_error, float)
+
+
+    def test_polynomial_chaos_loo_error(self):
+        data = self.uncertainty_calculations.polynomial_chaos(polynomial_order=2,
+                                                              loo_error=True,
+                                                              seed=self.seed)
+
+        self.assertIsInstance(data["TestingModel1d"].loo_error, float)
+        self.assertIn("loo_error", data["TestingModel1d"].get_metrics())
+
+
+    def test_create_PCE_collocation_halton(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_collocation(polynomial_order=2,
+                                                                 nr_collocation_nodes=8,
+                                                                 sampling_rule="halton")
+
+        self.assertIn("sampling_rule=halton", data.method)
+        self.assertTrue(np.allclose(data.nodes, distribution.sample(8, "H")))
+
+        with self.assertRaises(ValueError):
+            self.uncertainty_calculations.create_PCE_collocation(polynomial_order=2,
+                                                                 sampling_rule="sobol")
+
+
+    def test_create_PCE_collocation_tolerance(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_collocation(polynomial_order=3,
+                                                                 tolerance=1e-3)
+
+        # The model and features are linear in the uncertain parameters
+        self.assertIn("polynomial_order=1,", data.method)
+        self.assertIn("tolerance=0.001", data.method)
+
+        P = cp.orth_ttr(3, distribution)
+        self.assertIn("nr_collocation_nodes={}".format(2*len(P) + 2), data.method)
+
+        for feature in ["TestingModel1d", "feature0d", "feature1d", "feature2d"]:
+            self.assertLessEqual(data[feature].loo_error, 1e-3)
+
+
+    def test_select_polynomial_order(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_collocation(polynomial_order=3)
+
+        data.incomplete = []
+        U_hat, order = self.uncertainty_calculations.select_polynomial_order(data,
+                                                                            data.nodes,
+                                                                            distribution,
+                                                                            polynomial_order=3,
+                                                                            tolerance=1e-3)
+
+        self.assertEqual(order, 1)
+        self.assertEqual(data.incomplete, [])
+        self.assertEqual(sorted(U_hat.keys()),
+                         ["TestingModel1d", "feature0d", "feature1d", "feature2d"])
+
+        # No order is accurate enough
+        U_hat, order = self.uncertainty_calculations.select_polynomial_order(data,
+                                                                            data.nodes,
+                                                                            distribution,
+                                                                            polynomial_order=2,
+                                                                            tolerance=-1)
+
+        self.assertEqual(order, 2)
+
+
+    def test_extend_PCE_collocation(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_collocation(polynomial_order=2,
+                                                                 nr_collocation_nodes=8,
+                                                                 sampling_rule="halton")
+
+        self.assertEqual(data.nodes.shape, (2, 8))
+        old_nodes = data.nodes.copy()
+
+        fits = {}
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.extend_PCE_collocation(data,
+                                                                 nr_new_nodes=6,
+                                                                 polynomial_order=2,
+                                                                 fits=fits)
+
+        self.assertEqual(data.nodes.shape, (2, 14))
+        self.assertTrue(np.array_equal(data.nodes[:, :8], old_nodes))
+        self.assertTrue(np.allclose(data.nodes, distribution.sample(14, "H")))
+        self.assertEqual(len(data["TestingModel1d"].evaluations), 14)
+        self.assertEqual(fits["TestingModel1d"].nr_nodes, 14)
+        self.assertIn("nr_collocation_nodes=14", data.method)
+        self.assertIn("sampling_rule=halton", data.method)
+        self.assertEqual(data.sampling_rule, "halton")
+        self.assertFalse(data.rosenblatt)
+
+        P = cp.orth_ttr(2, distribution)
+        expected = self.uncertainty_calculations.fit_collocation(P, data, data.nodes)
+
+        samples = distribution.sample(10)
+        for feature in ["TestingModel1d", "feature0d", "feature1d", "feature2d"]:
+            self.assertTrue(np.allclose(U_hat[feature](*samples),
+                                        expected[feature](*samples)))
+
+
+    def test_extend_PCE_collocation_fits(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_collocation(polynomial_order=2,
+                                                                 nr_collocation_nodes=8,
+                                                                 sampling_rule="halton")
+
+        fits = {}
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.extend_PCE_collocation(data,
+                                                                 nr_new_nodes=4,
+                                                                 polynomial_order=2,
+                                                                 fits=fits)
+
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.extend_PCE_collocation(data,
+                                                                 nr_new_nodes=4,
+                                                                 polynomial_order=2,
+                                                                 fits=fits)
+
+        self.assertEqual(data.nodes.shape, (2, 16))
+        self.assertEqual(len(np.unique(data.nodes, axis=1).T), 16)
+        self.assertEqual(fits["feature1d"].nr_nodes, 16)
+
+        P = cp.orth_ttr(2, distribution)
+        expected = self.uncertainty_calculations.fit_collocation(P, data, data.nodes)
+
+        samples = distribution.sample(10)
+        self.assertTrue(np.allclose(U_hat["feature1d"](*samples),
+                                    expected["feature1d"](*samples)))
+
+        with self.assertRaises(ValueError):
+            self.uncertainty_calculations.extend_PCE_collocation(data,
+                                                                 nr_new_nodes=4,
+                                                                 polynomial_order=3,
+                                                                 fits=fits)
+
+
+    def test_extend_PCE_collocation_rosenblatt(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_collocation_rosenblatt(polynomial_order=2,
+                                                                            nr_collocation_nodes=8,
+                                                                            sampling_rule="halton")
+
+        U_hat, dist_R, data = \
+            self.uncertainty_calculations.extend_PCE_collocation(data,
+                                                                 nr_new_nodes=6,
+                                                                 polynomial_order=2)
+
+        self.assertIn("Rosenblatt", data.method)
+        self.assertTrue(data.rosenblatt)
+        self.assertEqual(data.nodes.shape, (2, 14))
+
+        distribution = self.uncertainty_calculations.create_distribution()
+        nodes_R = dist_R.inv(distribution.fwd(data.nodes))
+
+        P = cp.orth_ttr(2, dist_R)
+        expected = self.uncertainty_calculations.fit_collocation(P, data, nodes_R)
+
+        samples = dist_R.sample(10)
+        self.assertTrue(np.allclose(U_hat["TestingModel1d"](*samples),
+                                    expected["TestingModel1d"](*samples)))
+
+
+    def test_extend_PCE_collocation_attributes(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_collocation_rosenblatt(polynomial_order=2,
+                                                                            nr_collocation_nodes=8,
+                                                                            sampling_rule="halton")
+
+        self.assertEqual(data.sampling_rule, "halton")
+        self.assertTrue(data.rosenblatt)
+
+        # Only the attributes decide how the nodes are extended
+        data.method = ""
+
+        U_hat, dist_R, data = \
+            self.uncertainty_calculations.extend_PCE_collocation(data,
+                                                                 nr_new_nodes=6,
+                                                                 polynomial_order=2)
+
+        self.assertIn("Rosenblatt", data.method)
+        self.assertEqual(data.nodes.shape, (2, 14))
+
+        data.sampling_rule = "hammersley"
+
+        with self.assertRaises(ValueError):
+            self.uncertainty_calculations.extend_PCE_collocation(data,
+                                                                 nr_new_nodes=4,
+                                                                 polynomial_order=2)
+
+
+    def test_extend_PCE_collocation_loo_error(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_collocation(polynomial_order=2,
+                                                                 nr_collocation_nodes=8,
+                                                                 sampling_rule="halton")
+
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.extend_PCE_collocation(data,
+                                                                 nr_new_nodes=6,
+                                                                 polynomial_order=2,
+                                                                 loo_error=True)
+
+        errors = {feature: data[feature].loo_error for feature in U_hat}
+
+        P = cp.orth_ttr(2, distribution)
+        self.uncertainty_calculations.fit_collocation(P, data, data.nodes, loo_error=True)
+
+        for feature in ["TestingModel1d", "feature0d", "feature1d", "feature2d"]:
+            self.assertIsInstance(errors[feature], float)
+            self.assertTrue(np.isclose(errors[feature], data[feature].loo_error, atol=1e-8))
+
+
+    def test_extend_PCE_collocation_error(self):
+        data = Data(logger_level="error")
+
+        with self.assertRaises(ValueError):
+            self.uncertainty_calculations.extend_PCE_collocation(data, nr_new_nodes=4)
+
+
+    def test_extend_PCE_collocation_hammersley(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_collocation(polynomial_order=2,
+                                                                 nr_collocation_nodes=8)
+
+        with self.assertRaises(ValueError):
+            self.uncertainty_calculations.extend_PCE_collocation(data,
+                                                                 nr_new_nodes=4,
+                                                                 polynomial_order=2)
+
+
+    def test_extend_polynomial_chaos(self):
+        data = self.uncertainty_calculations.polynomial_chaos(polynomial_order=2,
+                                                              nr_collocation_nodes=8,
+                                                              sampling_rule="halton",
+                                                              seed=self.seed)
+
+        data = self.uncertainty_calculations.extend_polynomial_chaos(data,
+                                                                     nr_new_nodes=6,
+                                                                     polynomial_order=2,
+                                                                     seed=self.seed)
+
+        self.assertEqual(data.nodes.shape, (2, 14))
+        self.assertEqual(len(data["TestingModel1d"].evaluations), 14)
+        self.assertEqual(data.seed, self.seed)
+
+        for feature in ["TestingModel1d", "feature0d", "feature1d", "feature2d"]:
+            self.assertIsNotNone(data[feature].mean)
+            self.assertIsNotNone(data[feature].variance)
+            self.assertIsNotNone(data[feature].sobol_first)
+
+
+    def test_create_PCE_adaptive_loo_error(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_adaptive(max_evaluations=20,
+                                                              loo_error=True)
+
+        for feature in ["TestingModel1d", "feature0d", "feature1d", "feature2d"]:
+            self.assertIsInstance(data[feature].loo_error, float)
+
+
+    def test_create_PCE_adaptive(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_adaptive(max_evaluations=20)
+
+        self.assertEqual(data.uncertain_parameters, ["a", "b"])
+        self.assertIsInstance(U_hat["feature0d"], numpoly.ndpoly)
+        self.assertIsInstance(U_hat["feature1d"], numpoly.ndpoly)
+        self.assertIsInstance(U_hat["feature2d"], numpoly.ndpoly)
+        self.assertIsInstance(U_hat["TestingModel1d"], numpoly.ndpoly)
+
+        self.assertLessEqual(len(data["TestingModel1d"].evaluations), 20)
+        self.assertIn("adaptive", data.method)
+
+
+    def test_create_PCE_adaptive_anisotropic(self):
+        def model(a, b):
+            return None, a**3 + 0.5*a**2 + 1e-8*b
+
+        parameters = Parameters([["a", None, cp.Uniform(-1, 1)],
+                                 ["b", None, cp.Uniform(-1, 1)]])
+        uncertainty_calculations = UncertaintyCalculations(model=Model(model),
+                                                           parameters=parameters,
+                                                           features=None,
+                                                           logger_level="error")
+
+        U_hat, distribution, data = \
+            uncertainty_calculations.create_PCE_adaptive(tolerance=1e-6, max_evaluations=50)
+
+        self.assertIn("converged=True", data.method)
+        self.assertLess(len(data["model"].evaluations), 10)
+
+        samples = distribution.sample(10)
+        self.assertTrue(np.allclose(U_hat["model"](*samples),
+                                    samples[0]**3 + 0.5*samples[0]**2, atol=1e-3))
+
+
+    def test_create_PCE_adaptive_rosenblatt(self):
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_adaptive(max_evaluations=10,
+                                                              rosenblatt=True)
+
+        self.assertIsInstance(U_hat["TestingModel1d"], numpoly.ndpoly)
+        self.assertIn("Rosenblatt", data.method)
+
+
+    def test_create_PCE_adaptive_interpolate(self):
+        self.uncertainty_calculations.model = TestingModelAdaptive()
+
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_adaptive(max_evaluations=10)
+
+        self.assertNotIn("TestingModelAdaptive", data.error)
+        self.assertIn("TestingModelAdaptive", U_hat)
+        self.assertEqual(np.shape(data["TestingModelAdaptive"].evaluations)[1],
+                         len(data["TestingModelAdaptive"].time))
+
+
+    def test_create_PCE_adaptive_dependent_error(self):
+        a = cp.Uniform(1, 2)
+        b = cp.Uniform(1, 2) + a
+
+        self.uncertainty_calculations.parameters = Parameters({"a": 1, "b": 2},
+                                                              distribution=cp.J(a, b))
+
+        with self.assertRaises(ValueError):
+            self.uncertainty_calculations.create_PCE_adaptive()
+
+
+    def test_leja_sequence(self):
+        distribution = cp.Uniform(-1, 1)
+
+        sequence = self.uncertainty_calculations.leja_sequence(5, distribution)
+
+        self.assertEqual(len(sequence), 5)
+        self.assertEqual(len(np.unique(sequence)), 5)
+        self.assertTrue(np.allclose(sequence[:3],
+                                    self.uncertainty_calculations.leja_sequence(3, distribution)))
+
+        nodes = cp.generate_quadrature(4, distribution, rule="J", sparse=False)[0]
+        self.assertTrue(np.allclose(np.sort(sequence), np.sort(np.ravel(nodes))))
+
+
+    def test_leja_nodes(self):
+        distributions = [cp.Uniform(-1, 1), cp.Normal(0, 1)]
+
+        nodes = self.uncertainty_calculations.leja_nodes([(0, 0), (2, 1)], distributions)
+
+        sequence_a = self.uncertainty_calculations.leja_sequence(3, distributions[0])
+        sequence_b = self.uncertainty_calculations.leja_sequence(2, distributions[1])
+
+        self.assertEqual(nodes.shape, (2, 2))
+        self.assertTrue(np.allclose(nodes[:, 0], [sequence_a[0], sequence_b[0]]))
+        self.assertTrue(np.allclose(nodes[:, 1], [sequence_a[2], sequence_b[1]]))
+
+
+    def test_margin(self):
+        margin = self.uncertainty_calculations._margin([(0, 0), (1, 0), (0, 1)])
+
+        self.assertEqual(set(margin), set([(2, 0), (1, 1), (0, 2)]))
+
+        margin = self.uncertainty_calculations._margin([(0, 0), (1, 0), (2, 0)])
+
+        self.assertEqual(set(margin), set([(3, 0), (0, 1)]))
+
+
+    def test_lower_set(self):
+        lower_set = self.uncertainty_calculations._lower_set([[2, 1]])
+
+        self.assertEqual(set(tuple(index) for index in lower_set),
+                         set([(0, 0), (1, 0), (2, 0), (0, 1), (1, 1), (2, 1)]))
+        self.assertEqual(tuple(lower_set[0]), (0, 0))
+
+
+    def test_polynomial_chaos_collocation(self):
+        features = TestingFeatures(features_to_run=["feature0d_var",
+                                                    "feature1d_var",
+                                                    "feature2d_var"])
+        self.uncertainty_calculations.features = features
+
+        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
+                                                              seed=self.seed)
+
+        filename = os.path.join(self.output_test_dir, "TestingModel1d.h5")
+        data.save(filename)
+
+        folder = os.path.dirname(os.path.realpath(__file__))
+        compare_file = os.path.join(folder, "data/TestingModel1d.h5")
+        result = subprocess.call(["h5diff", "-d", str(self.threshold), filename, compare_file])
+
+        self.assertEqual(result, 0)
+
+
+
+    def test_PC_collocation_rosenblatt(self):
+        features = TestingFeatures(features_to_run=["feature0d_var",
+                                                    "feature1d_var",
+                                                    "feature2d_var"])
+        self.uncertainty_calculations.features = features
+
+        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
+                                                              rosenblatt=True,
+                                                              seed=self.seed)
+
+        filename = os.path.join(self.output_test_dir, "TestingModel1d_Rosenblatt.h5")
+        data.save(filename)
+
+        folder = os.path.dirname(os.path.realpath(__file__))
+        compare_file = os.path.join(folder, "data/TestingModel1d_Rosenblatt.h5")
+        result = subprocess.call(["h5diff", "-d", str(self.threshold), filename, compare_file])
+
+        self.assertEqual(result, 0)
+
+
+    def test_PC_collocation_auto(self):
+        features = TestingFeatures(features_to_run=[])
+        self.uncertainty_calculations.features = features
+
+        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
+                                                              rosenblatt="auto",
+                                                              seed=self.seed)
+
+        self.assertNotIn("Rosenblatt", data.method)
+
+        a = cp.Uniform(1, 2)
+        b = cp.Uniform(1, 2) + a
+
+        parameter_dict = {"a": a, "b": b}
+
+        self.uncertainty_calculations.parameters = Parameters(parameter_dict)
+
+        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
+                                                              rosenblatt="auto",
+                                                              seed=self.seed)
+
+        self.assertIn("Rosenblatt", data.method)
+
+
+        self.uncertainty_calculations.parameters.distribution = cp.J(cp.Uniform(), cp.Uniform())
+
+        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
+                                                              rosenblatt="auto",
+                                                              seed=self.seed)
+
+        self.assertNotIn("Rosenblatt", data.method)
+
+
+        self.uncertainty_calculations.parameters.distribution = cp.J(a, b)
+
+        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
+                                                              rosenblatt="auto",
+                                                              seed=self.seed)
+
+        self.assertIn("Rosenblatt", data.method)
+
+
+        self.uncertainty_calculations.parameters.distribution = cp.J(a, b)
+        with self.assertRaises(ValueError):
+            data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
+                                                                rosenblatt=False,
+                                                                seed=self.seed)
+
+
+
+    def test_create_PCE_collocation_rosenblatt_dependent(self):
+        a = cp.Uniform(1, 2)
+        b = cp.Uniform(1, 2) + a
+
+        parameter_dict = {"a": a, "b": b}
+
+        self.uncertainty_calculations.parameters = Parameters(parameter_dict)
+
+
+        U_hat, distribution, data = \
+            self.uncertainty_calculations.create_PCE_collocation_rosenblatt()
+
+        self.assertEqual(data.uncertain_parameters, ["a", "b"])
+        self.assertIsInstance(U_hat["feature0d"], numpoly.ndpoly)
+        self.assertIsInstance(U_hat["feature1d"], numpoly.ndpoly)
+        self.assertIsInstance(U_hat["feature2d"], numpoly.ndpoly)
+        self.assertIsInstance(U_hat["TestingModel1d"], numpoly.ndpoly)
+
+
+
+    def test_polynomial_chaos_spectral(self):
+        features = TestingFeatures(features_to_run=["feature0d_var",
+                                                    "feature1d_var",
+                                                    "feature2d_var"])
+        self.uncertainty_calculations.features = features
+
+        data = self.uncertainty_calculations.polynomial_chaos(method="spectral",
+                                                              seed=self.seed)
+
+        filename = os.path.join(self.output_test_dir, "TestingModel1d_spectral.h5")
+        data.save(filename)
+
+        folder = os.path.dirname(os.path.realpath(__file__))
+        compare_file = os.path.join(folder, "data/TestingModel1d_spectral.h5")
+
+        result = subprocess.call(["h5diff", "-d", str(self.threshold), filename, compare_file])
+
+        self.assertEqual(result, 0)
+
+
+
+    def test_polynomial_chaos_spectral_rosenblatt(self):
+        features = TestingFeatures(features_to_run=["feature0d_var",
+                                                    "feature1d_var",
+                                                    "feature2d_var"])
+        self.uncertainty_calculations.features = features
+        data = self.uncertainty_calculations.polynomial_chaos(method="spectral",
+                                                              rosenblatt=True,
+                                                              seed=self.seed)
+
+        filename = os.path.join(self.output_test_dir, "TestingModel1d_Rosenblatt_spectral.h5")
+        data.save(filename)
+
+        folder = os.path.dirname(os.path.realpath(__file__))
+        compare_file = os.path.join(folder, "data/TestingModel1d_Rosenblatt_spectral.h5")
+
+        result = subprocess.call(["h5diff", "-d", str(self.threshold), filename, compare_file])
+
+        self.assertEqual(result, 0)
+
+
+
+    def test_ignore_model(self):
+        self.uncertainty_calculations.model.ignore = True
+
+        data = self.uncertainty_calculations.polynomial_chaos(method="spectral",
+                                                              rosenblatt=True,
+                                                              seed=self.seed)
+        self.assertEqual(set(data["TestingModel1d"].get_metrics()),
+                         set(["evaluations", "time"]))
+
+
+        data = self.uncertainty_calculations.polynomial_chaos(method="spectral",
+                                                              rosenblatt=False,
+                                                              seed=self.seed)
+        self.assertEqual(set(data["TestingModel1d"].get_metrics()),
+                             set(["evaluations", "time"]))
+
+
+        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
+                                                              rosenblatt=True,
+                                                              seed=self.seed)
+        self.assertEqual(set(data["TestingModel1d"].get_metrics()),
+                         set(["evaluations", "time"]))
+
+
+        data = self.uncertainty_calculations.polynomial_chaos(method="collocation",
+                                                              rosenblatt=False,
+                                                              seed=self.seed)
+        self.assertEqual(set(data["TestingModel1d"].get_metrics()),
+                         set(["evaluations", "time"]))
+
+
+        data = self.uncertainty_calculations.monte_carlo(seed=self.seed,
+                                                         nr_samples=self.nr_mc_samples)
+        self.assertEqual(set(data["TestingModel1d"].get_metrics()),
+                         set(["evaluations", "time"]))
+
+
+    def test_ignore_model_create_PCE_spectral(self):
+        np.random.seed(self.seed)
+
+        self.uncertainty_calculations.model.ignore = True
+
+        U_hat, distribution, data = self.uncertainty_calculations.create_PCE_spectral()
+
+        self.assertEqual(data.uncertain_parameters, ["a", "b"])
+        self.assertIsInstance(U_hat["feature0d"], numpoly.ndpoly)
+        self.assertIsInstance(U_hat["feature1d"], numpoly.ndpoly)
+        self.assertIsInstance(U_hat["feature2d"], numpoly.ndpoly)
+        self.assertNotIn("TestingModel1d", U_hat)
+
+        self.assertIn("TestingModel1d", data)
+
+
+    def test_ignore_model_create_PCE_spectral_rosenblatt(self):
+        np.random.seed(self.seed)
+
+        self.uncertainty_calculations.model.ignore = True
+
+        U_hat, distribution, data = self.uncertainty_calculations.create_PCE_spectral_rosenblatt()
+
+        self.assertEqual(data.uncertain_parameters, ["a", "b"])
+        self.assertIsInstance(U_hat["feature0d"], numpoly.ndpoly)
+        self.assertIsInstance(U_hat["feature1d"], numpoly.ndpoly)
+        self.assertIsInstance(U_hat["feature2d"], numpoly.ndpoly)
+        self.assertNotIn("TestingModel1d", U_hat)
+
+        self.assertIn("TestingModel1d", data)
+
+
+
+    def test_ignore_model_create_PCE_collocation(self):
+        np.random.seed(self.seed)
+
+        self.uncertainty_calculations.model.ignore = True
+
+        U_hat, distribution, data = self.uncertainty_calculations.create_PCE_collocation()
+
+        self.assertEqual(data.uncertain_parameters, ["a", "b"])
+        self.assertIsInstance(U_hat["feature0d"], numpoly.ndpoly)
+        self.assertIsInstance(U_hat["feature1d"], numpoly.ndpoly)
+        self.assertIsInstance(U_hat["feature2d"], numpoly.ndpoly)
+        self.assertNotIn("TestingModel1d", U_hat)
+
+        self.assertIn("TestingModel1d", data)
+
+
+    def test_ignore_model_create_PCE_collocation_rosenblatt(self):
+        np.random.seed(self.seed)
+
+        self.uncertainty_calculations.model.ignore = True
+
+        U_hat, distribution, data = self.uncertainty_calculations.create_PCE_collocation_rosenblatt()
+
+        self.assertEqual(data.uncertain_parameters, ["a", "b"])
+        self.assertIsInstance(U_hat["feature0d"], numpoly.ndpoly)
+        self.assertIsInstance(U_hat["feature1d"], numpoly.ndpoly)
+        self.assertIsInstance(U_hat["feature2d"], numpoly.ndpoly)
+        self.assertNotIn("TestingModel1d", U_hat)
+
+        self.assertIn("TestingModel1d", data)
 
     def test_ignore_network(self):
         self.model = TestingModelAdaptive(ignore=True)
@@ -1586,6 +2473,284 @@ class TestUncertaintyCalculations(unittest.TestCase):
         self.assertEqual(np.shape(data["feature0d"]["sobol_total_average"]), (2,))
 
 
+    def test_monte_carlo_sobol_second(self):
+        parameter_list = [["a", 1, None],
+                          ["b", 2, None]]
+
+        parameters = Parameters(parameter_list)
+        parameters.set_all_distributions(uniform(0.5))
+
+        model = TestingModel1d()
+        features = TestingFeatures(features_to_run=["feature0d", "feature1d"])
+
+        self.uncertainty_calculations = UncertaintyCalculations(model,
+                                                                parameters=parameters,
+                                                                features=features,
+                                                                logger_level="error")
+
+        data = self.uncertainty_calculations.monte_carlo(nr_samples=self.nr_mc_samples,
+                                                         seed=10,
+                                                         sobol_second=True)
+
+        nr_sobol_samples = int(np.round(self.nr_mc_samples/2.))
+        self.assertEqual(len(data["TestingModel1d"].evaluations), nr_sobol_samples*6)
+
+        self.assertEqual(np.shape(data["feature0d"]["sobol_first"]), (2,))
+        self.assertEqual(np.shape(data["feature0d"]["sobol_second"]), (2, 2))
+        self.assertEqual(np.shape(data["feature1d"]["sobol_second"]), (2, 2, 10))
+        self.assertEqual(np.shape(data["TestingModel1d"]["sobol_second"]), (2, 2, 10))
+
+
+    def test_create_sobol_samples_saltelli(self):
+        problem = {"num_vars": 2,
+                   "names": ["a", "b"],
+                   "bounds": [[0, 1]]*2}
+
+        samples = self.uncertainty_calculations.create_sobol_samples(["a", "b"], 8)
+
+        self.assertTrue(np.array_equal(samples, saltelli.sample(problem, 8, calc_second_order=False)))
+
+
+    def test_create_sobol_samples_layout(self):
+        for sampling_rule in ["sobol", "halton", "latin_hypercube", "random"]:
+            samples = self.uncertainty_calculations.create_sobol_samples(["a", "b", "c"], 8,
+                                                                         sampling_rule=sampling_rule,
+                                                                         calc_second_order=True)
+
+            self.assertEqual(samples.shape, (8*8, 3))
+            self.assertTrue(np.all((samples >= 0) & (samples <= 1)))
+
+            blocks = samples.reshape(8, 8, 3)
+            A = blocks[:, 0]
+            B = blocks[:, 7]
+
+            for i in range(3):
+                AB = A.copy()
+                AB[:, i] = B[:, i]
+                BA = B.copy()
+                BA[:, i] = A[:, i]
+
+                self.assertTrue(np.array_equal(blocks[:, 1 + i], AB))
+                self.assertTrue(np.array_equal(blocks[:, 4 + i], BA))
+
+
+    def test_create_sobol_samples_random_shift(self):
+        np.random.seed(1)
+        samples_1 = self.uncertainty_calculations.create_sobol_samples(["a", "b"], 8, sampling_rule="sobol")
+        samples_2 = self.uncertainty_calculations.create_sobol_samples(["a", "b"], 8, sampling_rule="sobol")
+
+        self.assertFalse(np.array_equal(samples_1, samples_2))
+
+        samples_1 = self.uncertainty_calculations.create_sobol_samples(["a", "b"], 8, sampling_rule="sobol", random_shift=False)
+        samples_2 = self.uncertainty_calculations.create_sobol_samples(["a", "b"], 8, sampling_rule="sobol", random_shift=False)
+
+        self.assertTrue(np.array_equal(samples_1, samples_2))
+
+
+    def test_create_sobol_samples_skip_values(self):
+        samples = self.uncertainty_calculations.create_sobol_samples(["a", "b"], 12,
+                                                                     sampling_rule="sobol",
+                                                                     random_shift=False)
+
+        samples_skip = self.uncertainty_calculations.create_sobol_samples(["a", "b"], 8,
+                                                                          sampling_rule="sobol",
+                                                                          random_shift=False,
+                                                                          skip_values=4)
+
+        self.assertTrue(np.array_equal(samples_skip, samples[4*4:]))
+
+
+    def test_create_sobol_samples_error(self):
+        with self.assertRaises(ValueError):
+            self.uncertainty_calculations.create_sobol_samples(["a", "b"], 8, sampling_rule="not_existing")
+
+
+    def test_monte_carlo_sampling_rule(self):
+        data = self.uncertainty_calculations.monte_carlo(nr_samples=self.nr_mc_samples,
+                                                         seed=10,
+                                                         sampling_rule="halton")
+
+        self.assertIn("sampling_rule=halton, random_shift=True", data.method)
+        self.assertEqual(np.shape(data["feature0d"]["sobol_first"]), (2,))
+
+
+    def test_monte_carlo_adaptive(self):
+        data = self.uncertainty_calculations.monte_carlo_adaptive(tolerance=1000,
+                                                                  batch_size=10,
+                                                                  max_samples=40,
+                                                                  seed=10)
+
+        self.assertEqual(len(data["TestingModel1d"].evaluations), 5*4)
+        self.assertIn("converged=True", data.method)
+        self.assertEqual(np.shape(data["feature1d"]["sobol_first"]), (2, 10))
+        self.assertEqual(np.shape(data["feature0d"]["mean"]), ())
+
+
+    def test_monte_carlo_adaptive_max_samples(self):
+        data = self.uncertainty_calculations.monte_carlo_adaptive(tolerance=0,
+                                                                  batch_size=10,
+                                                                  max_samples=30,
+                                                                  seed=10)
+
+        self.assertEqual(len(data["TestingModel1d"].evaluations), 15*4)
+        self.assertIn("converged=False", data.method)
+
+
+    def test_monte_carlo_adaptive_reuse(self):
+        data = self.uncertainty_calculations.monte_carlo_adaptive(tolerance=0,
+                                                                  batch_size=10,
+                                                                  max_samples=30,
+                                                                  seed=10,
+                                                                  sampling_rule="halton")
+
+        data_mc = self.uncertainty_calculations.monte_carlo(nr_samples=30,
+                                                            seed=10,
+                                                            sampling_rule="halton",
+                                                            random_shift=False)
+
+        self.assertTrue(np.allclose(data.nodes, data_mc.nodes))
+
+        for feature in ["TestingModel1d", "feature0d", "feature1d"]:
+            self.assertTrue(np.allclose(data[feature].evaluations, data_mc[feature].evaluations))
+            self.assertTrue(np.allclose(data[feature].mean, data_mc[feature].mean))
+            self.assertTrue(np.allclose(data[feature].sobol_first, data_mc[feature].sobol_first,
+                                        equal_nan=True))
+
+
+    def test_monte_carlo_adaptive_nodes(self):
+        data = self.uncertainty_calculations.monte_carlo_adaptive(tolerance=0,
+                                                                  batch_size=6,
+                                                                  max_samples=30,
+                                                                  seed=10)
+
+        nodes_R = self.uncertainty_calculations.create_sobol_samples(["a", "b"],
+                                                                     15,
+                                                                     sampling_rule="sobol",
+                                                                     random_shift=False,
+                                                                     skip_values=1024)
+
+        distribution = self.uncertainty_calculations.create_distribution()
+        nodes = distribution.inv(cp.J(cp.Uniform(), cp.Uniform()).fwd(nodes_R.T))
+
+        self.assertEqual(data.nodes.shape, (2, 15*4))
+        self.assertTrue(np.allclose(data.nodes, nodes))
+
+
+    def test_monte_carlo_adaptive_interpolate(self):
+        self.uncertainty_calculations.model = TestingModelAdaptive()
+
+        data = self.uncertainty_calculations.monte_carlo_adaptive(tolerance=0,
+                                                                  batch_size=10,
+                                                                  max_samples=30,
+                                                                  seed=10)
+
+        self.assertNotIn("TestingModelAdaptive", data.error)
+        self.assertNotIn("feature_interpolate", data.error)
+        self.assertEqual(data["TestingModelAdaptive"].evaluations.shape,
+                         (15*4, len(data["TestingModelAdaptive"].time)))
+        self.assertEqual(np.shape(data["TestingModelAdaptive"].sobol_first),
+                         (2, len(data["TestingModelAdaptive"].time)))
+
+        # The time grid given by the user is restored
+        self.assertIsNone(self.uncertainty_calculations.runmodel.interpolation_time)
+
+
+    def test_evaluate_new_nodes(self):
+        self.uncertainty_calculations.model = TestingModelAdaptive()
+
+        data = self.uncertainty_calculations.evaluate_new_nodes(np.array([[0.1], [0.1]]), ["a", "b"])
+        time = data["TestingModelAdaptive"].time
+
+        new_data = self.uncertainty_calculations.evaluate_new_nodes(np.array([[1.5], [1.5]]),
+                                                                    ["a", "b"],
+                                                                    data)
+
+        self.assertTrue(np.array_equal(new_data["TestingModelAdaptive"].time, time))
+        self.assertEqual(new_data["TestingModelAdaptive"].evaluations.shape, (1, len(time)))
+
+
+    def test_data_interpolation_time(self):
+        self.uncertainty_calculations.model = TestingModelAdaptive()
+
+        data = Data(logger_level="error")
+        data.add_features(["TestingModelAdaptive", "feature_interpolate", "feature1d"])
+        data["TestingModelAdaptive"].time = np.arange(5)
+        data["feature_interpolate"].time = np.arange(3)
+        data["feature1d"].time = np.arange(10)
+
+        times = self.uncertainty_calculations.data_interpolation_time(data)
+
+        self.assertEqual(sorted(times.keys()), ["TestingModelAdaptive", "feature_interpolate"])
+        self.assertTrue(np.array_equal(times["TestingModelAdaptive"], np.arange(5)))
+
+        times = self.uncertainty_calculations.data_interpolation_time(data, {"feature_interpolate": [0, 1]})
+        self.assertEqual(times["feature_interpolate"], [0, 1])
+
+        self.assertEqual(self.uncertainty_calculations.data_interpolation_time(data, [0, 1]), [0, 1])
+
+
+    def test_monte_carlo_adaptive_error(self):
+        with self.assertRaises(ValueError):
+            self.uncertainty_calculations.monte_carlo_adaptive(sampling_rule="latin_hypercube")
+
+
+    def test_concatenate_data(self):
+        data = Data(logger_level="error")
+        data.add_features(["a", "b"])
+        data["a"].evaluations = np.zeros((2, 3))
+        data["b"].evaluations = np.zeros((2, 3))
+
+        new_data = Data(logger_level="error")
+        new_data.add_features(["a", "b"])
+        new_data["a"].evaluations = np.ones((1, 3))
+        new_data["b"].evaluations = np.ones((1, 4))
+
+        data = self.uncertainty_calculations.concatenate_data(data, new_data)
+
+        self.assertTrue(np.array_equal(data["a"].evaluations, [[0, 0, 0], [0, 0, 0], [1, 1, 1]]))
+        self.assertEqual(len(data["b"].evaluations), 3)
+        self.assertEqual(data.error, ["b"])
+
+
+    def test_concatenate_data_time(self):
+        data = Data(logger_level="error")
+        data.add_features("feature_interpolate")
+        data["feature_interpolate"].evaluations = np.zeros((2, 3))
+        data["feature_interpolate"].time = np.arange(3)
+
+        new_data = Data(logger_level="error")
+        new_data.add_features("feature_interpolate")
+        new_data["feature_interpolate"].evaluations = np.ones((1, 3))
+        new_data["feature_interpolate"].time = np.arange(3) + 1
+
+        data = self.uncertainty_calculations.concatenate_data(data, new_data)
+
+        self.assertEqual(len(data["feature_interpolate"].evaluations), 3)
+        self.assertEqual(data.error, ["feature_interpolate"])
+
+
+    def test_concatenate_data_none(self):
+        new_data = Data(logger_level="error")
+
+        self.assertIs(self.uncertainty_calculations.concatenate_data(None, new_data), new_data)
+
+
+    def test_concatenate_data_nodes(self):
+        data = Data(logger_level="error")
+        data.add_features("a")
+        data["a"].evaluations = np.zeros((2, 3))
+        data.nodes = np.zeros((2, 2))
+
+        new_data = Data(logger_level="error")
+        new_data.add_features("a")
+        new_data["a"].evaluations = np.ones((1, 3))
+        new_data.nodes = np.ones((2, 1))
+
+        data = self.uncertainty_calculations.concatenate_data(data, new_data)
+
+        self.assertTrue(np.array_equal(data.nodes, [[0, 0, 1], [0, 0, 1]]))
+
+
     def test_monte_carlo_feature1d(self):
         parameter_list = [["a", 1, None],
                           ["b", 2, None]]
@@ -2015,6 +3180,63 @@ class TestUncertaintyCalculations(unittest.TestCase):
 
 
 
+    def test_separate_output_values_second_order(self):
+        nr_uncertain_parameters = 3
+        nr_samples = 4
+
+        evaluations = np.arange(nr_samples*(2*nr_uncertain_parameters + 2), dtype=float)
+
+        A, B, AB, BA = self.uncertainty_calculations.separate_output_values(evaluations,
+                                                                            nr_uncertain_parameters=nr_uncertain_parameters,
+                                                                            nr_samples=nr_samples,
+                                                                            calc_second_order=True)
+
+        original_A, original_B, original_AB, original_BA = separate_output_values(evaluations,
+                                                                                   D=nr_uncertain_parameters,
+                                                                                   N=nr_samples,
+                                                                                   calc_second_order=True)
+
+        self.assertTrue(np.array_equal(A, original_A))
+        self.assertTrue(np.array_equal(B, original_B))
+        self.assertTrue(np.array_equal(AB, original_AB))
+        self.assertTrue(np.array_equal(BA, original_BA))
+
+
+    def test_mc_calculate_sobol_second(self):
+        nr_uncertain_parameters = 3
+        nr_samples = 16
+
+        np.random.seed(10)
+        evaluations = np.random.rand(nr_samples*(2*nr_uncertain_parameters + 2), 5)
+
+        sobol_first, sobol_total, sobol_second = \
+            self.uncertainty_calculations.mc_calculate_sobol_second(evaluations,
+                                                                    nr_uncertain_parameters,
+                                                                    nr_samples)
+
+        self.assertEqual(sobol_first.shape, (3, 5))
+        self.assertEqual(sobol_total.shape, (3, 5))
+        self.assertEqual(sobol_second.shape, (3, 3, 5))
+
+        # SALib only handles one output value per evaluation
+        for t in range(evaluations.shape[1]):
+            A, B, AB, BA = separate_output_values(evaluations[:, t],
+                                                  D=nr_uncertain_parameters,
+                                                  N=nr_samples,
+                                                  calc_second_order=True)
+
+            for j in range(nr_uncertain_parameters):
+                self.assertTrue(np.allclose(sobol_first[j, t], first_order(A, AB[:, j], B)))
+                self.assertTrue(np.allclose(sobol_total[j, t], total_order(A, AB[:, j], B)))
+                self.assertEqual(sobol_second[j, j, t], 0)
+
+                for k in range(j + 1, nr_uncertain_parameters):
+                    expected = second_order(A, AB[:, j], AB[:, k], BA[:, j], B)
+
+                    self.assertTrue(np.allclose(sobol_second[j, k, t], expected))
+                    self.assertTrue(np.allclose(sobol_second[k, j, t], expected))
+
+
     def mc_calculate_sobol_use_case(self, base_evaluation):
         # N = 1, D = 1 => Nt = 3
         nr_uncertain_parameters = 1
@@ -2067,6 +3289,293 @@ class TestUncertaintyCalculations(unittest.TestCase):
 
 
 
+    def test_separate_output_values_views(self):
+        evaluations = np.random.rand(2*4, 3)
+
+        A, B, AB = self.uncertainty_calculations.separate_output_values(evaluations,
+                                                                        nr_uncertain_parameters=2,
+                                                                        nr_samples=2)
+
+        self.assertTrue(np.shares_memory(A, evaluations))
+        self.assertTrue(np.shares_memory(B, evaluations))
+        self.assertTrue(np.shares_memory(AB, evaluations))
+
+
+    def test_mc_calculate_sobol_salib(self):
+        nr_uncertain_parameters = 3
+        nr_samples = 16
+
+        np.random.seed(10)
+        evaluations = np.random.rand(nr_samples*(nr_uncertain_parameters + 2), 4, 5)
+
+        sobol_first, sobol_total = self.uncertainty_calculations.mc_calculate_sobol(evaluations,
+                                                                                    nr_uncertain_parameters,
+                                                                                    nr_samples)
+
+        self.assertEqual(sobol_first.shape, (3, 4, 5))
+        self.assertEqual(sobol_total.shape, (3, 4, 5))
+
+        # SALib only handles one output value per evaluation
+        flat_evaluations = evaluations.reshape(len(evaluations), -1)
+        flat_first = sobol_first.reshape(nr_uncertain_parameters, -1)
+        flat_total = sobol_total.reshape(nr_uncertain_parameters, -1)
+
+        for t in range(flat_evaluations.shape[1]):
+            A, B, AB, _ = separate_output_values(flat_evaluations[:, t],
+                                                 D=nr_uncertain_parameters,
+                                                 N=nr_samples,
+                                                 calc_second_order=False)
+
+            for i in range(nr_uncertain_parameters):
+                self.assertTrue(np.allclose(flat_first[i, t], first_order(A, AB[:, i], B)))
+                self.assertTrue(np.allclose(flat_total[i, t], total_order(A, AB[:, i], B)))
+
+
+    def test_mc_calculate_sobol_chunksize(self):
+        nr_uncertain_parameters = 3
+        nr_samples = 16
+
+        np.random.seed(10)
+        evaluations = np.random.rand(nr_samples*(2*nr_uncertain_parameters + 2), 7)
+
+        result = self.uncertainty_calculations.mc_calculate_sobol_second(evaluations,
+                                                                         nr_uncertain_parameters,
+                                                                         nr_samples)
+
+        result_chunked = self.uncertainty_calculations.mc_calculate_sobol_second(evaluations,
+                                                                                 nr_uncertain_parameters,
+                                                                                 nr_samples,
+                                                                                 chunksize=3)
+
+        for sobol, sobol_chunked in zip(result, result_chunked):
+            self.assertTrue(np.allclose(sobol, sobol_chunked))
+
+
+    def test_mc_bootstrap(self):
+        nr_uncertain_parameters = 3
+        nr_samples = 200
+
+        np.random.seed(10)
+        evaluations = np.random.rand(nr_samples*(nr_uncertain_parameters + 2), 4)
+
+        confidence_intervals = self.uncertainty_calculations.mc_bootstrap(evaluations,
+                                                                         nr_uncertain_parameters,
+                                                                         nr_samples,
+                                                                         nr_bootstrap=50)
+
+        self.assertEqual(sorted(confidence_intervals),
+                         ["mean", "sobol_first", "sobol_total", "variance"])
+
+        self.assertEqual(confidence_intervals["mean"][0].shape, (4,))
+        self.assertEqual(confidence_intervals["sobol_first"][0].shape, (3, 4))
+
+        A, B = self.uncertainty_calculations.separate_output_values(evaluations,
+                                                                    nr_uncertain_parameters,
+                                                                    nr_samples)[:2]
+        mean = np.mean(np.concatenate([A, B]), 0)
+
+        lower, upper = confidence_intervals["mean"]
+        self.assertTrue(np.all(lower <= upper))
+        self.assertTrue(np.all((lower < mean) & (mean < upper)))
+
+        sobol_total = self.uncertainty_calculations.mc_calculate_sobol(evaluations,
+                                                                       nr_uncertain_parameters,
+                                                                       nr_samples)[1]
+        lower, upper = confidence_intervals["sobol_total"]
+        self.assertTrue(np.all((lower < sobol_total) & (sobol_total < upper)))
+
+
+    def test_mc_bootstrap_one_parameter(self):
+        np.random.seed(10)
+        evaluations = np.random.rand(20*3)
+
+        confidence_intervals = self.uncertainty_calculations.mc_bootstrap(evaluations, 1, 20)
+
+        self.assertEqual(sorted(confidence_intervals), ["mean", "variance"])
+        self.assertEqual(np.shape(confidence_intervals["mean"][0]), ())
+
+
+    def test_mc_bootstrap_percentiles(self):
+        nr_uncertain_parameters = 2
+        nr_samples = 100
+
+        np.random.seed(10)
+        evaluations = np.random.rand(nr_samples*(nr_uncertain_parameters + 2), 3)
+
+        confidence_intervals = self.uncertainty_calculations.mc_bootstrap(evaluations,
+                                                                         nr_uncertain_parameters,
+                                                                         nr_samples,
+                                                                         nr_bootstrap=50,
+                                                                         percentiles=True)
+
+        self.assertEqual(sorted(confidence_intervals),
+                         ["mean", "percentile_5", "percentile_95",
+                          "sobol_first", "sobol_total", "variance"])
+
+        A, B = self.uncertainty_calculations.separate_output_values(evaluations,
+                                                                    nr_uncertain_parameters,
+                                                                    nr_samples)[:2]
+        percentile_95 = np.percentile(np.concatenate([A, B]), 95, 0)
+
+        lower, upper = confidence_intervals["percentile_95"]
+        self.assertEqual(lower.shape, (3,))
+        self.assertTrue(np.all((lower <= percentile_95) & (percentile_95 <= upper)))
+
+
+    def test_mc_bootstrap_indices(self):
+        nr_uncertain_parameters = 2
+        nr_samples = 20
+
+        np.random.seed(10)
+        evaluations = np.random.rand(nr_samples*(nr_uncertain_parameters + 2), 3)
+
+        # Every resample contains each row once, so each estimate is the
+        # estimate from all evaluations
+        indices = np.tile(np.arange(nr_samples), (5, 1))
+
+        confidence_intervals = self.uncertainty_calculations.mc_bootstrap(evaluations,
+                                                                         nr_uncertain_parameters,
+                                                                         nr_samples,
+                                                                         indices=indices,
+                                                                         percentiles=True)
+
+        A, B = self.uncertainty_calculations.separate_output_values(evaluations,
+                                                                    nr_uncertain_parameters,
+                                                                    nr_samples)[:2]
+        independent_evaluations = np.concatenate([A, B])
+
+        sobol_first = self.uncertainty_calculations.mc_calculate_sobol(evaluations,
+                                                                       nr_uncertain_parameters,
+                                                                       nr_samples)[0]
+
+        expected = {"mean": np.mean(independent_evaluations, 0),
+                    "variance": np.var(independent_evaluations, 0),
+                    "percentile_5": np.percentile(independent_evaluations, 5, 0),
+                    "sobol_first": sobol_first}
+
+        for metric in expected:
+            lower, upper = confidence_intervals[metric]
+            self.assertTrue(np.allclose(lower, expected[metric]))
+            self.assertTrue(np.allclose(upper, expected[metric]))
+
+
+    def test_mc_bootstrap_second(self):
+        nr_uncertain_parameters = 3
+        nr_samples = 16
+
+        np.random.seed(10)
+        evaluations = np.random.rand(nr_samples*(2*nr_uncertain_parameters + 2), 5)
+
+        indices = np.tile(np.arange(nr_samples), (5, 1))
+
+        confidence_intervals = self.uncertainty_calculations.mc_bootstrap(evaluations,
+                                                                         nr_uncertain_parameters,
+                                                                         nr_samples,
+                                                                         indices=indices,
+                                                                         calc_second_order=True)
+
+        sobol_first, sobol_total, sobol_second = \
+            self.uncertainty_calculations.mc_calculate_sobol_second(evaluations,
+                                                                    nr_uncertain_parameters,
+                                                                    nr_samples)
+
+        expected = {"sobol_first": sobol_first,
+                    "sobol_total": sobol_total,
+                    "sobol_second": sobol_second}
+
+        for metric in expected:
+            lower, upper = confidence_intervals[metric]
+            self.assertTrue(np.allclose(lower, expected[metric]))
+            self.assertTrue(np.allclose(upper, expected[metric]))
+
+
+    def test_mc_bootstrap_chunksize(self):
+        nr_uncertain_parameters = 3
+        nr_samples = 20
+
+        np.random.seed(10)
+        evaluations = np.random.rand(nr_samples*(2*nr_uncertain_parameters + 2), 5)
+        indices = np.random.randint(0, nr_samples, size=(10, nr_samples))
+
+        confidence_intervals = self.uncertainty_calculations.mc_bootstrap(evaluations,
+                                                                         nr_uncertain_parameters,
+                                                                         nr_samples,
+                                                                         indices=indices,
+                                                                         percentiles=True,
+                                                                         calc_second_order=True)
+
+        for chunksize in [1, 2]:
+            chunked = self.uncertainty_calculations.mc_bootstrap(evaluations,
+                                                                 nr_uncertain_parameters,
+                                                                 nr_samples,
+                                                                 indices=indices,
+                                                                 percentiles=True,
+                                                                 calc_second_order=True,
+                                                                 chunksize=chunksize)
+
+            self.assertEqual(set(chunked), set(confidence_intervals))
+
+            for metric in confidence_intervals:
+                self.assertTrue(np.allclose(chunked[metric],
+                                            confidence_intervals[metric]))
+
+
+    def test_mc_confidence_intervals_second(self):
+        data = self.uncertainty_calculations.monte_carlo(nr_samples=40,
+                                                         seed=10,
+                                                         nr_bootstrap=20,
+                                                         sobol_second=True)
+
+        self.assertEqual(np.shape(data["TestingModel1d"].sobol_second_confidence_interval),
+                         (2, 2, 2, 10))
+
+        lower, upper = data["TestingModel1d"].sobol_second_confidence_interval
+        self.assertTrue(np.all(lower <= upper))
+
+
+    def test_mc_confidence_intervals(self):
+        data = self.uncertainty_calculations.monte_carlo(nr_samples=40,
+                                                         seed=10,
+                                                         nr_bootstrap=20)
+
+        for metric in ["mean", "variance", "percentile_5", "percentile_95"]:
+            interval = data["TestingModel1d"][metric + "_confidence_interval"]
+            self.assertEqual(interval.shape, (2, 10))
+            self.assertTrue(np.all(interval[0] <= interval[1]))
+
+        self.assertEqual(data["TestingModel1d"].sobol_first_confidence_interval.shape, (2, 2, 10))
+        self.assertEqual(data["feature2d"].sobol_total_confidence_interval.shape, (2, 2, 2, 10))
+        self.assertEqual(data["feature0d"].mean_confidence_interval.shape, (2,))
+
+
+    def test_mc_confidence_intervals_seed(self):
+        data = self.uncertainty_calculations.monte_carlo(nr_samples=40,
+                                                         seed=10,
+                                                         nr_bootstrap=20)
+
+        uncertainty_calculations = UncertaintyCalculations(model=self.model,
+                                                           parameters=self.parameters,
+                                                           features=self.features,
+                                                           logger_level="error",
+                                                           CPUs=None)
+
+        data_serial = uncertainty_calculations.monte_carlo(nr_samples=40,
+                                                           seed=10,
+                                                           nr_bootstrap=20)
+
+        for feature in data:
+            self.assertTrue(np.allclose(data[feature].sobol_first_confidence_interval,
+                                        data_serial[feature].sobol_first_confidence_interval,
+                                        equal_nan=True))
+
+
+    def test_monte_carlo_no_confidence_intervals(self):
+        data = self.uncertainty_calculations.monte_carlo(nr_samples=40, seed=10)
+
+        self.assertIsNone(data["TestingModel1d"].mean_confidence_interval)
+        self.assertIsNone(data["TestingModel1d"].sobol_first_confidence_interval)
+
+
     def test_mc_calculate_sobol(self):
         test_arrays = [0, np.zeros((4)), np.zeros((4, 3)), np.zeros((4, 3, 4, 5, 6, 2, 3, 1, 2))]
 
@@ -2,7 +2,7 @@ import numpy as np
 import unittest
 
 from uncertainpy.utils import lengths, none_to_nan, contains_nan
-from uncertainpy.utils import is_regular, set_nan
+from uncertainpy.utils import is_regular, set_nan, valid_mask
 
 
 class TestLengths(unittest.TestCase):
@@ -615,3 +615,29 @@ class TestIsRegular(unittest.TestCase):
     #     self.assertTrue(np.isnan(result[0]))
     #     self.assertTrue(np.isnan(result[1][0]))
     #     self.assertTrue(np.array_equal(result[1][1], [1, 2, 3]))
+
+
+
+class TestValidMask(unittest.TestCase):
+    def test_array(self):
+        values = np.array([[1, 2, 3], [4, np.nan, 6], [7, 8, 9]])
+        result = valid_mask(values)
+        self.assertTrue(np.array_equal(result, [True, False, True]))
+
+
+    def test_array_0d(self):
+        values = np.array([1, np.nan, 3])
+        result = valid_mask(values)
+        self.assertTrue(np.array_equal(result, [True, False, True]))
+
+
+    def test_array_empty(self):
+        values = np.zeros((2, 0))
+        result = valid_mask(values)
+        self.assertTrue(np.array_equal(result, [True, True]))
+
+
+    def test_irregular(self):
+        values = [[1, 2, 3], None, [1, 2], [np.nan]]
+        result = valid_mask(values)
+        self.assertTrue(np.array_equal(result, [True, False, True, False]))
@@ -3,7 +3,7 @@ from .testing_models import TestingModelNoTime, TestingModelNoTimeU
 from .testing_models import TestingModelAdaptive, TestingModelConstant
 from .testing_models import TestingModelIncomplete
 from .testing_models import PostprocessErrorNumpy, PostprocessErrorValue, PostprocessErrorOne
-from .testing_models import model_function
+from .testing_models import model_function, model_function_vectorized
 
 from .testing_features import TestingFeatures
 from .testing_uncertainty import TestingUncertaintyCalculations
@@ -10,6 +10,13 @@ def model_function(a=1, b=2):
     return time, values
 
 
+def model_function_vectorized(a=1, b=2):
+    time = np.arange(0, 10)
+    values = np.arange(0, 10) + np.asarray(a + b)[:, np.newaxis]
+
+    return [(time, node_values) for node_values in values]
+
+
 
 class TestingModel0d(Model):
     def __init__(self):
@@ -12,6 +12,10 @@ class TestingUncertaintyCalculations(UncertaintyCalculations):
                          quadrature_order=4,
                          nr_pc_mc_samples=10**4,
                          allow_incomplete=False,
+                         sobol_second=False,
+                         tolerance=None,
+                         loo_error=False,
+                         sampling_rule="hammersley",
                          seed=None):
 
         arguments = {}
@@ -37,7 +41,11 @@ class TestingUncertaintyCalculations(UncertaintyCalculations):
     def monte_carlo(self,
                     uncertain_parameters=None,
                     nr_samples=10**3,
-                    seed=None):
+                    seed=None,
+                    sobol_second=False,
+                    sampling_rule="saltelli",
+                    random_shift=True,
+                    nr_bootstrap=None):
         arguments = {}
 
         arguments["function"] = "MC"